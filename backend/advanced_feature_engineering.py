@@ -2,13 +2,17 @@
 State-of-the-art feature creation, selection, and transformation techniques
 """
 
+import asyncio
 import logging
+import sys
 import warnings
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
@@ -53,8 +57,104 @@ from sklearn.preprocessing import (
     StandardScaler,
 )
 
+from services.feature_matrix import FeatureMatrix, FeatureSchema, Rows, as_records
+from services.trend_engine import ols_slopes
+
 logger = logging.getLogger(__name__)
 
+_PERCENTILES = (5, 10, 25, 75, 90, 95)
+_MOMENTS = (2, 3, 4, 5)
+_HOLIDAYS = ((1, 1), (7, 4), (12, 25), (11, 24))
+
+STATISTICAL_COLUMNS = (
+    "stat_mean", "stat_median", "stat_std", "stat_var", "stat_skew",
+    "stat_kurtosis", "stat_min", "stat_max", "stat_range", "stat_iqr",
+    "stat_coefficient_variation", "stat_mad", "stat_trimmed_mean",
+    "stat_geometric_mean", "stat_harmonic_mean",
+    *(f"stat_percentile_{p}" for p in _PERCENTILES),
+    *(f"stat_moment_{i}" for i in _MOMENTS),
+    "stat_normality_p", "stat_entropy",
+)
+
+TEMPORAL_COLUMNS = (
+    "temporal_hour", "temporal_day_of_week", "temporal_day_of_month",
+    "temporal_month", "temporal_quarter", "temporal_year",
+    "temporal_is_weekend", "temporal_is_holiday",
+    "temporal_hour_sin", "temporal_hour_cos", "temporal_day_sin",
+    "temporal_day_cos", "temporal_month_sin", "temporal_month_cos",
+    "temporal_season", "temporal_is_business_hours", "temporal_is_prime_time",
+)
+
+PLAYER_COLUMNS = (
+    "player_recent_avg", "player_recent_trend", "player_consistency",
+    "player_career_avg", "player_games_played", "player_career_high",
+    "player_vs_opponent_avg", "player_vs_opponent_games",
+    "player_home_avg", "player_away_avg", "player_home_away_diff",
+)
+
+ADVANCED_FEATURE_SCHEMA = FeatureSchema(
+    name="advanced_features",
+    version=1,
+    columns=STATISTICAL_COLUMNS + TEMPORAL_COLUMNS + PLAYER_COLUMNS,
+)
+
+
+# Quality metrics are estimated from this many recent feature rows
+QUALITY_HISTORY_SIZE = 256
+# Features kept by the interaction screen (pairs / triples)
+INTERACTION_TOP_K = 20
+INTERACTION_TRIPLE_TOP_K = 10
+QUALITY_BLOCK_SIZE = 512
+
+
+def feature_quality_matrix(
+    X: np.ndarray, y: Optional[np.ndarray] = None, block_size: int = QUALITY_BLOCK_SIZE
+) -> Dict[str, np.ndarray]:
+    """Per-column quality metrics of a (samples × features) matrix, all at once.
+
+    NaN (or any non-finite value) marks a feature missing from a sample. Returns arrays (one value per
+    column) of variance, variance relative to the mean column variance,
+    |correlation| with ``y`` (0 without a target), redundancy (largest
+    |correlation| with any other column, computed a block of columns at a
+    time) and stability (1 / (1 + coefficient of variation)).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_samples, n_features = X.shape
+    observed = np.isfinite(X)
+    counts = observed.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(observed, X, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        centered = np.where(observed, X - mean, 0.0)
+        variance = (centered**2).sum(axis=0) / np.maximum(counts, 1)
+        std = np.sqrt(variance)
+        Z = np.divide(centered, std, out=np.zeros_like(centered), where=std > 0)
+
+        mean_variance = variance.mean() if n_features else 0.0
+        variance_ratio = variance / (mean_variance + 1e-8)
+        stability = 1.0 / (1.0 + std / (np.abs(mean) + 1e-8))
+
+        correlation = np.zeros(n_features)
+        if y is not None and n_samples > 2:
+            y = np.asarray(y, dtype=np.float64)
+            y_std = y.std()
+            if y_std > 0:
+                correlation = np.abs(Z.T @ ((y - y.mean()) / y_std)) / np.maximum(counts, 1)
+
+    redundancy = np.zeros(n_features)
+    if n_samples > 2:
+        for start in range(0, n_features, block_size):
+            block = np.abs(Z[:, start : start + block_size].T @ Z) / n_samples
+            block[np.arange(block.shape[0]), np.arange(start, start + block.shape[0])] = 0.0
+            redundancy[start : start + block.shape[0]] = block.max(axis=1)
+
+    return {
+        "variance": variance,
+        "variance_ratio": variance_ratio,
+        "correlation_with_target": np.minimum(correlation, 1.0),
+        "redundancy": np.minimum(redundancy, 1.0),
+        "stability": stability,
+    }
+
 
 class FeatureEngineeringStrategy(str, Enum):
     """Advanced feature engineering strategies"""
@@ -75,6 +175,17 @@ class FeatureEngineeringStrategy(str, Enum):
     TECHNICAL_INDICATORS = "technical_indicators"
 
 
+# Pure numpy/scipy/sklearn strategies and their synchronous builders, which
+# can be handed to an executor as they are
+CPU_BOUND_STRATEGIES = {
+    FeatureEngineeringStrategy.STATISTICAL_TRANSFORMATION: "_create_statistical_features",
+    FeatureEngineeringStrategy.TECHNICAL_INDICATORS: "_create_technical_indicator_features",
+    FeatureEngineeringStrategy.FREQUENCY_DOMAIN: "_create_frequency_domain_features",
+    FeatureEngineeringStrategy.CLUSTERING_FEATURES: "_create_clustering_features",
+    FeatureEngineeringStrategy.ANOMALY_FEATURES: "_create_anomaly_features",
+}
+
+
 class FeatureImportanceMethod(str, Enum):
     """Feature importance calculation methods"""
 
@@ -152,6 +263,10 @@ class AdvancedFeatureEngineer:
         # Caching and optimization
         self.feature_computation_cache = {}
         self.performance_metrics = defaultdict(list)
+        # Recent (column ids, values, target) rows the quality metrics are
+        # estimated from; ids index quality_columns
+        self.quality_history: deque = deque(maxlen=QUALITY_HISTORY_SIZE)
+        self.quality_columns: Dict[str, int] = {}
 
         # Initialize advanced feature engineering components
         self.initialize_advanced_components()
@@ -211,8 +326,12 @@ class AdvancedFeatureEngineer:
         try:
             self.sentiment_analyzer = SentimentIntensityAnalyzer()
         except LookupError:
-            nltk.download("vader_lexicon")
-            self.sentiment_analyzer = SentimentIntensityAnalyzer()
+            nltk.download("vader_lexicon", quiet=True)
+            try:
+                self.sentiment_analyzer = SentimentIntensityAnalyzer()
+            except LookupError:
+                logger.warning("vader_lexicon unavailable; sentiment features disabled")
+                self.sentiment_analyzer = None
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Failed to initialize SentimentIntensityAnalyzer: {e}")
             self.sentiment_analyzer = None
@@ -225,8 +344,15 @@ class AdvancedFeatureEngineer:
         target_variable: Optional[str] = None,
         strategies: List[FeatureEngineeringStrategy] = None,
         context: Optional[Dict[str, Any]] = None,
+        parallel: bool = False,
+        executor: Optional[Executor] = None,
     ) -> FeatureSet:
-        """Engineer features optimized for maximum prediction accuracy"""
+        """Engineer features optimized for maximum prediction accuracy
+
+        With ``parallel`` the CPU-bound strategies run concurrently in
+        ``executor`` (the loop's default thread pool if None) while the rest
+        run on the loop; results are merged in strategy order either way.
+        """
         if strategies is None:
             strategies = [
                 FeatureEngineeringStrategy.STATISTICAL_TRANSFORMATION,
@@ -241,25 +367,39 @@ class AdvancedFeatureEngineer:
 
         start_time = datetime.now()
         engineered_features = {}
-        feature_metrics = {}
         transformation_pipeline = []
 
         # 1. Basic preprocessing and cleaning
         cleaned_data = await self._advanced_data_cleaning(raw_data)
 
         # 2. Apply each feature engineering strategy
-        for strategy in strategies:
-            try:
-                strategy_features = await self._apply_strategy(
-                    strategy, cleaned_data, context
-                )
-                engineered_features.update(strategy_features)
-                transformation_pipeline.append(strategy.value)
-                logger.info(
-                    f"Applied {strategy.value}: {len(strategy_features)} features created"
-                )
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Error applying strategy {strategy.value}: {e}")
+        if parallel:
+            results = await asyncio.gather(
+                *(
+                    self._run_strategy(strategy, cleaned_data, context, executor)
+                    for strategy in strategies
+                ),
+                return_exceptions=True,
+            )
+        else:
+            results = []
+            for strategy in strategies:
+                try:
+                    results.append(
+                        await self._apply_strategy(strategy, cleaned_data, context)
+                    )
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    results.append(e)
+
+        for strategy, strategy_features in zip(strategies, results):
+            if isinstance(strategy_features, Exception):
+                logger.error(f"Error applying strategy {strategy.value}: {strategy_features}")
+                continue
+            engineered_features.update(strategy_features)
+            transformation_pipeline.append(strategy.value)
+            logger.info(
+                f"Applied {strategy.value}: {len(strategy_features)} features created"
+            )
 
         # 3. Feature interaction discovery
         interaction_features = await self._discover_feature_interactions(
@@ -275,12 +415,10 @@ class AdvancedFeatureEngineer:
         engineered_features.update(transformed_features)
         transformation_pipeline.append("statistical_transformations")
 
-        # 5. Feature quality assessment
-        for feature_name, feature_value in engineered_features.items():
-            metrics = await self._assess_feature_quality(
-                feature_name, feature_value, engineered_features, target_variable
-            )
-            feature_metrics[feature_name] = metrics
+        # 5. Feature quality assessment, every feature at once
+        target_value = raw_data.get(target_variable) if target_variable else None
+        self._record_quality_sample(engineered_features, target_value)
+        feature_metrics = self._assess_feature_quality_batch(engineered_features)
 
         # 6. Feature selection and optimization
         optimized_features = await self._optimize_feature_set(
@@ -328,22 +466,14 @@ class AdvancedFeatureEngineer:
         context: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Apply specific feature engineering strategy"""
-        if strategy == FeatureEngineeringStrategy.STATISTICAL_TRANSFORMATION:
-            return await self._create_statistical_features(data)
+        if strategy in CPU_BOUND_STRATEGIES:
+            return getattr(self, CPU_BOUND_STRATEGIES[strategy])(data)
         elif strategy == FeatureEngineeringStrategy.TEMPORAL_PATTERNS:
             return await self._create_temporal_features(data, context)
         elif strategy == FeatureEngineeringStrategy.INTERACTION_DISCOVERY:
             return await self._create_interaction_features(data)
         elif strategy == FeatureEngineeringStrategy.DOMAIN_SPECIFIC:
             return await self._create_domain_specific_features(data, context)
-        elif strategy == FeatureEngineeringStrategy.TECHNICAL_INDICATORS:
-            return await self._create_technical_indicator_features(data)
-        elif strategy == FeatureEngineeringStrategy.FREQUENCY_DOMAIN:
-            return await self._create_frequency_domain_features(data)
-        elif strategy == FeatureEngineeringStrategy.CLUSTERING_FEATURES:
-            return await self._create_clustering_features(data)
-        elif strategy == FeatureEngineeringStrategy.ANOMALY_FEATURES:
-            return await self._create_anomaly_features(data)
         elif strategy == FeatureEngineeringStrategy.POLYNOMIAL_EXPANSION:
             return await self._create_polynomial_features(data)
         elif strategy == FeatureEngineeringStrategy.SENTIMENT_FEATURES:
@@ -351,7 +481,7 @@ class AdvancedFeatureEngineer:
         else:
             return {}
 
-    async def _create_statistical_features(
+    def _create_statistical_features(
         self, data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Create advanced statistical features"""
@@ -454,7 +584,7 @@ class AdvancedFeatureEngineer:
 
         return features
 
-    async def _create_technical_indicator_features(
+    def _create_technical_indicator_features(
         self, data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Create technical analysis indicator features"""
@@ -527,7 +657,7 @@ class AdvancedFeatureEngineer:
 
         return features
 
-    async def _create_frequency_domain_features(
+    def _create_frequency_domain_features(
         self, data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Create frequency domain features using FFT"""
@@ -579,7 +709,7 @@ class AdvancedFeatureEngineer:
 
         return features
 
-    async def _create_clustering_features(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_clustering_features(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create clustering-based features"""
         features = {}
 
@@ -619,7 +749,7 @@ class AdvancedFeatureEngineer:
 
         return features
 
-    async def _create_anomaly_features(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_anomaly_features(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create anomaly detection features"""
         features = {}
 
@@ -753,171 +883,491 @@ class AdvancedFeatureEngineer:
 
         return features
 
+    def _screen_interaction_candidates(
+        self, numeric_features: Dict[str, float], k: int
+    ) -> List[str]:
+        """Top-k features to combine, by |correlation| with the target.
+
+        Falls back to variance across recent rows, and to input order when
+        there is no history yet.
+        """
+        names = list(numeric_features)
+        if len(names) <= k or len(self.quality_history) < 3:
+            return names[:k]
+        X, y = self._quality_matrix(names)
+        quality = feature_quality_matrix(X, y)
+        score = quality["correlation_with_target"] if y is not None else quality["variance_ratio"]
+        # Stable sort keeps input order among ties
+        return [names[i] for i in np.argsort(-score, kind="stable")[:k]]
+
     async def _discover_feature_interactions(
         self, features: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Discover important feature interactions"""
-        interaction_features = {}
-
+        """Pairwise and three-way interactions of the screened top-k features"""
         numeric_features = {
             k: v for k, v in features.items() if isinstance(v, (int, float, np.number))
         }
-        feature_names = list(numeric_features.keys())
-
-        # Limit to prevent explosion
-        max_features = min(20, len(feature_names))
-        selected_features = feature_names[:max_features]
-
-        # Pairwise interactions
-        for i, feat1 in enumerate(selected_features):
-            for j, feat2 in enumerate(selected_features[i + 1 :], i + 1):
-                val1, val2 = numeric_features[feat1], numeric_features[feat2]
-
-                # Multiple interaction types
-                interaction_features[f"{feat1}_X_{feat2}_multiply"] = val1 * val2
-                interaction_features[f"{feat1}_X_{feat2}_add"] = val1 + val2
-                interaction_features[f"{feat1}_X_{feat2}_subtract"] = val1 - val2
-                interaction_features[f"{feat1}_X_{feat2}_divide"] = val1 / (val2 + 1e-8)
-                interaction_features[f"{feat1}_X_{feat2}_max"] = max(val1, val2)
-                interaction_features[f"{feat1}_X_{feat2}_min"] = min(val1, val2)
-                interaction_features[f"{feat1}_X_{feat2}_mean"] = (val1 + val2) / 2
-
-                # Advanced interactions
-                interaction_features[f"{feat1}_X_{feat2}_harmonic"] = (
-                    2 * val1 * val2 / (val1 + val2 + 1e-8)
-                )
-                interaction_features[f"{feat1}_X_{feat2}_geometric"] = np.sqrt(
-                    abs(val1 * val2)
-                )
-                interaction_features[f"{feat1}_X_{feat2}_power"] = val1 ** (
-                    val2 * 0.1
-                )  # Scale power
+        selected = self._screen_interaction_candidates(numeric_features, INTERACTION_TOP_K)
+        if len(selected) < 2:
+            return {}
+
+        values = np.array([numeric_features[name] for name in selected], dtype=np.float64)
+        i, j = np.triu_indices(len(selected), k=1)
+        a, b = values[i], values[j]
+        with np.errstate(all="ignore"):
+            pair_values = {
+                "multiply": a * b,
+                "add": a + b,
+                "subtract": a - b,
+                "divide": a / (b + 1e-8),
+                "max": np.maximum(a, b),
+                "min": np.minimum(a, b),
+                "mean": (a + b) / 2,
+                "harmonic": 2 * a * b / (a + b + 1e-8),
+                "geometric": np.sqrt(np.abs(a * b)),
+                "power": np.power(a, b * 0.1),  # Scale power
+            }
+
+        interaction_features = {}
+        pair_names = [f"{selected[p]}_X_{selected[q]}" for p, q in zip(i, j)]
+        for p, name in enumerate(pair_names):
+            for kind, column in pair_values.items():
+                interaction_features[f"{name}_{kind}"] = column[p]
 
         # Higher-order interactions (limited)
-        top_features = selected_features[:10]
-        for i, feat1 in enumerate(top_features):
-            for j, feat2 in enumerate(top_features[i + 1 :], i + 1):
-                for k, feat3 in enumerate(top_features[j + 1 :], j + 1):
-                    val1, val2, val3 = (
-                        numeric_features[feat1],
-                        numeric_features[feat2],
-                        numeric_features[feat3],
-                    )
-                    interaction_features[f"{feat1}_X_{feat2}_X_{feat3}_product"] = (
-                        val1 * val2 * val3
-                    )
-                    interaction_features[f"{feat1}_X_{feat2}_X_{feat3}_mean"] = (
-                        val1 + val2 + val3
-                    ) / 3
+        top = min(INTERACTION_TRIPLE_TOP_K, len(selected))
+        if top >= 3:
+            p, q, r = np.array(
+                [(p, q, r) for p in range(top) for q in range(p + 1, top) for r in range(q + 1, top)]
+            ).T
+            products = values[p] * values[q] * values[r]
+            means = (values[p] + values[q] + values[r]) / 3
+            for t in range(len(p)):
+                name = f"{selected[p[t]]}_X_{selected[q[t]]}_X_{selected[r[t]]}"
+                interaction_features[f"{name}_product"] = products[t]
+                interaction_features[f"{name}_mean"] = means[t]
 
         return interaction_features
 
-    async def _assess_feature_quality(
+    def _record_quality_sample(
+        self, features: Dict[str, Any], target_value: Any = None
+    ) -> None:
+        columns = self.quality_columns
+        numeric = [
+            (columns.setdefault(k, len(columns)), float(v))
+            for k, v in features.items()
+            if isinstance(v, (int, float, np.number))
+        ]
+        ids = np.fromiter((c for c, _ in numeric), dtype=np.intp, count=len(numeric))
+        values = np.fromiter((v for _, v in numeric), dtype=np.float64, count=len(numeric))
+        target = float(target_value) if isinstance(target_value, (int, float, np.number)) else None
+        self.quality_history.append((ids, values, target))
+
+    def _quality_matrix(self, names: Sequence[str]):
+        """Recent rows of ``names`` as one matrix (NaN where absent), plus targets if all known"""
+        position = np.full(len(self.quality_columns), -1, dtype=np.intp)
+        for c, name in enumerate(names):
+            column = self.quality_columns.get(name)
+            if column is not None:
+                position[column] = c
+        X = np.full((len(self.quality_history), len(names)), np.nan)
+        targets = []
+        for r, (ids, values, target) in enumerate(self.quality_history):
+            pos = position[ids]
+            present = pos >= 0
+            X[r, pos[present]] = values[present]
+            targets.append(target)
+        y = None if any(t is None for t in targets) else np.array(targets)
+        return X, y
+
+    @staticmethod
+    @lru_cache(maxsize=16384)
+    def _name_scores(feature_name: str) -> Dict[str, float]:
+        """Interpretability, cost and domain relevance from the feature name"""
+        name = feature_name.lower()
+        interpretability = 0.6
+        if any(p in name for p in ("avg", "mean", "sum", "count", "ratio", "percent", "score")):
+            interpretability = 0.9
+        elif any(p in name for p in ("quantum", "complex", "transform")):
+            interpretability = 0.3
+        expensive = ("interaction", "quantum", "frequency", "transform", "cluster")
+        relevant = ("player", "team", "game", "performance", "stats", "odds", "score")
+        return {
+            "interpretability_score": interpretability,
+            "computation_cost": 0.5 if any(p in name for p in expensive) else 0.1,
+            "domain_relevance": 0.9 if any(p in name for p in relevant) else 0.6,
+        }
+
+    def _assess_feature_quality_batch(
+        self, all_features: Dict[str, Any]
+    ) -> Dict[str, AdvancedFeatureMetrics]:
+        """Quality metrics for every feature from one (recent rows × features) matrix.
+
+        Variance, target correlation, redundancy and stability come from
+        ``feature_quality_matrix`` over ``quality_history``; non-numeric
+        features keep the defaults.
+        """
+        names = [
+            k for k, v in all_features.items() if isinstance(v, (int, float, np.number))
+        ]
+        X, y = self._quality_matrix(names)
+        quality = feature_quality_matrix(X, y) if names else {}
+        column = {name: c for c, name in enumerate(names)}
+
+        # Normality only for fully observed columns: one vectorized test
+        distribution = np.full(len(names), 0.5)
+        complete = np.flatnonzero(np.isfinite(X).all(axis=0))
+        if len(self.quality_history) >= 20 and len(complete):
+            with np.errstate(all="ignore"):
+                _, p_values = stats.normaltest(X[:, complete], axis=0)
+            distribution[complete] = np.nan_to_num(np.minimum(1.0, p_values * 2), nan=0.5)
+
+        now = datetime.now()
+        metrics = {}
+        for feature_name in all_features:
+            c = column.get(feature_name)
+            if c is None:
+                measured = {}
+            else:
+                correlation = float(quality["correlation_with_target"][c])
+                measured = {
+                    "correlation_with_target": correlation,
+                    "predictive_power": correlation if y is not None else 0.5,
+                    "variance_ratio": float(quality["variance_ratio"][c]),
+                    "redundancy_score": float(quality["redundancy"][c]),
+                    "stability_score": float(quality["stability"][c]),
+                    "distribution_score": float(distribution[c]),
+                }
+            metrics[feature_name] = AdvancedFeatureMetrics(
+                feature_name=feature_name,
+                importance_score=0.5,
+                stability_score=measured.get("stability_score", 0.8),
+                correlation_with_target=measured.get("correlation_with_target", 0.0),
+                mutual_information=0.0,
+                variance_ratio=measured.get("variance_ratio", 0.5),
+                outlier_resistance=0.7,
+                redundancy_score=measured.get("redundancy_score", 0.3),
+                predictive_power=measured.get("predictive_power", 0.5),
+                noise_ratio=0.2,
+                distribution_score=measured.get("distribution_score", 0.7),
+                temporal_consistency=0.8,
+                feature_interactions=[],
+                created_timestamp=now,
+                last_updated=now,
+                **self._name_scores(feature_name),
+            )
+        return metrics
+
+    async def _run_strategy(
         self,
-        feature_name: str,
-        feature_value: Any,
-        all_features: Dict[str, Any],
+        strategy: FeatureEngineeringStrategy,
+        data: Dict[str, Any],
+        context: Optional[Dict[str, Any]],
+        executor: Optional[Executor],
+    ) -> Dict[str, Any]:
+        """CPU-bound strategies in ``executor``, the rest on the event loop"""
+        if strategy not in CPU_BOUND_STRATEGIES:
+            return await self._apply_strategy(strategy, data, context)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, getattr(self, CPU_BOUND_STRATEGIES[strategy]), data
+        )
+
+    async def _advanced_data_cleaning(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop missing and non-finite values"""
+        cleaned = {}
+        for key, value in (raw_data or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, (float, np.floating)) and not np.isfinite(value):
+                continue
+            cleaned[key] = value
+        return cleaned
+
+    async def _apply_statistical_transformations(
+        self, features: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Signed log of large-magnitude numeric features"""
+        return {
+            f"{name}_log_transform": float(np.sign(value) * np.log1p(abs(value)))
+            for name, value in features.items()
+            if isinstance(value, (int, float, np.number)) and np.isfinite(value) and abs(value) > 100
+        }
+
+    async def _optimize_feature_set(
+        self,
+        features: Dict[str, Any],
+        feature_metrics: Dict[str, AdvancedFeatureMetrics],
         target_variable: Optional[str] = None,
-    ) -> AdvancedFeatureMetrics:
-        """Assess comprehensive feature quality metrics"""
-        # Initialize with defaults
-        importance_score = 0.5
-        stability_score = 0.8
-        correlation_with_target = 0.0
-        mutual_information = 0.0
-        variance_ratio = 0.5
-        outlier_resistance = 0.7
-        interpretability_score = 0.6
-        computation_cost = 0.1
-        redundancy_score = 0.3
-        predictive_power = 0.5
-        noise_ratio = 0.2
-        distribution_score = 0.7
-        temporal_consistency = 0.8
-        domain_relevance = 0.6
-
-        # Calculate actual metrics where possible
-        if isinstance(feature_value, (int, float, np.number)):
-            # Variance-based importance
-            numeric_values = [
-                v
-                for v in all_features.values()
-                if isinstance(v, (int, float, np.number))
+        correlation_threshold: float = 0.95,
+    ) -> Dict[str, Any]:
+        """Drop non-finite features and near-duplicates of a feature already kept.
+
+        Only features whose redundancy exceeds the threshold can have such a
+        duplicate, so the greedy pass correlates just those, in input order.
+        """
+        redundant = [
+            name
+            for name, metrics in feature_metrics.items()
+            if name in features and metrics.redundancy_score > correlation_threshold
+        ]
+        dropped = set()
+        if len(redundant) > 1:
+            X, _ = self._quality_matrix(redundant)
+            X = np.where(np.isfinite(X), X, 0.0)
+            std = X.std(axis=0)
+            Z = np.divide(X - X.mean(axis=0), std, out=np.zeros_like(X), where=std > 0)
+            kept: List[int] = []
+            for c in range(len(redundant)):
+                if kept and np.max(np.abs(Z[:, kept].T @ Z[:, c])) / len(Z) > correlation_threshold:
+                    dropped.add(redundant[c])
+                else:
+                    kept.append(c)
+
+        return {
+            name: value
+            for name, value in features.items()
+            if name not in dropped
+            and not (isinstance(value, (int, float, np.number)) and not np.isfinite(value))
+        }
+
+    async def _calculate_feature_set_quality(
+        self,
+        features: Dict[str, Any],
+        feature_metrics: Dict[str, AdvancedFeatureMetrics],
+    ) -> float:
+        kept = [feature_metrics[name] for name in features if name in feature_metrics]
+        if not kept:
+            return 0.0
+        return float(
+            np.mean(
+                [(m.predictive_power + m.stability_score + (1 - m.redundancy_score)) / 3 for m in kept]
+            )
+        )
+
+    def _calculate_sparsity_ratio(self, features: Dict[str, Any]) -> float:
+        numeric = [v for v in features.values() if isinstance(v, (int, float, np.number))]
+        return float(np.mean(np.asarray(numeric) == 0)) if numeric else 0.0
+
+    def _estimate_memory_usage(self, features: Dict[str, Any]) -> float:
+        """Approximate size of the feature dict in MB"""
+        size = sys.getsizeof(features) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in features.items()
+        )
+        return size / (1024 * 1024)
+
+    def _calculate_interpretability_index(
+        self, feature_metrics: Dict[str, AdvancedFeatureMetrics]
+    ) -> float:
+        return float(np.mean([m.interpretability_score for m in feature_metrics.values()] or [0.0]))
+
+    def _calculate_stability_index(
+        self, feature_metrics: Dict[str, AdvancedFeatureMetrics]
+    ) -> float:
+        return float(np.mean([m.stability_score for m in feature_metrics.values()] or [0.0]))
+
+    def _calculate_predictive_index(
+        self, feature_metrics: Dict[str, AdvancedFeatureMetrics]
+    ) -> float:
+        return float(np.mean([m.predictive_power for m in feature_metrics.values()] or [0.0]))
+
+    def engineer_feature_matrix(
+        self,
+        rows: Rows,
+        numeric_fields: Optional[List[str]] = None,
+        timestamp_field: str = "timestamp",
+    ) -> FeatureMatrix:
+        """Batch statistical, temporal and player features for many props.
+
+        Each row is a raw-data dict (or DataFrame row) as passed to
+        ``engineer_maximum_accuracy_features``. Every stage is computed over
+        all rows at once and written into ``ADVANCED_FEATURE_SCHEMA`` order.
+
+        Args:
+            rows: Props as a list of dicts or a DataFrame
+            numeric_fields: Fields the statistical stage summarizes; defaults
+                to the numeric fields of the first row. A field missing from
+                a row is imputed with that row's mean.
+            timestamp_field: Field holding each row's game time
+        """
+        records = as_records(rows)
+        n_rows = len(records)
+        schema = ADVANCED_FEATURE_SCHEMA
+        matrix = schema.empty(n_rows)
+        if n_rows == 0:
+            return FeatureMatrix(values=matrix, schema=schema)
+
+        if numeric_fields is None:
+            numeric_fields = [
+                k for k, v in records[0].items()
+                if isinstance(v, (int, float, np.number)) and not isinstance(v, bool)
             ]
-            if numeric_values:
-                variance_ratio = np.var([feature_value]) / (
-                    np.var(numeric_values) + 1e-8
-                )
 
-            # Distribution normality
-            try:
-                _, p_value = stats.normaltest([feature_value] * 10)  # Simplified
-                distribution_score = min(1.0, p_value * 2)
-            except:
-                distribution_score = 0.5
-
-        # Interpretability based on feature name
-        interpretable_patterns = [
-            "avg",
-            "mean",
-            "sum",
-            "count",
-            "ratio",
-            "percent",
-            "score",
-        ]
-        if any(pattern in feature_name.lower() for pattern in interpretable_patterns):
-            interpretability_score = 0.9
-        elif any(
-            pattern in feature_name.lower()
-            for pattern in ["quantum", "complex", "transform"]
-        ):
-            interpretability_score = 0.3
-
-        # Computation cost based on feature name complexity
-        expensive_patterns = [
-            "interaction",
-            "quantum",
-            "frequency",
-            "transform",
-            "cluster",
-        ]
-        if any(pattern in feature_name.lower() for pattern in expensive_patterns):
-            computation_cost = 0.5
-
-        # Domain relevance for sports betting
-        relevant_patterns = [
-            "player",
-            "team",
-            "game",
-            "performance",
-            "stats",
-            "odds",
-            "score",
-        ]
-        if any(pattern in feature_name.lower() for pattern in relevant_patterns):
-            domain_relevance = 0.9
-
-        return AdvancedFeatureMetrics(
-            feature_name=feature_name,
-            importance_score=importance_score,
-            stability_score=stability_score,
-            correlation_with_target=correlation_with_target,
-            mutual_information=mutual_information,
-            variance_ratio=variance_ratio,
-            outlier_resistance=outlier_resistance,
-            interpretability_score=interpretability_score,
-            computation_cost=computation_cost,
-            redundancy_score=redundancy_score,
-            predictive_power=predictive_power,
-            noise_ratio=noise_ratio,
-            distribution_score=distribution_score,
-            temporal_consistency=temporal_consistency,
-            domain_relevance=domain_relevance,
-            feature_interactions=[],
-            created_timestamp=datetime.now(),
-            last_updated=datetime.now(),
+        blocks = (
+            (STATISTICAL_COLUMNS, self._batch_statistical_features(records, numeric_fields)),
+            (TEMPORAL_COLUMNS, self._batch_temporal_features(records, timestamp_field)),
+            (PLAYER_COLUMNS, self._batch_player_features(records)),
         )
+        for columns, block in blocks:
+            if block is not None:
+                start = schema.index[columns[0]]
+                matrix[:, start:start + len(columns)] = block
+
+        return FeatureMatrix(
+            values=matrix,
+            schema=schema,
+            row_ids=[record.get("id", index) for index, record in enumerate(records)],
+        )
+
+    def _batch_statistical_features(
+        self, records: List[Dict[str, Any]], fields: List[str]
+    ) -> Optional[np.ndarray]:
+        """``_create_statistical_features`` for every row along axis 1"""
+        if not fields:
+            return None
+        values = np.array(
+            [[record.get(f, np.nan) for f in fields] for record in records], dtype=np.float64
+        )
+        missing = np.isnan(values)
+        if missing.any():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                row_means = np.nan_to_num(np.nanmean(values, axis=1))
+            values = np.where(missing, row_means[:, None], values)
+
+        mean = values.mean(axis=1)
+        median = np.median(values, axis=1)
+        std = values.std(axis=1)
+        low, high = values.min(axis=1), values.max(axis=1)
+        percentiles = np.percentile(values, (25, 75) + _PERCENTILES, axis=1)
+        positive = np.abs(values) + 1e-8
+
+        if values.shape[1] >= 8:
+            normality_p = stats.normaltest(values, axis=1).pvalue
+            normality_p = np.where(np.isnan(normality_p), 0.5, normality_p)
+        else:
+            normality_p = np.full(len(values), 0.5)
+
+        # 10-bin histogram entropy per row without a Python loop
+        spread = high - low
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bins = np.where(
+                spread[:, None] > 0, (values - low[:, None]) / spread[:, None] * 10, 0
+            )
+        bins = np.clip(bins.astype(np.int64), 0, 9)
+        counts = (bins[:, :, None] == np.arange(10)).sum(axis=1)
+        probs = counts / values.shape[1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -np.where(probs > 0, probs * np.log2(probs), 0.0).sum(axis=1)
+
+        return np.column_stack([
+            mean,
+            median,
+            std,
+            values.var(axis=1),
+            stats.skew(values, axis=1),
+            stats.kurtosis(values, axis=1),
+            low,
+            high,
+            high - low,
+            percentiles[1] - percentiles[0],
+            std / (mean + 1e-8),
+            np.median(np.abs(values - median[:, None]), axis=1),
+            stats.trim_mean(values, 0.1, axis=1),
+            stats.gmean(positive, axis=1),
+            stats.hmean(positive, axis=1),
+            *percentiles[2:],
+            *(stats.moment(values, moment=i, axis=1) for i in _MOMENTS),
+            normality_p,
+            entropy,
+        ])
+
+    def _batch_temporal_features(
+        self, records: List[Dict[str, Any]], timestamp_field: str
+    ) -> Optional[np.ndarray]:
+        """``_create_temporal_features`` for every row; rows without a time stay 0"""
+        raw = [record.get(timestamp_field) for record in records]
+        if all(value is None for value in raw):
+            return None
+        times = pd.DatetimeIndex(pd.to_datetime(raw, errors="coerce"))
+        present = ~times.isna()
+
+        hour = times.hour.to_numpy(dtype=np.float64, na_value=0)
+        dow = times.dayofweek.to_numpy(dtype=np.float64, na_value=0)
+        day = times.day.to_numpy(dtype=np.float64, na_value=0)
+        month = times.month.to_numpy(dtype=np.float64, na_value=0)
+        holiday = np.zeros(len(records), dtype=bool)
+        for holiday_month, holiday_day in _HOLIDAYS:
+            holiday |= (month == holiday_month) & (day == holiday_day)
+        season = np.select(
+            [np.isin(month, (12, 1, 2)), np.isin(month, (3, 4, 5)), np.isin(month, (6, 7, 8))],
+            [0, 1, 2],
+            default=3,
+        )
+
+        block = np.column_stack([
+            hour,
+            dow,
+            day,
+            month,
+            times.quarter.to_numpy(dtype=np.float64, na_value=0),
+            times.year.to_numpy(dtype=np.float64, na_value=0),
+            dow >= 5,
+            holiday,
+            np.sin(2 * np.pi * hour / 24),
+            np.cos(2 * np.pi * hour / 24),
+            np.sin(2 * np.pi * dow / 7),
+            np.cos(2 * np.pi * dow / 7),
+            np.sin(2 * np.pi * month / 12),
+            np.cos(2 * np.pi * month / 12),
+            season,
+            (hour >= 9) & (hour <= 17),
+            (hour >= 19) & (hour <= 22),
+        ]).astype(np.float64)
+        block[~present] = 0.0
+        return block
+
+    def _batch_player_features(self, records: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """``_create_player_performance_features`` for every row"""
+        player_stats = [record.get("player_stats") or {} for record in records]
+        if not any(player_stats):
+            return None
+
+        recent = [list(stats_.get("recent_games") or []) for stats_ in player_stats]
+        counts = np.array([len(games) for games in recent])
+        width = max(1, counts.max())
+        padded = np.zeros((len(recent), width))
+        for row, games in enumerate(recent):
+            padded[row, :len(games)] = games
+
+        mask = np.arange(width)[None, :] < counts[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            recent_avg = np.where(counts > 0, padded.sum(axis=1) / counts, 0.0)
+            variance = np.where(
+                mask, (padded - recent_avg[:, None]) ** 2, 0.0
+            ).sum(axis=1) / counts
+        consistency = np.where(counts > 0, 1.0 / (1.0 + np.sqrt(variance)), 0.0)
+
+        def nested(section: str, key: str) -> np.ndarray:
+            return np.array(
+                [float((stats_.get(section) or {}).get(key, 0) or 0) for stats_ in player_stats]
+            )
+
+        home_avg = nested("home_away_splits", "home_avg")
+        away_avg = nested("home_away_splits", "away_avg")
+        return np.column_stack([
+            recent_avg,
+            ols_slopes(padded, counts),
+            consistency,
+            nested("career_stats", "average"),
+            nested("career_stats", "games_played"),
+            nested("career_stats", "career_high"),
+            nested("vs_opponent", "average"),
+            nested("vs_opponent", "games"),
+            home_avg,
+            away_avg,
+            home_avg - away_avg,
+        ])
 
     def _is_holiday(self, timestamp: datetime) -> int:
         """Check if timestamp is a holiday"""
@@ -22,6 +22,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, Field
 
+from services.lineup_pricing import payout_table, pick_type_multiplier
+
 # Import existing services
 try:
     from .betting_opportunity_service import (
@@ -157,6 +159,7 @@ class SelectedPick(BaseModel):
 
 class LineupRequest(BaseModel):
     picks: List[SelectedPick]
+    playType: Optional[str] = "power"  # "power" or "flex"
 
 
 class LineupResponse(BaseModel):
@@ -375,7 +378,9 @@ def get_current_user(
 # --- PrizePicks Utilities ---
 
 
-def validate_lineup(picks: List[SelectedPick]) -> tuple[bool, List[str]]:
+def validate_lineup(
+    picks: List[SelectedPick], play_type: str = "power"
+) -> tuple[bool, List[str]]:
     """Validate lineup according to PrizePicks rules."""
     violations = []
 
@@ -384,6 +389,10 @@ def validate_lineup(picks: List[SelectedPick]) -> tuple[bool, List[str]]:
         violations.append("Minimum 2 picks required")
     if len(picks) > 6:
         violations.append("Maximum 6 picks allowed")
+    if play_type == "flex" and len(picks) < 3:
+        violations.append("Flex plays require at least 3 picks")
+    if play_type not in ("power", "flex"):
+        violations.append(f"Unknown play type: {play_type}")
 
     # Check for duplicate players
     players = [pick.player for pick in picks]
@@ -405,18 +414,16 @@ def validate_lineup(picks: List[SelectedPick]) -> tuple[bool, List[str]]:
     return len(violations) == 0, violations
 
 
-def calculate_payout(picks: List[SelectedPick], bet_amount: float) -> float:
-    """Calculate payout based on PrizePicks rules."""
-    base_multiplier = {2: 3, 3: 5, 4: 10, 5: 20, 6: 40}.get(len(picks), 3)
-
-    pick_type_multiplier = 1.0
-    for pick in picks:
-        if pick.pickType == "demon":
-            pick_type_multiplier *= 1.25
-        elif pick.pickType == "goblin":
-            pick_type_multiplier *= 0.85
+def calculate_payout(
+    picks: List[SelectedPick], bet_amount: float, play_type: str = "power"
+) -> float:
+    """Calculate the top payout (every pick hits) under PrizePicks rules.
 
-    return bet_amount * base_multiplier * pick_type_multiplier
+    Win probabilities and expected payouts for correlated picks come from
+    ``services.lineup_pricing.LineupPricer``.
+    """
+    multiplier = payout_table(play_type, len(picks))[-1]
+    return bet_amount * multiplier * pick_type_multiplier([pick.pickType for pick in picks])
 
 
 # --- WebSocket Connection Manager ---
@@ -691,7 +698,8 @@ async def submit_lineup(
     request: LineupRequest, current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Submit a new lineup for validation and storage."""
-    is_valid, violations = validate_lineup(request.picks)
+    play_type = request.playType or "power"
+    is_valid, violations = validate_lineup(request.picks, play_type)
 
     if not is_valid:
         return api_response(
@@ -711,7 +719,7 @@ async def submit_lineup(
         request.picks
     )
     bet_amount = 50.0  # Default bet amount
-    potential_payout = calculate_payout(request.picks, bet_amount)
+    potential_payout = calculate_payout(request.picks, bet_amount, play_type)
 
     lineup_id = str(uuid.uuid4())
 
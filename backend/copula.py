@@ -0,0 +1,405 @@
+"""Copula fitting from Kendall's tau, with analytic densities and samplers.
+
+``CopulaModeling`` used to do three costly things on every risk assessment:
+
+* evaluate copula log-densities one observation at a time (with a
+  ``np.linalg.solve`` per row);
+* search a grid of Student-t degrees of freedom;
+* run a bounded scalar search over each Archimedean family's whole
+  parameter range.
+
+Here every copula parameter starts from Kendall's tau inversion:
+
+* ρ = sin(πτ/2) for the Gaussian and t correlation matrices (made
+  positive definite);
+* θ = 2τ/(1-τ) for Clayton and θ = 1/(1-τ) for Gumbel;
+* the Debye-function relation for Frank.
+
+Log-densities are closed-form and evaluated over all observations at once.
+Only the t degrees of freedom and the Archimedean θ are then refined by
+maximum likelihood, each over a bracket around its start.
+
+Kendall's tau is kept as concordance counts (``KendallConcordance``). New
+return rows then update it in O(new × old) sign comparisons rather than by
+re-sorting the whole history. The samplers draw joint uniforms from a
+fitted copula. ``joint_probability`` uses them to price the chance that
+several correlated legs all hit.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import integrate, optimize, stats
+from scipy.special import gammaln, ndtri, stdtrit
+
+# Parameter ranges the risk manager searched
+CLAYTON_BOUNDS = (0.1, 10.0)
+GUMBEL_BOUNDS = (1.01, 10.0)
+FRANK_BOUNDS = (-30.0, 30.0)
+DF_BOUNDS = (2.5, 60.0)
+# Smallest eigenvalue kept when repairing a tau-implied correlation matrix
+MIN_EIGENVALUE = 1e-6
+# Rows of old data compared per block in an incremental tau update
+CONCORDANCE_BLOCK = 4096
+# Draws per sampling chunk in joint_probability
+SAMPLE_CHUNK = 1 << 16
+
+ARCHIMEDEAN = ("clayton", "gumbel", "frank")
+
+
+def pseudo_observations(X: np.ndarray) -> np.ndarray:
+    """Column ranks scaled into (0, 1): rank / (n + 1), ties averaged"""
+    X = np.asarray(X, dtype=np.float64)
+    return stats.rankdata(X, axis=0) / (len(X) + 1)
+
+
+def _sign_products(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Σ over row pairs (a in A, b in B) of sign(a - b)ᵀ sign(a - b), (d × d)"""
+    total = np.zeros((A.shape[1], A.shape[1]))
+    for start in range(0, len(B), CONCORDANCE_BLOCK):
+        signs = np.sign(A[:, None, :] - B[None, start : start + CONCORDANCE_BLOCK, :]).reshape(-1, A.shape[1])
+        total += signs.T @ signs
+    return total
+
+
+class KendallConcordance:
+    """Kendall's tau-b matrix kept as pairwise concordance counts.
+
+    ``S[k, l]`` is Σ over row pairs of sign(Δx_k) sign(Δx_l): concordant
+    minus discordant pairs off the diagonal, and untied pairs on it. So
+    τ_b = S_kl / sqrt(S_kk S_ll), and appending rows only adds their
+    comparisons with the existing rows and with each other.
+    """
+
+    def __init__(self, X: np.ndarray):
+        self.data = np.array(X, dtype=np.float64)
+        n, d = self.data.shape
+        pairs = n * (n - 1) / 2
+        untied = np.array([pairs - self._tied_pairs(self.data[:, k]) for k in range(d)])
+        self.S = np.diag(untied)
+        for k in range(d):
+            for l in range(k + 1, d):
+                tau = stats.kendalltau(self.data[:, k], self.data[:, l])[0]
+                self.S[k, l] = self.S[l, k] = (0.0 if np.isnan(tau) else tau) * np.sqrt(untied[k] * untied[l])
+
+    @staticmethod
+    def _tied_pairs(column: np.ndarray) -> float:
+        _, counts = np.unique(column, return_counts=True)
+        return float((counts * (counts - 1) / 2).sum())
+
+    def append(self, rows: np.ndarray) -> None:
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, self.data.shape[1])
+        # New-vs-old pairs once each, new-vs-new ordered pairs counted twice
+        self.S += _sign_products(rows, self.data) + _sign_products(rows, rows) / 2
+        self.data = np.vstack([self.data, rows])
+
+    def tau(self) -> np.ndarray:
+        scale = np.sqrt(np.diag(self.S))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tau = self.S / np.outer(scale, scale)
+        tau[~np.isfinite(tau)] = 0.0
+        np.fill_diagonal(tau, 1.0)
+        return tau
+
+
+def kendall_tau_matrix(X: np.ndarray) -> np.ndarray:
+    return KendallConcordance(X).tau()
+
+
+def nearest_correlation(R: np.ndarray) -> np.ndarray:
+    """Clip eigenvalues to ``MIN_EIGENVALUE`` and rescale to a unit diagonal"""
+    eigenvalues, eigenvectors = np.linalg.eigh((R + R.T) / 2)
+    if eigenvalues.min() >= MIN_EIGENVALUE:
+        return R
+    R = (eigenvectors * np.maximum(eigenvalues, MIN_EIGENVALUE)) @ eigenvectors.T
+    scale = np.sqrt(np.diag(R))
+    return R / np.outer(scale, scale)
+
+
+def elliptical_correlation(tau: np.ndarray) -> np.ndarray:
+    """Correlation matrix from Kendall's tau: ρ = sin(πτ/2)"""
+    return nearest_correlation(np.sin(np.pi * np.asarray(tau) / 2))
+
+
+def _frank_tau(theta: float) -> float:
+    if abs(theta) < 1e-8:
+        return 0.0
+    debye, _ = integrate.quad(lambda t: t / np.expm1(t) if t else 1.0, 0.0, theta)
+    return 1 + 4 * (debye / theta - 1) / theta
+
+
+def archimedean_theta(family: str, tau: float) -> float:
+    """Kendall's tau inversion for a bivariate Archimedean family, within its bounds"""
+    if family == "clayton":
+        return float(np.clip(2 * tau / (1 - tau) if tau > 0 else CLAYTON_BOUNDS[0], *CLAYTON_BOUNDS))
+    if family == "gumbel":
+        return float(np.clip(1 / (1 - tau) if tau > 0 else GUMBEL_BOUNDS[0], *GUMBEL_BOUNDS))
+    if family == "frank":
+        tau_range = _frank_tau(FRANK_BOUNDS[0]), _frank_tau(FRANK_BOUNDS[1])
+        if abs(tau) < 1e-10:
+            return 0.0
+        if not tau_range[0] < tau < tau_range[1]:
+            return FRANK_BOUNDS[0] if tau <= tau_range[0] else FRANK_BOUNDS[1]
+        return float(optimize.brentq(lambda t: _frank_tau(t) - tau, *FRANK_BOUNDS))
+    raise ValueError(f"Unknown Archimedean copula {family!r}")
+
+
+def gaussian_logpdf(U: np.ndarray, correlation: np.ndarray) -> np.ndarray:
+    """Gaussian copula log-density of each row of U"""
+    Z = ndtri(U)
+    L = np.linalg.cholesky(correlation)
+    W = np.linalg.solve(L, Z.T)
+    log_det = 2 * np.log(np.diag(L)).sum()
+    return -0.5 * log_det - 0.5 * ((W**2).sum(axis=0) - (Z**2).sum(axis=1))
+
+
+def student_t_logpdf(U: np.ndarray, correlation: np.ndarray, df: float) -> np.ndarray:
+    """Student-t copula log-density of each row of U"""
+    d = U.shape[1]
+    X = stdtrit(df, U)
+    L = np.linalg.cholesky(correlation)
+    quad = (np.linalg.solve(L, X.T) ** 2).sum(axis=0)
+    log_det = 2 * np.log(np.diag(L)).sum()
+    constant = gammaln((df + d) / 2) + (d - 1) * gammaln(df / 2) - d * gammaln((df + 1) / 2)
+    return (
+        constant
+        - 0.5 * log_det
+        - (df + d) / 2 * np.log1p(quad / df)
+        + (df + 1) / 2 * np.log1p(X**2 / df).sum(axis=1)
+    )
+
+
+def archimedean_logpdf(family: str, U: np.ndarray, theta: float) -> np.ndarray:
+    """Bivariate Clayton, Gumbel or Frank copula log-density of each row of U"""
+    u, v = U[:, 0], U[:, 1]
+    if family == "clayton":
+        return (
+            np.log1p(theta)
+            - (1 + theta) * (np.log(u) + np.log(v))
+            - (2 + 1 / theta) * np.log(u**-theta + v**-theta - 1)
+        )
+    if family == "gumbel":
+        x, y = -np.log(u), -np.log(v)
+        s = x**theta + y**theta
+        A = s ** (1 / theta)
+        return (
+            -A
+            + x
+            + y
+            + (theta - 1) * (np.log(x) + np.log(y))
+            + (1 / theta - 2) * np.log(s)
+            + np.log(A + theta - 1)
+        )
+    if family == "frank":
+        if abs(theta) < 1e-8:
+            return np.zeros(len(U))
+        denominator = -np.expm1(-theta) - np.expm1(-theta * u) * np.expm1(-theta * v)
+        return np.log(-theta * np.expm1(-theta)) - theta * (u + v) - 2 * np.log(np.abs(denominator))
+    raise ValueError(f"Unknown Archimedean copula {family!r}")
+
+
+def _information_criteria(log_likelihood: float, n_params: int, n: int) -> Dict[str, float]:
+    return {
+        "log_likelihood": float(log_likelihood),
+        "aic": -2 * log_likelihood + 2 * n_params,
+        "bic": -2 * log_likelihood + n_params * np.log(n),
+    }
+
+
+def fit_gaussian(U: np.ndarray, tau: np.ndarray) -> Dict[str, Any]:
+    R = elliptical_correlation(tau)
+    d = U.shape[1]
+    return {
+        "copula_type": "gaussian",
+        "correlation_matrix": R,
+        **_information_criteria(gaussian_logpdf(U, R).sum(), d * (d - 1) // 2, len(U)),
+        "parameters": {"correlation": R},
+    }
+
+
+def fit_student_t(U: np.ndarray, tau: np.ndarray, df_start: Optional[float] = None) -> Dict[str, Any]:
+    """t copula: tau-implied correlation, profile-likelihood degrees of freedom.
+
+    With ``df_start`` (e.g. the previous fit) only [df/2, 2 df] is searched.
+    """
+    R = elliptical_correlation(tau)
+    d = U.shape[1]
+    bounds = DF_BOUNDS
+    if df_start is not None:
+        bounds = (max(DF_BOUNDS[0], df_start / 2), min(DF_BOUNDS[1], df_start * 2))
+    result = optimize.minimize_scalar(
+        lambda df: -student_t_logpdf(U, R, df).sum(), bounds=bounds, method="bounded", options={"xatol": 0.05}
+    )
+    df = float(result.x)
+    return {
+        "copula_type": "student_t",
+        "correlation_matrix": R,
+        "degrees_of_freedom": df,
+        **_information_criteria(-result.fun, d * (d - 1) // 2 + 1, len(U)),
+        "parameters": {"correlation": R, "df": df},
+    }
+
+
+def fit_archimedean(U: np.ndarray, family: str, tau: float) -> Dict[str, Any]:
+    """Bivariate Archimedean MLE, searched around the tau-inversion start"""
+    lower, upper = {"clayton": CLAYTON_BOUNDS, "gumbel": GUMBEL_BOUNDS, "frank": FRANK_BOUNDS}[family]
+    start = archimedean_theta(family, tau)
+    # Bracket in the distance from independence, widened if the optimum hits its edge
+    origin = {"clayton": 0.0, "gumbel": 1.0, "frank": 0.0}[family]
+    offset = start - origin
+    bracket = (
+        max(lower, origin + min(offset / 2, offset * 2) - 0.1),
+        min(upper, origin + max(offset / 2, offset * 2) + 0.1),
+    )
+
+    def nll(theta: float) -> float:
+        value = -archimedean_logpdf(family, U, theta).sum()
+        return value if np.isfinite(value) else np.inf
+
+    result = optimize.minimize_scalar(nll, bounds=bracket, method="bounded", options={"xatol": 1e-4})
+    edge = min(result.x - bracket[0], bracket[1] - result.x) < 1e-3
+    if edge and bracket != (lower, upper):
+        result = optimize.minimize_scalar(nll, bounds=(lower, upper), method="bounded", options={"xatol": 1e-4})
+    theta = float(result.x)
+    return {
+        "copula_type": family,
+        "theta": theta,
+        **_information_criteria(-result.fun, 1, len(U)),
+        "kendall_tau": float(tau),
+        "parameters": {"theta": theta},
+    }
+
+
+def fit_copulas(
+    X: np.ndarray,
+    tau: Optional[np.ndarray] = None,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Fit every family to the rows of X (raw data or pseudo-observations).
+
+    Args:
+        tau: Kendall's tau matrix of X, if already known (e.g. incrementally)
+        previous: An earlier ``fit_copulas`` result, to warm-start the t df
+    """
+    U = pseudo_observations(X)
+    if tau is None:
+        tau = kendall_tau_matrix(X)
+    df_start = (previous or {}).get("student_t", {}).get("degrees_of_freedom")
+    fits = {
+        "gaussian": fit_gaussian(U, tau),
+        "student_t": fit_student_t(U, tau, df_start),
+    }
+    if U.shape[1] == 2:
+        for family in ARCHIMEDEAN:
+            fits[family] = fit_archimedean(U, family, tau[0, 1])
+    return fits
+
+
+def best_copula(fits: Dict[str, Dict[str, Any]]) -> str:
+    """Family with the lowest AIC"""
+    return min(fits, key=lambda name: fits[name]["aic"])
+
+
+def _stable_draws(rng: np.random.Generator, alpha: float, n: int) -> np.ndarray:
+    """Positive α-stable variables with Laplace transform exp(-s^α) (Kanter)"""
+    if alpha >= 1:
+        return np.ones(n)
+    angle = rng.uniform(0, np.pi, n)
+    exponential = rng.standard_exponential(n)
+    return (
+        np.sin(alpha * angle) / np.sin(angle) ** (1 / alpha)
+        * (np.sin((1 - alpha) * angle) / exponential) ** ((1 - alpha) / alpha)
+    )
+
+
+def sample_copula(fit: Dict[str, Any], n: int, seed=None, d: Optional[int] = None) -> np.ndarray:
+    """(n × d) uniforms from a fitted copula (a ``fit_copulas`` entry)"""
+    rng = np.random.default_rng(seed)
+    family = fit["copula_type"]
+    if family in ("gaussian", "student_t"):
+        L = np.linalg.cholesky(fit["correlation_matrix"])
+        Z = rng.standard_normal((n, L.shape[0])) @ L.T
+        if family == "gaussian":
+            return stats.norm.cdf(Z)
+        df = fit["degrees_of_freedom"]
+        return stats.t.cdf(Z / np.sqrt(rng.chisquare(df, n) / df)[:, None], df)
+
+    theta, d = fit["theta"], d or 2
+    if family == "frank":
+        if d != 2:
+            raise ValueError("Frank copula sampling is bivariate only")
+        # Conditional inversion, valid for negative θ too
+        u, w = rng.uniform(size=(2, n))
+        if abs(theta) < 1e-8:
+            return np.column_stack([u, w])
+        v = -np.log1p(w * np.expm1(-theta) / (w + (1 - w) * np.exp(-theta * u))) / theta
+        return np.column_stack([u, v])
+
+    # Marshall-Olkin: U_k = ψ(E_k / V) with V the generator's frailty
+    exponential = rng.standard_exponential((n, d))
+    if family == "clayton":
+        V = rng.gamma(1 / theta, size=n)
+        return (1 + exponential / V[:, None]) ** (-1 / theta)
+    if family == "gumbel":
+        V = _stable_draws(rng, 1 / theta, n)
+        return np.exp(-((exponential / V[:, None]) ** (1 / theta)))
+    raise ValueError(f"Unknown copula {family!r}")
+
+
+def _hit_thresholds(fit: Dict[str, Any], probabilities: np.ndarray) -> Tuple[str, np.ndarray]:
+    """Where latent draws can be compared directly, skipping the uniform transform"""
+    family = fit["copula_type"]
+    if family == "gaussian":
+        return "latent", ndtri(probabilities)
+    if family == "student_t":
+        return "latent", stdtrit(fit["degrees_of_freedom"], probabilities)
+    return "uniform", probabilities
+
+
+def joint_probability(
+    fit: Dict[str, Any],
+    probabilities: Sequence[float],
+    n_samples: int = 100000,
+    seed=None,
+) -> Dict[str, Any]:
+    """Monte Carlo probability that every leg hits.
+
+    Leg k hits when its copula uniform is below ``probabilities[k]``, so each
+    leg keeps its own hit probability and the copula supplies the dependence.
+
+    Returns:
+        "probability", its "std_error", per-leg "marginal_hit_rates",
+        "independent_probability" (product of the legs) and "n_samples"
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    d = len(probabilities)
+    rng = np.random.default_rng(seed)
+    space, thresholds = _hit_thresholds(fit, probabilities)
+    if space == "latent":
+        L = np.linalg.cholesky(fit["correlation_matrix"])
+        if L.shape[0] != d:
+            raise ValueError(f"Copula has {L.shape[0]} legs, got {d} probabilities")
+
+    hits, leg_hits, drawn = 0, np.zeros(d), 0
+    while drawn < n_samples:
+        size = min(SAMPLE_CHUNK, n_samples - drawn)
+        if space == "latent":
+            Z = rng.standard_normal((size, d)) @ L.T
+            if fit["copula_type"] == "student_t":
+                df = fit["degrees_of_freedom"]
+                Z /= np.sqrt(rng.chisquare(df, size) / df)[:, None]
+            below = Z <= thresholds
+        else:
+            below = sample_copula(fit, size, rng, d) <= thresholds
+        hits += int(below.all(axis=1).sum())
+        leg_hits += below.sum(axis=0)
+        drawn += size
+
+    p = hits / drawn
+    return {
+        "probability": p,
+        "std_error": float(np.sqrt(p * (1 - p) / drawn)),
+        "marginal_hit_rates": leg_hits / drawn,
+        "independent_probability": float(np.prod(probabilities)),
+        "n_samples": drawn,
+    }
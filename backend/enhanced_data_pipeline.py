@@ -3,17 +3,30 @@ Advanced signal processing, time series analysis, and statistical data processin
 with rigorous mathematical foundations for sports betting applications
 """
 
+import hashlib
 import logging
 import math
 import time
 import warnings
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy import interpolate, stats
+from scipy import stats
 from scipy.fft import fft, fftfreq, ifft
+from scipy.signal import hilbert
+
+from low_rank_imputation import imputation_uncertainty, ppca_complete, svt_complete
+from signal_decomposition import decompose_columns, empirical_mode_decomposition
+
+try:
+    from statsmodels.tsa.stattools import adfuller
+
+    STATSMODELS_AVAILABLE = True
+except ImportError:
+    STATSMODELS_AVAILABLE = False
 
 warnings.filterwarnings("ignore")
 logger = logging.getLogger(__name__)
@@ -32,6 +45,50 @@ class DataProcessingResult:
     quality_metrics: Dict[str, float]
     transformation_log: List[Dict[str, Any]]
     uncertainty_estimates: Dict[str, np.ndarray]
+    stage_report: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+# Stages in run order and the stages each one reads from
+STAGE_ORDER = (
+    "missing_data",
+    "imputation_comparison",
+    "anomaly_detection",
+    "signal_decomposition",
+    "time_series_features",
+    "statistical_properties",
+    "quality_metrics",
+    "uncertainty_estimates",
+)
+STAGE_DEPENDENCIES = {
+    "missing_data": (),
+    "imputation_comparison": ("missing_data",),
+    "anomaly_detection": ("missing_data",),
+    "signal_decomposition": ("missing_data",),
+    "time_series_features": ("missing_data",),
+    "statistical_properties": ("missing_data",),
+    "quality_metrics": ("missing_data",),
+    "uncertainty_estimates": ("missing_data",),
+}
+# Stages that add columns to the processed frame
+COLUMN_STAGES = ("anomaly_detection", "signal_decomposition", "time_series_features")
+# Stages that summarize the processed frame
+SUMMARY_STAGES = ("statistical_properties", "quality_metrics", "uncertainty_estimates")
+# Stages that contribute transformation_log entries
+STAGE_LOGS = ("missing_data", "anomaly_detection", "signal_decomposition")
+
+# Result field -> stages that produce it
+ARTIFACT_STAGES = {
+    "processed_data": ("missing_data",),
+    "missing_data_analysis": ("missing_data",),
+    "imputation_comparison": ("imputation_comparison",),
+    "anomaly_detection": ("anomaly_detection",),
+    "signal_decomposition": ("signal_decomposition",),
+    "time_series_features": ("time_series_features",),
+    "statistical_properties": ("statistical_properties",),
+    "quality_metrics": ("quality_metrics",),
+    "uncertainty_estimates": ("uncertainty_estimates",),
+}
+DEFAULT_ARTIFACTS = tuple(a for a in ARTIFACT_STAGES if a != "imputation_comparison")
 
 
 class AdvancedSignalProcessing:
@@ -44,109 +101,25 @@ class AdvancedSignalProcessing:
     def empirical_mode_decomposition(
         self, signal: np.ndarray, max_imf: int = 10
     ) -> Dict[str, np.ndarray]:
-        """Empirical Mode Decomposition (EMD) for non-stationary signals"""
-
-        def is_imf(h):
-            """Check if a signal is an Intrinsic Mode Function"""
-            # Find extrema
-            maxima = signal.argrelextrema(h, np.greater)[0]
-            minima = signal.argrelextrema(h, np.less)[0]
-
-            # IMF criteria (simplified)
-            if len(maxima) < 2 or len(minima) < 2:
-                return False
-
-            # Number of extrema and zero crossings should differ by at most 1
-            zeros = np.where(np.diff(np.sign(h)))[0]
-            extrema_count = len(maxima) + len(minima)
-
-            return abs(extrema_count - len(zeros)) <= 1
-
-        def sift(h):
-            """Sifting process to extract IMF"""
-            for _ in range(100):  # Maximum iterations
-                # Find extrema
-                maxima = signal.argrelextrema(h, np.greater)[0]
-                minima = signal.argrelextrema(h, np.less)[0]
+        """Empirical Mode Decomposition (EMD) for non-stationary signals
 
-                if len(maxima) < 2 or len(minima) < 2:
-                    break
-
-                # Interpolate envelopes
-                t = np.arange(len(h))
-
-                # Upper envelope
-                if len(maxima) >= 2:
-                    upper_env = interpolate.interp1d(
-                        maxima,
-                        h[maxima],
-                        kind="cubic",
-                        bounds_error=False,
-                        fill_value="extrapolate",
-                    )(t)
-                else:
-                    upper_env = np.full_like(h, np.max(h))
-
-                # Lower envelope
-                if len(minima) >= 2:
-                    lower_env = interpolate.interp1d(
-                        minima,
-                        h[minima],
-                        kind="cubic",
-                        bounds_error=False,
-                        fill_value="extrapolate",
-                    )(t)
-                else:
-                    lower_env = np.full_like(h, np.min(h))
-
-                # Mean envelope
-                mean_env = (upper_env + lower_env) / 2
-
-                # Update h
-                h_new = h - mean_env
-
-                # Check stopping criterion
-                if np.sum((h - h_new) ** 2) / np.sum(h**2) < 0.01:
-                    h = h_new
-                    break
-
-                h = h_new
+        Uses the spline-caching sifter in ``signal_decomposition``.
+        """
+        return empirical_mode_decomposition(signal, max_imf=max_imf)
 
-            return h
-
-        # EMD decomposition
-        imfs = []
-        residual = signal.copy()
-
-        for i in range(max_imf):
-            # Extract IMF
-            imf = sift(residual.copy())
-
-            # Check if it's an IMF
-            if not is_imf(imf) or np.all(np.abs(imf) < 1e-6):
-                break
+    def empirical_mode_decomposition_many(
+        self, columns: List[np.ndarray], max_imf: int = 10, n_jobs: Optional[int] = None
+    ) -> List[Dict[str, np.ndarray]]:
+        """EMD of many series, spread over a process pool for wide frames"""
+        return decompose_columns(columns, n_jobs=n_jobs, max_imf=max_imf)
 
-            imfs.append(imf)
-            residual = residual - imf
-
-            # Stop if residual is monotonic
-            extrema = len(signal.argrelextrema(residual, np.greater)[0]) + len(
-                signal.argrelextrema(residual, np.less)[0]
-            )
-
-            if extrema < 3:
-                break
-
-        return {
-            "imfs": np.array(imfs) if imfs else np.array([signal]),
-            "residual": residual,
-            "n_imfs": len(imfs),
-        }
-
-    def hilbert_huang_transform(self, signal: np.ndarray) -> Dict[str, np.ndarray]:
+    def hilbert_huang_transform(
+        self, signal: np.ndarray, emd_result: Optional[Dict[str, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
         """Hilbert-Huang Transform for time-frequency analysis"""
-        # EMD decomposition
-        emd_result = self.empirical_mode_decomposition(signal)
+        # EMD decomposition (reuse one computed by the caller if given)
+        if emd_result is None:
+            emd_result = self.empirical_mode_decomposition(signal)
         imfs = emd_result["imfs"]
 
         # Hilbert transform of each IMF
@@ -156,7 +129,7 @@ class AdvancedSignalProcessing:
 
         for imf in imfs:
             # Hilbert transform
-            analytic_signal = signal.hilbert(imf)
+            analytic_signal = hilbert(imf)
 
             # Extract instantaneous attributes
             amplitude = np.abs(analytic_signal)
@@ -366,6 +339,11 @@ class AdvancedSignalProcessing:
         }
 
 
+# Smallest matrix dimension at which solver="auto" switches to the
+# randomized low-rank backend
+RANDOMIZED_MIN_DIM = 50
+
+
 class AdvancedMissingDataImputation:
     """Advanced missing data imputation using multiple sophisticated methods"""
 
@@ -374,9 +352,23 @@ class AdvancedMissingDataImputation:
         self.imputation_quality = {}
 
     def matrix_completion_svt(
-        self, X: np.ndarray, tau: Optional[float] = None, max_iter: int = 100
+        self,
+        X: np.ndarray,
+        tau: Optional[float] = None,
+        max_iter: int = 100,
+        solver: str = "auto",
+        **solver_kwargs,
     ) -> Dict[str, np.ndarray]:
-        """Singular Value Thresholding for matrix completion"""
+        """Singular Value Thresholding for matrix completion
+
+        Args:
+            solver: "exact" (full SVD per iteration), "randomized"
+                (``low_rank_imputation.svt_complete``: same iteration on
+                factors and observed entries, chunked, accepts memmaps) or
+                "auto" (randomized once both dimensions reach
+                ``RANDOMIZED_MIN_DIM``)
+            **solver_kwargs: Passed to ``svt_complete`` (e.g. ``chunk_rows``, ``out``)
+        """
         # Get missing data mask
         missing_mask = np.isnan(X)
         observed_mask = ~missing_mask
@@ -384,6 +376,11 @@ class AdvancedMissingDataImputation:
         if not np.any(missing_mask):
             return {"completed_matrix": X, "converged": True, "iterations": 0}
 
+        if self._use_randomized(X, solver):
+            result = svt_complete(X, tau=tau, max_iter=max_iter, **solver_kwargs)
+            result["uncertainty"] = imputation_uncertainty(X)
+            return result
+
         # Initialize with zeros for missing entries
         X_completed = X.copy()
         X_completed[missing_mask] = 0
@@ -420,7 +417,7 @@ class AdvancedMissingDataImputation:
                 if change < 1e-6:
                     break
 
-            X_completed.copy()
+            X_prev = X_completed.copy()
 
         # Estimate uncertainty for imputed values
         uncertainty = self._estimate_imputation_uncertainty(
@@ -438,47 +435,35 @@ class AdvancedMissingDataImputation:
     def _estimate_imputation_uncertainty(
         self, X_original: np.ndarray, X_completed: np.ndarray, missing_mask: np.ndarray
     ) -> np.ndarray:
-        """Estimate uncertainty in imputed values using cross-validation"""
-        uncertainty = np.zeros_like(X_original)
-
-        # For each missing entry, estimate uncertainty using nearby observed values
-        for i in range(X_original.shape[0]):
-            for _ in range(X_original.shape[1]):
-                if missing_mask[i, j]:
-                    # Find nearby observed values
-                    nearby_values = []
-
-                    # Row neighbors
-                    for k in range(X_original.shape[1]):
-                        if not missing_mask[i, k]:
-                            nearby_values.append(X_original[i, k])
-
-                    # Column neighbors
-                    for k in range(X_original.shape[0]):
-                        if not missing_mask[k, j]:
-                            nearby_values.append(X_original[k, j])
-
-                    if nearby_values:
-                        # Estimate uncertainty as variance of nearby values
-                        uncertainty[i, j] = np.var(nearby_values)
-                    else:
-                        # Global variance as fallback
-                        observed_values = X_original[~missing_mask]
-                        uncertainty[i, j] = (
-                            np.var(observed_values) if len(observed_values) > 0 else 1.0
-                        )
-
-        return uncertainty
+        """Estimate uncertainty in imputed values as the variance of the
+        observed values sharing each missing entry's row or column"""
+        return imputation_uncertainty(X_original)
+
+    @staticmethod
+    def _use_randomized(X: np.ndarray, solver: str) -> bool:
+        if solver not in ("auto", "exact", "randomized"):
+            raise ValueError(f"Unknown imputation solver: {solver}")
+        return solver == "randomized" or (
+            solver == "auto" and min(X.shape) >= RANDOMIZED_MIN_DIM
+        )
 
     def probabilistic_pca_imputation(
-        self, X: np.ndarray, n_components: int = None
+        self, X: np.ndarray, n_components: int = None, solver: str = "auto", **solver_kwargs
     ) -> Dict[str, np.ndarray]:
-        """Probabilistic PCA for missing data imputation"""
+        """Probabilistic PCA for missing data imputation
+
+        ``solver`` as in ``matrix_completion_svt``; "randomized" fits PPCA by
+        iterative imputation (``low_rank_imputation.ppca_complete``) instead
+        of per-row EM.
+        """
         missing_mask = np.isnan(X)
 
         if n_components is None:
             n_components = min(10, min(X.shape) - 1)
 
+        if self._use_randomized(X, solver):
+            return ppca_complete(X, n_components, **solver_kwargs)
+
         # EM algorithm for PPCA with missing data
         m, n = X.shape
 
@@ -512,7 +497,7 @@ class AdvancedMissingDataImputation:
             # M-step: update parameters
             # Update W
             W_new = np.zeros_like(W)
-            for _ in range(n):
+            for j in range(n):
                 observed_idx = ~missing_mask[:, j]
 
                 if np.any(observed_idx):
@@ -591,7 +576,7 @@ class AdvancedMissingDataImputation:
         uncertainties = np.zeros_like(X)
 
         # Impute each column independently
-        for _ in range(X.shape[1]):
+        for j in range(X.shape[1]):
             column_missing = missing_mask[:, j]
 
             if np.any(column_missing) and np.any(~column_missing):
@@ -866,104 +851,225 @@ class EnhancedMathematicalDataPipeline:
         # Processing history
         self.processing_history = []
 
+        # Memoized stage outputs keyed by (frame hash, stage, frame signature)
+        self.stage_cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+
     def comprehensive_data_processing(
-        self, data: pd.DataFrame, target_column: Optional[str] = None
+        self,
+        data: pd.DataFrame,
+        target_column: Optional[str] = None,
+        artifacts: Optional[Iterable[str]] = None,
     ) -> DataProcessingResult:
-        """Comprehensive data processing with advanced mathematical methods"""
+        """Comprehensive data processing with advanced mathematical methods
+
+        Args:
+            data: Input frame
+            target_column: Unused; kept for API compatibility
+            artifacts: Result fields to produce (see ``ARTIFACT_STAGES``).
+                Only the stages they need run; other fields come back empty.
+                Defaults to every standard field. PPCA and Gaussian-process
+                imputations only run for the "imputation_comparison" artifact.
+
+        Stage outputs are memoized on a content hash of ``data``; the
+        result's ``stage_report`` gives each stage's time and cache status.
+        """
         start_time = time.time()
+        artifacts = tuple(artifacts) if artifacts is not None else DEFAULT_ARTIFACTS
+        unknown = set(artifacts) - set(ARTIFACT_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline artifacts: {sorted(unknown)}")
+
+        stages = self.plan_stages(artifacts)
+        fingerprint = self.frame_fingerprint(data)
+        logger.info(f"Processing {data.shape} dataset with stages {stages}")
+
+        outputs: Dict[str, Any] = {}
+        stage_report: Dict[str, Dict[str, Any]] = {}
+        column_stages = tuple(stage for stage in COLUMN_STAGES if stage in stages)
+
+        for stage in stages:
+            if stage in SUMMARY_STAGES and "processed_data" not in outputs:
+                outputs["processed_data"] = self._assemble_processed_data(outputs, column_stages)
+
+            # Summary stages see the assembled frame, which depends on which
+            # column stages ran
+            cache_key = (fingerprint, stage, column_stages if stage in SUMMARY_STAGES else ())
+            stage_start = time.perf_counter()
+            cached = cache_key in self.stage_cache
+            if cached:
+                self.stage_cache.move_to_end(cache_key)
+                outputs[stage] = self.stage_cache[cache_key]
+            else:
+                outputs[stage] = getattr(self, f"_stage_{stage}")(data, outputs)
+                self.stage_cache[cache_key] = outputs[stage]
+                while len(self.stage_cache) > self.config.get("stage_cache_size", 32):
+                    self.stage_cache.popitem(last=False)
+            stage_report[stage] = {
+                "seconds": time.perf_counter() - stage_start,
+                "cached": cached,
+            }
 
-        logger.info("Starting comprehensive data processing for {data.shape} dataset")
+        if "processed_data" not in outputs:
+            outputs["processed_data"] = self._assemble_processed_data(outputs, column_stages)
+        processed_data = outputs["processed_data"]
 
-        # Initialize result containers
-        signal_decompositions = {}
-        anomaly_results = {}
-        missing_data_results = {}
-        time_series_features = {}
-        transformation_log = []
+        missing_data_results = dict(outputs.get("missing_data", {}).get("analysis", {}))
+        missing_data_results.update(outputs.get("imputation_comparison", {}))
 
-        # 1. Missing data analysis and imputation
-        logger.info("Phase 1: Missing data analysis and imputation")
+        # Create final result
+        result = DataProcessingResult(
+            processed_data=processed_data,
+            signal_decomposition=outputs.get("signal_decomposition", {}).get("results", {}),
+            anomaly_detection=outputs.get("anomaly_detection", {}).get("results", {}),
+            missing_data_analysis=missing_data_results,
+            time_series_features=outputs.get("time_series_features", {}).get("results", {}),
+            statistical_properties=outputs.get("statistical_properties", {}),
+            quality_metrics=outputs.get("quality_metrics", {}),
+            transformation_log=[
+                entry
+                for stage in stages
+                for entry in (outputs[stage].get("log", []) if stage in STAGE_LOGS else [])
+            ],
+            uncertainty_estimates=outputs.get("uncertainty_estimates", {}),
+            stage_report=stage_report,
+        )
 
-        missing_percentage = data.isnull().sum() / len(data)
-        columns_with_missing = missing_percentage[missing_percentage > 0].index.tolist()
+        # Store in processing history
+        processing_time = time.time() - start_time
+        self.processing_history.append(
+            {
+                "timestamp": time.time(),
+                "processing_time": processing_time,
+                "input_shape": data.shape,
+                "output_shape": processed_data.shape,
+                "transformations_applied": len(result.transformation_log),
+                "stages": stage_report,
+            }
+        )
 
-        if columns_with_missing:
-            # Convert to numpy for processing
-            X_missing = data[columns_with_missing].values
+        logger.info(
+            f"Comprehensive data processing completed in {processing_time:.3f}s"
+        )
+        logger.info(f"Data shape: {data.shape} → {processed_data.shape}")
 
-            # Matrix completion using SVT
-            svt_result = self.missing_data_handler.matrix_completion_svt(X_missing)
+        return result
 
-            # Probabilistic PCA imputation
-            ppca_result = self.missing_data_handler.probabilistic_pca_imputation(
-                X_missing
-            )
+    def plan_stages(self, artifacts: Iterable[str]) -> List[str]:
+        """Stages needed for ``artifacts``, with dependencies, in run order"""
+        needed = set()
+        pending = [stage for artifact in artifacts for stage in ARTIFACT_STAGES[artifact]]
+        while pending:
+            stage = pending.pop()
+            if stage not in needed:
+                needed.add(stage)
+                pending.extend(STAGE_DEPENDENCIES[stage])
+        return [stage for stage in STAGE_ORDER if stage in needed]
+
+    @staticmethod
+    def frame_fingerprint(data: pd.DataFrame) -> str:
+        """Content hash of a frame (values, index, column names and dtypes)"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        digest.update(repr(list(zip(data.columns, map(str, data.dtypes)))).encode())
+        return digest.hexdigest()
+
+    def clear_stage_cache(self) -> None:
+        """Drop memoized stage outputs (e.g. after changing ``config``)"""
+        self.stage_cache.clear()
+
+    def _numerical_columns(self, outputs: Dict[str, Any]) -> List[str]:
+        imputed = outputs["missing_data"]["imputed"]
+        return imputed.select_dtypes(include=[np.number]).columns.tolist()
+
+    def _assemble_processed_data(
+        self, outputs: Dict[str, Any], column_stages: Tuple[str, ...]
+    ) -> pd.DataFrame:
+        """Imputed frame plus the columns added by the column stages that ran"""
+        imputed = outputs["missing_data"]["imputed"]
+        added = {}
+        for stage in column_stages:
+            added.update(outputs[stage]["columns"])
+        if not added:
+            return imputed.copy()
+        return pd.concat(
+            [imputed, pd.DataFrame(added, index=imputed.index)], axis=1
+        )
+
+    def _stage_missing_data(self, data: pd.DataFrame, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Missing data analysis and SVT imputation"""
+        missing_percentage = data.isnull().sum() / len(data)
+        columns_with_missing = missing_percentage[missing_percentage > 0].index.tolist()
 
-            # Gaussian Process imputation
-            gp_result = self.missing_data_handler.gaussian_process_imputation(X_missing)
+        if not columns_with_missing:
+            return {"imputed": data.copy(), "analysis": {"no_missing_data": True}, "log": []}
 
-            # Choose best imputation method (simplified: use SVT)
-            imputed_data = data.copy()
-            imputed_data[columns_with_missing] = svt_result["completed_matrix"]
+        # Matrix completion using SVT
+        svt_result = self.missing_data_handler.matrix_completion_svt(
+            data[columns_with_missing].values
+        )
+        imputed_data = data.copy()
+        imputed_data[columns_with_missing] = svt_result["completed_matrix"]
 
-            missing_data_results = {
+        return {
+            "imputed": imputed_data,
+            "analysis": {
                 "svt_result": svt_result,
-                "ppca_result": ppca_result,
-                "gp_result": gp_result,
                 "columns_with_missing": columns_with_missing,
                 "missing_percentages": missing_percentage.to_dict(),
-            }
-
-            transformation_log.append(
+            },
+            "log": [
                 {
                     "step": "missing_data_imputation",
                     "method": "singular_value_thresholding",
                     "affected_columns": columns_with_missing,
                 }
-            )
-        else:
-            imputed_data = data.copy()
-            missing_data_results = {"no_missing_data": True}
-
-        # 2. Anomaly detection
-        logger.info("Phase 2: Anomaly detection")
-
-        # Multivariate anomaly detection on numerical columns
-        numerical_columns = imputed_data.select_dtypes(
-            include=[np.number]
-        ).columns.tolist()
-
-        if len(numerical_columns) > 1:
-            X_numeric = imputed_data[numerical_columns].values
-
-            # Multivariate outlier detection
-            multivariate_anomalies = (
-                self.anomaly_detector.multivariate_outlier_detection(X_numeric)
-            )
+            ],
+        }
 
-            # Time series anomaly detection (if applicable)
-            ts_anomalies = {}
-            if len(imputed_data) > 50:  # Sufficient data for time series analysis
-                for col in numerical_columns[
-                    :5
-                ]:  # Limit to first 5 columns for performance
-                    ts_anomaly = self.anomaly_detector.time_series_anomaly_detection(
-                        imputed_data[col].values
-                    )
-                    ts_anomalies[col] = ts_anomaly
+    def _stage_imputation_comparison(
+        self, data: pd.DataFrame, outputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """PPCA and Gaussian-process imputations, for comparison with SVT"""
+        columns_with_missing = data.columns[data.isnull().any()].tolist()
+        if not columns_with_missing:
+            return {}
+        X_missing = data[columns_with_missing].values
+        return {
+            "ppca_result": self.missing_data_handler.probabilistic_pca_imputation(X_missing),
+            "gp_result": self.missing_data_handler.gaussian_process_imputation(X_missing),
+        }
 
-            anomaly_results = {
-                "multivariate": multivariate_anomalies,
-                "time_series": ts_anomalies,
-            }
+    def _stage_anomaly_detection(
+        self, data: pd.DataFrame, outputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Multivariate and per-column time series anomaly detection"""
+        imputed_data = outputs["missing_data"]["imputed"]
+        numerical_columns = self._numerical_columns(outputs)
+        if len(numerical_columns) <= 1:
+            return {"results": {}, "columns": {}, "log": []}
+
+        # Multivariate outlier detection
+        multivariate_anomalies = self.anomaly_detector.multivariate_outlier_detection(
+            imputed_data[numerical_columns].values
+        )
 
-            # Mark anomalous rows
-            ensemble_outliers = multivariate_anomalies.get("ensemble", {}).get(
-                "outliers", np.zeros(len(imputed_data), dtype=bool)
-            )
-            imputed_data["anomaly_score"] = ensemble_outliers.astype(int)
+        # Time series anomaly detection (if applicable)
+        ts_anomalies = {}
+        if len(imputed_data) > 50:  # Sufficient data for time series analysis
+            for col in numerical_columns[:5]:  # Limit to first 5 columns for performance
+                ts_anomalies[col] = self.anomaly_detector.time_series_anomaly_detection(
+                    imputed_data[col].values
+                )
+
+        # Mark anomalous rows
+        ensemble_outliers = multivariate_anomalies.get("ensemble", {}).get(
+            "outliers", np.zeros(len(imputed_data), dtype=bool)
+        )
 
-            transformation_log.append(
+        return {
+            "results": {"multivariate": multivariate_anomalies, "time_series": ts_anomalies},
+            "columns": {"anomaly_score": ensemble_outliers.astype(int)},
+            "log": [
                 {
                     "step": "anomaly_detection",
                     "methods": [
@@ -974,39 +1080,49 @@ class EnhancedMathematicalDataPipeline:
                     ],
                     "anomalies_detected": np.sum(ensemble_outliers),
                 }
-            )
+            ],
+        }
 
-        # 3. Signal processing and decomposition
-        logger.info("Phase 3: Signal processing and decomposition")
+    def _stage_signal_decomposition(
+        self, data: pd.DataFrame, outputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """EMD, Hilbert-Huang and adaptive filtering per signal column"""
+        imputed_data = outputs["missing_data"]["imputed"]
+        # First 3 numerical columns by default; EMD for all of them runs
+        # across a process pool up front
+        signal_columns = self._numerical_columns(outputs)[: self.config.get("signal_columns", 3)]
+        emd_results = self.signal_processor.empirical_mode_decomposition_many(
+            [imputed_data[col].values for col in signal_columns],
+            n_jobs=self.config.get("n_jobs"),
+        )
 
-        for col in numerical_columns[:3]:  # Process first 3 numerical columns
+        results, columns, log = {}, {}, []
+        for col, emd_result in zip(signal_columns, emd_results):
             signal_data = imputed_data[col].values
 
-            # EMD decomposition
-            emd_result = self.signal_processor.empirical_mode_decomposition(signal_data)
-
-            # Hilbert-Huang Transform
-            hht_result = self.signal_processor.hilbert_huang_transform(signal_data)
+            # Hilbert-Huang Transform on the precomputed decomposition
+            hht_result = self.signal_processor.hilbert_huang_transform(
+                signal_data, emd_result
+            )
 
             # Adaptive filtering
             adaptive_result = self.signal_processor.adaptive_filtering(signal_data)
 
-            signal_decompositions[col] = {
+            results[col] = {
                 "emd": emd_result,
                 "hht": hht_result,
                 "adaptive_filtering": adaptive_result,
             }
 
             # Add decomposed components as features
-            if len(emd_result["imfs"]) > 0:
-                for i, imf in enumerate(emd_result["imfs"][:3]):  # Add first 3 IMFs
-                    imputed_data[f"{col}_imf_{i}"] = imf
+            for i, imf in enumerate(emd_result["imfs"][:3]):  # Add first 3 IMFs
+                columns[f"{col}_imf_{i}"] = imf
 
             # Add filtered signals
-            imputed_data[f"{col}_kalman"] = adaptive_result["kalman_estimate"]
-            imputed_data[f"{col}_wiener"] = adaptive_result["wiener_estimate"]
+            columns[f"{col}_kalman"] = adaptive_result["kalman_estimate"]
+            columns[f"{col}_wiener"] = adaptive_result["wiener_estimate"]
 
-            transformation_log.append(
+            log.append(
                 {
                     "step": "signal_decomposition",
                     "column": col,
@@ -1015,83 +1131,50 @@ class EnhancedMathematicalDataPipeline:
                 }
             )
 
-        # 4. Advanced time series feature extraction
-        logger.info("Phase 4: Time series feature extraction")
-
-        for col in numerical_columns[:2]:  # Process first 2 columns
-            ts_data = imputed_data[col].values
-
-            # Statistical features
-            statistical_features = self._extract_statistical_features(ts_data)
+        return {"results": results, "columns": columns, "log": log}
 
-            # Frequency domain features
-            frequency_features = self._extract_frequency_features(ts_data)
-
-            # Complexity measures
-            complexity_features = self._extract_complexity_features(ts_data)
+    def _stage_time_series_features(
+        self, data: pd.DataFrame, outputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Statistical, frequency and complexity features per column"""
+        imputed_data = outputs["missing_data"]["imputed"]
+        results, columns = {}, {}
 
-            time_series_features[col] = {
-                "statistical": statistical_features,
-                "frequency": frequency_features,
-                "complexity": complexity_features,
+        for col in self._numerical_columns(outputs)[:2]:  # Process first 2 columns
+            ts_data = imputed_data[col].values
+            results[col] = {
+                "statistical": self._extract_statistical_features(ts_data),
+                "frequency": self._extract_frequency_features(ts_data),
+                "complexity": self._extract_complexity_features(ts_data),
             }
 
-            # Add features to dataframe
-            for feature_type, features in time_series_features[col].items():
+            # Scalar features become constant columns
+            for feature_type, features in results[col].items():
                 for feature_name, feature_value in features.items():
                     if np.isscalar(feature_value):
-                        imputed_data[f"{col}_{feature_type}_{feature_name}"] = (
-                            feature_value
-                        )
-
-        # 5. Statistical properties analysis
-        logger.info("Phase 5: Statistical properties analysis")
-
-        statistical_props = self._analyze_statistical_properties(
-            imputed_data, numerical_columns
-        )
+                        columns[f"{col}_{feature_type}_{feature_name}"] = feature_value
 
-        # 6. Quality metrics computation
-        quality_metrics = self._compute_quality_metrics(
-            data, imputed_data, transformation_log
-        )
+        return {"results": results, "columns": columns}
 
-        # 7. Uncertainty estimation
-        uncertainty_estimates = self._estimate_processing_uncertainty(
-            data, imputed_data, missing_data_results
+    def _stage_statistical_properties(
+        self, data: pd.DataFrame, outputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return self._analyze_statistical_properties(
+            outputs["processed_data"], self._numerical_columns(outputs)
         )
 
-        # Create final result
-        result = DataProcessingResult(
-            processed_data=imputed_data,
-            signal_decomposition=signal_decompositions,
-            anomaly_detection=anomaly_results,
-            missing_data_analysis=missing_data_results,
-            time_series_features=time_series_features,
-            statistical_properties=statistical_props,
-            quality_metrics=quality_metrics,
-            transformation_log=transformation_log,
-            uncertainty_estimates=uncertainty_estimates,
-        )
+    def _stage_quality_metrics(self, data: pd.DataFrame, outputs: Dict[str, Any]) -> Dict[str, float]:
+        transformation_log = [
+            entry for stage in STAGE_LOGS if stage in outputs for entry in outputs[stage].get("log", [])
+        ]
+        return self._compute_quality_metrics(data, outputs["processed_data"], transformation_log)
 
-        # Store in processing history
-        processing_time = time.time() - start_time
-        self.processing_history.append(
-            {
-                "timestamp": time.time(),
-                "processing_time": processing_time,
-                "input_shape": data.shape,
-                "output_shape": imputed_data.shape,
-                "transformations_applied": len(transformation_log),
-            }
-        )
-
-        logger.info(
-            f"Comprehensive data processing completed in {processing_time:.3f}s"
+    def _stage_uncertainty_estimates(
+        self, data: pd.DataFrame, outputs: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        return self._estimate_processing_uncertainty(
+            data, outputs["processed_data"], outputs["missing_data"]["analysis"]
         )
-        logger.info("Data shape: {data.shape} → {imputed_data.shape}")
-
-        return result
 
     def _extract_statistical_features(self, ts: np.ndarray) -> Dict[str, float]:
         """Extract statistical features from time series"""
@@ -1107,7 +1190,9 @@ class EnhancedMathematicalDataPipeline:
 
         # Distribution tests
         features["normality_pvalue"] = stats.normaltest(ts)[1]
-        features["stationarity_adf"] = stats.adfuller(ts)[1] if len(ts) > 12 else 1.0
+        features["stationarity_adf"] = (
+            adfuller(ts)[1] if STATSMODELS_AVAILABLE and len(ts) > 12 else 1.0
+        )
 
         # Autocorrelation
         if len(ts) > 1:
@@ -1325,7 +1410,7 @@ class EnhancedMathematicalDataPipeline:
 
             # Find highly correlated pairs
             for i in range(len(numerical_columns)):
-                for _ in range(i + 1, len(numerical_columns)):
+                for j in range(i + 1, len(numerical_columns)):
                     corr_val = corr_matrix.iloc[i, j]
                     if abs(corr_val) > 0.8:
                         properties["correlation_analysis"][
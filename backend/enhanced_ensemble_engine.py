@@ -6,10 +6,13 @@ Built upon existing ensemble_engine.py foundation
 import asyncio
 import logging
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
+from itertools import chain, combinations
+from math import comb
 import joblib
 from concurrent.futures import ThreadPoolExecutor
 from scipy.optimize import minimize
@@ -22,9 +25,23 @@ from ensemble_engine import (
     UltraAdvancedEnsembleEngine, ModelType, PredictionContext, 
     EnsembleConfiguration, PredictionOutput, ModelMetrics
 )
+from pareto import pareto_select
+from quantum_ensemble import EnsembleObjective, QuantumWeightEvolution, entanglement_matrix
 
 logger = logging.getLogger(__name__)
 
+# Contexts × model sets whose last quantum-inspired optimum is kept
+WARM_START_CACHE_SIZE = 64
+# Ensemble sizes considered by multi-objective selection
+MIN_ENSEMBLE_SIZE = 2
+MAX_ENSEMBLE_SIZE = 8
+# Candidate ensembles scored per optimization; larger model pools are sampled
+MAX_CANDIDATE_ENSEMBLES = 4096
+CANDIDATE_SAMPLE_SEED = 0
+# Weights for picking one ensemble off the Pareto frontier
+OBJECTIVE_WEIGHTS = {'accuracy': 0.4, 'diversity': 0.2, 'speed': 0.2, 'robustness': 0.2}
+DEFAULT_OBJECTIVE_WEIGHT = 0.25
+
 class OptimizationStrategy(str, Enum):
     """Advanced optimization strategies for ensemble weighting"""
     QUANTUM_INSPIRED = "quantum_inspired"
@@ -60,18 +77,32 @@ class MultiObjectiveConfig:
             self.weight_constraints = {'accuracy': (0.2, 0.8), 'diversity': (0.1, 0.5)}
 
 class QuantumInspiredOptimizer:
-    """Quantum-inspired optimization for ensemble weights"""
+    """Quantum-inspired optimization for ensemble weights
+
+    Weights are evolved as a batched population of quantum states (see
+    ``quantum_ensemble``), warm-started from the previous optimum found for
+    the same context and model set.
+    """
     
     def __init__(self, config: QuantumEnsembleConfig):
         self.config = config
-        self.quantum_states = {}
+        self.evolution = QuantumWeightEvolution(
+            superposition_states=config.superposition_states,
+            max_iterations=config.quantum_iterations,
+            coherence_time=config.coherence_time,
+            noise_level=config.noise_level,
+        )
+        # Previous optimum per (context, models), used to warm-start reweighting
+        self.warm_starts: "OrderedDict[Tuple[Any, Tuple[str, ...]], np.ndarray]" = OrderedDict()
         self.entanglement_matrix = None
+        self.last_run: Optional[Dict[str, Any]] = None
         
     async def optimize_weights(
         self,
         model_performances: Dict[str, float],
         correlation_matrix: np.ndarray,
-        historical_data: List[Dict[str, Any]]
+        historical_data: List[Dict[str, Any]],
+        context: Any = None
     ) -> Dict[str, float]:
         """Optimize ensemble weights using quantum-inspired algorithms"""
         try:
@@ -81,186 +112,38 @@ class QuantumInspiredOptimizer:
             if n_models == 0:
                 return {}
             
-            # Initialize quantum states
-            quantum_states = self._initialize_quantum_states(n_models)
+            # Objective matrix built once and shared by every state and generation
+            objective = EnsembleObjective.from_history(models, model_performances, historical_data)
             
             # Create entanglement matrix
-            entanglement_matrix = self._create_entanglement_matrix(
+            self.entanglement_matrix = entanglement_matrix(
                 correlation_matrix, self.config.entanglement_strength
             )
             
-            best_weights = None
-            best_score = -np.inf
-            
-            for iteration in range(self.config.quantum_iterations):
-                # Quantum evolution
-                quantum_states = self._quantum_evolution(
-                    quantum_states, entanglement_matrix, iteration
-                )
-                
-                # Measurement and weight extraction
-                weights = self._measure_quantum_states(quantum_states, models)
-                
-                # Evaluate ensemble performance
-                score = await self._evaluate_quantum_ensemble(
-                    weights, model_performances, historical_data
-                )
-                
-                if score > best_score:
-                    best_score = score
-                    best_weights = weights.copy()
-                
-                # Apply quantum noise for exploration
-                if iteration % 10 == 0:
-                    quantum_states = self._apply_quantum_noise(
-                        quantum_states, self.config.noise_level
-                    )
+            key = (context, tuple(models))
+            run = self.evolution.run(
+                objective, self.entanglement_matrix, warm_start=self.warm_starts.get(key)
+            )
+            self.warm_starts[key] = run['weights']
+            self.warm_starts.move_to_end(key)
+            while len(self.warm_starts) > WARM_START_CACHE_SIZE:
+                self.warm_starts.popitem(last=False)
+            self.last_run = run
             
-            return best_weights or {model: 1.0/n_models for model in models}
+            return {model: float(weight) for model, weight in zip(models, run['weights'])}
             
         except Exception as e:
             logger.error(f"Quantum optimization failed: {e}")
             # Fallback to uniform weights
             return {model: 1.0/len(model_performances) for model in model_performances.keys()}
-    
-    def _initialize_quantum_states(self, n_models: int) -> np.ndarray:
-        """Initialize quantum states in superposition"""
-        states = np.random.complex128((n_models, self.config.superposition_states))
-        # Normalize to unit magnitude
-        for i in range(n_models):
-            norm = np.linalg.norm(states[i])
-            if norm > 0:
-                states[i] /= norm
-        return states
-    
-    def _create_entanglement_matrix(
-        self, correlation_matrix: np.ndarray, strength: float
-    ) -> np.ndarray:
-        """Create entanglement matrix based on model correlations"""
-        n_models = correlation_matrix.shape[0]
-        entanglement = np.zeros((n_models, n_models), dtype=complex)
-        
-        for i in range(n_models):
-            for j in range(i+1, n_models):
-                # Entanglement strength based on correlation
-                entanglement[i, j] = strength * correlation_matrix[i, j] * np.exp(1j * np.pi/4)
-                entanglement[j, i] = np.conj(entanglement[i, j])
-        
-        return entanglement
-    
-    def _quantum_evolution(
-        self, states: np.ndarray, entanglement: np.ndarray, iteration: int
-    ) -> np.ndarray:
-        """Evolve quantum states using Hamiltonian dynamics"""
-        dt = self.config.coherence_time / self.config.quantum_iterations
-        
-        # Hamiltonian evolution
-        for i in range(len(states)):
-            # Self-evolution
-            phase = np.exp(-1j * iteration * dt)
-            states[i] *= phase
-            
-            # Entanglement effects
-            for j in range(len(states)):
-                if i != j:
-                    coupling = entanglement[i, j] * dt
-                    states[i] += coupling * states[j]
-            
-            # Renormalize
-            norm = np.linalg.norm(states[i])
-            if norm > 0:
-                states[i] /= norm
-        
-        return states
-    
-    def _measure_quantum_states(
-        self, states: np.ndarray, models: List[str]
-    ) -> Dict[str, float]:
-        """Measure quantum states to extract classical weights"""
-        weights = {}
-        
-        for i, model in enumerate(models):
-            # Probability amplitude
-            probability = np.sum(np.abs(states[i])**2)
-            weights[model] = float(probability)
-        
-        # Normalize weights
-        total_weight = sum(weights.values())
-        if total_weight > 0:
-            weights = {k: v/total_weight for k, v in weights.items()}
-        else:
-            weights = {model: 1.0/len(models) for model in models}
-        
-        return weights
-    
-    def _apply_quantum_noise(
-        self, states: np.ndarray, noise_level: float
-    ) -> np.ndarray:
-        """Apply quantum decoherence noise"""
-        noise = np.random.normal(0, noise_level, states.shape) + \
-                1j * np.random.normal(0, noise_level, states.shape)
-        
-        noisy_states = states + noise
-        
-        # Renormalize
-        for i in range(len(noisy_states)):
-            norm = np.linalg.norm(noisy_states[i])
-            if norm > 0:
-                noisy_states[i] /= norm
-        
-        return noisy_states
-    
-    async def _evaluate_quantum_ensemble(
-        self,
-        weights: Dict[str, float],
-        performances: Dict[str, float],
-        historical_data: List[Dict[str, Any]]
-    ) -> float:
-        """Evaluate quantum ensemble performance"""
-        # Weighted performance score
-        weighted_performance = sum(
-            weights[model] * performances[model] 
-            for model in weights.keys()
-        )
-        
-        # Diversity bonus (entropy of weights)
-        entropy = -sum(w * np.log(w + 1e-10) for w in weights.values())
-        diversity_bonus = entropy / np.log(len(weights)) if len(weights) > 1 else 0
-        
-        # Historical consistency
-        consistency_score = await self._calculate_consistency(weights, historical_data)
-        
-        # Composite score
-        return 0.6 * weighted_performance + 0.2 * diversity_bonus + 0.2 * consistency_score
-    
-    async def _calculate_consistency(
-        self, weights: Dict[str, float], historical_data: List[Dict[str, Any]]
-    ) -> float:
-        """Calculate consistency of weights with historical performance"""
-        if not historical_data:
-            return 0.5
-        
-        # Simplified consistency calculation
-        recent_data = historical_data[-10:]  # Last 10 predictions
-        consistency_scores = []
-        
-        for data in recent_data:
-            if 'model_weights' in data:
-                historical_weights = data['model_weights']
-                # Calculate weight similarity (cosine similarity)
-                common_models = set(weights.keys()) & set(historical_weights.keys())
-                if common_models:
-                    w1 = np.array([weights.get(m, 0) for m in common_models])
-                    w2 = np.array([historical_weights.get(m, 0) for m in common_models])
-                    
-                    if np.linalg.norm(w1) > 0 and np.linalg.norm(w2) > 0:
-                        similarity = np.dot(w1, w2) / (np.linalg.norm(w1) * np.linalg.norm(w2))
-                        consistency_scores.append(similarity)
-        
-        return np.mean(consistency_scores) if consistency_scores else 0.5
 
 class MultiObjectiveOptimizer:
-    """Multi-objective optimization for ensemble selection"""
+    """Multi-objective optimization for ensemble selection
+
+    Candidate ensembles are scored as rows of one matrix and ranked with the
+    vectorized non-dominated sort in ``pareto``, so thousands of ensembles
+    can be considered on every request.
+    """
     
     def __init__(self, config: MultiObjectiveConfig):
         self.config = config
@@ -274,7 +157,7 @@ class MultiObjectiveOptimizer:
         """Optimize ensemble using multi-objective criteria"""
         try:
             # Calculate objective scores for each model
-            objective_scores = await self._calculate_objective_scores(
+            objective_scores = self._calculate_objective_scores(
                 candidate_models, model_metrics, context
             )
             
@@ -285,7 +168,7 @@ class MultiObjectiveOptimizer:
             
             # Select best solution from Pareto frontier
             best_solution = await self._select_from_pareto_frontier(
-                pareto_solutions, objective_scores
+                pareto_solutions, candidate_models, objective_scores
             )
             
             # Calculate optimal weights for selected models
@@ -306,157 +189,97 @@ class MultiObjectiveOptimizer:
             uniform_weights = {model: 1.0/len(top_models) for model in top_models}
             return top_models, uniform_weights
     
-    async def _calculate_objective_scores(
+    def _calculate_objective_scores(
         self,
         models: List[str],
         metrics: Dict[str, ModelMetrics],
         context: PredictionContext
-    ) -> Dict[str, Dict[str, float]]:
-        """Calculate scores for each objective"""
-        scores = {}
-        
-        for model in models:
-            model_metrics = metrics[model]
-            model_scores = {}
-            
-            # Accuracy objective
-            model_scores['accuracy'] = model_metrics.accuracy
-            
+    ) -> np.ndarray:
+        """(models × objectives) score matrix, columns in config.objectives order"""
+        accuracy = np.array([metrics[model].accuracy for model in models], dtype=float)
+        columns = {
+            'accuracy': accuracy,
             # Speed objective (inverse of processing time)
-            model_scores['speed'] = 1.0 / (1.0 + model_metrics.avg_return)  # Placeholder
-            
-            # Robustness objective
-            model_scores['robustness'] = model_metrics.robustness_score
-            
-            # Diversity objective (calculated later)
-            model_scores['diversity'] = 0.5  # Placeholder
-            
-            scores[model] = model_scores
-        
-        # Calculate diversity scores
-        await self._calculate_diversity_scores(scores, models)
-        
-        return scores
+            'speed': 1.0 / (1.0 + np.array([metrics[model].avg_return for model in models], dtype=float)),  # Placeholder
+            'robustness': np.array([metrics[model].robustness_score for model in models], dtype=float),
+            'diversity': self._calculate_diversity_scores(accuracy),
+        }
+        return np.column_stack([columns[objective] for objective in self.config.objectives])
     
-    async def _calculate_diversity_scores(
-        self, scores: Dict[str, Dict[str, float]], models: List[str]
-    ):
-        """Calculate diversity scores between models"""
-        n_models = len(models)
-        
-        for i, model1 in enumerate(models):
-            diversity_sum = 0.0
-            
-            for j, model2 in enumerate(models):
-                if i != j:
-                    # Calculate diversity based on prediction differences
-                    # This is a simplified calculation
-                    diversity = abs(
-                        scores[model1]['accuracy'] - scores[model2]['accuracy']
-                    )
-                    diversity_sum += diversity
-            
-            # Average diversity
-            scores[model1]['diversity'] = diversity_sum / (n_models - 1) if n_models > 1 else 0.0
+    def _calculate_diversity_scores(self, accuracy: np.ndarray) -> np.ndarray:
+        """Mean absolute accuracy difference of each model to every other model"""
+        n_models = len(accuracy)
+        if n_models < 2:
+            return np.zeros(n_models)
+        # Simplified: diversity based on prediction (accuracy) differences
+        return np.abs(accuracy[:, None] - accuracy[None, :]).sum(axis=1) / (n_models - 1)
+    
+    def _candidate_ensembles(self, n_models: int) -> np.ndarray:
+        """(candidates × models) membership matrix of ensembles to score
+
+        Every combination of MIN_ENSEMBLE_SIZE..MAX_ENSEMBLE_SIZE models while
+        there are at most MAX_CANDIDATE_ENSEMBLES of them, otherwise a seeded
+        uniform sample of the same combinations.
+        """
+        sizes = np.arange(MIN_ENSEMBLE_SIZE, min(n_models, MAX_ENSEMBLE_SIZE) + 1)
+        counts = np.array([comb(n_models, int(size)) for size in sizes], dtype=float)
+        if counts.sum() <= MAX_CANDIDATE_ENSEMBLES:
+            membership = np.zeros((int(counts.sum()), n_models), dtype=bool)
+            row = 0
+            for size, count in zip(sizes, counts.astype(int)):
+                members = np.fromiter(
+                    chain.from_iterable(combinations(range(n_models), int(size))),
+                    dtype=np.intp, count=count * int(size)
+                ).reshape(count, int(size))
+                membership[np.arange(row, row + count)[:, None], members] = True
+                row += count
+            return membership
+        
+        rng = np.random.default_rng(CANDIDATE_SAMPLE_SEED)
+        ensemble_sizes = rng.choice(sizes, size=MAX_CANDIDATE_ENSEMBLES, p=counts / counts.sum())
+        # Models ranked by a random key per ensemble; the first `size` are its members
+        membership = rng.random((MAX_CANDIDATE_ENSEMBLES, n_models)).argsort(axis=1).argsort(axis=1) < ensemble_sizes[:, None]
+        return np.unique(membership, axis=0)
     
     def _find_pareto_frontier(
         self,
         models: List[str],
-        objective_scores: Dict[str, Dict[str, float]]
-    ) -> List[List[str]]:
-        """Find Pareto optimal solutions"""
-        pareto_solutions = []
-        
-        # Generate all possible combinations up to max size
-        from itertools import combinations
-        
-        max_ensemble_size = min(len(models), 8)  # Reasonable limit
-        
-        for size in range(2, max_ensemble_size + 1):
-            for combination in combinations(models, size):
-                if self._is_pareto_optimal(
-                    list(combination), pareto_solutions, objective_scores
-                ):
-                    pareto_solutions.append(list(combination))
-        
-        return pareto_solutions[:self.config.pareto_frontier_size]
-    
-    def _is_pareto_optimal(
-        self,
-        candidate: List[str],
-        existing_solutions: List[List[str]],
-        objective_scores: Dict[str, Dict[str, float]]
-    ) -> bool:
-        """Check if candidate solution is Pareto optimal"""
-        candidate_scores = self._aggregate_ensemble_scores(candidate, objective_scores)
-        
-        for existing in existing_solutions:
-            existing_scores = self._aggregate_ensemble_scores(existing, objective_scores)
-            
-            # Check if existing dominates candidate
-            dominates = True
-            for objective in self.config.objectives:
-                if existing_scores[objective] <= candidate_scores[objective]:
-                    dominates = False
-                    break
-            
-            if dominates:
-                return False
-        
-        return True
+        objective_scores: np.ndarray
+    ) -> np.ndarray:
+        """Membership rows of the best-spread non-dominated ensembles"""
+        if len(models) < MIN_ENSEMBLE_SIZE:
+            return np.ones((1, len(models)), dtype=bool)
+        membership = self._candidate_ensembles(len(models))
+        ensemble_scores = self._aggregate_ensemble_scores(membership, objective_scores)
+        selected = pareto_select(ensemble_scores, self.config.pareto_frontier_size, max_rank=0)
+        return membership[selected]
     
     def _aggregate_ensemble_scores(
-        self, ensemble: List[str], objective_scores: Dict[str, Dict[str, float]]
-    ) -> Dict[str, float]:
-        """Aggregate objective scores for an ensemble"""
-        aggregated = {}
-        
-        for objective in self.config.objectives:
-            if objective == 'diversity':
-                # For diversity, take the average
-                scores = [objective_scores[model][objective] for model in ensemble]
-                aggregated[objective] = np.mean(scores)
-            else:
-                # For other objectives, take weighted average
-                scores = [objective_scores[model][objective] for model in ensemble]
-                aggregated[objective] = np.mean(scores)
-        
-        return aggregated
+        self, membership: np.ndarray, objective_scores: np.ndarray
+    ) -> np.ndarray:
+        """Mean member score per objective for each ensemble"""
+        return (membership @ objective_scores) / membership.sum(axis=1, keepdims=True)
     
     async def _select_from_pareto_frontier(
         self,
-        pareto_solutions: List[List[str]],
-        objective_scores: Dict[str, Dict[str, float]]
+        pareto_solutions: np.ndarray,
+        models: List[str],
+        objective_scores: np.ndarray
     ) -> List[str]:
         """Select best solution from Pareto frontier"""
-        if not pareto_solutions:
+        if len(pareto_solutions) == 0:
             return []
         
         # Score each solution using weighted objectives
-        solution_scores = {}
-        
-        # Default weights for objectives
-        objective_weights = {
-            'accuracy': 0.4,
-            'diversity': 0.2,
-            'speed': 0.2,
-            'robustness': 0.2
-        }
-        
-        for solution in pareto_solutions:
-            aggregated_scores = self._aggregate_ensemble_scores(solution, objective_scores)
-            
-            # Calculate weighted score
-            weighted_score = sum(
-                objective_weights.get(obj, 0.25) * score
-                for obj, score in aggregated_scores.items()
-            )
-            
-            solution_scores[tuple(solution)] = weighted_score
+        objective_weights = np.array([
+            OBJECTIVE_WEIGHTS.get(objective, DEFAULT_OBJECTIVE_WEIGHT)
+            for objective in self.config.objectives
+        ])
+        solution_scores = self._aggregate_ensemble_scores(pareto_solutions, objective_scores) @ objective_weights
         
         # Return solution with highest weighted score
-        best_solution = max(solution_scores.items(), key=lambda x: x[1])
-        return list(best_solution[0])
+        best_solution = pareto_solutions[int(np.argmax(solution_scores))]
+        return [model for model, member in zip(models, best_solution) if member]
     
     async def _calculate_optimal_weights(
         self, selected_models: List[str], model_metrics: Dict[str, ModelMetrics]
@@ -570,7 +393,7 @@ class EnhancedEnsembleEngine(UltraAdvancedEnsembleEngine):
         
         # Optimize weights
         weights = await self.quantum_optimizer.optimize_weights(
-            model_performances, correlation_matrix, self.performance_history
+            model_performances, correlation_matrix, self.performance_history, context
         )
         
         # Select models with significant weights
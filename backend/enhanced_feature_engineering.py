@@ -3,9 +3,11 @@ Advanced statistical signal processing, manifold learning, and information theor
 for sophisticated feature extraction and transformation
 """
 
+import hashlib
 import logging
 import time
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
@@ -14,9 +16,18 @@ import numpy as np
 from scipy import stats
 from scipy.sparse.linalg import eigsh
 from sklearn.decomposition import PCA
-from sklearn.feature_selection import mutual_info_regression
+from sklearn.feature_selection import f_regression
 from sklearn.preprocessing import StandardScaler
 
+from entropy_estimators import (
+    multiscale_entropy,
+    mutual_information,
+    transfer_entropy_matrix,
+    transfer_entropy_pair,
+)
+from sparse_graph import binary, correlation_adjacency, motif_counts
+from sparse_graph import centralities as sparse_centralities
+
 warnings.filterwarnings("ignore")
 logger = logging.getLogger(__name__)
 
@@ -124,62 +135,8 @@ class WaveletTransformFeatures:
     def multiscale_entropy(
         self, signal_data: np.ndarray, max_scale: int = 20
     ) -> np.ndarray:
-        """Multiscale sample entropy"""
-
-        def sample_entropy(data, m=2, r=0.2):
-            """Sample entropy calculation"""
-            N = len(data)
-            patterns = np.array([data[i : i + m] for i in range(N - m + 1)])
-
-            # Count matches
-            matches_m = 0
-            matches_m1 = 0
-
-            for i in range(len(patterns)):
-                template = patterns[i]
-                distances = np.max(np.abs(patterns - template), axis=1)
-
-                matches_m += (
-                    np.sum(distances <= r * np.std(data)) - 1
-                )  # Exclude self-match
-
-                if i < len(patterns) - 1:
-                    template_m1 = data[i : i + m + 1]
-                    patterns_m1 = np.array(
-                        [data[j : j + m + 1] for _ in range(N - m) if j != i]
-                    )
-                    if len(patterns_m1) > 0:
-                        distances_m1 = np.max(np.abs(patterns_m1 - template_m1), axis=1)
-                        matches_m1 += np.sum(distances_m1 <= r * np.std(data))
-
-            if matches_m == 0 or matches_m1 == 0:
-                return 0.0
-
-            return -np.log(matches_m1 / matches_m)
-
-        entropies = []
-
-        for scale in range(1, max_scale + 1):
-            # Coarse-grain the signal
-            if scale == 1:
-                coarse_grained = signal_data
-            else:
-                n_points = len(signal_data) // scale
-                coarse_grained = np.array(
-                    [
-                        np.mean(signal_data[i * scale : (i + 1) * scale])
-                        for i in range(n_points)
-                    ]
-                )
-
-            # Calculate sample entropy
-            if len(coarse_grained) > 10:  # Need sufficient data points
-                entropy = sample_entropy(coarse_grained)
-                entropies.append(entropy)
-            else:
-                entropies.append(0.0)
-
-        return np.array(entropies)
+        """Multiscale sample entropy (see ``entropy_estimators``)"""
+        return multiscale_entropy(signal_data, max_scale=max_scale)
 
 
 class ManifoldLearningFeatures:
@@ -403,76 +360,26 @@ class InformationTheoreticFeatures:
     def transfer_entropy(
         self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None, lag: int = 1
     ) -> Dict[str, float]:
-        """Transfer entropy between time series"""
-
-        def _embed_timeseries(ts, embedding_dim=3, delay=1):
-            """Time delay embedding"""
-            n = len(ts) - (embedding_dim - 1) * delay
-            embedded = np.zeros((n, embedding_dim))
-            for i in range(embedding_dim):
-                embedded[:, i] = ts[i * delay : i * delay + n]
-            return embedded
-
-        # Embed time series
-        X_embedded = _embed_timeseries(X)
-        Y_embedded = _embed_timeseries(Y)
-
-        # Shift for lagged transfer entropy
-        if lag > 0:
-            X_past = X_embedded[:-lag]
-            X_future = X_embedded[lag:]
-            Y_past = Y_embedded[:-lag]
-            Y_future = Y_embedded[lag:]
-        else:
-            X_past = X_embedded
-            X_future = X_embedded
-            Y_past = Y_embedded
-            Y_future = Y_embedded
-
-        # Estimate mutual information using k-NN
-        from sklearn.feature_selection import mutual_info_regression
-
-        # TE(X→Y) = I(Y_future; X_past | Y_past)
-        # = I(Y_future; X_past, Y_past) - I(Y_future; Y_past)
-        # Joint MI: I(Y_future; X_past, Y_past)
-        joint_features = np.hstack([X_past, Y_past])
-        joint_mi = mutual_info_regression(
-            joint_features.reshape(-1, joint_features.shape[-1]),
-            Y_future.mean(axis=1),
-            discrete_features=False,
-        )[0]
-
-        # Conditional MI: I(Y_future; Y_past)
-        cond_mi = mutual_info_regression(
-            Y_past.reshape(-1, Y_past.shape[-1]),
-            Y_future.mean(axis=1),
-            discrete_features=False,
-        )[0]
-
-        te_x_to_y = joint_mi - cond_mi
-
-        # TE(Y→X)
-        joint_features_yx = np.hstack([Y_past, X_past])
-        joint_mi_yx = mutual_info_regression(
-            joint_features_yx.reshape(-1, joint_features_yx.shape[-1]),
-            X_future.mean(axis=1),
-            discrete_features=False,
-        )[0]
-
-        cond_mi_yx = mutual_info_regression(
-            X_past.reshape(-1, X_past.shape[-1]),
-            X_future.mean(axis=1),
-            discrete_features=False,
-        )[0]
-
-        te_y_to_x = joint_mi_yx - cond_mi_yx
-
-        return {
-            "te_x_to_y": float(max(0, te_x_to_y)),
-            "te_y_to_x": float(max(0, te_y_to_x)),
-            "net_transfer": float(te_x_to_y - te_y_to_x),
-            "total_transfer": float(te_x_to_y + te_y_to_x),
-        }
+        """Transfer entropy between time series
+
+        TE(X→Y) = I(Y_future; X_past | Y_past) with 3-step delay embeddings,
+        estimated directly with the KSG conditional-MI estimator
+        (``entropy_estimators``) rather than as a difference of two MIs.
+        """
+        if lag < 1:
+            raise ValueError("Transfer entropy needs lag >= 1")
+        return transfer_entropy_pair(X, Y, embedding_dim=3, lag=lag)
+
+    def transfer_entropy_matrix(
+        self, X: np.ndarray, lag: int = 1, n_jobs: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Transfer entropy between every ordered pair of feature columns
+
+        Returns the (n_features × n_features) matrix with [i, j] = TE(i → j)
+        plus each feature's net outflow (sent minus received).
+        """
+        te = transfer_entropy_matrix(X, embedding_dim=3, lag=lag, n_jobs=n_jobs)
+        return {"matrix": te, "net_outflow": te.sum(axis=1) - te.sum(axis=0)}
 
     def partial_information_decomposition(
         self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray
@@ -507,14 +414,14 @@ class InformationTheoreticFeatures:
         n_features = X.shape[1]
         rankings = {}
 
-        # 1. Mutual Information
-        mi_scores = mutual_info_regression(X, y, discrete_features=False)
+        # 1. Mutual Information (KSG, one kNN structure over y for all features)
+        mi_scores = mutual_information(X, y)
         rankings["mutual_information"] = {
             f"feature_{i}": float(score) for i, score in enumerate(mi_scores)
         }
 
         # 2. F-statistic
-        f_scores, p_values = stats.f_regression(X, y)
+        f_scores, p_values = f_regression(X, y)
         rankings["f_statistic"] = {
             f"feature_{i}": float(score) for i, score in enumerate(f_scores)
         }
@@ -581,68 +488,75 @@ class InformationTheoreticFeatures:
 
 
 class GraphBasedFeatures:
-    """Graph-based feature extraction and network analysis"""
-
-    def __init__(self):
-        self.graphs = {}
-        self.centrality_measures = {}
+    """Graph-based feature extraction and network analysis
+
+    Correlation networks are built as sparse adjacency matrices and their
+    centralities computed with sparse linear algebra (``sparse_graph``);
+    both are cached per feature-set fingerprint.
+    """
+
+    def __init__(self, betweenness_samples: Optional[int] = 128, cache_size: int = 16):
+        # Betweenness from this many sampled sources (exact when >= nodes)
+        self.betweenness_samples = betweenness_samples
+        self.cache_size = cache_size
+        self.graphs: "OrderedDict[str, Any]" = OrderedDict()
+        self.centrality_measures: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def feature_set_fingerprint(X: np.ndarray, threshold: float) -> str:
+        """Content hash of a feature matrix and edge threshold"""
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        digest = hashlib.blake2b(X.view(np.uint8), digest_size=16)
+        digest.update(repr((X.shape, float(threshold))).encode())
+        return digest.hexdigest()
+
+    def _cached(self, cache: OrderedDict, key: str, compute):
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        value = cache[key] = compute()
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def correlation_adjacency(self, X: np.ndarray, threshold: float = 0.3):
+        """CSR adjacency with |corr| > threshold between feature columns"""
+        key = self.feature_set_fingerprint(X, threshold)
+        return self._cached(self.graphs, key, lambda: correlation_adjacency(X, threshold))
 
     def construct_correlation_network(
         self, X: np.ndarray, threshold: float = 0.3
     ) -> nx.Graph:
         """Construct correlation network from features"""
-        # Compute correlation matrix
-        corr_matrix = np.corrcoef(X.T)
-
-        # Create graph
-        G = nx.Graph()
-
-        n_features = X.shape[1]
-        for i in range(n_features):
-            G.add_node(i, feature_id=f"feature_{i}")
+        G = nx.from_scipy_sparse_array(self.correlation_adjacency(X, threshold))
+        nx.set_node_attributes(G, {i: f"feature_{i}" for i in G.nodes()}, "feature_id")
+        return G
 
-        # Add edges based on correlation threshold
-        for i in range(n_features):
-            for _ in range(i + 1, n_features):
-                if abs(corr_matrix[i, j]) > threshold:
-                    G.add_edge(i, j, weight=abs(corr_matrix[i, j]))
+    def correlation_network_features(
+        self, X: np.ndarray, threshold: float = 0.3
+    ) -> Dict[str, Any]:
+        """Adjacency, per-feature centralities (arrays) and motif counts"""
+        key = self.feature_set_fingerprint(X, threshold)
+
+        def compute():
+            adjacency = self.correlation_adjacency(X, threshold)
+            return {
+                "fingerprint": key,
+                "adjacency": adjacency,
+                "centralities": sparse_centralities(adjacency, self.betweenness_samples),
+                "motifs": motif_counts(binary(adjacency)),
+            }
 
-        return G
+        return self._cached(self.centrality_measures, key, compute)
 
     def graph_centrality_features(self, G: nx.Graph) -> Dict[str, Dict[str, float]]:
         """Compute various centrality measures"""
-        centralities = {}
-
-        # Degree centrality
-        centralities["degree"] = nx.degree_centrality(G)
-
-        # Betweenness centrality
-        centralities["betweenness"] = nx.betweenness_centrality(G)
-
-        # Closeness centrality
-        if nx.is_connected(G):
-            centralities["closeness"] = nx.closeness_centrality(G)
-        else:
-            # Handle disconnected graph
-            centralities["closeness"] = {}
-            for component in nx.connected_components(G):
-                subgraph = G.subgraph(component)
-                subgraph_closeness = nx.closeness_centrality(subgraph)
-                centralities["closeness"].update(subgraph_closeness)
-
-        # Eigenvector centrality
-        try:
-            centralities["eigenvector"] = nx.eigenvector_centrality(G, max_iter=1000)
-        except:
-            centralities["eigenvector"] = {node: 0.0 for node in G.nodes()}
-
-        # PageRank
-        centralities["pagerank"] = nx.pagerank(G)
-
-        # Clustering coefficient
-        centralities["clustering"] = nx.clustering(G)
-
-        return centralities
+        nodes = list(G.nodes())
+        adjacency = nx.to_scipy_sparse_array(G, nodelist=nodes, weight="weight", format="csr")
+        measures = sparse_centralities(adjacency, self.betweenness_samples)
+        return {
+            name: dict(zip(nodes, values.tolist())) for name, values in measures.items()
+        }
 
     def community_detection(self, G: nx.Graph) -> Dict[str, Any]:
         """Community detection using multiple algorithms"""
@@ -697,25 +611,10 @@ class GraphBasedFeatures:
 
     def network_motifs(self, G: nx.Graph, motif_size: int = 3) -> Dict[str, int]:
         """Count network motifs (subgraph patterns)"""
-        motif_counts = {}
-
-        if motif_size == 3:
-            # Triangle motifs
-            triangles = list(nx.enumerate_all_cliques(G))
-            triangle_count = len([clique for clique in triangles if len(clique) == 3])
-            motif_counts["triangles"] = triangle_count
-
-            # Path motifs (3-node paths)
-            path_count = 0
-            for node in G.nodes():
-                neighbors = list(G.neighbors(node))
-                for i in range(len(neighbors)):
-                    for _ in range(i + 1, len(neighbors)):
-                        if not G.has_edge(neighbors[i], neighbors[j]):
-                            path_count += 1
-            motif_counts["3_paths"] = path_count
-
-        return motif_counts
+        if motif_size != 3:
+            return {}
+        # Triangles and open 3-node paths from A @ A
+        return motif_counts(binary(nx.to_scipy_sparse_array(G, format="csr")))
 
 
 class EnhancedMathematicalFeatureEngineering:
@@ -803,24 +702,32 @@ class EnhancedMathematicalFeatureEngineering:
                 )
                 info_results["transfer_entropy"] = te_results
 
+            # All feature pairs at once (opt-in; runs on a process pool)
+            if self.config.get("transfer_entropy_matrix") and X.shape[1] >= 2:
+                info_results["transfer_entropy_matrix"] = (
+                    self.information_features.transfer_entropy_matrix(
+                        X, n_jobs=self.config.get("n_jobs")
+                    )
+                )
+
         # 5. Graph-based features
         graph_results = {}
 
-        # Construct correlation network
+        # Correlation network, centralities and motifs (cached per feature set)
+        network = self.graph_features.correlation_network_features(X_scaled)
         corr_graph = self.graph_features.construct_correlation_network(X_scaled)
         graph_results["correlation_graph"] = corr_graph
-
-        # Centrality measures
-        centralities = self.graph_features.graph_centrality_features(corr_graph)
-        graph_results["centralities"] = centralities
+        graph_results["centralities"] = {
+            name: dict(enumerate(values.tolist()))
+            for name, values in network["centralities"].items()
+        }
 
         # Community detection
         communities = self.graph_features.community_detection(corr_graph)
         graph_results["communities"] = communities
 
         # Network motifs
-        motifs = self.graph_features.network_motifs(corr_graph)
-        graph_results["motifs"] = motifs
+        graph_results["motifs"] = network["motifs"]
 
         # 6. Nonlinear transformations
         nonlinear_transforms = {}
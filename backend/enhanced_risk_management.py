@@ -3,15 +3,46 @@ Advanced stochastic processes, extreme value theory, and financial mathematics
 for sophisticated risk assessment and portfolio optimization
 """
 
+import hashlib
 import logging
 import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
 import numpy as np
-from scipy import optimize, stats
+from scipy import stats
+
+from copula import (
+    KendallConcordance,
+    best_copula,
+    fit_archimedean,
+    fit_copulas,
+    fit_gaussian,
+    fit_student_t,
+    joint_probability,
+    kendall_tau_matrix,
+    pseudo_observations,
+)
+from extreme_value import (
+    MIN_EXCEEDANCES,
+    QUANTILE_LEVELS,
+    RETURN_PERIODS,
+    block_maxima,
+    fit_gev,
+    fit_gpd,
+    gev_return_levels,
+    gpd_quantiles,
+    hill_estimator,
+    series_fingerprint,
+    tail_risk,
+    threshold_exceedances,
+)
+from monte_carlo_risk import simulate_portfolio_risk
+from volatility import RISKMETRICS_LAMBDA, ewma_forecast, fit_garch, garch_forecast
 
 warnings.filterwarnings("ignore")
 logger = logging.getLogger(__name__)
@@ -50,360 +81,138 @@ class RiskAssessmentResult:
 
 
 class ExtremeValueTheory:
-    """Extreme Value Theory for tail risk analysis"""
+    """Extreme Value Theory for tail risk analysis
 
-    def __init__(self):
+    The single-series methods and ``tail_risk_batch`` share the batched fits
+    in ``extreme_value``. Batch results are cached per series fingerprint,
+    so re-running a report only fits series whose data changed.
+    """
+
+    def __init__(self, cache_size: int = 100000):
         self.gev_parameters = {}
         self.gpd_parameters = {}
         self.threshold_selection = {}
+        self.cache_size = cache_size
+        self.tail_cache: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
 
     def generalized_extreme_value(
         self, data: np.ndarray, block_size: int = 252
     ) -> Dict[str, float]:
         """Fit Generalized Extreme Value distribution to block maxima"""
-        # Create block maxima
-        n_blocks = len(data) // block_size
-        block_maxima = []
-
-        for i in range(n_blocks):
-            block = data[i * block_size : (i + 1) * block_size]
-            if len(block) > 0:
-                block_maxima.append(np.max(block))
-
-        block_maxima = np.array(block_maxima)
-
-        # Fit GEV distribution
-        # GEV CDF: exp(-[1 + ξ(x-μ)/σ]^(-1/ξ)) for ξ ≠ 0
-
-        def gev_likelihood(params):
-            """Negative log-likelihood for GEV distribution"""
-            xi, mu, sigma = params
-
-            if sigma <= 0:
-                return np.inf
-
-            z = (block_maxima - mu) / sigma
-
-            if xi == 0:
-                # Gumbel case
-                log_likelihood = -np.sum(np.log(sigma)) - np.sum(z) - np.sum(np.exp(-z))
-            else:
-                # General case
-                y = 1 + xi * z
-                if np.any(y <= 0):
-                    return np.inf
-
-                log_likelihood = (
-                    -np.sum(np.log(sigma))
-                    - (1 + 1 / xi) * np.sum(np.log(y))
-                    - np.sum(y ** (-1 / xi))
-                )
-
-            return -log_likelihood
-
-        # Initial parameter estimates
-        sample_mean = np.mean(block_maxima)
-        sample_std = np.std(block_maxima)
-
-        initial_params = [0.1, sample_mean, sample_std]
-
-        # Optimize
-        try:
-            result = optimize.minimize(
-                gev_likelihood,
-                initial_params,
-                method="L-BFGS-B",
-                bounds=[(-0.5, 0.5), (None, None), (0.01, None)],
-            )
-
-            if result.success:
-                xi_hat, mu_hat, sigma_hat = result.x
-            else:
-                # Fallback to method of moments
-                xi_hat = 0.0
-                mu_hat = sample_mean
-                sigma_hat = sample_std
-
-        except:
-            xi_hat = 0.0
-            mu_hat = sample_mean
-            sigma_hat = sample_std
-
-        # Compute return levels
-        return_periods = [10, 50, 100, 500, 1000]
-        return_levels = {}
-
-        for T in return_periods:
-            p = 1 - 1 / T
-
-            if abs(xi_hat) < 1e-6:  # Gumbel case
-                return_level = mu_hat - sigma_hat * np.log(-np.log(p))
-            else:
-                return_level = mu_hat + (sigma_hat / xi_hat) * (
-                    (-np.log(p)) ** (-xi_hat) - 1
-                )
-
-            return_levels[f"{T}_year"] = return_level
+        fit = fit_gev(block_maxima(data, block_size))
+        xi_hat, mu_hat, sigma_hat = (float(fit[key][0]) for key in ("shape", "location", "scale"))
+        levels = gev_return_levels(fit["shape"], fit["location"], fit["scale"])[:, 0]
+        nll = float(fit["neg_loglik"][0])
 
         return {
             "shape_parameter": xi_hat,
             "location_parameter": mu_hat,
             "scale_parameter": sigma_hat,
-            "return_levels": return_levels,
-            "aic": 2 * 3 + 2 * gev_likelihood([xi_hat, mu_hat, sigma_hat]),
-            "bic": 3 * np.log(len(block_maxima))
-            + 2 * gev_likelihood([xi_hat, mu_hat, sigma_hat]),
+            "return_levels": {f"{T}_year": float(level) for T, level in zip(RETURN_PERIODS, levels)},
+            "aic": 2 * 3 + 2 * nll,
+            "bic": 3 * np.log(int(fit["n_blocks"][0])) + 2 * nll,
         }
 
     def generalized_pareto_distribution(
         self, data: np.ndarray, threshold: Optional[float] = None
     ) -> Dict[str, float]:
         """Fit Generalized Pareto Distribution to exceedances over threshold"""
-        if threshold is None:
-            # Automatic threshold selection using sample quantile
-            threshold = np.percentile(data, 90)
-
-        # Extract exceedances
-        exceedances = data[data > threshold] - threshold
-
-        if len(exceedances) < 10:
+        excess, thresholds, counts = threshold_exceedances(data, threshold)
+        if counts[0] < MIN_EXCEEDANCES:
             return {"error": "Insufficient exceedances"}
 
-        # Fit GPD: F(x) = 1 - (1 + ξx/σ)^(-1/ξ)
-        def gpd_likelihood(params):
-            """Negative log-likelihood for GPD"""
-            xi, sigma = params
-
-            if sigma <= 0:
-                return np.inf
-
-            if xi == 0:
-                # Exponential case
-                log_likelihood = (
-                    -len(exceedances) * np.log(sigma) - np.sum(exceedances) / sigma
-                )
-            else:
-                y = 1 + xi * exceedances / sigma
-                if np.any(y <= 0):
-                    return np.inf
-
-                log_likelihood = -len(exceedances) * np.log(sigma) - (
-                    1 + 1 / xi
-                ) * np.sum(np.log(y))
-
-            return -log_likelihood
-
-        # Initial estimates
-        sample_mean = np.mean(exceedances)
-        sample_var = np.var(exceedances)
-
-        # Method of moments initial estimates
-        if sample_var > 0:
-            xi_init = 0.5 * (sample_mean**2 / sample_var - 1)
-            sigma_init = sample_mean * (1 + xi_init)
-        else:
-            xi_init = 0.1
-            sigma_init = sample_mean
-
-        try:
-            result = optimize.minimize(
-                gpd_likelihood,
-                [xi_init, sigma_init],
-                method="L-BFGS-B",
-                bounds=[(-0.5, 0.5), (0.01, None)],
-            )
-
-            if result.success:
-                xi_hat, sigma_hat = result.x
-            else:
-                xi_hat, sigma_hat = xi_init, sigma_init
-
-        except:
-            xi_hat, sigma_hat = xi_init, sigma_init
-
-        # Estimate high quantiles
-        n = len(data)
-        n_exceedances = len(exceedances)
-
-        # Tail probability estimate
-        tail_prob = n_exceedances / n
-
-        # High quantile estimates
-        quantile_levels = [0.99, 0.995, 0.999, 0.9995, 0.9999]
-        quantile_estimates = {}
-
-        for q in quantile_levels:
-            if q > 1 - tail_prob:
-                # Use GPD extrapolation
-                p_cond = (q - (1 - tail_prob)) / tail_prob
-
-                if abs(xi_hat) < 1e-6:  # Exponential case
-                    exceedance_quantile = -sigma_hat * np.log(1 - p_cond)
-                else:
-                    exceedance_quantile = (sigma_hat / xi_hat) * (
-                        (1 - p_cond) ** (-xi_hat) - 1
-                    )
-
-                quantile_estimates[f"q_{q}"] = threshold + exceedance_quantile
-            else:
-                # Use empirical quantile
-                quantile_estimates[f"q_{q}"] = np.percentile(data, q * 100)
-
+        fit = fit_gpd(excess)
+        quantiles = gpd_quantiles(data, fit["shape"], fit["scale"], thresholds, counts)[:, 0]
         return {
-            "shape_parameter": xi_hat,
-            "scale_parameter": sigma_hat,
-            "threshold": threshold,
-            "n_exceedances": n_exceedances,
-            "exceedance_rate": tail_prob,
-            "quantile_estimates": quantile_estimates,
-            "mean_excess": np.mean(exceedances),
-            "aic": 2 * 2 + 2 * gpd_likelihood([xi_hat, sigma_hat]),
+            "shape_parameter": float(fit["shape"][0]),
+            "scale_parameter": float(fit["scale"][0]),
+            "threshold": float(thresholds[0]),
+            "n_exceedances": int(counts[0]),
+            "exceedance_rate": counts[0] / len(data),
+            "quantile_estimates": {f"q_{q}": float(value) for q, value in zip(QUANTILE_LEVELS, quantiles)},
+            "mean_excess": float(fit["mean_excess"][0]),
+            "aic": 2 * 2 + 2 * float(fit["neg_loglik"][0]),
         }
 
     def hill_estimator(
         self, data: np.ndarray, k: Optional[int] = None
     ) -> Dict[str, float]:
         """Hill estimator for tail index"""
-        # Sort data in descending order
-        sorted_data = np.sort(data)[::-1]
-
-        if k is None:
-            # Choose k as square root of sample size (rule of thumb)
-            k = int(np.sqrt(len(data)))
-
-        k = min(k, len(sorted_data) - 1)
-
-        # Hill estimator: γ = (1/k) * Σ log(X_{i}/X_{k+1})
-        if k > 0 and sorted_data[k] > 0:
-            log_ratios = np.log(sorted_data[:k] / sorted_data[k])
-            hill_estimate = np.mean(log_ratios)
-        else:
-            hill_estimate = 0.0
-
-        # Asymptotic variance
-        asymptotic_variance = hill_estimate**2 / k if k > 0 else np.inf
-
-        # Confidence interval
-        std_error = np.sqrt(asymptotic_variance)
-        ci_95 = (hill_estimate - 1.96 * std_error, hill_estimate + 1.96 * std_error)
-
+        hill = {key: value[0] for key, value in hill_estimator(data, k).items()}
         return {
-            "hill_estimate": hill_estimate,
-            "k_threshold": k,
-            "asymptotic_variance": asymptotic_variance,
-            "confidence_interval_95": ci_95,
-            "tail_index": 1.0 / hill_estimate if hill_estimate > 0 else np.inf,
+            "hill_estimate": float(hill["hill_estimate"]),
+            "k_threshold": int(hill["k_threshold"]),
+            "asymptotic_variance": float(hill["asymptotic_variance"]),
+            "confidence_interval_95": (float(hill["ci_lower"]), float(hill["ci_upper"])),
+            "tail_index": float(hill["tail_index"]),
         }
 
+    def tail_risk_batch(
+        self,
+        series: Dict[str, np.ndarray],
+        block_size: int = 252,
+        threshold_quantile: float = 0.9,
+        hill_k: Optional[int] = None,
+        n_jobs: Optional[int] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """GEV, GPD and Hill summaries for many series (e.g. every user's returns).
+
+        Args:
+            series: Series id -> 1-D returns (losses should be positive)
+            n_jobs, executor: Process-pool fan-out for the fits
+
+        Returns:
+            Series id -> flat dict of ``extreme_value.tail_risk`` fields
+        """
+        settings = (block_size, threshold_quantile, hill_k)
+        keys = {sid: series_fingerprint(values, settings) for sid, values in series.items()}
+        missing = [sid for sid, key in keys.items() if key not in self.tail_cache]
+        if missing:
+            report = tail_risk(
+                [series[sid] for sid in missing],
+                block_size=block_size,
+                threshold_quantile=threshold_quantile,
+                hill_k=hill_k,
+                n_jobs=n_jobs,
+                executor=executor,
+            )
+            for j, sid in enumerate(missing):
+                self.tail_cache[keys[sid]] = {field: values[j].item() for field, values in report.items()}
+            logger.info(f"Fitted tail models for {len(missing)} of {len(series)} series")
+
+        results = {}
+        for sid, key in keys.items():
+            self.tail_cache.move_to_end(key)
+            results[sid] = self.tail_cache[key]
+        while len(self.tail_cache) > self.cache_size:
+            self.tail_cache.popitem(last=False)
+        return results
+
 
 class CopulaModeling:
-    """Copula modeling for dependency structure"""
+    """Copula modeling for dependency structure
 
-    def __init__(self):
+    Fits start from Kendall's tau inversion and use the closed-form densities
+    in ``copula``. ``fit_returns`` caches its selection per returns
+    fingerprint. When the returns extend the previously fitted history, it
+    updates the tau matrix with only the new rows.
+    """
+
+    def __init__(self, cache_size: int = 32):
         self.copula_types = ["gaussian", "student_t", "clayton", "gumbel", "frank"]
-        self.fitted_copulas = {}
+        self.cache_size = cache_size
+        self.fitted_copulas: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.concordance: Optional[KendallConcordance] = None
+        self.last_fit: Optional[Dict[str, Any]] = None
 
     def gaussian_copula(self, U: np.ndarray) -> Dict[str, Any]:
         """Fit Gaussian copula"""
-        # Transform to normal scores
-        Z = stats.norm.ppf(np.clip(U, 1e-6, 1 - 1e-6))
-
-        # Estimate correlation matrix
-        correlation_matrix = np.corrcoef(Z.T)
-
-        # Log-likelihood
-        log_likelihood = 0.0
-        for i in range(len(U)):
-            try:
-                # Multivariate normal density
-                mvn_logpdf = stats.multivariate_normal.logpdf(
-                    Z[i], cov=correlation_matrix
-                )
-
-                # Marginal normal densities
-                marginal_logpdf = np.sum(stats.norm.logpdf(Z[i]))
-
-                log_likelihood += mvn_logpdf - marginal_logpdf
-            except:
-                continue
-
-        # AIC/BIC
-        n_params = (
-            U.shape[1] * (U.shape[1] - 1) // 2
-        )  # Number of correlation parameters
-        aic = -2 * log_likelihood + 2 * n_params
-        bic = -2 * log_likelihood + n_params * np.log(len(U))
-
-        return {
-            "correlation_matrix": correlation_matrix,
-            "log_likelihood": log_likelihood,
-            "aic": aic,
-            "bic": bic,
-            "parameters": {"correlation": correlation_matrix},
-        }
+        return fit_gaussian(pseudo_observations(U), kendall_tau_matrix(U))
 
     def student_t_copula(self, U: np.ndarray) -> Dict[str, Any]:
         """Fit Student-t copula"""
-
-        # Transform to t-scores (initial guess for degrees of freedom)
-        def fit_t_copula(df):
-            t_scores = stats.t.ppf(np.clip(U, 1e-6, 1 - 1e-6), df)
-
-            # Estimate correlation matrix
-            correlation_matrix = np.corrcoef(t_scores.T)
-
-            # Log-likelihood
-            log_likelihood = 0.0
-            for i in range(len(U)):
-                try:
-                    # Multivariate t density (approximate)
-                    quad_form = np.dot(
-                        t_scores[i], np.linalg.solve(correlation_matrix, t_scores[i])
-                    )
-                    mvt_logpdf = (
-                        -0.5 * (df + U.shape[1]) * np.log(1 + quad_form / df)
-                        + 0.5 * np.log(np.linalg.det(correlation_matrix))
-                        + 0.5 * U.shape[1] * np.log(df)
-                    )
-
-                    # Marginal t densities
-                    marginal_logpdf = np.sum(stats.t.logpdf(t_scores[i], df))
-
-                    log_likelihood += mvt_logpdf - marginal_logpdf
-                except:
-                    continue
-
-            return -log_likelihood, correlation_matrix
-
-        # Optimize over degrees of freedom
-        df_candidates = [3, 5, 7, 10, 15, 20, 30]
-        best_nll = np.inf
-        best_df = 10
-        best_corr = np.eye(U.shape[1])
-
-        for df in df_candidates:
-            try:
-                nll, corr = fit_t_copula(df)
-                if nll < best_nll:
-                    best_nll = nll
-                    best_df = df
-                    best_corr = corr
-            except:
-                continue
-
-        log_likelihood = -best_nll
-        n_params = U.shape[1] * (U.shape[1] - 1) // 2 + 1  # Correlation + df
-        aic = -2 * log_likelihood + 2 * n_params
-        bic = -2 * log_likelihood + n_params * np.log(len(U))
-
-        return {
-            "correlation_matrix": best_corr,
-            "degrees_of_freedom": best_df,
-            "log_likelihood": log_likelihood,
-            "aic": aic,
-            "bic": bic,
-            "parameters": {"correlation": best_corr, "df": best_df},
-        }
+        return fit_student_t(pseudo_observations(U), kendall_tau_matrix(U))
 
     def archimedean_copula(
         self, U: np.ndarray, copula_type: str = "clayton"
@@ -411,136 +220,61 @@ class CopulaModeling:
         """Fit Archimedean copulas (Clayton, Gumbel, Frank)"""
         if U.shape[1] != 2:
             return {"error": "Archimedean copulas implemented for bivariate case only"}
-
-        u1, u2 = U[:, 0], U[:, 1]
-
-        def clayton_loglik(theta):
-            if theta <= 0:
-                return np.inf
-
-            # Clayton copula density
-            term1 = (1 + theta) * (u1 * u2) ** (-(1 + theta))
-            term2 = (u1 ** (-theta) + u2 ** (-theta) - 1) ** (-(1 / theta + 2))
-
-            # Avoid numerical issues
-            term1 = np.clip(term1, 1e-10, 1e10)
-            term2 = np.clip(term2, 1e-10, 1e10)
-
-            log_density = np.log(term1) + np.log(term2)
-
-            # Remove invalid values
-            valid = np.isfinite(log_density)
-            if np.sum(valid) == 0:
-                return np.inf
-
-            return -np.sum(log_density[valid])
-
-        def gumbel_loglik(theta):
-            if theta < 1:
-                return np.inf
-
-            # Gumbel copula density (simplified)
-            log_u1 = np.log(-np.log(u1))
-            log_u2 = np.log(-np.log(u2))
-
-            A = (-log_u1) ** theta + (-log_u2) ** theta
-
-            # Avoid numerical issues
-            valid = (
-                (u1 > 1e-6) & (u1 < 1 - 1e-6) & (u2 > 1e-6) & (u2 < 1 - 1e-6) & (A > 0)
-            )
-
-            if np.sum(valid) == 0:
-                return np.inf
-
-            log_density = (
-                np.log(u1[valid])
-                + np.log(u2[valid])
-                + (theta - 1) * (log_u1[valid] + log_u2[valid])
-                + np.log(A[valid] ** (1 / theta - 2))
-                + np.log(theta - 1 + A[valid] ** (1 / theta))
-            )
-
-            return -np.sum(log_density)
-
-        # Fit the specified copula
-        if copula_type == "clayton":
-            # Clayton parameter estimation
-            tau_kendall = stats.kendalltau(u1, u2)[0]
-            theta_init = 2 * tau_kendall / (1 - tau_kendall) if tau_kendall > 0 else 0.5
-
-            try:
-                result = optimize.minimize_scalar(
-                    clayton_loglik, bounds=(0.1, 10), method="bounded"
-                )
-                theta_hat = result.x if result.success else theta_init
-                log_likelihood = -clayton_loglik(theta_hat)
-            except:
-                theta_hat = theta_init
-                log_likelihood = -clayton_loglik(theta_hat)
-
-        elif copula_type == "gumbel":
-            # Gumbel parameter estimation
-            tau_kendall = stats.kendalltau(u1, u2)[0]
-            theta_init = 1 / (1 - tau_kendall) if tau_kendall > 0 else 1.5
-
-            try:
-                result = optimize.minimize_scalar(
-                    gumbel_loglik, bounds=(1.01, 10), method="bounded"
-                )
-                theta_hat = result.x if result.success else theta_init
-                log_likelihood = -gumbel_loglik(theta_hat)
-            except:
-                theta_hat = theta_init
-                log_likelihood = -gumbel_loglik(theta_hat)
-
-        else:  # Frank copula (simplified)
-            tau_kendall = stats.kendalltau(u1, u2)[0]
-            theta_hat = 5.0 * tau_kendall  # Rough approximation
-            log_likelihood = 0.0  # Placeholder
-
-        aic = -2 * log_likelihood + 2 * 1  # 1 parameter
-        bic = -2 * log_likelihood + 1 * np.log(len(U))
-
-        return {
-            "copula_type": copula_type,
-            "theta": theta_hat,
-            "log_likelihood": log_likelihood,
-            "aic": aic,
-            "bic": bic,
-            "kendall_tau": stats.kendalltau(u1, u2)[0],
-            "parameters": {"theta": theta_hat},
-        }
+        return fit_archimedean(pseudo_observations(U), copula_type, kendall_tau_matrix(U)[0, 1])
 
     def select_best_copula(self, U: np.ndarray) -> Dict[str, Any]:
         """Select best copula using information criteria"""
-        results = {}
+        return self._selection(fit_copulas(U))
 
-        # Fit different copulas
-        copula_results = {
-            "gaussian": self.gaussian_copula(U),
-            "student_t": self.student_t_copula(U),
+    @staticmethod
+    def _selection(copula_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        best = best_copula(copula_results)
+        return {
+            "copula_comparison": copula_results,
+            "best_copula": best,
+            "best_result": copula_results[best],
         }
 
-        # Add Archimedean copulas for bivariate case
-        if U.shape[1] == 2:
-            copula_results["clayton"] = self.archimedean_copula(U, "clayton")
-            copula_results["gumbel"] = self.archimedean_copula(U, "gumbel")
-
-        # Select best based on AIC
-        best_aic = np.inf
-        best_copula = "gaussian"
-
-        for copula_name, result in copula_results.items():
-            if "aic" in result and result["aic"] < best_aic:
-                best_aic = result["aic"]
-                best_copula = copula_name
+    def fit_returns(self, returns: np.ndarray) -> Dict[str, Any]:
+        """Select the best copula for (time × assets) returns, reusing earlier work"""
+        returns = np.ascontiguousarray(returns, dtype=np.float64)
+        key = hashlib.blake2b(returns.view(np.uint8), digest_size=16).hexdigest() + repr(returns.shape)
+        if key in self.fitted_copulas:
+            self.fitted_copulas.move_to_end(key)
+            self.last_fit = self.fitted_copulas[key]
+            return self.last_fit
+
+        previous = None
+        known = self.concordance
+        if (
+            known is not None
+            and known.data.shape[1] == returns.shape[1]
+            and len(known.data) < len(returns)
+            and np.array_equal(known.data, returns[: len(known.data)])
+        ):
+            known.append(returns[len(known.data) :])
+            previous = self.last_fit["copula_comparison"] if self.last_fit else None
+        else:
+            self.concordance = KendallConcordance(returns)
 
-        results["copula_comparison"] = copula_results
-        results["best_copula"] = best_copula
-        results["best_result"] = copula_results[best_copula]
+        result = self._selection(fit_copulas(returns, tau=self.concordance.tau(), previous=previous))
+        self.fitted_copulas[key] = self.last_fit = result
+        while len(self.fitted_copulas) > self.cache_size:
+            self.fitted_copulas.popitem(last=False)
+        return result
 
-        return results
+    def joint_probability(
+        self,
+        probabilities: List[float],
+        copula_type: Optional[str] = None,
+        n_samples: int = 100000,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Probability that all legs hit under the last fitted copula (best by AIC)"""
+        if self.last_fit is None:
+            raise ValueError("No copula fitted yet; call fit_returns first")
+        fit = self.last_fit["copula_comparison"][copula_type or self.last_fit["best_copula"]]
+        return joint_probability(fit, probabilities, n_samples=n_samples, seed=seed)
 
 
 class StochasticProcessModeling:
@@ -786,17 +520,8 @@ class EnhancedRiskManagement:
         correlation_structure = np.eye(1)
 
         if individual_returns is not None and individual_returns.shape[1] > 1:
-            # Convert to uniform margins
-            from scipy.stats import rankdata
-
-            U = np.zeros_like(individual_returns)
-
-            for i in range(individual_returns.shape[1]):
-                ranks = rankdata(individual_returns[:, i])
-                U[:, i] = ranks / (len(ranks) + 1)
-
-            # Fit copula models
-            copula_results = self.copula_modeling.select_best_copula(U)
+            # Fit copula models (ranked to uniform margins inside)
+            copula_results = self.copula_modeling.fit_returns(individual_returns)
 
             # Correlation structure
             correlation_structure = np.corrcoef(individual_returns.T)
@@ -884,43 +609,27 @@ class EnhancedRiskManagement:
         return result
 
     def _monte_carlo_risk_simulation(
-        self, returns: np.ndarray, n_simulations: int = 10000
-    ) -> Dict[str, np.ndarray]:
-        """Monte Carlo simulation for risk assessment"""
-        # Fit return distribution
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-
-        # Generate scenarios
-        scenarios = np.random.normal(
-            mean_return, std_return, (n_simulations, len(returns))
-        )
-
-        # Portfolio value paths
-        portfolio_paths = np.cumprod(1 + scenarios, axis=1)
-
-        # Risk metrics from simulation
-        final_values = portfolio_paths[:, -1]
-        min_values = np.min(portfolio_paths, axis=1)
-        max_drawdowns = (
-            1 - min_values / np.maximum.accumulate(portfolio_paths, axis=1)[:, -1]
+        self,
+        returns: np.ndarray,
+        n_simulations: int = 10000,
+        method: str = "antithetic",
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Monte Carlo simulation for risk assessment
+
+        Paths are simulated in bounded-memory chunks and reduced to
+        percentiles, tail and drawdown statistics with confidence bands
+        (see ``monte_carlo_risk``).
+        """
+        return simulate_portfolio_risk(
+            float(np.mean(returns)),
+            float(np.std(returns)),
+            horizon=len(returns),
+            n_paths=n_simulations,
+            method=method,
+            seed=self.config.get("monte_carlo_seed") if seed is None else seed,
         )
 
-        return {
-            "portfolio_paths": portfolio_paths[:100],  # Store subset for memory
-            "final_values": final_values,
-            "max_drawdowns": max_drawdowns,
-            "percentiles": {
-                "p5": np.percentile(final_values, 5),
-                "p10": np.percentile(final_values, 10),
-                "p25": np.percentile(final_values, 25),
-                "p50": np.percentile(final_values, 50),
-                "p75": np.percentile(final_values, 75),
-                "p90": np.percentile(final_values, 90),
-                "p95": np.percentile(final_values, 95),
-            },
-        }
-
     def _stress_testing(self, returns: np.ndarray) -> Dict[str, float]:
         """Stress testing scenarios"""
         mean_return = np.mean(returns)
@@ -1061,83 +770,21 @@ class EnhancedRiskManagement:
         """Volatility forecasting using multiple models"""
         forecasts = {}
 
-        # 1. EWMA (Exponentially Weighted Moving Average)
-        lambda_ewma = 0.94  # RiskMetrics parameter
-
-        ewma_var = np.zeros(len(returns))
-        ewma_var[0] = np.var(returns[: min(50, len(returns))])  # Initial variance
-
-        for t in range(1, len(returns)):
-            ewma_var[t] = (
-                lambda_ewma * ewma_var[t - 1] + (1 - lambda_ewma) * returns[t - 1] ** 2
-            )
-
-        # Forecast next period
-        next_var = lambda_ewma * ewma_var[-1] + (1 - lambda_ewma) * returns[-1] ** 2
-        ewma_forecast = [np.sqrt(next_var)] * horizon
-
-        forecasts["ewma"] = np.array(ewma_forecast)
-
-        # 2. GARCH(1,1) simplified estimation
-        def garch_likelihood(params):
-            omega, alpha, beta = params
-
-            if omega <= 0 or alpha < 0 or beta < 0 or alpha + beta >= 1:
-                return np.inf
+        # 1. EWMA (Exponentially Weighted Moving Average), RiskMetrics λ
+        forecasts["ewma"] = ewma_forecast(returns, RISKMETRICS_LAMBDA, horizon)
 
-            variance = np.zeros(len(returns))
-            variance[0] = np.var(returns)
-
-            log_likelihood = 0
-            for t in range(1, len(returns)):
-                variance[t] = (
-                    omega + alpha * returns[t - 1] ** 2 + beta * variance[t - 1]
-                )
-                if variance[t] <= 0:
-                    return np.inf
-                log_likelihood += -0.5 * (
-                    np.log(variance[t]) + returns[t] ** 2 / variance[t]
-                )
-
-            return -log_likelihood
-
-        # Simple parameter estimation
+        # 2. GARCH(1,1) maximum likelihood
         try:
-            initial_params = [0.1 * np.var(returns), 0.1, 0.8]
-            result = optimize.minimize(
-                garch_likelihood,
-                initial_params,
-                bounds=[(1e-6, None), (0, 0.3), (0, 0.95)],
-                method="L-BFGS-B",
-            )
-
-            if result.success:
-                omega, alpha, beta = result.x
-
-                # Generate forecast
-                last_variance = (
-                    omega + alpha * returns[-1] ** 2 + beta * np.var(returns[-10:])
+            fitted = fit_garch(returns)
+            if fitted["converged"] and np.isfinite(fitted["neg_loglik"]):
+                forecasts["garch"] = garch_forecast(
+                    returns, fitted["omega"], fitted["alpha"], fitted["beta"], horizon
                 )
-
-                garch_forecast = []
-                for h in range(horizon):
-                    # Multi-step ahead variance forecast
-                    if h == 0:
-                        var_h = omega + alpha * returns[-1] ** 2 + beta * last_variance
-                    else:
-                        # Long-run variance
-                        long_run_var = omega / (1 - alpha - beta)
-                        var_h = long_run_var + (alpha + beta) ** h * (
-                            last_variance - long_run_var
-                        )
-
-                    garch_forecast.append(np.sqrt(var_h))
-
-                forecasts["garch"] = np.array(garch_forecast)
             else:
                 forecasts["garch"] = forecasts["ewma"]  # Fallback
 
-        except:
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"GARCH fit failed, using EWMA: {e}")
             forecasts["garch"] = forecasts["ewma"]  # Fallback
 
         # 3. Historical volatility (rolling window)
@@ -0,0 +1,391 @@
+"""Fast sample entropy and multiscale entropy estimators.
+
+Templates are sliding-window views of the signal (no copies). Matches are
+counted once per unordered pair, in blocks of rows, with the Chebyshev
+distance built one coordinate at a time so memory stays at
+``block_size × N`` floats. The length-m and length-(m+1) counts come out of
+the same pass: the (m+1)-distance is the m-distance maxed with the last
+coordinate. For long signals a KD-tree (scipy ``cKDTree.count_neighbors``
+with the max-norm) can do the counting instead.
+
+Mutual information and transfer entropy use the Kraskov-Stögbauer-Grassberger
+kNN estimators. Each series is standardized and delay-embedded once
+(``EmbeddedSeries``). The neighbor structures over a target's own past and
+future are built once and reused for every source. Within one estimate, the joint-space
+kNN radius is queried once and then reused for all the marginal counts.
+``transfer_entropy_matrix`` computes every ordered pair on a process pool,
+one target per task.
+"""
+
+from concurrent.futures import Executor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.special import digamma
+
+from parallel_tasks import map_tasks, pool_workers
+
+try:
+    from scipy.spatial import cKDTree
+
+    KDTREE_AVAILABLE = True
+except ImportError:
+    KDTREE_AVAILABLE = False
+
+# Above this many templates "auto" counts with a KD-tree when available
+KDTREE_MIN_TEMPLATES = 500
+
+# Series × samples before transfer entropy goes to worker processes
+PARALLEL_MIN_WORK = 20000
+
+# Up to this many embedded rows a target keeps sorted distance tables
+# (2 × rows² floats) instead of KD-trees
+SORTED_DISTANCE_MAX_ROWS = 2000
+
+
+def embed(signal_data: np.ndarray, m: int) -> np.ndarray:
+    """(N - m + 1, m) read-only view of every length-m template"""
+    return sliding_window_view(np.ascontiguousarray(signal_data, dtype=np.float64), m)
+
+
+def coarse_grain(signal_data: np.ndarray, scale: int) -> np.ndarray:
+    """Means of consecutive non-overlapping windows of length ``scale``"""
+    signal_data = np.asarray(signal_data, dtype=np.float64)
+    if scale == 1:
+        return signal_data
+    n_points = len(signal_data) // scale
+    return signal_data[: n_points * scale].reshape(n_points, scale).mean(axis=1)
+
+
+def count_matches_blocked(
+    templates: np.ndarray, tolerance: float, block_size: int = 256
+) -> Tuple[int, int]:
+    """Pairs i < j within ``tolerance`` on the first m-1 and on all m columns.
+
+    ``templates`` has shape (n, m). Returns (matches over columns[:-1],
+    matches over all columns), i.e. the SampEn B and A counts when
+    ``templates`` are the length-(m+1) templates.
+    """
+    n, width = templates.shape
+    columns = [np.ascontiguousarray(templates[:, k]) for k in range(width)]
+    matches_m = 0
+    matches_m1 = 0
+
+    for start in range(0, n - 1, block_size):
+        stop = min(start + block_size, n)
+        # Row i of the block is compared with templates i+1 .. n-1 only
+        distance = np.abs(columns[0][start:stop, None] - columns[0][None, start + 1:])
+        for k in range(1, width - 1):
+            np.maximum(
+                distance,
+                np.abs(columns[k][start:stop, None] - columns[k][None, start + 1:]),
+                out=distance,
+            )
+        upper = np.triu(np.ones((stop - start, n - start - 1), dtype=bool))
+        within_m = (distance <= tolerance) & upper
+        matches_m += int(np.count_nonzero(within_m))
+
+        last = np.abs(columns[-1][start:stop, None] - columns[-1][None, start + 1:])
+        matches_m1 += int(np.count_nonzero(within_m & (last <= tolerance)))
+
+    return matches_m, matches_m1
+
+
+def count_matches_kdtree(templates: np.ndarray, tolerance: float) -> Tuple[int, int]:
+    """Same counts as ``count_matches_blocked`` using max-norm KD-trees"""
+    if not KDTREE_AVAILABLE:
+        raise ImportError("scipy is required for KD-tree match counting")
+    n = len(templates)
+    counts = []
+    for data in (templates[:, :-1], templates):
+        tree = cKDTree(data)
+        # Ordered pairs including self-matches
+        ordered = tree.count_neighbors(tree, tolerance, p=np.inf)
+        counts.append(int((ordered - n) // 2))
+    return counts[0], counts[1]
+
+
+def sample_entropy(
+    signal_data: np.ndarray,
+    m: int = 2,
+    r: float = 0.2,
+    tolerance: Optional[float] = None,
+    method: str = "auto",
+    block_size: int = 256,
+) -> float:
+    """Sample entropy -ln(A / B) (Richman & Moorman).
+
+    Args:
+        signal_data: 1-D signal
+        m: Template length
+        r: Tolerance as a fraction of the signal's standard deviation
+        tolerance: Absolute tolerance, overrides ``r``
+        method: "blocked", "kdtree" or "auto"
+        block_size: Rows per block for the blocked counter
+
+    Returns:
+        Sample entropy, or 0.0 when there are no matches of either length
+    """
+    signal_data = np.asarray(signal_data, dtype=np.float64)
+    if len(signal_data) <= m + 1:
+        return 0.0
+    if tolerance is None:
+        tolerance = r * np.std(signal_data)
+
+    # The first N - m templates of length m + 1; their first m columns are
+    # the length-m templates, so B and A are counted over the same i, j
+    templates = embed(signal_data, m + 1)
+
+    if method == "auto":
+        method = (
+            "kdtree"
+            if KDTREE_AVAILABLE and len(templates) >= KDTREE_MIN_TEMPLATES and m <= 4
+            else "blocked"
+        )
+    if method == "kdtree":
+        matches_m, matches_m1 = count_matches_kdtree(templates, tolerance)
+    elif method == "blocked":
+        matches_m, matches_m1 = count_matches_blocked(templates, tolerance, block_size)
+    else:
+        raise ValueError(f"Unknown sample entropy method: {method}")
+
+    if matches_m == 0 or matches_m1 == 0:
+        return 0.0
+    return float(-np.log(matches_m1 / matches_m))
+
+
+def multiscale_entropy(
+    signal_data: np.ndarray,
+    max_scale: int = 20,
+    m: int = 2,
+    r: float = 0.2,
+    min_points: int = 10,
+    method: str = "auto",
+) -> np.ndarray:
+    """Sample entropy of the coarse-grained signal at scales 1..max_scale.
+
+    The tolerance is ``r`` times the standard deviation of each
+    coarse-grained series; scales leaving ``min_points`` or fewer points
+    give 0.0.
+    """
+    signal_data = np.asarray(signal_data, dtype=np.float64)
+    entropies = np.zeros(max_scale)
+    for scale in range(1, max_scale + 1):
+        coarse_grained = coarse_grain(signal_data, scale)
+        if len(coarse_grained) > min_points:
+            entropies[scale - 1] = sample_entropy(coarse_grained, m=m, r=r, method=method)
+    return entropies
+
+
+def _standardize(values: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Unit variance plus a tiny jitter to break ties (as sklearn's KSG does)"""
+    values = np.asarray(values, dtype=np.float64)
+    std = values.std(axis=0)
+    values = values / np.where(std > 0, std, 1.0)
+    jitter = np.random.default_rng(seed).standard_normal(values.shape)
+    return values + 1e-10 * np.maximum(1.0, np.abs(values).mean(axis=0)) * jitter
+
+
+def _kth_neighbor_radius(points: np.ndarray, k: int) -> np.ndarray:
+    """Max-norm distance from each point to its k-th nearest other point"""
+    distances, _ = cKDTree(points).query(points, k=[k + 1], p=np.inf)
+    return distances[:, 0]
+
+
+def _count_within(tree: "cKDTree", points: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    """Points strictly closer than ``radius`` (max-norm), the point itself included"""
+    return tree.query_ball_point(
+        points, np.nextafter(radius, 0), p=np.inf, return_length=True
+    )
+
+
+def _require_kdtree() -> None:
+    if not KDTREE_AVAILABLE:
+        raise ImportError("scipy is required for kNN information estimators")
+
+
+def _count_within_sorted(
+    sorted_values: np.ndarray, values: np.ndarray, radius: np.ndarray
+) -> np.ndarray:
+    """1-D version of ``_count_within`` by binary search in sorted values"""
+    return np.searchsorted(sorted_values, values + radius, side="left") - np.searchsorted(
+        sorted_values, values - radius, side="right"
+    )
+
+
+def mutual_information(
+    X: np.ndarray, y: np.ndarray, k: int = 3, seed: int = 0
+) -> np.ndarray:
+    """KSG estimate of I(X[:, j]; y) for every column j, in nats.
+
+    Same estimator as ``sklearn.feature_selection.mutual_info_regression``
+    (``n_neighbors=k``). Only the joint kNN query needs a tree; the marginal
+    counts are binary searches, with ``y`` sorted once for all columns.
+    """
+    _require_kdtree()
+    X = _standardize(np.asarray(X, dtype=np.float64).reshape(len(y), -1), seed)
+    y = _standardize(np.asarray(y, dtype=np.float64), seed + 1)
+    n = len(y)
+    y_sorted = np.sort(y)
+
+    scores = np.zeros(X.shape[1])
+    for j in range(X.shape[1]):
+        x = X[:, j]
+        radius = _kth_neighbor_radius(np.column_stack([x, y]), k)
+        n_x = _count_within_sorted(np.sort(x), x, radius)
+        n_y = _count_within_sorted(y_sorted, y, radius)
+        scores[j] = digamma(n) + digamma(k) - np.mean(digamma(n_x) + digamma(n_y))
+    return np.maximum(scores, 0.0)
+
+
+def _sorted_distances(points: np.ndarray, block_size: int = 256) -> np.ndarray:
+    """Each point's max-norm distances to all points (itself included), sorted"""
+    n = len(points)
+    distances = np.empty((n, n))
+    for start in range(0, n, block_size):
+        block = distances[start : start + block_size]
+        np.abs(points[start : start + block_size, None, 0] - points[None, :, 0], out=block)
+        for k in range(1, points.shape[1]):
+            np.maximum(
+                block,
+                np.abs(points[start : start + block_size, None, k] - points[None, :, k]),
+                out=block,
+            )
+    distances.sort(axis=1)
+    return distances
+
+
+class EmbeddedSeries:
+    """A standardized series split into delay-embedded pasts and future values.
+
+    Row t pairs the past window ``(x[t], ..., x[t + dim - 1])`` with the
+    value ``lag`` steps after it. Neighbor counts in the series' own past and
+    (future, past) spaces are what every transfer-entropy estimate with
+    this series as target needs. Up to ``SORTED_DISTANCE_MAX_ROWS`` rows,
+    each point's sorted distances are computed once, and a count at any
+    radius is then a binary search. Above that, a KD-tree is built once.
+    ``release`` frees them.
+    """
+
+    def __init__(self, values: np.ndarray, embedding_dim: int = 3, lag: int = 1, seed: int = 0):
+        values = _standardize(values, seed)
+        n_rows = len(values) - embedding_dim - lag + 1
+        if n_rows <= embedding_dim + 1:
+            raise ValueError("Series too short for the embedding")
+        self.past = np.ascontiguousarray(embed(values, embedding_dim)[:n_rows])
+        self.future = values[embedding_dim - 1 + lag : embedding_dim - 1 + lag + n_rows, None]
+        self.future_past = np.hstack([self.future, self.past])
+        self._index: Dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return len(self.past)
+
+    def _count(self, name: str, points: np.ndarray, radius: np.ndarray) -> np.ndarray:
+        index = self._index.get(name)
+        if index is None:
+            if len(points) <= SORTED_DISTANCE_MAX_ROWS:
+                index = _sorted_distances(points)
+            else:
+                index = cKDTree(points)
+            self._index[name] = index
+        if isinstance(index, np.ndarray):
+            # Distances strictly below the radius; the point itself included
+            return np.fromiter(
+                (np.searchsorted(row, r) for row, r in zip(index, radius)),
+                dtype=np.int64,
+                count=len(radius),
+            )
+        return _count_within(index, points, radius)
+
+    def count_past(self, radius: np.ndarray) -> np.ndarray:
+        return self._count("past", self.past, radius)
+
+    def count_future_past(self, radius: np.ndarray) -> np.ndarray:
+        return self._count("future_past", self.future_past, radius)
+
+    def release(self) -> None:
+        self._index.clear()
+
+
+def transfer_entropy(source: EmbeddedSeries, target: EmbeddedSeries, k: int = 3) -> float:
+    """TE(source → target) = I(target future; source past | target past), in nats.
+
+    Frenzel-Pompe / KSG conditional MI: one kNN query in the joint space
+    gives each point's radius, which is then reused for the counts in the
+    (target future, target past), (source past, target past) and
+    (target past) subspaces. The first two use the target's cached
+    neighbor structures.
+    """
+    _require_kdtree()
+    source_target = np.hstack([source.past, target.past])
+    joint = np.hstack([target.future, source_target])
+    radius = _kth_neighbor_radius(joint, k)
+
+    n_z = target.count_past(radius)
+    n_yz = target.count_future_past(radius)
+    n_xz = _count_within(cKDTree(source_target), source_target, radius)
+    return float(max(digamma(k) + np.mean(digamma(n_z) - digamma(n_yz) - digamma(n_xz)), 0.0))
+
+
+def _transfer_entropy_columns(args) -> np.ndarray:
+    """TE from every series to each of ``targets`` (one worker task)"""
+    series, targets, k, embedding_dim, lag = args
+    embedded = [EmbeddedSeries(series[:, i], embedding_dim, lag) for i in range(series.shape[1])]
+    columns = np.zeros((series.shape[1], len(targets)))
+    for c, j in enumerate(targets):
+        for i, source in enumerate(embedded):
+            if i != j:
+                columns[i, c] = transfer_entropy(source, embedded[j], k)
+        embedded[j].release()
+    return columns
+
+
+def transfer_entropy_matrix(
+    series: np.ndarray,
+    k: int = 3,
+    embedding_dim: int = 3,
+    lag: int = 1,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> np.ndarray:
+    """Pairwise transfer entropy between the columns of ``series``.
+
+    Targets are split into one group per worker; each task embeds every
+    series once and reuses each target's trees across all sources.
+
+    Args:
+        series: (n_samples, n_series) array, one time series per column
+        k: Nearest neighbors for the KSG estimator
+        embedding_dim: Past window length
+        lag: Steps ahead of the window for the future value
+        n_jobs: Worker processes (default: CPU count); 1 runs inline
+        executor: Reuse an existing pool instead of starting one
+
+    Returns:
+        (n_series, n_series) matrix with entry [i, j] = TE(i → j), zero diagonal
+    """
+    series = np.asarray(series, dtype=np.float64)
+    n_samples, n_series = series.shape
+    work = n_samples * n_series
+
+    workers = pool_workers(n_series, work, PARALLEL_MIN_WORK, n_jobs, executor)
+    groups = [g.tolist() for g in np.array_split(np.arange(n_series), workers)]
+    tasks = [(series, targets, k, embedding_dim, lag) for targets in groups]
+    return np.hstack(map_tasks(_transfer_entropy_columns, tasks, work, PARALLEL_MIN_WORK, n_jobs, executor))
+
+
+def transfer_entropy_pair(
+    x: np.ndarray, y: np.ndarray, k: int = 3, embedding_dim: int = 3, lag: int = 1
+) -> Dict[str, float]:
+    """TE in both directions between two series"""
+    source = EmbeddedSeries(x, embedding_dim, lag)
+    target = EmbeddedSeries(y, embedding_dim, lag)
+    te_x_to_y = transfer_entropy(source, target, k)
+    te_y_to_x = transfer_entropy(target, source, k)
+    return {
+        "te_x_to_y": te_x_to_y,
+        "te_y_to_x": te_y_to_x,
+        "net_transfer": te_x_to_y - te_y_to_x,
+        "total_transfer": te_x_to_y + te_y_to_x,
+    }
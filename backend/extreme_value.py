@@ -0,0 +1,540 @@
+"""Batched extreme value fits: GEV block maxima, GPD exceedances, Hill.
+
+``ExtremeValueTheory`` fitted one series at a time. It built block maxima in
+a Python loop and minimized the GEV/GPD likelihoods with L-BFGS-B on finite
+difference gradients, starting from moment estimates. Here every function
+works on a (time × series) matrix. Series of different lengths are padded
+with NaN, and NaN entries are ignored throughout.
+
+* Block maxima come from one reshape to (blocks × block_size × series).
+* The GEV and GPD negative log-likelihoods return their analytic gradients.
+  Near ξ = 0 they switch to the Gumbel / exponential limit and its series
+  expansion in ξ.
+* Fits start from probability-weighted-moment estimates (Hosking, Wallis &
+  Wood 1985 for the GEV; L-moments for the GPD).
+* From there, projected BFGS runs on a whole chunk of series at once. It
+  makes one likelihood/gradient pass per iteration and does a backtracking
+  line search per series. Steps that leave the support (1 + ξ z <= 0) are
+  halved, not fed to the optimizer as a wall. That wall is what stopped
+  L-BFGS-B at its start point whenever its first step overshot.
+* Each series is standardized before fitting, so the scale bounds and the
+  tolerances mean the same thing for every series.
+* Chunks of series can be fitted in a process pool.
+"""
+
+import hashlib
+import logging
+import warnings
+from concurrent.futures import Executor
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.special import gamma
+
+from parallel_tasks import map_tasks
+
+logger = logging.getLogger(__name__)
+
+# Shape bounds the risk manager used for both GEV and GPD
+SHAPE_BOUNDS = (-0.5, 0.5)
+# Lower bound on the scale, in units of each series' standard deviation
+SCALE_FLOOR = 1e-3
+# |ξ| below this uses the Gumbel / exponential limit
+GUMBEL_EPS = 1e-6
+EULER_GAMMA = 0.5772156649015329
+
+MIN_BLOCKS = 3
+MIN_EXCEEDANCES = 10
+RETURN_PERIODS = (10, 50, 100, 500, 1000)
+QUANTILE_LEVELS = (0.99, 0.995, 0.999, 0.9995, 0.9999)
+
+# Series per fitting task
+FIT_CHUNK = 256
+# Non-missing observations before column fits go to worker processes
+PARALLEL_MIN_WORK = 1 << 22
+
+SeriesInput = Union[np.ndarray, Sequence[np.ndarray]]
+
+
+def as_series_matrix(series: SeriesInput) -> np.ndarray:
+    """(time × series) float64 matrix, NaN-padded when the series differ in length"""
+    if isinstance(series, np.ndarray) and series.ndim <= 2:
+        data = np.asarray(series, dtype=np.float64)
+        return data[:, None] if data.ndim == 1 else data
+    columns = [np.asarray(s, dtype=np.float64).ravel() for s in series]
+    data = np.full((max((len(c) for c in columns), default=0), len(columns)), np.nan)
+    for j, column in enumerate(columns):
+        data[: len(column), j] = column
+    return data
+
+
+def series_fingerprint(values: np.ndarray, settings: Tuple = ()) -> str:
+    """Content hash of one series (NaN entries dropped) and the fit settings"""
+    values = np.asarray(values, dtype=np.float64).ravel()
+    values = np.ascontiguousarray(values[~np.isnan(values)])
+    digest = hashlib.blake2b(values.view(np.uint8), digest_size=16)
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
+
+def block_maxima(data: SeriesInput, block_size: int = 252) -> np.ndarray:
+    """(blocks × series) maxima of consecutive complete blocks.
+
+    A trailing partial block is dropped, as before. Each series' own length
+    (up to its last observation) sets its complete blocks, so a shorter
+    series padded into a ragged batch gets NaN past them rather than a
+    maximum over its partial block.
+    """
+    X = as_series_matrix(data)
+    n_blocks = X.shape[0] // block_size
+    if not n_blocks:
+        return np.empty((0, X.shape[1]))
+    blocks = X[: n_blocks * block_size].reshape(n_blocks, block_size, X.shape[1])
+    maxima = np.fmax.reduce(blocks, axis=1)
+    observed = ~np.isnan(X)
+    lengths = np.where(observed.any(axis=0), X.shape[0] - np.argmax(observed[::-1], axis=0), 0)
+    maxima[np.arange(n_blocks)[:, None] >= (lengths // block_size)[None, :]] = np.nan
+    return maxima
+
+
+def threshold_exceedances(
+    data: SeriesInput, threshold: Optional[Union[float, np.ndarray]] = None, quantile: float = 0.9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Excesses over a per-series threshold (NaN elsewhere), thresholds, and counts
+
+    The threshold defaults to each series' ``quantile`` sample quantile.
+    """
+    X = as_series_matrix(data)
+    if threshold is None:
+        threshold = np.nanpercentile(X, quantile * 100, axis=0) if X.size else np.full(X.shape[1], np.nan)
+    threshold = np.broadcast_to(np.asarray(threshold, dtype=np.float64), (X.shape[1],))
+    excess = X - threshold
+    excess[~(excess > 0)] = np.nan
+    return excess, threshold, np.count_nonzero(~np.isnan(excess), axis=0)
+
+
+def _sorted_ascending(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Columns sorted ascending (NaN last) and their non-NaN counts"""
+    return np.sort(X, axis=0), np.count_nonzero(~np.isnan(X), axis=0)
+
+
+def _pwm(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unbiased probability-weighted moments b0, b1, b2 of each column"""
+    S, n = _sorted_ascending(X)
+    rank = np.arange(S.shape[0], dtype=np.float64)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w1 = np.where(rank < n, rank / (n - 1), 0.0)
+        w2 = np.where(rank < n, rank * (rank - 1) / ((n - 1) * (n - 2)), 0.0)
+        values = np.where(rank < n, S, 0.0)
+        b0 = values.sum(axis=0) / n
+        b1 = (w1 * values).sum(axis=0) / n
+        b2 = (w2 * values).sum(axis=0) / n
+    return b0, b1, b2
+
+
+def gev_pwm(maxima: np.ndarray) -> np.ndarray:
+    """(series × 3) (ξ, μ, σ) starts from probability-weighted moments"""
+    b0, b1, b2 = _pwm(as_series_matrix(maxima))
+    l2 = 2 * b1 - b0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = l2 / (3 * b2 - b0) - np.log(2) / np.log(3)
+        # Hosking's k is -ξ
+        k = np.clip(7.8590 * c + 2.9554 * c**2, -SHAPE_BOUNDS[1], -SHAPE_BOUNDS[0])
+        gumbel = np.abs(k) < GUMBEL_EPS
+        safe_k = np.where(gumbel, 1.0, k)
+        g = gamma(1 + safe_k)
+        sigma = np.where(gumbel, l2 / np.log(2), l2 * safe_k / (g * (1 - 2.0**-safe_k)))
+        mu = np.where(gumbel, b0 - EULER_GAMMA * sigma, b0 + sigma * (g - 1) / safe_k)
+    return np.column_stack([-k, mu, sigma])
+
+
+def gpd_pwm(exceedances: np.ndarray) -> np.ndarray:
+    """(series × 2) (ξ, σ) starts from the first two L-moments of the excesses"""
+    b0, b1, _ = _pwm(as_series_matrix(exceedances))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xi = np.clip(2 - b0 / (2 * b1 - b0), *SHAPE_BOUNDS)
+    return np.column_stack([xi, b0 * (1 - xi)])
+
+
+def gev_neg_loglik(
+    params: np.ndarray, maxima: np.ndarray, gradient: bool = True
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Per-series GEV negative log-likelihood and its (ξ, μ, σ) gradient.
+
+    ``params`` is (series × 3). Series with a point outside the support
+    (1 + ξ z <= 0) or σ <= 0 get an infinite likelihood and a zero gradient.
+    """
+    X = as_series_matrix(maxima)
+    params = np.atleast_2d(params)
+    xi, mu, sigma = params[:, 0], params[:, 1], params[:, 2]
+    observed = ~np.isnan(X)
+    valid_sigma = sigma > 0
+    safe_sigma = np.where(valid_sigma, sigma, 1.0)
+    z = np.where(observed, (X - mu) / safe_sigma, 0.0)
+    gumbel = np.abs(xi) < GUMBEL_EPS
+    safe_xi = np.where(gumbel, 1.0, xi)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        y = 1 + safe_xi * z
+        in_support = np.where(gumbel, True, (y > 0) | ~observed).all(axis=0) & valid_sigma
+        y = np.where(y > 0, y, 1.0)
+        log_y = np.log(y)
+        t = np.where(gumbel, np.exp(-z), np.exp(-log_y / safe_xi))
+        terms = np.where(gumbel, z + t, (1 + 1 / safe_xi) * log_y + t)
+        n = observed.sum(axis=0)
+        nll = n * np.log(safe_sigma) + np.where(observed, terms, 0.0).sum(axis=0)
+    nll = np.where(in_support, nll, np.inf)
+    if not gradient:
+        return nll, None
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # d(log-density)/dμ = ((1 + ξ) - t) / (σ y), and z times that minus 1/σ for σ
+        core = np.where(gumbel, 1 - t, ((1 + safe_xi) - t) / y)
+        d_mu = core / safe_sigma
+        d_sigma = (z * core - 1) / safe_sigma
+        d_xi = np.where(
+            gumbel,
+            z**2 * (1 - t) / 2 - z,
+            (1 - t) * log_y / safe_xi**2 - ((1 + safe_xi) - t) * z / (safe_xi * y),
+        )
+    grad = -np.column_stack(
+        [np.where(observed, d, 0.0).sum(axis=0) for d in (d_xi, d_mu, d_sigma)]
+    )
+    grad[~in_support] = 0.0
+    return nll, grad
+
+
+def gpd_neg_loglik(
+    params: np.ndarray, exceedances: np.ndarray, gradient: bool = True
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Per-series GPD negative log-likelihood and its (ξ, σ) gradient"""
+    E = as_series_matrix(exceedances)
+    params = np.atleast_2d(params)
+    xi, sigma = params[:, 0], params[:, 1]
+    observed = ~np.isnan(E)
+    valid_sigma = sigma > 0
+    safe_sigma = np.where(valid_sigma, sigma, 1.0)
+    w = np.where(observed, E / safe_sigma, 0.0)
+    exponential = np.abs(xi) < GUMBEL_EPS
+    safe_xi = np.where(exponential, 1.0, xi)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = 1 + safe_xi * w
+        in_support = np.where(exponential, True, (y > 0) | ~observed).all(axis=0) & valid_sigma
+        y = np.where(y > 0, y, 1.0)
+        log_y = np.log(y)
+        terms = np.where(exponential, w, (1 + 1 / safe_xi) * log_y)
+        nll = observed.sum(axis=0) * np.log(safe_sigma) + np.where(observed, terms, 0.0).sum(axis=0)
+    nll = np.where(in_support, nll, np.inf)
+    if not gradient:
+        return nll, None
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d_sigma = np.where(exponential, w - 1, (1 + safe_xi) * w / y - 1) / safe_sigma
+        d_xi = np.where(
+            exponential,
+            w**2 / 2 - w,
+            log_y / safe_xi**2 - (1 + 1 / safe_xi) * w / y,
+        )
+    grad = -np.column_stack([np.where(observed, d, 0.0).sum(axis=0) for d in (d_xi, d_sigma)])
+    grad[~in_support] = 0.0
+    return nll, grad
+
+
+def _bounds(kind: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Lower and upper parameter bounds, in standardized units"""
+    if kind == "gev":
+        return np.array([SHAPE_BOUNDS[0], -np.inf, SCALE_FLOOR]), np.array([SHAPE_BOUNDS[1], np.inf, np.inf])
+    return np.array([SHAPE_BOUNDS[0], SCALE_FLOOR]), np.array([SHAPE_BOUNDS[1], np.inf])
+
+
+def _fit_chunk(task) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Projected BFGS on every column of one chunk at once.
+
+    Each iteration evaluates the likelihood and analytic gradient of all
+    still-active columns in one pass. Each column keeps its own BFGS
+    Hessian approximation (the Newton step is solved on the free
+    coordinates) and runs its own backtracking (Armijo) line search;
+    steps that leave the support score +inf and are halved. Coordinates at a
+    bound with the gradient pointing outward are held fixed. Columns arrive
+    standardized with their warm starts. A column whose start cannot be
+    improved keeps it (the moment-start fallback the risk manager had).
+    """
+    kind, data, starts, max_iter, tol = task
+    loglik = gev_neg_loglik if kind == "gev" else gpd_neg_loglik
+    lower, upper = _bounds(kind)
+    m, p = starts.shape
+
+    fittable = np.all(np.isfinite(starts), axis=1)
+    theta = np.clip(np.where(fittable[:, None], starts, 0.0), lower, upper)
+    nll, grad = loglik(theta, data)
+    fittable &= np.isfinite(nll)
+    B = np.repeat(np.eye(p)[None], m, axis=0)
+    scaled = np.zeros(m, dtype=bool)
+    converged = ~fittable
+    for _ in range(max_iter):
+        active = np.flatnonzero(~converged)
+        if not len(active):
+            break
+        X = data[:, active]
+        g = grad[active]
+        t = theta[active]
+        free = ~(((t <= lower) & (g > 0)) | ((t >= upper) & (g < 0)))
+        # Newton step on the free coordinates with the BFGS Hessian approximation
+        B_free = B[active] * free[:, :, None] * free[:, None, :] + np.eye(p) * ~free[:, None, :]
+        direction = np.linalg.solve(B_free, -(g * free)[:, :, None])[:, :, 0]
+        # Not a descent direction: restart from steepest descent
+        uphill = ~((direction * g).sum(axis=1) < 0)
+        direction[uphill] = -g[uphill] * free[uphill]
+        B[active[uphill]] = np.eye(p)
+        scaled[active[uphill]] = False
+
+        accepted = np.zeros(len(active), dtype=bool)
+        trial = t.copy()
+        trial_nll = nll[active].copy()
+        for halving in range(40):
+            pending = np.flatnonzero(~accepted)
+            if not len(pending):
+                break
+            candidate = np.clip(t[pending] + 0.5**halving * direction[pending], lower, upper)
+            candidate_nll, _ = loglik(candidate, X[:, pending], gradient=False)
+            decrease = ((candidate - t[pending]) * g[pending]).sum(axis=1)
+            good = np.isfinite(candidate_nll) & (candidate_nll <= nll[active[pending]] + 1e-4 * decrease)
+            accepted[pending[good]] = True
+            trial[pending[good]] = candidate[good]
+            trial_nll[pending[good]] = candidate_nll[good]
+
+        moved = active[accepted]
+        if len(moved):
+            _, new_grad = loglik(trial[accepted], data[:, moved])
+            s = trial[accepted] - theta[moved]
+            y = new_grad - grad[moved]
+            sy = (s * y).sum(axis=1)
+            update = sy > 1e-12
+            # Scale the first approximation to the observed curvature
+            first = update & ~scaled[moved]
+            B[moved[first]] *= ((y[first] ** 2).sum(axis=1) / sy[first])[:, None, None]
+            scaled[moved[first]] = True
+            u = moved[update]
+            Bs = (B[u] @ s[update][:, :, None])[:, :, 0]
+            sBs = (s[update] * Bs).sum(axis=1)
+            B[u] += (
+                y[update][:, :, None] * y[update][:, None, :] / sy[update][:, None, None]
+                - Bs[:, :, None] * Bs[:, None, :] / sBs[:, None, None]
+            )
+            grad[moved] = new_grad
+
+        change = np.abs(nll[active] - trial_nll)
+        theta[active] = trial
+        nll[active] = trial_nll
+        converged[active] = ~accepted | (change <= tol * (1 + np.abs(trial_nll)))
+
+    converged &= fittable
+    theta[~fittable] = np.nan
+    nll[~fittable] = np.nan
+    return theta, nll, converged
+
+
+def _fit_columns(
+    kind: str,
+    data: np.ndarray,
+    starts: np.ndarray,
+    n_jobs: Optional[int],
+    executor: Optional[Executor],
+    max_iter: int = 200,
+    tol: float = 1e-10,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    tasks = [
+        (kind, data[:, start : start + FIT_CHUNK], starts[start : start + FIT_CHUNK], max_iter, tol)
+        for start in range(0, data.shape[1], FIT_CHUNK)
+    ]
+    if not tasks:
+        return starts.copy(), np.empty(0), np.empty(0, dtype=bool)
+
+    work = np.count_nonzero(~np.isnan(data))
+    results = map_tasks(_fit_chunk, tasks, work, PARALLEL_MIN_WORK, n_jobs, executor)
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def _standardize(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        center = np.nanmean(X, axis=0)
+        spread = np.nanstd(X, axis=0)
+    spread = np.where(spread > 0, spread, np.nan)
+    return (X - center) / spread, center, spread
+
+
+def fit_gev(
+    maxima: np.ndarray,
+    n_jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> Dict[str, np.ndarray]:
+    """Maximum-likelihood GEV for each column of (blocks × series) maxima.
+
+    Returns per-series "shape", "location", "scale", "neg_loglik",
+    "converged" and "n_blocks". Series with fewer than ``MIN_BLOCKS``
+    maxima, or constant maxima, get NaN parameters.
+    """
+    M = as_series_matrix(maxima)
+    n_blocks = np.count_nonzero(~np.isnan(M), axis=0)
+    Z, center, spread = _standardize(M)
+    Z[:, n_blocks < MIN_BLOCKS] = np.nan
+    starts = gev_pwm(Z)
+    starts[:, 2] = np.maximum(starts[:, 2], SCALE_FLOOR)
+    params, nll, converged = _fit_columns("gev", Z, starts, n_jobs, executor)
+    scale = params[:, 2] * spread
+    return {
+        "shape": params[:, 0],
+        "location": center + params[:, 1] * spread,
+        "scale": scale,
+        # Back in data units: the Jacobian of z = (x - center) / spread
+        "neg_loglik": nll + n_blocks * np.log(spread),
+        "converged": converged,
+        "n_blocks": n_blocks,
+    }
+
+
+def fit_gpd(
+    exceedances: np.ndarray,
+    n_jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> Dict[str, np.ndarray]:
+    """Maximum-likelihood GPD for each column of (time × series) excesses.
+
+    Excesses are scaled by each series' mean excess before fitting. Series
+    with fewer than ``MIN_EXCEEDANCES`` excesses get NaN parameters.
+    """
+    E = as_series_matrix(exceedances)
+    counts = np.count_nonzero(~np.isnan(E), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_excess = np.where(counts > 0, np.nansum(E, axis=0) / counts, np.nan)
+    unit = np.where(mean_excess > 0, mean_excess, np.nan)
+    # Order is irrelevant to the GPD fit: pack each column's excesses on top
+    W = np.sort(E / unit, axis=0)[: max(int(counts.max(initial=0)), 1)]
+    W[:, counts < MIN_EXCEEDANCES] = np.nan
+    starts = gpd_pwm(W)
+    starts[:, 1] = np.maximum(starts[:, 1], SCALE_FLOOR)
+    params, nll, converged = _fit_columns("gpd", W, starts, n_jobs, executor)
+    return {
+        "shape": params[:, 0],
+        "scale": params[:, 1] * unit,
+        "neg_loglik": nll + counts * np.log(unit),
+        "converged": converged,
+        "n_exceedances": counts,
+        "mean_excess": mean_excess,
+    }
+
+
+def gev_return_levels(
+    shape: np.ndarray, location: np.ndarray, scale: np.ndarray, periods: Sequence[int] = RETURN_PERIODS
+) -> np.ndarray:
+    """(periods × series) levels exceeded once per ``T`` blocks on average"""
+    shape, location, scale = (np.atleast_1d(np.asarray(a, dtype=np.float64)) for a in (shape, location, scale))
+    y = -np.log(1 - 1 / np.asarray(periods, dtype=np.float64))[:, None]
+    gumbel = np.abs(shape) < GUMBEL_EPS
+    safe_shape = np.where(gumbel, 1.0, shape)
+    return np.where(
+        gumbel,
+        location - scale * np.log(y),
+        location + scale / safe_shape * (y**-safe_shape - 1),
+    )
+
+
+def gpd_quantiles(
+    data: np.ndarray,
+    shape: np.ndarray,
+    scale: np.ndarray,
+    threshold: np.ndarray,
+    n_exceedances: np.ndarray,
+    levels: Sequence[float] = QUANTILE_LEVELS,
+) -> np.ndarray:
+    """(levels × series) quantiles: GPD tail beyond the threshold, empirical below it"""
+    X = as_series_matrix(data)
+    levels = np.asarray(levels, dtype=np.float64)[:, None]
+    n = np.count_nonzero(~np.isnan(X), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tail_prob = n_exceedances / n
+        p_cond = np.clip((levels - (1 - tail_prob)) / tail_prob, 0.0, 1.0)
+        exponential = np.abs(shape) < GUMBEL_EPS
+        safe_shape = np.where(exponential, 1.0, shape)
+        excess = np.where(
+            exponential,
+            -scale * np.log1p(-p_cond),
+            scale / safe_shape * ((1 - p_cond) ** -safe_shape - 1),
+        )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        empirical = np.nanpercentile(X, levels[:, 0] * 100, axis=0) if X.size else np.full(levels.shape, np.nan)
+    return np.where(levels > 1 - tail_prob, threshold + excess, empirical)
+
+
+def hill_estimator(data: SeriesInput, k: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Hill tail-index estimate of each column from its ``k`` largest values.
+
+    ``k`` defaults to ⌊√n⌋ per series and is capped at n - 1. The estimate
+    is 0 when the (k+1)-th largest value is not positive.
+    """
+    X = as_series_matrix(data)
+    n = np.count_nonzero(~np.isnan(X), axis=0)
+    # Descending, NaN last
+    S = -np.sort(-X, axis=0)
+    k = np.sqrt(n).astype(int) if k is None else np.full(X.shape[1], int(k))
+    k = np.minimum(k, n - 1)
+
+    usable = k > 0
+    anchor = np.take_along_axis(S, np.maximum(k, 0)[None, :], axis=0)[0] if len(S) else np.full(X.shape[1], np.nan)
+    usable &= anchor > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_top = np.where(np.arange(len(S))[:, None] < k, np.log(np.where(S > 0, S, 1.0)), 0.0)
+        safe_k = np.maximum(k, 1)
+        hill = np.where(usable, log_top.sum(axis=0) / safe_k - np.log(np.where(usable, anchor, 1.0)), 0.0)
+        variance = np.where(k > 0, hill**2 / safe_k, np.inf)
+        std_error = np.sqrt(variance)
+        tail_index = np.where(hill > 0, 1.0 / np.where(hill > 0, hill, 1.0), np.inf)
+    return {
+        "hill_estimate": hill,
+        "k_threshold": k,
+        "asymptotic_variance": variance,
+        "ci_lower": hill - 1.96 * std_error,
+        "ci_upper": hill + 1.96 * std_error,
+        "tail_index": tail_index,
+    }
+
+
+def tail_risk(
+    series: SeriesInput,
+    block_size: int = 252,
+    threshold_quantile: float = 0.9,
+    hill_k: Optional[int] = None,
+    n_jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> Dict[str, np.ndarray]:
+    """GEV, GPD and Hill summaries of every series, one array per field.
+
+    Fields are named ``gev_*``, ``gpd_*`` and ``hill_*``. They also include
+    ``gev_return_level_<T>`` and ``gpd_q_<level>``, and AICs, matching the
+    per-series dicts of ``ExtremeValueTheory``.
+    """
+    X = as_series_matrix(series)
+    gev = fit_gev(block_maxima(X, block_size), n_jobs=n_jobs, executor=executor)
+    excess, threshold, _ = threshold_exceedances(X, quantile=threshold_quantile)
+    gpd = fit_gpd(excess, n_jobs=n_jobs, executor=executor)
+    hill = hill_estimator(X, hill_k)
+
+    report = {f"gev_{key}": value for key, value in gev.items()}
+    report["gev_aic"] = 2 * 3 + 2 * gev["neg_loglik"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        report["gev_bic"] = 3 * np.log(gev["n_blocks"]) + 2 * gev["neg_loglik"]
+    levels = gev_return_levels(gev["shape"], gev["location"], gev["scale"])
+    report.update({f"gev_return_level_{T}": level for T, level in zip(RETURN_PERIODS, levels)})
+
+    report.update({f"gpd_{key}": value for key, value in gpd.items()})
+    report["gpd_threshold"] = threshold
+    report["gpd_exceedance_rate"] = gpd["n_exceedances"] / np.maximum(np.count_nonzero(~np.isnan(X), axis=0), 1)
+    report["gpd_aic"] = 2 * 2 + 2 * gpd["neg_loglik"]
+    quantiles = gpd_quantiles(X, gpd["shape"], gpd["scale"], threshold, gpd["n_exceedances"])
+    report.update({f"gpd_q_{level}": q for level, q in zip(QUANTILE_LEVELS, quantiles)})
+
+    report.update({key if key.startswith("hill") else f"hill_{key}": value for key, value in hill.items()})
+    return report
@@ -1,25 +1,9 @@
 # Copied and adapted from Newfolder (example structure)
-import time
-from typing import Any, Dict
+from services.feature_store import TTLCache
 
 
-class FeatureCache:
-    def __init__(self, ttl: int = 3600):
-        self.cache: Dict[str, Any] = {}
-        self.expiry: Dict[str, float] = {}
-        self.ttl = ttl
+class FeatureCache(TTLCache):
+    """Bounded LRU feature cache; entries expire after ``ttl`` seconds"""
 
-    def set(self, key: str, value: Any):
-        self.cache[key] = value
-        self.expiry[key] = time.time() + self.ttl
-
-    def get(self, key: str) -> Any:
-        if key in self.cache and time.time() < self.expiry[key]:
-            return self.cache[key]
-        self.cache.pop(key, None)
-        self.expiry.pop(key, None)
-        return None
-
-    def clear(self):
-        self.cache.clear()
-        self.expiry.clear()
+    def __init__(self, ttl: int = 3600, max_size: int = 10000):
+        super().__init__(max_size=max_size, ttl=ttl)
@@ -0,0 +1,389 @@
+"""Scalable low-rank matrix completion.
+
+``AdvancedMissingDataImputation`` takes a full SVD of the dense
+(players × games) matrix on every iteration, which is cubic in the smaller
+dimension. Here everything iterates on the observed entries plus thin
+factors, never on a dense matrix:
+
+* ``randomized_svd`` finds the leading singular triplets of any linear
+  operator by sketching its range (Halko, Martinsson & Tropp). It can be
+  warm-started from the previous iteration's right singular vectors, which
+  barely move between iterations, so one power iteration is enough.
+* ``svt_complete`` and ``ppca_complete`` treat the filled-in matrix as
+  "low rank + sparse residual on the observed entries" (the Soft-Impute
+  trick), so it is never formed. SVT's accumulated residual also lives only
+  on observed entries.
+* The input is read and the completed matrix written ``chunk_rows`` rows at a
+  time, so both can be ``np.memmap`` arrays (or h5py datasets). Working memory
+  is O(observed entries + (rows + cols) × rank).
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, aslinearoperator
+
+logger = logging.getLogger(__name__)
+
+# Elements read or written per chunk (~32MB of float64)
+CHUNK_ELEMENTS = 1 << 22
+
+
+def _chunk_rows(shape: Tuple[int, int], chunk_rows: Optional[int]) -> int:
+    return chunk_rows or max(1, CHUNK_ELEMENTS // max(shape[1], 1))
+
+
+def observed_entries(
+    X, chunk_rows: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row-major (rows, cols, values) of the non-NaN entries, read in chunks"""
+    m, _ = X.shape
+    step = _chunk_rows(X.shape, chunk_rows)
+    rows, cols, values = [], [], []
+    for start in range(0, m, step):
+        block = np.asarray(X[start : start + step], dtype=np.float64)
+        r, c = np.nonzero(~np.isnan(block))
+        rows.append(r + start)
+        cols.append(c)
+        values.append(block[r, c])
+    return (
+        np.concatenate(rows).astype(np.int64),
+        np.concatenate(cols).astype(np.int64),
+        np.concatenate(values),
+    )
+
+
+def _csr_pattern(rows: np.ndarray, cols: np.ndarray, shape: Tuple[int, int]):
+    """CSR matrix over the (row-major) observed pattern; update ``.data`` in place"""
+    indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+    return sparse.csr_matrix((np.zeros(len(rows)), cols, indptr), shape=shape)
+
+
+def entries_from_factors(
+    left: np.ndarray, right: np.ndarray, rows: np.ndarray, cols: np.ndarray
+) -> np.ndarray:
+    """(left @ right)[rows, cols] without forming the product"""
+    result = np.zeros(len(rows))
+    # One pair of 1-D gathers per rank component beats gathering whole rows
+    for left_k, right_k in zip(np.ascontiguousarray(left.T), right):
+        result += left_k[rows] * right_k[cols]
+    return result
+
+
+def low_rank_plus_sparse(
+    left: np.ndarray, right: np.ndarray, residual: sparse.csr_matrix
+) -> LinearOperator:
+    """``left @ right + residual`` as an operator (matrix products only)"""
+
+    def matmat(M):
+        return left @ (right @ M) + residual @ M
+
+    def rmatmat(M):
+        return right.T @ (left.T @ M) + residual.T @ M
+
+    return LinearOperator(
+        residual.shape,
+        matvec=lambda v: matmat(v.reshape(-1, 1)).ravel(),
+        rmatvec=lambda v: rmatmat(v.reshape(-1, 1)).ravel(),
+        matmat=matmat,
+        rmatmat=rmatmat,
+        dtype=np.float64,
+    )
+
+
+def randomized_svd(
+    A,
+    rank: int,
+    n_oversamples: int = 10,
+    n_power_iter: Optional[int] = None,
+    init: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Leading ``rank`` singular triplets (U, s, Vt) of ``A``.
+
+    Args:
+        A: Dense array, sparse matrix or ``LinearOperator``
+        rank: Number of triplets to return
+        n_oversamples: Extra sketch columns for accuracy
+        n_power_iter: Subspace iterations (default 2, or 1 when warm-started)
+        init: Warm start, e.g. the previous call's ``Vt.T`` (n × k); padded
+            with Gaussian columns up to ``rank + n_oversamples``
+    """
+    A = aslinearoperator(A)
+    m, n = A.shape
+    rank = min(rank, m, n)
+    size = min(rank + n_oversamples, m, n)
+    rng = rng if rng is not None else np.random.default_rng(0)
+
+    if init is not None and init.shape[1]:
+        start = init[:, :size]
+        omega = np.hstack([start, rng.standard_normal((n, size - start.shape[1]))])
+        n_power_iter = 1 if n_power_iter is None else n_power_iter
+    else:
+        omega = rng.standard_normal((n, size))
+        n_power_iter = 2 if n_power_iter is None else n_power_iter
+
+    Q, _ = np.linalg.qr(A.matmat(omega))
+    for _ in range(n_power_iter):
+        Z, _ = np.linalg.qr(A.rmatmat(Q))
+        Q, _ = np.linalg.qr(A.matmat(Z))
+
+    B = A.rmatmat(Q).T  # size × n
+    Ub, s, Vt = np.linalg.svd(B, full_matrices=False)
+    return (Q @ Ub)[:, :rank], s[:rank], Vt[:rank]
+
+
+def fill_from_factors(
+    X,
+    left: np.ndarray,
+    right: np.ndarray,
+    offset: Optional[np.ndarray] = None,
+    out=None,
+    chunk_rows: Optional[int] = None,
+):
+    """Observed entries of ``X``; missing ones from ``left @ right + offset``.
+
+    Written ``chunk_rows`` rows at a time into ``out`` (a new array by
+    default, or e.g. an ``np.memmap``).
+    """
+    m, n = X.shape
+    out = np.empty((m, n)) if out is None else out
+    step = _chunk_rows(X.shape, chunk_rows)
+    for start in range(0, m, step):
+        block = np.asarray(X[start : start + step], dtype=np.float64)
+        estimate = left[start : start + step] @ right
+        if offset is not None:
+            estimate += offset
+        out[start : start + step] = np.where(np.isnan(block), estimate, block)
+    return out
+
+
+def _frobenius_sq(left: np.ndarray, right: np.ndarray) -> float:
+    return float(np.sum((left.T @ left) * (right @ right.T)))
+
+
+def _inner(left_a, right_a, left_b, right_b) -> float:
+    """<A, B> for A = left_a @ right_a, B = left_b @ right_b"""
+    return float(np.sum((left_a.T @ left_b) * (right_a @ right_b.T)))
+
+
+def svt_complete(
+    X,
+    tau: Optional[float] = None,
+    max_iter: int = 100,
+    tol: float = 1e-6,
+    rank_step: int = 5,
+    chunk_rows: Optional[int] = None,
+    out=None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Singular Value Thresholding on factors and observed entries.
+
+    Runs the iteration of ``AdvancedMissingDataImputation.matrix_completion_svt``:
+    shrink the singular values of ``X_completed + Y``, keep observed values,
+    and accumulate the observed residual in ``Y``. Both ``X_completed`` and
+    ``Y`` differ from the current low-rank estimate only on observed entries,
+    so each iteration is a warm-started randomized SVD of "low rank + sparse".
+
+    Args:
+        X: Matrix with NaN for missing entries (ndarray or memmap)
+        tau: Shrinkage threshold (default ``5 * sqrt(m * n)``)
+        max_iter: Iteration limit
+        tol: Stop once the relative change in the completed matrix is below this
+        rank_step: Rank increment when the sketch misses singular values above tau
+        chunk_rows: Rows per input/output chunk
+        out: Optional preallocated output for the completed matrix
+
+    Returns:
+        Dict with "completed_matrix", "converged", "iterations",
+        "rank_estimate" and the factors "left"/"right" (``left @ right`` is
+        the low-rank estimate)
+    """
+    m, n = X.shape
+    rows, cols, values = observed_entries(X, chunk_rows)
+    if len(values) == 0:
+        raise ValueError("Cannot complete a matrix with no observed entries")
+    tau = 5 * np.sqrt(m * n) if tau is None else tau
+    rng = np.random.default_rng(seed)
+    values_sq = float(np.dot(values, values))
+
+    dual = np.zeros(len(values))  # Y on the observed entries
+    sparse_part = _csr_pattern(rows, cols, (m, n))
+    left, right = np.zeros((m, 0)), np.zeros((0, n))
+    fitted = np.zeros(len(values))  # low-rank estimate on the observed entries
+    rank = rank_step
+    init = None
+    iteration = 0
+    converged = False
+
+    for iteration in range(1, max_iter + 1):
+        # X_completed + Y = L + P_Ω(X - L) + Y
+        sparse_part.data[:] = values - fitted + dual
+        operator = low_rank_plus_sparse(left, right, sparse_part)
+        while True:
+            U, s, Vt = randomized_svd(operator, rank, init=init, rng=rng)
+            if s[-1] <= tau or rank >= min(m, n):
+                break
+            rank = min(rank + rank_step, m, n)
+
+        keep = s > tau
+        new_left = U[:, keep] * (s[keep] - tau)
+        new_right = Vt[keep]
+        new_fitted = entries_from_factors(new_left, new_right, rows, cols)
+        dual += values - new_fitted
+
+        # ||X_completed - X_prev|| only sees the missing entries
+        change_sq = (
+            _frobenius_sq(new_left, new_right)
+            + _frobenius_sq(left, right)
+            - 2 * _inner(new_left, new_right, left, right)
+            - np.sum((new_fitted - fitted) ** 2)
+        )
+        previous_sq = values_sq + _frobenius_sq(left, right) - np.dot(fitted, fitted)
+
+        left, right, fitted = new_left, new_right, new_fitted
+        init = Vt.T
+        rank = min(int(keep.sum()) + rank_step, m, n)
+        if iteration > 1 and np.sqrt(max(change_sq, 0.0) / previous_sq) < tol:
+            converged = True
+            break
+
+    return {
+        "completed_matrix": fill_from_factors(X, left, right, out=out, chunk_rows=chunk_rows),
+        "converged": converged,
+        "iterations": iteration,
+        "rank_estimate": right.shape[0],
+        "left": left,
+        "right": right,
+    }
+
+
+def ppca_complete(
+    X,
+    n_components: int,
+    max_iter: int = 100,
+    tol: float = 1e-6,
+    chunk_rows: Optional[int] = None,
+    out=None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Probabilistic PCA with missing data by iterative imputation.
+
+    Each iteration fits PPCA (Tipping & Bishop's closed form) to the
+    currently filled-in matrix and re-imputes the missing entries with the
+    posterior-mean reconstruction. In SVD terms that is
+    ``U diag(s (1 - σ²/λ)) Vᵀ``, with ``λ = s² / m`` and σ² the mean of the
+    discarded eigenvalues. The filled matrix is never formed. It is the
+    low-rank estimate plus a sparse residual on the observed entries, and
+    only its top ``n_components`` singular triplets are needed
+    (warm-started randomized SVD).
+
+    Returns:
+        Dict with "imputed_matrix", "latent_factors" (n × q loadings W),
+        "noise_variance", "mean", "n_components", "converged" and "iterations"
+    """
+    m, n = X.shape
+    q = max(1, min(n_components, min(m, n) - 1))
+    rows, cols, values = observed_entries(X, chunk_rows)
+    if len(values) == 0:
+        raise ValueError("Cannot complete a matrix with no observed entries")
+    rng = np.random.default_rng(seed)
+
+    # Start from column means
+    counts = np.bincount(cols, minlength=n)
+    mu = np.bincount(cols, weights=values, minlength=n) / np.maximum(counts, 1)
+    left, right = np.zeros((m, 0)), np.zeros((0, n))
+    residual = _csr_pattern(rows, cols, (m, n))
+    init = None
+    W = np.zeros((n, q))
+    sigma2 = 1.0
+    iteration = 0
+    converged = False
+
+    for iteration in range(1, max_iter + 1):
+        # Filled matrix minus mean = low-rank estimate + residual on observed entries
+        residual.data[:] = values - mu[cols] - entries_from_factors(left, right, rows, cols)
+
+        # Recenter on the column means of the filled matrix
+        shift = left.sum(axis=0) @ right + np.asarray(residual.sum(axis=0)).ravel()
+        shift /= m
+        mu = mu + shift
+        low_left = np.hstack([left, -np.ones((m, 1))])
+        low_right = np.vstack([right, shift])
+        centered = low_rank_plus_sparse(low_left, low_right, residual)
+
+        U, s, Vt = randomized_svd(centered, q, init=init, rng=rng)
+        init = Vt.T
+
+        # ||centered||_F² from the factors: ||L||² + 2<L, S> + ||S||²
+        low_rank_sq = _frobenius_sq(low_left, low_right)
+        cross = np.dot(residual.data, entries_from_factors(low_left, low_right, rows, cols))
+        total_sq = low_rank_sq + 2 * cross + np.dot(residual.data, residual.data)
+
+        eigenvalues = s**2 / m
+        discarded = max(total_sq / m - eigenvalues.sum(), 0.0)
+        sigma2_new = discarded / max(n - q, 1)
+        shrink = np.clip(1 - sigma2_new / np.maximum(eigenvalues, 1e-300), 0, None)
+
+        W_new = Vt.T * np.sqrt(np.clip(eigenvalues - sigma2_new, 0, None))
+        new_left, new_right = U * (s * shrink), Vt
+
+        change = np.linalg.norm(W_new - W) + abs(sigma2_new - sigma2)
+        left, right, W, sigma2 = new_left, new_right, W_new, sigma2_new
+        if change < tol * max(1.0, np.linalg.norm(W)):
+            converged = True
+            break
+
+    return {
+        "imputed_matrix": fill_from_factors(X, left, right, offset=mu, out=out, chunk_rows=chunk_rows),
+        "latent_factors": W,
+        "noise_variance": sigma2,
+        "mean": mu,
+        "n_components": q,
+        "converged": converged,
+        "iterations": iteration,
+    }
+
+
+def imputation_uncertainty(X, chunk_rows: Optional[int] = None) -> np.ndarray:
+    """Variance of the observed values sharing a row or column with each
+    missing entry (0 for observed entries), as in
+    ``AdvancedMissingDataImputation._estimate_imputation_uncertainty``.
+    Computed from per-row and per-column sums instead of per-entry loops.
+    """
+    m, n = X.shape
+    step = _chunk_rows(X.shape, chunk_rows)
+    row_count, row_sum, row_sq = np.zeros(m), np.zeros(m), np.zeros(m)
+    col_count, col_sum, col_sq = np.zeros(n), np.zeros(n), np.zeros(n)
+    for start in range(0, m, step):
+        block = np.asarray(X[start : start + step], dtype=np.float64)
+        observed = ~np.isnan(block)
+        filled = np.where(observed, block, 0.0)
+        row_count[start : start + step] = observed.sum(axis=1)
+        row_sum[start : start + step] = filled.sum(axis=1)
+        row_sq[start : start + step] = (filled**2).sum(axis=1)
+        col_count += observed.sum(axis=0)
+        col_sum += filled.sum(axis=0)
+        col_sq += (filled**2).sum(axis=0)
+
+    total = col_count.sum()
+    if total:
+        global_mean = col_sum.sum() / total
+        global_variance = col_sq.sum() / total - global_mean**2
+    else:
+        global_variance = 1.0
+
+    uncertainty = np.zeros((m, n))
+    for start in range(0, m, step):
+        block = np.asarray(X[start : start + step], dtype=np.float64)
+        sl = slice(start, start + step)
+        count = row_count[sl, None] + col_count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (row_sum[sl, None] + col_sum) / count
+            variance = (row_sq[sl, None] + col_sq) / count - mean**2
+        variance = np.where(count > 0, np.maximum(variance, 0.0), global_variance)
+        uncertainty[sl] = np.where(np.isnan(block), variance, 0.0)
+    return uncertainty
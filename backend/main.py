@@ -187,6 +187,8 @@ async def lifespan(app: FastAPI):
         logger.info("� Shutting down A1Betting backend...")
         if hasattr(autonomous_system, "stop"):
             await autonomous_system.stop()
+        if hasattr(comprehensive_prizepicks_service, "close"):
+            await comprehensive_prizepicks_service.close()
         logger.info("✅ Shutdown complete")
     except Exception as e:
         logger.error(f"❌ Shutdown error: {e}")
@@ -9,6 +9,7 @@ Implements comprehensive rate limiting for API endpoints with:
 - Distributed rate limiting support
 """
 
+import math
 import time
 import redis
 import hashlib
@@ -20,9 +21,12 @@ from functools import wraps
 import json
 from datetime import datetime, timedelta
 
+from .rate_limit_store import InProcessRateLimitStore
+
 class RateLimitStrategy(Enum):
     FIXED_WINDOW = "fixed_window"
     SLIDING_WINDOW = "sliding_window"
+    SLIDING_WINDOW_COUNTER = "sliding_window_counter"
     TOKEN_BUCKET = "token_bucket"
     LEAKY_BUCKET = "leaky_bucket"
 
@@ -40,11 +44,10 @@ class RateLimitResult:
     reset_time: float
     retry_after: Optional[int] = None
 
-class AdvancedRateLimiter:
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
-        self.redis_client = redis_client or self._create_redis_client()
-        self.logger = self.setup_logging()
-        
+class RateLimitPolicy:
+    """Rate limit tables and key scheme shared by the sync and async limiters"""
+
+    def __init__(self):
         # Default rate limits for different endpoint types
         self.default_limits = {
             'public': RateLimit(100, 3600),  # 100 requests per hour
@@ -71,6 +74,64 @@ class AdvancedRateLimiter:
             'suspicious': RateLimit(10, 3600),  # Reduced limit for suspicious IPs
         }
     
+    def get_rate_limit_key(self, identifier: str, endpoint: str, limit_type: str = "user") -> str:
+        """Generate rate limit key for storage"""
+        key_parts = [
+            "rate_limit",
+            limit_type,
+            hashlib.md5(f"{identifier}:{endpoint}".encode()).hexdigest()
+        ]
+        return ":".join(key_parts)
+    
+    def get_applicable_limit(self, endpoint: str, user_tier: str) -> RateLimit:
+        """Get the applicable rate limit for endpoint and user tier"""
+        
+        # Check for exact endpoint match
+        if endpoint in self.endpoint_limits:
+            return self.endpoint_limits[endpoint]
+        
+        # Check for wildcard matches
+        for pattern, limit in self.endpoint_limits.items():
+            if pattern.endswith('*') and endpoint.startswith(pattern[:-1]):
+                return limit
+        
+        # Fall back to user tier default
+        return self.default_limits.get(user_tier, self.default_limits['public'])
+    
+    def check_local(
+        self,
+        store: InProcessRateLimitStore,
+        key: str,
+        rate_limit: RateLimit,
+        current_time: float
+    ) -> RateLimitResult:
+        """Check a limit against process-local state"""
+        if rate_limit.strategy in (RateLimitStrategy.TOKEN_BUCKET, RateLimitStrategy.LEAKY_BUCKET):
+            allowed, remaining, reset_time, retry_after = store.hit_gcra(
+                key, rate_limit.requests, rate_limit.window_seconds,
+                rate_limit.burst_limit or rate_limit.requests, current_time
+            )
+        else:
+            buckets = 1 if rate_limit.strategy == RateLimitStrategy.FIXED_WINDOW else None
+            allowed, count, reset_time, retry_after = store.hit_window(
+                f"{key}:{rate_limit.strategy.value}", rate_limit.requests,
+                rate_limit.window_seconds, current_time, buckets
+            )
+            remaining = max(0, rate_limit.requests - count)
+        
+        if retry_after is not None:
+            retry_after = max(1, int(math.ceil(retry_after)))
+        return RateLimitResult(allowed, remaining, reset_time, retry_after)
+
+class AdvancedRateLimiter(RateLimitPolicy):
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        super().__init__()
+        self.logger = self.setup_logging()
+        self.redis_client = redis_client or self._create_redis_client()
+        
+        # Process-local state used when Redis is unavailable
+        self.local_store = InProcessRateLimitStore()
+    
     def _create_redis_client(self) -> redis.Redis:
         """Create Redis client for distributed rate limiting"""
         try:
@@ -101,15 +162,6 @@ class AdvancedRateLimiter:
         
         return logger
     
-    def get_rate_limit_key(self, identifier: str, endpoint: str, limit_type: str = "user") -> str:
-        """Generate rate limit key for storage"""
-        key_parts = [
-            "rate_limit",
-            limit_type,
-            hashlib.md5(f"{identifier}:{endpoint}".encode()).hexdigest()
-        ]
-        return ":".join(key_parts)
-    
     def check_rate_limit(
         self, 
         identifier: str, 
@@ -136,21 +188,6 @@ class AdvancedRateLimiter:
         
         return user_result
     
-    def get_applicable_limit(self, endpoint: str, user_tier: str) -> RateLimit:
-        """Get the applicable rate limit for endpoint and user tier"""
-        
-        # Check for exact endpoint match
-        if endpoint in self.endpoint_limits:
-            return self.endpoint_limits[endpoint]
-        
-        # Check for wildcard matches
-        for pattern, limit in self.endpoint_limits.items():
-            if pattern.endswith('*') and endpoint.startswith(pattern[:-1]):
-                return limit
-        
-        # Fall back to user tier default
-        return self.default_limits.get(user_tier, self.default_limits['public'])
-    
     def _check_limit(
         self, 
         identifier: str, 
@@ -204,11 +241,10 @@ class AdvancedRateLimiter:
                 
             except Exception as e:
                 self.logger.error(f"Redis error in sliding window check: {e}")
-                # Fall back to allowing the request
-                return RateLimitResult(True, rate_limit.requests - 1, current_time + rate_limit.window_seconds)
+                return self.check_local(self.local_store, key, rate_limit, current_time)
         else:
-            # In-memory fallback (not recommended for production)
-            request_count = 1  # Simplified for demo
+            # In-memory fallback (per-process only)
+            return self.check_local(self.local_store, key, rate_limit, current_time)
         
         allowed = request_count <= rate_limit.requests
         requests_remaining = max(0, rate_limit.requests - request_count)
@@ -244,9 +280,9 @@ class AdvancedRateLimiter:
                 
             except Exception as e:
                 self.logger.error(f"Redis error in fixed window check: {e}")
-                return RateLimitResult(True, rate_limit.requests - 1, window_start + rate_limit.window_seconds)
+                return self.check_local(self.local_store, key, rate_limit, current_time)
         else:
-            current_count = 1  # Simplified for demo
+            return self.check_local(self.local_store, key, rate_limit, current_time)
         
         allowed = current_count <= rate_limit.requests
         requests_remaining = max(0, rate_limit.requests - current_count)
@@ -305,11 +341,9 @@ class AdvancedRateLimiter:
                 
             except Exception as e:
                 self.logger.error(f"Redis error in token bucket check: {e}")
-                return RateLimitResult(True, rate_limit.requests - 1, current_time + rate_limit.window_seconds)
+                return self.check_local(self.local_store, key, rate_limit, current_time)
         else:
-            # Simplified in-memory version
-            allowed = True
-            tokens = bucket_size - 1
+            return self.check_local(self.local_store, key, rate_limit, current_time)
         
         requests_remaining = int(tokens)
         reset_time = current_time + rate_limit.window_seconds
@@ -362,6 +396,9 @@ class AdvancedRateLimiter:
     
     def clear_rate_limit(self, identifier: str, endpoint: str = None):
         """Clear rate limit for identifier (admin function)"""
+        if endpoint:
+            self.local_store.clear(self.get_rate_limit_key(identifier, endpoint, "user"))
+        
         if not self.redis_client:
             return
         
@@ -0,0 +1,315 @@
+"""
+Async Rate Limiting
+
+Non-blocking counterpart to ``AdvancedRateLimiter`` for use inside the
+FastAPI event loop. Each strategy is a server-side Lua script, so a check is
+a single atomic EVALSHA round trip instead of a multi-command pipeline:
+
+- sliding window log: bounded ZSET that only grows on admitted requests
+- sliding window counter: two fixed-window counters weighted by overlap
+- token bucket / leaky bucket: GCRA, one theoretical-arrival-time per key
+
+When Redis is not configured or is failing, checks are answered from an
+``InProcessRateLimitStore`` instead of failing open.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import os
+import secrets
+import time
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as redis
+
+from .advanced_rate_limiting import (
+    RateLimit,
+    RateLimitPolicy,
+    RateLimitResult,
+    RateLimitStrategy,
+)
+from .rate_limit_store import InProcessRateLimitStore
+
+logger = logging.getLogger(__name__)
+
+
+# KEYS[1] = zset; ARGV = now_ms, window_ms, limit, member
+SLIDING_WINDOW_LOG_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', key, window)
+
+local reset = now + window
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window
+end
+local retry = 0
+if allowed == 0 then
+    retry = reset - now
+end
+return {allowed, limit - count, reset, retry}
+"""
+
+# KEYS[1] = hash {w: window id, c: current count, p: previous count}
+# ARGV = now_ms, window_ms, limit
+SLIDING_WINDOW_COUNTER_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+local current_window = math.floor(now / window)
+local state = redis.call('HMGET', key, 'w', 'c', 'p')
+local w = tonumber(state[1]) or current_window
+local curr = tonumber(state[2]) or 0
+local prev = tonumber(state[3]) or 0
+if w ~= current_window then
+    if w == current_window - 1 then
+        prev = curr
+    else
+        prev = 0
+    end
+    curr = 0
+end
+
+local elapsed = now - current_window * window
+local estimated = prev * (window - elapsed) / window + curr
+local allowed = 0
+local retry = 0
+if estimated + 1 <= limit then
+    curr = curr + 1
+    estimated = estimated + 1
+    allowed = 1
+elseif curr + 1 > limit or prev == 0 then
+    retry = window - elapsed
+else
+    -- elapsed time at which the weighted previous window leaves room
+    retry = math.ceil(window - (limit - curr - 1) * window / prev - elapsed)
+end
+
+redis.call('HSET', key, 'w', current_window, 'c', curr, 'p', prev)
+redis.call('PEXPIRE', key, window * 2)
+return {allowed, math.floor(limit - estimated), (current_window + 1) * window, retry}
+"""
+
+# KEYS[1] = theoretical arrival time; ARGV = now_ms, emission_interval_ms, burst
+GCRA_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call('GET', key)) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local diff = now - (new_tat - interval * burst)
+if diff < 0 then
+    return {0, 0, math.ceil(tat), math.ceil(-diff)}
+end
+
+redis.call('SET', key, string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor(diff / interval), math.ceil(new_tat), 0}
+"""
+
+# KEYS[1] = per-window counter; ARGV = window_ms, limit, reset_ms
+FIXED_WINDOW_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+local allowed = 1
+local retry = 0
+if count > tonumber(ARGV[2]) then
+    allowed = 0
+    retry = redis.call('PTTL', KEYS[1])
+end
+return {allowed, tonumber(ARGV[2]) - count, tonumber(ARGV[3]), retry}
+"""
+
+_STRATEGY_SCRIPTS = {
+    RateLimitStrategy.SLIDING_WINDOW: "sliding_window_log",
+    RateLimitStrategy.SLIDING_WINDOW_COUNTER: "sliding_window_counter",
+    RateLimitStrategy.FIXED_WINDOW: "fixed_window",
+    RateLimitStrategy.TOKEN_BUCKET: "gcra",
+    RateLimitStrategy.LEAKY_BUCKET: "gcra",
+}
+
+
+class AsyncAdvancedRateLimiter(RateLimitPolicy):
+    """Rate limiter backed by ``redis.asyncio`` and atomic Lua scripts"""
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        redis_url: Optional[str] = None,
+        local_store: Optional[InProcessRateLimitStore] = None,
+        redis_retry_seconds: float = 5.0,
+    ):
+        super().__init__()
+        if redis_client is None and redis_url is not None:
+            redis_client = redis.from_url(
+                redis_url, socket_connect_timeout=5, socket_timeout=5
+            )
+        self.redis_client = redis_client
+        self.local_store = local_store or InProcessRateLimitStore()
+
+        # After a Redis failure, serve from local state for a short while
+        # rather than paying a connection timeout on every request
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis_down_until = 0.0
+
+        self._scripts: Dict[str, Any] = {}
+        if self.redis_client is not None:
+            self._scripts = {
+                "sliding_window_log": self.redis_client.register_script(SLIDING_WINDOW_LOG_SCRIPT),
+                "sliding_window_counter": self.redis_client.register_script(SLIDING_WINDOW_COUNTER_SCRIPT),
+                "fixed_window": self.redis_client.register_script(FIXED_WINDOW_SCRIPT),
+                "gcra": self.redis_client.register_script(GCRA_SCRIPT),
+            }
+
+        # Unique ZSET members without per-request uuid generation
+        self._member_prefix = f"{os.getpid()}-{secrets.token_hex(4)}"
+        self._member_seq = itertools.count()
+
+        self.stats = {"redis_checks": 0, "local_checks": 0, "redis_errors": 0}
+
+    @property
+    def redis_available(self) -> bool:
+        return self.redis_client is not None and time.time() >= self._redis_down_until
+
+    async def check_rate_limit(
+        self,
+        identifier: str,
+        endpoint: str,
+        user_tier: str = 'public',
+        ip_address: Optional[str] = None
+    ) -> RateLimitResult:
+        """Check if request is within rate limits"""
+        rate_limit = self.get_applicable_limit(endpoint, user_tier)
+
+        if not ip_address:
+            return await self._check_limit(identifier, endpoint, rate_limit, "user")
+
+        # User and IP limits are independent keys, so check them concurrently
+        user_result, ip_result = await asyncio.gather(
+            self._check_limit(identifier, endpoint, rate_limit, "user"),
+            self._check_limit(ip_address, endpoint, self.ip_limits['default'], "ip"),
+        )
+        if not ip_result.allowed:
+            return ip_result
+        return user_result
+
+    async def _check_limit(
+        self,
+        identifier: str,
+        endpoint: str,
+        rate_limit: RateLimit,
+        limit_type: str
+    ) -> RateLimitResult:
+        """Check specific rate limit using the configured strategy"""
+        key = self.get_rate_limit_key(identifier, endpoint, limit_type)
+        current_time = time.time()
+
+        if self.redis_available:
+            try:
+                result = await self._eval(key, rate_limit, current_time)
+                self.stats["redis_checks"] += 1
+                return result
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                self._redis_down_until = time.time() + self.redis_retry_seconds
+                logger.error(f"Redis error in {rate_limit.strategy.value} check: {e}")
+
+        self.stats["local_checks"] += 1
+        return self.check_local(self.local_store, key, rate_limit, current_time)
+
+    async def _eval(self, key: str, rate_limit: RateLimit, current_time: float) -> RateLimitResult:
+        """Run the strategy's script; one EVALSHA round trip"""
+        strategy = rate_limit.strategy
+        script = self._scripts[_STRATEGY_SCRIPTS.get(strategy, "sliding_window_log")]
+        now_ms = int(current_time * 1000)
+        window_ms = int(rate_limit.window_seconds * 1000)
+
+        if strategy in (RateLimitStrategy.TOKEN_BUCKET, RateLimitStrategy.LEAKY_BUCKET):
+            interval_ms = window_ms / rate_limit.requests
+            burst = rate_limit.burst_limit or rate_limit.requests
+            response = await script(keys=[key], args=[now_ms, repr(interval_ms), burst])
+        elif strategy == RateLimitStrategy.FIXED_WINDOW:
+            window_id = now_ms // window_ms
+            reset_ms = (window_id + 1) * window_ms
+            response = await script(
+                keys=[f"{key}:{window_id}"], args=[window_ms, rate_limit.requests, reset_ms]
+            )
+        elif strategy == RateLimitStrategy.SLIDING_WINDOW_COUNTER:
+            response = await script(keys=[f"{key}:swc"], args=[now_ms, window_ms, rate_limit.requests])
+        else:
+            member = f"{now_ms}-{self._member_prefix}-{next(self._member_seq)}"
+            response = await script(keys=[key], args=[now_ms, window_ms, rate_limit.requests, member])
+
+        return self._to_result(response)
+
+    @staticmethod
+    def _to_result(response: List[Any]) -> RateLimitResult:
+        allowed, remaining, reset_ms, retry_ms = (int(value) for value in response)
+        retry_after = None
+        if not allowed:
+            retry_after = max(1, int(math.ceil(retry_ms / 1000)))
+        return RateLimitResult(bool(allowed), max(0, remaining), reset_ms / 1000, retry_after)
+
+    async def get_rate_limit_status(self, identifier: str, endpoint: str, user_tier: str = 'public') -> Dict:
+        """Get current rate limit status for identifier and endpoint"""
+        rate_limit = self.get_applicable_limit(endpoint, user_tier)
+        result = await self._check_limit(identifier, endpoint, rate_limit, "user")
+
+        return {
+            'endpoint': endpoint,
+            'user_tier': user_tier,
+            'rate_limit': {
+                'requests': rate_limit.requests,
+                'window_seconds': rate_limit.window_seconds,
+                'strategy': rate_limit.strategy.value
+            },
+            'current_status': {
+                'allowed': result.allowed,
+                'requests_remaining': result.requests_remaining,
+                'reset_time': result.reset_time,
+                'retry_after': result.retry_after
+            },
+            'backend': 'redis' if self.redis_available else 'local',
+        }
+
+    async def clear_rate_limit(self, identifier: str, endpoint: str):
+        """Clear rate limit state for identifier on endpoint (admin function)"""
+        key = self.get_rate_limit_key(identifier, endpoint, "user")
+        self.local_store.clear(key)
+        if self.redis_client is None:
+            return
+
+        try:
+            keys = [key, f"{key}:swc"]
+            async for fixed_key in self.redis_client.scan_iter(match=f"{key}:*"):
+                keys.append(fixed_key)
+            await self.redis_client.delete(*keys)
+            logger.info(f"Cleared rate limits for {identifier} on {endpoint}")
+        except Exception as e:
+            logger.error(f"Error clearing rate limits: {e}")
+
+    async def close(self):
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
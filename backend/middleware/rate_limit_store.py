@@ -0,0 +1,148 @@
+"""
+In-process rate limit state
+
+Used by the advanced rate limiters when Redis is not configured or is
+temporarily unreachable. Window strategies are counted with a per-key ring
+of sub-buckets, so a check is O(1) amortized and memory per key is fixed
+no matter how many requests the key makes. Token bucket limits use GCRA,
+which only needs one float per key.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# (allowed, count_or_remaining, reset_time, retry_after_seconds)
+StoreResult = Tuple[bool, int, float, Optional[float]]
+
+
+class _CounterRing:
+    """Fixed number of sub-bucket counters covering one window"""
+
+    __slots__ = ("counts", "head", "total")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.head = -1  # absolute index of the newest bucket
+        self.total = 0
+
+    def advance(self, bucket_index: int) -> None:
+        """Zero every bucket that fell out of the window since the last hit"""
+        size = len(self.counts)
+        if bucket_index - self.head >= size:
+            for i in range(size):
+                self.counts[i] = 0
+            self.total = 0
+        else:
+            for stale in range(self.head + 1, bucket_index + 1):
+                slot = stale % size
+                self.total -= self.counts[slot]
+                self.counts[slot] = 0
+        if bucket_index > self.head:
+            self.head = bucket_index
+
+    def oldest_active(self) -> int:
+        """Absolute index of the oldest bucket that still holds requests"""
+        size = len(self.counts)
+        for offset in range(size - 1, -1, -1):
+            index = self.head - offset
+            if self.counts[index % size]:
+                return index
+        return self.head
+
+
+class InProcessRateLimitStore:
+    """Bounded, thread-safe rate limit state for a single process"""
+
+    def __init__(self, buckets_per_window: int = 60, max_keys: int = 100000):
+        self.buckets_per_window = buckets_per_window
+        self.max_keys = max_keys
+        self._rings: "OrderedDict[str, _CounterRing]" = OrderedDict()
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _ring_for(self, key: str, buckets: int) -> _CounterRing:
+        ring = self._rings.get(key)
+        if ring is None or len(ring.counts) != buckets:
+            ring = _CounterRing(buckets)
+            self._rings[key] = ring
+            if len(self._rings) > self.max_keys:
+                self._rings.popitem(last=False)
+        else:
+            self._rings.move_to_end(key)
+        return ring
+
+    def hit_window(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: float,
+        now: float,
+        buckets: Optional[int] = None,
+    ) -> StoreResult:
+        """Count a request against a window of ``window_seconds``.
+
+        ``buckets=1`` gives a fixed window aligned to the epoch; the default
+        ring approximates a sliding window at ``window / buckets`` resolution.
+        """
+        buckets = buckets or self.buckets_per_window
+        width = window_seconds / buckets
+        bucket_index = int(now // width)
+
+        with self._lock:
+            ring = self._ring_for(key, buckets)
+            ring.advance(bucket_index)
+
+            allowed = ring.total < limit
+            if allowed:
+                ring.counts[bucket_index % buckets] += 1
+                ring.total += 1
+
+            # The window frees a slot once its oldest populated bucket ages out
+            reset_time = (ring.oldest_active() + buckets) * width
+            count = ring.total
+
+        retry_after = None if allowed else max(0.0, reset_time - now)
+        return allowed, count, reset_time, retry_after
+
+    def hit_gcra(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: float,
+        burst: int,
+        now: float,
+    ) -> StoreResult:
+        """Generic cell rate algorithm: ``limit`` per window, ``burst`` capacity"""
+        interval = window_seconds / limit
+        tolerance = interval * burst
+
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + interval
+            diff = now - (new_tat - tolerance)
+            if diff < 0:
+                return False, 0, tat, -diff
+
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+            if len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+
+        remaining = int(math.floor(diff / interval + 1e-9))
+        return True, remaining, new_tat, None
+
+    def clear(self, key_prefix: Optional[str] = None) -> None:
+        """Drop all state, or only keys starting with ``key_prefix``"""
+        with self._lock:
+            if key_prefix is None:
+                self._rings.clear()
+                self._tats.clear()
+                return
+            for table in (self._rings, self._tats):
+                for key in [k for k in table if k.startswith(key_prefix)]:
+                    del table[key]
+
+    def __len__(self) -> int:
+        return len(self._rings) + len(self._tats)
@@ -0,0 +1,204 @@
+"""Chunked, variance-reduced Monte Carlo for portfolio path risk.
+
+The simulator used to draw the whole (paths × horizon) normal matrix and
+its ``cumprod`` at once with the global, unseeded ``np.random``. Here paths
+are simulated in chunks of at most ``CHUNK_ELEMENTS`` draws, and each chunk
+is reduced on the spot to a short vector of statistics (final-value
+percentiles, VaR/CVaR, drawdown percentiles, loss probability). Only those
+vectors are kept, so memory does not grow with the number of paths.
+
+Every chunk gets its own ``numpy.random.Generator`` spawned from one
+``SeedSequence``, so results depend only on the seed and the chunk layout,
+not on which process ran which chunk, and chunks can be spread over a
+process pool. Draws are plain pseudo-random, antithetic pairs (z, -z), or
+scrambled Sobol points (each chunk an independent randomized-QMC
+replicate). Mean-type statistics use the final value as a control variate,
+since its expectation (1 + μ)^T is known exactly.
+
+Estimates are chunk averages (batch means), and the spread across chunks
+gives each one a confidence band.
+"""
+
+import logging
+from concurrent.futures import Executor
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+from parallel_tasks import map_tasks
+
+logger = logging.getLogger(__name__)
+
+# Normal draws per chunk (~32 MB of float64)
+CHUNK_ELEMENTS = 1 << 22
+MIN_CHUNK_PATHS = 256
+# Normal draws across all chunks before simulation goes to worker processes
+PARALLEL_MIN_WORK = 1 << 24
+# scipy's Sobol direction numbers
+SOBOL_MAX_DIM = 21201
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+TAIL_LEVELS = (0.95, 0.99)
+DRAWDOWN_PERCENTILES = (50, 95, 99)
+METHODS = ("pseudo", "antithetic", "sobol")
+
+
+def _statistic_names() -> Tuple[str, ...]:
+    return (
+        *(f"p{p}" for p in PERCENTILES),
+        "mean_final_value",
+        *(f"var_{level}" for level in TAIL_LEVELS),
+        *(f"cvar_{level}" for level in TAIL_LEVELS),
+        "loss_probability",
+        "mean_max_drawdown",
+        *(f"drawdown_p{p}" for p in DRAWDOWN_PERCENTILES),
+    )
+
+
+STATISTICS = _statistic_names()
+
+
+def _draws(
+    rng: np.random.Generator, n_paths: int, horizon: int, method: str
+) -> np.ndarray:
+    if method == "antithetic":
+        half = rng.standard_normal((n_paths // 2, horizon))
+        return np.concatenate([half, -half])
+    if method == "sobol":
+        sampler = qmc.Sobol(d=horizon, scramble=True, seed=rng)
+        points = sampler.random(n_paths)
+        return ndtri(points, out=points)
+    return rng.standard_normal((n_paths, horizon))
+
+
+def _control_variate(y: np.ndarray, x: np.ndarray, x_mean: float) -> float:
+    """Mean of y adjusted by the known mean of x (optimal in-chunk coefficient)"""
+    x_centered = x - x.mean()
+    denominator = np.dot(x_centered, x_centered)
+    if denominator <= 0:
+        return float(y.mean())
+    slope = np.dot(x_centered, y - y.mean()) / denominator
+    return float(y.mean() - slope * (x.mean() - x_mean))
+
+
+def _simulate_chunk(task) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """One chunk of paths reduced to ``STATISTICS`` (plus sample paths if asked)"""
+    seed, n_paths, mean, std, horizon, method, keep_paths = task
+    rng = np.random.default_rng(seed)
+    # Returns, then log values, computed in place in the one draw buffer
+    log_paths = _draws(rng, n_paths, horizon, method)
+    log_paths *= std
+    log_paths += mean
+    np.maximum(log_paths, -1 + 1e-12, out=log_paths)
+    np.log1p(log_paths, out=log_paths)
+    np.cumsum(log_paths, axis=1, out=log_paths)
+    peaks = np.maximum.accumulate(np.maximum(log_paths, 0.0), axis=1)
+    max_drawdowns = 1 - np.exp((log_paths - peaks).min(axis=1))
+    final_values = np.exp(log_paths[:, -1])
+    sample = np.exp(log_paths[:keep_paths]) if keep_paths else None
+
+    expected_final = (1 + mean) ** horizon
+    final_returns = final_values - 1
+    values = list(np.percentile(final_values, PERCENTILES))
+    values.append(float(final_values.mean()))
+    var_levels = [np.percentile(final_returns, (1 - level) * 100) for level in TAIL_LEVELS]
+    values.extend(var_levels)
+    for threshold in var_levels:
+        tail = final_returns[final_returns <= threshold]
+        values.append(float(tail.mean()) if len(tail) else float(threshold))
+    values.append(_control_variate((final_values < 1).astype(np.float64), final_values, expected_final))
+    values.append(_control_variate(max_drawdowns, final_values, expected_final))
+    values.extend(np.percentile(max_drawdowns, DRAWDOWN_PERCENTILES))
+    return np.array(values, dtype=np.float64), sample
+
+
+def chunk_sizes(n_paths: int, horizon: int, method: str) -> Sequence[int]:
+    """Split ``n_paths`` into chunks of at most ``CHUNK_ELEMENTS`` draws.
+
+    Antithetic chunks are even, Sobol chunks powers of two (balanced points).
+    """
+    per_chunk = max(MIN_CHUNK_PATHS, CHUNK_ELEMENTS // max(horizon, 1))
+    if method == "sobol":
+        per_chunk = 1 << int(np.log2(per_chunk))
+    per_chunk = min(per_chunk, n_paths)
+    if method == "sobol":
+        # A small n_paths is rounded up so every chunk stays balanced
+        per_chunk = 1 << (max(per_chunk, 1) - 1).bit_length()
+    elif method == "antithetic":
+        per_chunk += per_chunk % 2
+    n_chunks = max(1, -(-n_paths // per_chunk))
+    return [per_chunk] * n_chunks
+
+
+def simulate_portfolio_risk(
+    mean: float,
+    std: float,
+    horizon: int,
+    n_paths: int = 100000,
+    method: str = "antithetic",
+    seed: Optional[int] = None,
+    confidence: float = 0.95,
+    keep_paths: int = 100,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """Simulate i.i.d. normal-return portfolio paths and summarize their risk.
+
+    Args:
+        mean, std: Per-period return distribution
+        horizon: Periods per path
+        n_paths: Paths in total (rounded up to whole chunks)
+        method: "pseudo", "antithetic" or "sobol"
+        seed: Seed of the root ``SeedSequence`` (None: fresh entropy)
+        confidence: Level of the reported confidence bands
+        keep_paths: Value paths kept from the first chunk, for plotting
+        n_jobs: Worker processes (default: CPU count); 1 runs inline
+        executor: Reuse an existing pool instead of starting one
+
+    Returns:
+        "estimates" and "confidence_intervals" keyed by ``STATISTICS``,
+        "percentiles" (final-value p5..p95), "portfolio_paths", and the
+        chunk layout ("n_paths", "n_chunks", "method", "seed")
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method {method!r}; expected one of {METHODS}")
+    if method == "sobol" and horizon > SOBOL_MAX_DIM:
+        logger.warning(f"Sobol supports {SOBOL_MAX_DIM} dimensions, not {horizon}; using antithetic draws")
+        method = "antithetic"
+
+    sizes = chunk_sizes(n_paths, horizon, method)
+    root = np.random.SeedSequence(seed)
+    tasks = [
+        (child, size, mean, std, horizon, method, keep_paths if i == 0 else 0)
+        for i, (child, size) in enumerate(zip(root.spawn(len(sizes)), sizes))
+    ]
+
+    work = sum(sizes) * horizon
+    results = map_tasks(_simulate_chunk, tasks, work, PARALLEL_MIN_WORK, n_jobs, executor)
+
+    chunk_stats = np.array([values for values, _ in results])
+    weights = np.array(sizes, dtype=np.float64)
+    estimates = np.average(chunk_stats, axis=0, weights=weights)
+    if len(sizes) > 1:
+        spread = np.sqrt(np.average((chunk_stats - estimates) ** 2, axis=0, weights=weights) / (len(sizes) - 1))
+        half_width = stats.t.ppf(0.5 + confidence / 2, len(sizes) - 1) * spread
+    else:
+        half_width = np.full(len(STATISTICS), np.nan)
+
+    named = dict(zip(STATISTICS, estimates.tolist()))
+    return {
+        "estimates": named,
+        "confidence_intervals": {
+            name: (value - width, value + width)
+            for name, value, width in zip(STATISTICS, estimates.tolist(), half_width.tolist())
+        },
+        "percentiles": {f"p{p}": named[f"p{p}"] for p in PERCENTILES},
+        "portfolio_paths": results[0][1],
+        "n_paths": int(sum(sizes)),
+        "n_chunks": len(sizes),
+        "method": method,
+        "seed": root.entropy,
+    }
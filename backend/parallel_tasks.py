@@ -0,0 +1,49 @@
+"""Inline-or-pool dispatch shared by the batched numeric modules.
+
+EMD, transfer entropy, extreme-value fits and Monte Carlo risk all split
+their work into picklable tasks. The tasks run inline when parallelism
+cannot pay off: one worker, fewer than two tasks, or less total work than
+the caller's ``min_work``. Otherwise they run on a caller-supplied executor
+(a thread or process pool), or on a process pool started for the call.
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+Task = TypeVar("Task")
+Result = TypeVar("Result")
+
+
+def pool_workers(
+    n_tasks: int,
+    work: float,
+    min_work: float,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Workers worth using for ``n_tasks`` tasks (1 means run inline)"""
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if executor is None and (n_jobs == 1 or n_tasks < 2 or work < min_work):
+        return 1
+    return max(1, min(n_jobs, n_tasks))
+
+
+def map_tasks(
+    func: Callable[[Task], Result],
+    tasks: Sequence[Task],
+    work: float,
+    min_work: float,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunksize: int = 1,
+) -> List[Result]:
+    """``[func(task) for task in tasks]``, inline or on a pool (see module docstring)"""
+    tasks = list(tasks)
+    if executor is not None:
+        return list(executor.map(func, tasks, chunksize=chunksize))
+    workers = pool_workers(len(tasks), work, min_work, n_jobs)
+    if workers == 1:
+        return [func(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, tasks, chunksize=chunksize))
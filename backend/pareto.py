@@ -0,0 +1,189 @@
+"""Fast non-dominated sorting and crowding distance for ensemble selection.
+
+``MultiObjectiveOptimizer._find_pareto_frontier`` used to check every
+candidate ensemble against the solutions accepted so far with
+``_is_pareto_optimal``. Each check re-aggregated both ensembles' member
+scores in Python, so a search was O(n²·k) interpreted comparisons. The
+result also depended on enumeration order: the first
+``pareto_frontier_size`` survivors were kept, not the best-spread ones.
+
+Here candidates are rows of a (candidates × objectives) score matrix, and
+every objective is maximized. Candidate a dominates b when a ≥ b on every
+objective and a > b on at least one. ``non_dominated_sort`` gives every
+candidate its front rank (0 = Pareto optimal). Candidates are first sorted
+lexicographically, in descending order, and duplicate rows share a rank.
+After that sort only an earlier row can dominate a later one. Three
+algorithms share this sort:
+
+* two objectives: one sweep keeps the best second objective of each front.
+  Those maxima do not increase with rank, so each point finds its front by
+  binary search, O(n log n);
+* three objectives: the sweep keeps a (2nd, 3rd objective) staircase of
+  maxima for each front. A dominance query is a binary search in one
+  staircase, and the front is again found by binary search over ranks;
+* more objectives: the dominance matrix is built in broadcast blocks, only
+  above the diagonal of the sorted order. Fronts are then peeled off with
+  Deb's domination counts, all as array operations.
+
+``crowding_distance`` is NSGA-II's spread measure within each front.
+``pareto_select`` truncates by (rank, -crowding), so a short frontier keeps
+the boundary solutions and an even spread between them.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, Optional
+
+import numpy as np
+
+# Boolean comparisons materialized per dominance-matrix block
+BROADCAST_BUDGET = 1 << 24
+# Sorted rows per upper-triangular dominance block
+DOMINANCE_ROW_BLOCK = 256
+
+
+def dominance_matrix(scores: np.ndarray) -> np.ndarray:
+    """D[i, j] is True when row i dominates row j (all objectives maximized)"""
+    scores = np.asarray(scores, dtype=np.float64)
+    n, k = scores.shape
+    dominates = np.empty((n, n), dtype=bool)
+    rows = max(1, BROADCAST_BUDGET // max(n * k, 1))
+    for start in range(0, n, rows):
+        block = scores[start : start + rows, None, :]
+        dominates[start : start + rows] = (block >= scores[None]).all(axis=2) & (block > scores[None]).any(axis=2)
+    return dominates
+
+
+def _sorted_unique(scores: np.ndarray):
+    """Unique rows in descending lexicographic order and each input row's index into them"""
+    unique, inverse = np.unique(scores, axis=0, return_inverse=True)
+    return unique[::-1], len(unique) - 1 - inverse.reshape(-1)
+
+
+def _sweep_two(points: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(points), dtype=np.int64)
+    # -(best second objective) of each front, non-decreasing with rank
+    front_keys: List[float] = []
+    for i, y in enumerate(points[:, 1].tolist()):
+        rank = bisect_right(front_keys, -y)
+        if rank == len(front_keys):
+            front_keys.append(-y)
+        else:
+            front_keys[rank] = -y
+        ranks[i] = rank
+    return ranks
+
+
+def _sweep_three(points: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(points), dtype=np.int64)
+    # Per front: staircase of (2nd, 3rd) maxima, keyed by -2nd ascending with the 3rd ascending
+    staircases: List[List[List[float]]] = []
+
+    def dominated(rank, y, z):
+        keys, values = staircases[rank]
+        end = bisect_right(keys, -y)
+        return end > 0 and values[end - 1] >= z
+
+    for i, (y, z) in enumerate(points[:, 1:].tolist()):
+        low, high = 0, len(staircases)
+        while low < high:
+            middle = (low + high) // 2
+            if dominated(middle, y, z):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(staircases):
+            staircases.append([[], []])
+        keys, values = staircases[low]
+        start = bisect_left(keys, -y)
+        end = bisect_right(values, z, lo=start)
+        keys[start:end] = [-y]
+        values[start:end] = [z]
+        ranks[i] = low
+    return ranks
+
+
+def _peel_fronts(points: np.ndarray) -> np.ndarray:
+    n, k = points.shape
+    columns = np.ascontiguousarray(points.T)
+    dominates = np.zeros((n, n), dtype=bool)
+    rows = int(np.clip(BROADCAST_BUDGET // n, 1, DOMINANCE_ROW_BLOCK))
+    scratch = np.empty((rows, n), dtype=bool)
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        # Rows are unique and sorted, so only j > i can be dominated by i, and ≥ everywhere suffices
+        block = dominates[start:stop, start:]
+        compare = scratch[: stop - start, : n - start]
+        np.greater_equal(columns[0, start:stop, None], columns[0, None, start:], out=block)
+        for objective in range(1, k):
+            np.greater_equal(columns[objective, start:stop, None], columns[objective, None, start:], out=compare)
+            block &= compare
+        block[:, : stop - start] &= ~np.tri(stop - start, dtype=bool)
+
+    ranks = np.full(n, -1, dtype=np.int64)
+    counts = np.count_nonzero(dominates, axis=0)
+    remaining = np.ones(n, dtype=bool)
+    rank = 0
+    while remaining.any():
+        front = np.flatnonzero(remaining & (counts == 0))
+        ranks[front] = rank
+        remaining[front] = False
+        counts -= np.count_nonzero(dominates[front], axis=0)
+        rank += 1
+    return ranks
+
+
+def non_dominated_sort(scores: np.ndarray) -> np.ndarray:
+    """Front rank of every row of a (candidates × objectives) matrix, 0 = Pareto optimal"""
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim != 2:
+        raise ValueError("scores must be a (candidates × objectives) matrix")
+    if len(scores) == 0:
+        return np.empty(0, dtype=np.int64)
+    points, inverse = _sorted_unique(scores)
+    if scores.shape[1] == 1:
+        ranks = np.arange(len(points))
+    elif scores.shape[1] == 2:
+        ranks = _sweep_two(points)
+    elif scores.shape[1] == 3:
+        ranks = _sweep_three(points)
+    else:
+        ranks = _peel_fronts(points)
+    return ranks[inverse]
+
+
+def crowding_distance(scores: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """NSGA-II crowding distance of every row within its own front (boundaries are inf)"""
+    scores = np.asarray(scores, dtype=np.float64)
+    distance = np.zeros(len(scores))
+    order = np.argsort(ranks, kind="stable")
+    boundaries = np.flatnonzero(np.diff(ranks[order])) + 1
+    for members in np.split(order, boundaries):
+        if len(members) <= 2:
+            distance[members] = np.inf
+            continue
+        front = scores[members]
+        by_objective = np.argsort(front, axis=0, kind="stable")
+        ordered = np.take_along_axis(front, by_objective, axis=0)
+        span = ordered[-1] - ordered[0]
+        gaps = np.empty_like(ordered)
+        gaps[1:-1] = (ordered[2:] - ordered[:-2]) / np.where(span > 0, span, 1.0)
+        gaps[[0, -1]] = np.inf
+        contributions = np.empty_like(gaps)
+        np.put_along_axis(contributions, by_objective, gaps, axis=0)
+        distance[members] = contributions.sum(axis=1)
+    return distance
+
+
+def pareto_select(scores: np.ndarray, n_select: int, max_rank: Optional[int] = None) -> np.ndarray:
+    """Indices of up to ``n_select`` best rows by front rank, then by crowding distance
+
+    Rows in fronts past ``max_rank`` are never selected (0 keeps only the
+    Pareto-optimal rows).
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    ranks = non_dominated_sort(scores)
+    distance = crowding_distance(scores, ranks)
+    order = np.lexsort((-distance, ranks))
+    if max_rank is not None:
+        order = order[ranks[order] <= max_rank]
+    return order[:n_select]
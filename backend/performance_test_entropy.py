@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Performance Testing Script for Sample / Multiscale Entropy
+Times the old per-template Python loop against the blocked Chebyshev and
+KD-tree counters in entropy_estimators at N=1k and N=10k.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from entropy_estimators import multiscale_entropy, sample_entropy
+
+
+def loop_sample_entropy(data, m=2, r=0.2):
+    """The previous implementation's approach: one Python iteration per template"""
+    tolerance = r * np.std(data)
+    n_templates = len(data) - m
+    patterns_m = np.array([data[i:i + m] for i in range(n_templates)])
+    patterns_m1 = np.array([data[i:i + m + 1] for i in range(n_templates)])
+    matches_m = matches_m1 = 0
+    for i in range(n_templates):
+        matches_m += np.sum(np.max(np.abs(patterns_m - patterns_m[i]), axis=1) <= tolerance) - 1
+        matches_m1 += np.sum(np.max(np.abs(patterns_m1 - patterns_m1[i]), axis=1) <= tolerance) - 1
+    if matches_m == 0 or matches_m1 == 0:
+        return 0.0
+    return -np.log(matches_m1 / matches_m)
+
+
+def timed(func, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+class EntropyPerformanceTester:
+    def __init__(self, sizes=(1000, 10000)):
+        self.sizes = sizes
+        self.results = {}
+
+    def test_sample_entropy(self, n):
+        data = np.random.default_rng(42).normal(size=n).cumsum()
+        reference, loop_time = timed(loop_sample_entropy, data)
+        blocked, blocked_time = timed(sample_entropy, data, method="blocked")
+        kdtree, kdtree_time = timed(sample_entropy, data, method="kdtree")
+        assert np.isclose(reference, blocked) and np.isclose(reference, kdtree)
+
+        self.results[n] = {"loop": loop_time, "blocked": blocked_time, "kdtree": kdtree_time}
+        print(
+            f"✅ SampEn N={n:>6}: loop {loop_time * 1000:8.1f}ms | "
+            f"blocked {blocked_time * 1000:7.1f}ms ({loop_time / blocked_time:5.1f}x) | "
+            f"kdtree {kdtree_time * 1000:7.1f}ms ({loop_time / kdtree_time:5.1f}x)"
+        )
+
+    def test_multiscale_entropy(self, n):
+        data = np.random.default_rng(7).normal(size=n)
+        _, elapsed = timed(multiscale_entropy, data, max_scale=20)
+        self.results[f"mse_{n}"] = elapsed
+        print(f"✅ MSE N={n:>6}, 20 scales: {elapsed * 1000:.1f}ms")
+
+    def run(self):
+        print("📈 Entropy benchmark")
+        print("=" * 40)
+        for n in self.sizes:
+            self.test_sample_entropy(n)
+        for n in self.sizes:
+            self.test_multiscale_entropy(n)
+        return self.results
+
+
+if __name__ == "__main__":
+    EntropyPerformanceTester().run()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Performance Testing Script for Correlation-Network Graph Features
+Times the previous path (edge-by-edge NetworkX graph plus NetworkX
+centralities) against the sparse adjacency and sparse-linear-algebra
+centralities in sparse_graph, and the fingerprint cache on a repeat call.
+"""
+
+import os
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from enhanced_feature_engineering import GraphBasedFeatures
+
+
+def make_features(n_features, n_samples=400, n_factors=8, seed=0):
+    """Features driven by a few shared factors, so the network has structure"""
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(size=(n_factors, n_features)) * (rng.random((n_factors, n_features)) < 0.2)
+    return rng.normal(size=(n_samples, n_factors)) @ loadings + rng.normal(size=(n_samples, n_features))
+
+
+def networkx_features(X, threshold=0.3):
+    corr_matrix = np.corrcoef(X.T)
+    G = nx.Graph()
+    G.add_nodes_from(range(X.shape[1]))
+    for i in range(X.shape[1]):
+        for j in range(i + 1, X.shape[1]):
+            if abs(corr_matrix[i, j]) > threshold:
+                G.add_edge(i, j, weight=abs(corr_matrix[i, j]))
+    return {
+        "degree": nx.degree_centrality(G),
+        "betweenness": nx.betweenness_centrality(G),
+        "eigenvector": nx.eigenvector_centrality(G, max_iter=1000),
+        "pagerank": nx.pagerank(G),
+        "clustering": nx.clustering(G),
+    }
+
+
+def timed(func, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+class GraphFeaturesPerformanceTester:
+    def __init__(self, sizes=(100, 300, 600, 1500), networkx_max_features=600):
+        self.sizes = sizes
+        self.networkx_max_features = networkx_max_features
+        self.results = {}
+
+    def test_size(self, n_features):
+        X = make_features(n_features)
+        graph = GraphBasedFeatures()
+        sparse_result, sparse_time = timed(graph.correlation_network_features, X)
+        _, cached_time = timed(graph.correlation_network_features, X)
+        edges = sparse_result["adjacency"].nnz // 2
+        self.results[n_features] = {"sparse": sparse_time, "cached": cached_time}
+
+        line = f"✅ {n_features:>5} features, {edges:>6} edges: sparse {sparse_time * 1000:8.1f}ms"
+        if n_features <= self.networkx_max_features:
+            reference, nx_time = timed(networkx_features, X)
+            self.results[n_features]["networkx"] = nx_time
+            ref = np.array([reference["betweenness"][i] for i in range(n_features)])
+            corr = np.corrcoef(ref, sparse_result["centralities"]["betweenness"])[0, 1]
+            line += (
+                f" | networkx {nx_time * 1000:9.1f}ms ({nx_time / sparse_time:6.1f}x)"
+                f" | sampled betweenness r={corr:.3f}"
+            )
+        print(line + f" | cached {cached_time * 1000:.2f}ms")
+
+    def run(self):
+        print("🕸️  Correlation network benchmark")
+        print("=" * 40)
+        for n_features in self.sizes:
+            self.test_size(n_features)
+        return self.results
+
+
+if __name__ == "__main__":
+    GraphFeaturesPerformanceTester().run()
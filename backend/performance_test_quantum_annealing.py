@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Performance Testing Script for quantum-inspired portfolio annealing
+Times the previous single-chain annealer (per-bet tunneling loop, energy
+re-read from bet dicts every step) against batched parallel tempering, and
+compares the portfolio energy each one reaches.
+"""
+
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.parallel_tempering import BetArrays
+from services.quantum_optimization_service import QuantumPortfolioManager
+
+
+def previous_energy(amplitudes, bets):
+    """The previous implementation: energy summed bet by bet from dicts"""
+    portfolio_return = 0.0
+    portfolio_risk = 0.0
+    for i, bet in enumerate(bets):
+        weight = amplitudes[i] ** 2
+        portfolio_return += weight * bet.get("expected_return", 0.0)
+        portfolio_risk += weight * bet.get("risk_score", 0.5)
+    return -(portfolio_return - 0.5 * portfolio_risk)
+
+
+def previous_annealing(bets, temperature=1.0, max_iterations=1000, threshold=1e-6):
+    """The previous implementation: one chain, exponential cooling"""
+    amplitudes = np.random.normal(0, 1, len(bets))
+    amplitudes /= np.linalg.norm(amplitudes)
+    energy = previous_energy(amplitudes, bets)
+    best_amplitudes, best_energy = amplitudes, energy
+    for iteration in range(max_iterations):
+        current_temp = temperature * (0.95**iteration)
+        new_amplitudes = amplitudes.copy()
+        for i in range(len(bets)):
+            new_amplitudes[i] += np.random.normal(0, current_temp * 0.1)
+        new_amplitudes /= np.linalg.norm(new_amplitudes)
+        new_energy = previous_energy(new_amplitudes, bets)
+        delta = new_energy - energy
+        if delta < 0 or random.random() < math.exp(-delta / (current_temp + 1e-10)):
+            amplitudes, energy = new_amplitudes, new_energy
+            if energy < best_energy:
+                best_amplitudes, best_energy = amplitudes, energy
+        if iteration > 100 and abs(energy - best_energy) < threshold:
+            break
+    return best_amplitudes, best_energy
+
+
+def timed(func, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+class QuantumAnnealingPerformanceTester:
+    def __init__(self, bet_counts=(20, 200, 1000)):
+        self.bet_counts = bet_counts
+        self.results = {}
+
+    @staticmethod
+    def _bets(n_bets, seed=0):
+        rng = np.random.default_rng(seed)
+        return [
+            {"id": f"bet_{i}", "expected_return": float(rng.normal(0.05, 0.05)), "risk_score": float(rng.uniform(0.1, 0.9))}
+            for i in range(n_bets)
+        ]
+
+    def test_portfolio(self):
+        for n_bets in self.bet_counts:
+            bets = self._bets(n_bets)
+            optimum = -BetArrays.from_bets(bets).scores().max()
+            np.random.seed(0)
+            (_, previous_best), previous_time = timed(previous_annealing, bets)
+            manager = QuantumPortfolioManager()
+            result, current_time = timed(lambda: asyncio.run(manager.optimize_portfolio(bets)))
+            telemetry = result.telemetry
+            self.results[n_bets] = {"previous": previous_time, "parallel_tempering": current_time}
+            print(
+                f"✅ {n_bets} bets: single chain {previous_time:.2f}s → energy {previous_best:.4f} | "
+                f"{telemetry['n_chains']}×{len(telemetry['temperatures'])} tempering replicas {current_time:.2f}s "
+                f"({telemetry['iterations']} steps) → energy {telemetry['energy']:.4f} (optimum {optimum:.4f})"
+            )
+
+    def run(self):
+        print("🌀 Quantum annealing benchmark")
+        print("=" * 40)
+        self.test_portfolio()
+        return self.results
+
+
+if __name__ == "__main__":
+    QuantumAnnealingPerformanceTester().run()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Performance Testing Script for quantum-inspired ensemble weighting
+Times the previous weight evolution (one state set, nested per-model loops,
+an awaited per-dict evaluation every iteration) against the population-
+batched evolution, cold and warm-started, and repeated reweighting across
+contexts.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from quantum_ensemble import EnsembleObjective, QuantumWeightEvolution, entanglement_matrix
+
+
+async def previous_optimize_weights(performances, correlation, history, iterations=100, superposition=8):
+    """The previous implementation, with a working complex initializer"""
+    models = list(performances)
+    n_models = len(models)
+    states = np.random.normal(size=(n_models, superposition)) + 1j * np.random.normal(size=(n_models, superposition))
+    states /= np.linalg.norm(states, axis=1, keepdims=True)
+    entanglement = np.zeros((n_models, n_models), dtype=complex)
+    for i in range(n_models):
+        for j in range(i + 1, n_models):
+            entanglement[i, j] = 0.7 * correlation[i, j] * np.exp(1j * np.pi / 4)
+            entanglement[j, i] = np.conj(entanglement[i, j])
+
+    async def evaluate(weights):
+        weighted_performance = sum(weights[model] * performances[model] for model in weights)
+        entropy = -sum(w * np.log(w + 1e-10) for w in weights.values())
+        diversity_bonus = entropy / np.log(len(weights)) if len(weights) > 1 else 0
+        similarities = []
+        for data in history[-10:]:
+            if "model_weights" in data:
+                common = set(weights) & set(data["model_weights"])
+                w1 = np.array([weights.get(m, 0) for m in common])
+                w2 = np.array([data["model_weights"].get(m, 0) for m in common])
+                if common and np.linalg.norm(w1) > 0 and np.linalg.norm(w2) > 0:
+                    similarities.append(np.dot(w1, w2) / (np.linalg.norm(w1) * np.linalg.norm(w2)))
+        consistency = np.mean(similarities) if similarities else 0.5
+        return 0.6 * weighted_performance + 0.2 * diversity_bonus + 0.2 * consistency
+
+    dt = 0.5 / iterations
+    best_weights, best_score = None, -np.inf
+    for iteration in range(iterations):
+        for i in range(n_models):
+            states[i] *= np.exp(-1j * iteration * dt)
+            for j in range(n_models):
+                if i != j:
+                    states[i] += entanglement[i, j] * dt * states[j]
+            states[i] /= np.linalg.norm(states[i])
+        probabilities = {model: float(np.sum(np.abs(states[i]) ** 2)) for i, model in enumerate(models)}
+        total = sum(probabilities.values())
+        weights = {model: p / total for model, p in probabilities.items()}
+        score = await evaluate(weights)
+        if score > best_score:
+            best_weights, best_score = weights, score
+        if iteration % 10 == 0:
+            states = states + np.random.normal(0, 0.1, states.shape) + 1j * np.random.normal(0, 0.1, states.shape)
+            states /= np.linalg.norm(states, axis=1, keepdims=True)
+    return best_weights, best_score
+
+
+def timed(func, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+class QuantumEnsemblePerformanceTester:
+    def __init__(self, model_counts=(10, 30, 100)):
+        self.model_counts = model_counts
+        self.rng = np.random.default_rng(0)
+        self.results = {}
+
+    def _problem(self, n_models):
+        models = [f"model_{i}" for i in range(n_models)]
+        performances = {model: float(self.rng.uniform(0.5, 0.9)) for model in models}
+        history = [
+            {"model_weights": dict(zip(models, self.rng.dirichlet(np.ones(n_models))))} for _ in range(20)
+        ]
+        correlation = self.rng.random((n_models, n_models))
+        return models, performances, history, (correlation + correlation.T) / 2
+
+    def test_weight_evolution(self):
+        evolution = QuantumWeightEvolution()
+        for n_models in self.model_counts:
+            models, performances, history, correlation = self._problem(n_models)
+            np.random.seed(0)
+            (_, previous_score), previous_time = timed(
+                lambda: asyncio.run(previous_optimize_weights(performances, correlation, history))
+            )
+            objective = EnsembleObjective.from_history(models, performances, history)
+            coupling = entanglement_matrix(correlation, 0.7)
+            cold, cold_time = timed(evolution.run, objective, coupling, seed=0)
+            warm, warm_time = timed(evolution.run, objective, coupling, warm_start=cold["weights"], seed=1)
+            uniform_score = objective.scores(np.full(n_models, 1.0 / n_models))[0]
+            self.results[n_models] = {"previous": previous_time, "cold": cold_time, "warm": warm_time}
+            print(
+                f"✅ {n_models} models: previous {previous_time:.2f}s → score {previous_score:.4f} "
+                f"(uniform {uniform_score:.4f}) | batched {cold_time * 1000:.1f}ms ({cold['iterations']} generations) "
+                f"→ {cold['score']:.4f} | warm start {warm_time * 1000:.1f}ms ({warm['iterations']}) → {warm['score']:.4f}"
+            )
+
+    def test_reweighting_contexts(self, n_models=30, n_contexts=6, rounds=10):
+        models, performances, history, correlation = self._problem(n_models)
+        coupling = entanglement_matrix(correlation, 0.7)
+        evolution = QuantumWeightEvolution()
+        warm_starts = {}
+        start_time = time.perf_counter()
+        for round_index in range(rounds):
+            for context in range(n_contexts):
+                # Performances drift a little between reweighting rounds
+                drifted = {model: value + 0.01 * self.rng.normal() for model, value in performances.items()}
+                objective = EnsembleObjective.from_history(models, drifted, history)
+                run = evolution.run(objective, coupling, warm_start=warm_starts.get(context))
+                warm_starts[context] = run["weights"]
+        total_time = time.perf_counter() - start_time
+        self.results["contexts"] = total_time
+        print(
+            f"✅ {rounds} reweighting rounds × {n_contexts} contexts ({n_models} models): {total_time:.2f}s total, "
+            f"{total_time / (rounds * n_contexts) * 1000:.1f}ms per reweight"
+        )
+
+    def run(self):
+        print("⚛️ Quantum ensemble weighting benchmark")
+        print("=" * 40)
+        self.test_weight_evolution()
+        self.test_reweighting_contexts()
+        return self.results
+
+
+if __name__ == "__main__":
+    QuantumEnsemblePerformanceTester().run()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Performance Testing Script for Rate Limiting
+Measures checks per second for each async Lua strategy against a fakeredis
+stand-in, the in-process ring-counter fallback, and the legacy sync limiter.
+
+Requires: pip install "fakeredis[lua]"
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import fakeredis
+from fakeredis import aioredis
+
+from middleware.advanced_rate_limiting import AdvancedRateLimiter, RateLimit, RateLimitStrategy
+from middleware.async_rate_limiting import AsyncAdvancedRateLimiter
+
+STRATEGIES = [
+    RateLimitStrategy.SLIDING_WINDOW,
+    RateLimitStrategy.SLIDING_WINDOW_COUNTER,
+    RateLimitStrategy.FIXED_WINDOW,
+    RateLimitStrategy.TOKEN_BUCKET,
+]
+
+
+class RateLimitPerformanceTester:
+    def __init__(self, checks: int = 20000, clients: int = 500, concurrency: int = 64):
+        self.checks = checks
+        self.clients = clients
+        self.concurrency = concurrency
+        self.results = {}
+
+    def _configure(self, limiter, strategy: RateLimitStrategy) -> str:
+        endpoint = f"/bench/{strategy.value}"
+        limiter.endpoint_limits[endpoint] = RateLimit(1000, 60, strategy, burst_limit=100)
+        return endpoint
+
+    async def _run_async(self, limiter: AsyncAdvancedRateLimiter, endpoint: str) -> float:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(i: int):
+            async with semaphore:
+                await limiter.check_rate_limit(f"client-{i % self.clients}", endpoint)
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(self.checks)))
+        return self.checks / (time.perf_counter() - start_time)
+
+    async def test_async_redis(self):
+        """Async limiter, one EVALSHA per check"""
+        print("Testing async Lua strategies (fakeredis)...")
+        for strategy in STRATEGIES:
+            limiter = AsyncAdvancedRateLimiter(redis_client=aioredis.FakeRedis())
+            endpoint = self._configure(limiter, strategy)
+            rate = await self._run_async(limiter, endpoint)
+            assert limiter.stats["redis_errors"] == 0, "Lua scripts require fakeredis[lua]"
+            self.results[f"async_redis_{strategy.value}"] = rate
+            print(f"✅ {strategy.value}: {rate:,.0f} checks/s")
+
+    async def test_async_local(self):
+        """Async limiter with no Redis, served from ring counters"""
+        print("\nTesting in-process fallback...")
+        for strategy in STRATEGIES:
+            limiter = AsyncAdvancedRateLimiter()
+            endpoint = self._configure(limiter, strategy)
+            rate = await self._run_async(limiter, endpoint)
+            self.results[f"async_local_{strategy.value}"] = rate
+            print(f"✅ {strategy.value}: {rate:,.0f} checks/s")
+
+    def test_sync_redis(self):
+        """Legacy pipeline-based limiter for comparison"""
+        print("\nTesting sync limiter (fakeredis)...")
+        for strategy in (RateLimitStrategy.SLIDING_WINDOW, RateLimitStrategy.TOKEN_BUCKET):
+            limiter = AdvancedRateLimiter(redis_client=fakeredis.FakeRedis(decode_responses=True))
+            endpoint = self._configure(limiter, strategy)
+            start_time = time.perf_counter()
+            for i in range(self.checks):
+                limiter.check_rate_limit(f"client-{i % self.clients}", endpoint)
+            rate = self.checks / (time.perf_counter() - start_time)
+            self.results[f"sync_redis_{strategy.value}"] = rate
+            print(f"✅ {strategy.value}: {rate:,.0f} checks/s (blocks the event loop)")
+
+    def test_correctness(self):
+        """Every backend must admit exactly the limit inside one window"""
+        print("\nVerifying admission counts...")
+
+        async def admitted(limiter, strategy):
+            endpoint = self._configure(limiter, strategy)
+            limiter.endpoint_limits[endpoint] = RateLimit(50, 60, strategy)
+            results = [await limiter.check_rate_limit("probe", endpoint) for _ in range(80)]
+            return sum(r.allowed for r in results)
+
+        for strategy in STRATEGIES:
+            remote = asyncio.run(admitted(AsyncAdvancedRateLimiter(redis_client=aioredis.FakeRedis()), strategy))
+            local = asyncio.run(admitted(AsyncAdvancedRateLimiter(), strategy))
+            status = "✅" if remote == local == 50 else "⚠️ "
+            print(f"{status} {strategy.value}: redis={remote}, local={local} (expected 50)")
+
+    def run(self):
+        asyncio.run(self.test_async_redis())
+        asyncio.run(self.test_async_local())
+        self.test_sync_redis()
+        self.test_correctness()
+        return self.results
+
+
+if __name__ == "__main__":
+    RateLimitPerformanceTester().run()
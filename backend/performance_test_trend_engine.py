@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Performance Testing Script for Board-wide Trend Analytics
+Compares per-key np.polyfit trend analysis with BatchTrendEngine snapshots
+and screens 5k+ projection analyses for value in one vectorized pass.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.trend_engine import BatchTrendEngine, select_opportunities, value_bet_scores
+
+
+class TrendEnginePerformanceTester:
+    def __init__(self, n_keys: int = 5000, observations: int = 25, window: int = 10):
+        self.n_keys = n_keys
+        self.observations = observations
+        self.window = window
+        self.results = {}
+        rng = np.random.default_rng(7)
+        drift = rng.normal(0, 0.2, size=(n_keys, 1))
+        self.lines = 20 + np.cumsum(rng.normal(0, 0.5, size=(n_keys, observations)) + drift, axis=1)
+        self.keys = [f"player{i}_points" for i in range(n_keys)]
+
+    def test_polyfit_baseline(self):
+        """Original approach: one polyfit/mean/std per key on Python lists"""
+        start_time = time.perf_counter()
+        slopes = []
+        for row in self.lines:
+            recent = list(row[-self.window:])
+            slopes.append(np.polyfit(range(len(recent)), recent, 1)[0])
+            np.mean(recent)
+            np.std(recent)
+        elapsed = time.perf_counter() - start_time
+        self.results["polyfit_seconds"] = elapsed
+        print(f"✅ polyfit per key: {elapsed * 1000:.1f}ms for {self.n_keys} keys")
+        return np.array(slopes)
+
+    def test_batch_engine(self, reference_slopes):
+        """Incremental updates, then one vectorized snapshot"""
+        engine = BatchTrendEngine(window=self.window)
+        start_time = time.perf_counter()
+        for key, row in zip(self.keys, self.lines):
+            engine.update_many([key] * len(row), row)
+        update_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        snapshot = engine.snapshot()
+        snapshot_time = time.perf_counter() - start_time
+
+        error = np.max(np.abs(snapshot.slopes - reference_slopes))
+        self.results["update_seconds"] = update_time
+        self.results["snapshot_seconds"] = snapshot_time
+        print(
+            f"✅ BatchTrendEngine: {update_time / self.lines.size * 1e6:.1f}µs per update, "
+            f"snapshot {snapshot_time * 1000:.2f}ms (max slope error {error:.2e})"
+        )
+        return snapshot
+
+    def test_value_screen(self, snapshot):
+        """Score and rank every projection on the board"""
+        rng = np.random.default_rng(11)
+        board_lines = snapshot.means + rng.normal(0, 1.5, size=len(snapshot.means))
+        confidence = rng.uniform(0.5, 0.95, size=len(snapshot.means))
+
+        start_time = time.perf_counter()
+        predicted = snapshot.means + snapshot.slopes
+        scores = value_bet_scores(predicted, board_lines)
+        selected = select_opportunities(scores, confidence, min_value=0.05, min_confidence=0.7)
+        elapsed = time.perf_counter() - start_time
+        self.results["value_screen_seconds"] = elapsed
+        print(f"✅ Value screen: {len(selected)} opportunities from {len(scores)} in {elapsed * 1000:.2f}ms")
+
+    def run(self):
+        print("📈 Trend analytics benchmark")
+        print("=" * 40)
+        reference = self.test_polyfit_baseline()
+        snapshot = self.test_batch_engine(reference)
+        self.test_value_screen(snapshot)
+        speedup = self.results["polyfit_seconds"] / self.results["snapshot_seconds"]
+        print(f"\nSnapshot vs polyfit speedup: {speedup:.0f}x")
+        return self.results
+
+
+if __name__ == "__main__":
+    TrendEnginePerformanceTester().run()
@@ -0,0 +1,220 @@
+"""Population-batched, quantum-inspired evolution of ensemble weights.
+
+``QuantumInspiredOptimizer.optimize_weights`` used to run one weight
+candidate per iteration. Every iteration it:
+
+* evolved the states model by model in nested Python loops;
+* measured them into a weight dict;
+* awaited ``_evaluate_quantum_ensemble``, which re-read the weight history
+  and rebuilt cosine similarities one dict at a time.
+
+Each model's state was also normalized on its own, so every measurement gave
+uniform weights, and the state initializer raised before any of that ran.
+
+Here a population of states is evolved together as one
+(population × models × superposition) complex array. A state is normalized
+as a whole, and model i's weight is the measured probability Σ_s |ψ_is|².
+Each generation:
+
+* Hamiltonian step: a phase rotation plus entanglement coupling
+  ``ψ ← e^{-itΔt} ψ + Δt E ψ``, applied to every state at once;
+* measurement of all weight vectors;
+* scoring by ``EnsembleObjective`` with one matmul against its cached
+  (models × (1 + history)) matrix. The matrix holds the model performances
+  and the recent ensemble weights, aligned to the current models;
+* amplitudes pulled toward the best state measured so far, plus
+  decoherence noise. Its strength is laddered across the population, so
+  some states refine the best weights while others keep exploring.
+
+A run can be warm-started from a previous optimum: part of the population
+starts near it, and it is scored first, so a rerun never returns worse
+weights. The run stops once the best score has not improved for
+``patience`` generations.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+POPULATION_SIZE = 32
+# Generations without improvement before the run stops
+PATIENCE = 12
+MIN_IMPROVEMENT = 1e-7
+# Fraction of the gap to the best amplitudes closed per generation
+ROTATION_RATE = 0.5
+# Smallest decoherence noise, relative to noise_level, on the population's ladder
+NOISE_LADDER_FLOOR = 0.1
+# Share of the population seeded around a warm start, and its spread
+WARM_START_FRACTION = 0.5
+WARM_START_NOISE = 0.05
+# Composite score weights and the neutral consistency without usable history
+PERFORMANCE_WEIGHT = 0.6
+DIVERSITY_WEIGHT = 0.2
+CONSISTENCY_WEIGHT = 0.2
+NEUTRAL_CONSISTENCY = 0.5
+HISTORY_WINDOW = 10
+
+
+def entanglement_matrix(correlation_matrix: np.ndarray, strength: float) -> np.ndarray:
+    """Hermitian coupling strength·ρ_ij·e^{iπ/4} above the diagonal (conjugate below)"""
+    upper = np.triu(strength * np.asarray(correlation_matrix, dtype=float), 1) * np.exp(1j * np.pi / 4)
+    return upper + upper.conj().T
+
+
+class EnsembleObjective:
+    """Composite ensemble score for a whole population of weight vectors
+
+    0.6 · weighted performance + 0.2 · normalized weight entropy + 0.2 · mean
+    cosine similarity to the recent ensemble weights, each similarity taken
+    over the models a history entry shares with the current ensemble.
+    """
+
+    def __init__(self, performances: np.ndarray, history_weights: np.ndarray, history_mask: np.ndarray):
+        self.performances = np.asarray(performances, dtype=float)
+        history_weights = np.asarray(history_weights, dtype=float).reshape(-1, len(self.performances))
+        # One matmul gives every state's performance and its dot product with each history entry
+        self.matrix = np.column_stack([self.performances, history_weights.T])
+        self.history_mask = np.asarray(history_mask, dtype=float).reshape(history_weights.shape).T
+        self.history_norms = np.linalg.norm(history_weights, axis=1)
+        self.log_models = np.log(len(self.performances)) if len(self.performances) > 1 else 0.0
+
+    @classmethod
+    def from_history(
+        cls, models: Sequence[str], performances: Dict[str, float], historical_data: List[Dict[str, Any]]
+    ) -> "EnsembleObjective":
+        index = {model: i for i, model in enumerate(models)}
+        recent = [data["model_weights"] for data in historical_data[-HISTORY_WINDOW:] if "model_weights" in data]
+        history_weights = np.zeros((len(recent), len(models)))
+        history_mask = np.zeros((len(recent), len(models)), dtype=bool)
+        for row, weights in enumerate(recent):
+            for model, weight in weights.items():
+                if model in index:
+                    history_weights[row, index[model]] = weight
+                    history_mask[row, index[model]] = True
+        return cls([performances[model] for model in models], history_weights, history_mask)
+
+    def scores(self, weights: np.ndarray) -> np.ndarray:
+        """Scores of a (population × models) weight matrix"""
+        weights = np.atleast_2d(weights)
+        products = weights @ self.matrix
+        performance = products[:, 0]
+
+        entropy = -(weights * np.log(weights + 1e-10)).sum(axis=1)
+        diversity = entropy / self.log_models if self.log_models > 0 else np.zeros(len(weights))
+
+        consistency = np.full(len(weights), NEUTRAL_CONSISTENCY)
+        if self.history_mask.shape[1]:
+            norms = np.sqrt((weights**2) @ self.history_mask) * self.history_norms
+            valid = norms > 0
+            similarity = np.divide(products[:, 1:], norms, out=np.zeros_like(norms), where=valid)
+            counts = valid.sum(axis=1)
+            has_history = counts > 0
+            consistency[has_history] = similarity[has_history].sum(axis=1) / counts[has_history]
+
+        return PERFORMANCE_WEIGHT * performance + DIVERSITY_WEIGHT * diversity + CONSISTENCY_WEIGHT * consistency
+
+
+class QuantumWeightEvolution:
+    """Batched quantum-inspired search over ensemble weights on the simplex"""
+
+    def __init__(
+        self,
+        superposition_states: int = 8,
+        max_iterations: int = 100,
+        coherence_time: float = 0.5,
+        noise_level: float = 0.1,
+        population_size: int = POPULATION_SIZE,
+        patience: int = PATIENCE,
+    ):
+        self.superposition_states = superposition_states
+        self.max_iterations = max_iterations
+        self.coherence_time = coherence_time
+        self.noise_level = noise_level
+        self.population_size = population_size
+        self.patience = patience
+
+    @staticmethod
+    def _normalize(states: np.ndarray) -> np.ndarray:
+        norms = np.sqrt((np.abs(states) ** 2).sum(axis=(1, 2), keepdims=True))
+        return states / np.where(norms > 0, norms, 1.0)
+
+    @staticmethod
+    def measure(states: np.ndarray) -> np.ndarray:
+        """(population × models) weights Σ_s |ψ_is|² of normalized states"""
+        return (np.abs(states) ** 2).sum(axis=2)
+
+    def _complex_noise(self, rng: np.random.Generator, shape, scale: float) -> np.ndarray:
+        return rng.normal(0.0, scale, shape) + 1j * rng.normal(0.0, scale, shape)
+
+    def _initial_states(
+        self, rng: np.random.Generator, n_models: int, warm_start: Optional[np.ndarray]
+    ) -> np.ndarray:
+        shape = (self.population_size, n_models, self.superposition_states)
+        states = self._complex_noise(rng, shape, 1.0)
+        if warm_start is not None:
+            # Amplitudes √w spread evenly over the superposition with random phases
+            n_warm = max(1, int(self.population_size * WARM_START_FRACTION))
+            phases = np.exp(2j * np.pi * rng.random((n_warm,) + shape[1:]))
+            amplitudes = np.sqrt(warm_start / self.superposition_states)[None, :, None] * phases
+            amplitudes[1:] += self._complex_noise(rng, amplitudes[1:].shape, WARM_START_NOISE / np.sqrt(n_models))
+            states[:n_warm] = amplitudes
+        return self._normalize(states)
+
+    def run(
+        self,
+        objective: EnsembleObjective,
+        entanglement: np.ndarray,
+        warm_start: Optional[np.ndarray] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        rng = np.random.default_rng(seed)
+        n_models = len(objective.performances)
+        if warm_start is not None:
+            warm_start = np.clip(np.asarray(warm_start, dtype=float), 0.0, None)
+            warm_start = warm_start / warm_start.sum() if warm_start.sum() > 0 else None
+        states = self._initial_states(rng, n_models, warm_start)
+        dt = self.coherence_time / max(self.max_iterations, 1)
+        # Decoherence strengths spread over the population, from fine to coarse moves
+        noise_scales = (
+            self.noise_level
+            * np.geomspace(NOISE_LADDER_FLOOR, 1.0, self.population_size)[:, None, None]
+            / np.sqrt(n_models * self.superposition_states)
+        )
+
+        best_weights = np.full(n_models, 1.0 / n_models) if warm_start is None else warm_start
+        best_score = float(objective.scores(best_weights)[0])
+        best_amplitudes = np.sqrt(best_weights)[:, None] / np.sqrt(self.superposition_states)
+        score_trace = []
+        stall = 0
+        iteration = 0
+        for iteration in range(self.max_iterations):
+            states = self._normalize(np.exp(-1j * iteration * dt) * states + dt * (entanglement @ states))
+            weights = self.measure(states)
+            scores = objective.scores(weights)
+
+            leader = int(np.argmax(scores))
+            if scores[leader] > best_score + MIN_IMPROVEMENT:
+                best_score = float(scores[leader])
+                best_weights = weights[leader].copy()
+                best_amplitudes = np.abs(states[leader])
+                stall = 0
+            else:
+                stall += 1
+            score_trace.append(best_score)
+            if stall >= self.patience:
+                break
+
+            # Pull every amplitude toward the best state, keeping its own phase
+            magnitudes = np.abs(states)
+            phases = np.exp(1j * np.angle(states))
+            states = ((1.0 - ROTATION_RATE) * magnitudes + ROTATION_RATE * best_amplitudes) * phases
+            states = states + self._complex_noise(rng, states.shape, 1.0) * noise_scales
+            states = self._normalize(states)
+
+        return {
+            "weights": best_weights,
+            "score": best_score,
+            "iterations": iteration + 1,
+            "converged": stall >= self.patience,
+            "score_trace": np.array(score_trace),
+        }
@@ -14,10 +14,37 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 import json
+import re
 from collections import defaultdict, deque
 
+from .feature_matrix import FeatureMatrix, FeatureSchema, Rows, as_records
+from .feature_pipeline import CacheScope, FeatureDAG, FeatureStage, PropContext
+from .feature_registry import FeatureRegistry
+from .feature_store import FeatureStore, to_epoch
+
 logger = logging.getLogger(__name__)
 
+FEATURE_SET_NAME = "comprehensive_features"
+
+# Player performance columns embed the prop type ("avg_points_5g"); the
+# matrix schema uses one canonical column per window ("avg_prop_5g")
+_PROP_TYPE_COLUMN = re.compile(r"^(avg|std|trend)_.+_(\d+g)$")
+
+
+# raw_data keys read by the game- and player-level stages. Only these enter
+# their cache fingerprints, so prop fields (line_score, odds) don't split them
+GAME_KEYS = ('game_id', 'event_id', 'match_id')
+WEATHER_FIELDS = GAME_KEYS + ('venue', 'weather')
+GAME_SCRIPT_FIELDS = GAME_KEYS + ('home_team', 'away_team', 'spread', 'total')
+REFEREE_FIELDS = GAME_KEYS + ('referee', 'officials')
+VENUE_FIELDS = GAME_KEYS + ('venue', 'home_team')
+REST_TRAVEL_FIELDS = GAME_KEYS + ('team', 'rest_days', 'last_game_date', 'travel_distance')
+INJURY_FIELDS = GAME_KEYS + ('team', 'injury_status', 'injury_report', 'news')
+
+
+def canonical_feature_name(name: str) -> str:
+    return _PROP_TYPE_COLUMN.sub(r"\1_prop_\2", name)
+
 class FeatureCategory(Enum):
     """Feature categories for comprehensive engineering"""
     PLAYER_PERFORMANCE = "player_performance"
@@ -46,8 +73,10 @@ class FeatureSet:
 class ComprehensiveFeatureEngine:
     """Revolutionary feature engineering service for maximum accuracy"""
     
-    def __init__(self):
-        self.feature_cache: Dict[str, FeatureSet] = {}
+    def __init__(self, feature_store: Optional[FeatureStore] = None):
+        # Bounded online tier (+ Redis / SQLite history when configured)
+        self.feature_store = feature_store or FeatureStore.from_env(max_entries=10000)
+        self.feature_registry = FeatureRegistry(self.feature_store.offline)
         self.feature_history: deque = deque(maxlen=10000)
         self.feature_importance_cache: Dict[str, Dict[str, float]] = {}
         
@@ -56,6 +85,9 @@ class ComprehensiveFeatureEngine:
         self.matchup_lookback = 50  # games
         self.weather_impact_sports = ['nfl', 'mlb', 'ncaaf']
         
+        self.pipeline = self.build_feature_pipeline()
+        self._feature_schema: Optional[FeatureSchema] = None
+        
         logger.info("🔧 Comprehensive Feature Engine initialized with 100+ feature categories")
     
     async def engineer_features(self, player_name: str, sport: str, prop_type: str, 
@@ -68,55 +100,13 @@ class ComprehensiveFeatureEngine:
             all_features = {}
             feature_categories = {}
             
-            # 1. Player Performance Trends (20+ features)
-            performance_features = await self.create_player_performance_features(player_name, sport, prop_type, raw_data)
-            all_features.update(performance_features)
-            feature_categories[FeatureCategory.PLAYER_PERFORMANCE] = performance_features
-            
-            # 2. Matchup-Specific Performance (15+ features)
-            matchup_features = await self.create_matchup_specific_features(player_name, sport, prop_type, raw_data)
-            all_features.update(matchup_features)
-            feature_categories[FeatureCategory.MATCHUP_SPECIFIC] = matchup_features
-            
-            # 3. Rest & Travel Factors (10+ features)
-            rest_travel_features = await self.create_rest_travel_features(player_name, sport, raw_data)
-            all_features.update(rest_travel_features)
-            feature_categories[FeatureCategory.REST_TRAVEL] = rest_travel_features
-            
-            # 4. Weather Impact (8+ features for outdoor sports)
-            weather_features = await self.create_weather_impact_features(sport, raw_data)
-            all_features.update(weather_features)
-            feature_categories[FeatureCategory.WEATHER_IMPACT] = weather_features
-            
-            # 5. Injury Report Sentiment (12+ features)
-            injury_features = await self.create_injury_sentiment_features(player_name, sport, raw_data)
-            all_features.update(injury_features)
-            feature_categories[FeatureCategory.INJURY_SENTIMENT] = injury_features
-            
-            # 6. Line Movement Intelligence (15+ features)
-            line_movement_features = await self.create_line_movement_features(player_name, prop_type, raw_data)
-            all_features.update(line_movement_features)
-            feature_categories[FeatureCategory.LINE_MOVEMENT] = line_movement_features
-            
-            # 7. Historical Prop Performance (10+ features)
-            historical_features = await self.create_historical_prop_features(player_name, prop_type, raw_data)
-            all_features.update(historical_features)
-            feature_categories[FeatureCategory.HISTORICAL_PROP] = historical_features
-            
-            # 8. Game Script Predictions (8+ features)
-            game_script_features = await self.create_game_script_features(sport, raw_data)
-            all_features.update(game_script_features)
-            feature_categories[FeatureCategory.GAME_SCRIPT] = game_script_features
-            
-            # 9. Referee Impact (6+ features)
-            referee_features = await self.create_referee_impact_features(sport, raw_data)
-            all_features.update(referee_features)
-            feature_categories[FeatureCategory.REFEREE_IMPACT] = referee_features
-            
-            # 10. Venue Effects (8+ features)
-            venue_features = await self.create_venue_effects_features(sport, raw_data)
-            all_features.update(venue_features)
-            feature_categories[FeatureCategory.VENUE_EFFECTS] = venue_features
+            # Stages run as a DAG; shared game/player stages are memoized
+            stage_outputs = await self.pipeline.run(
+                PropContext(player_name, sport, prop_type, raw_data or {})
+            )
+            for stage_name, stage_features in stage_outputs.items():
+                all_features.update(stage_features)
+                feature_categories[FeatureCategory(stage_name)] = stage_features
             
             # Calculate feature importance
             feature_importance = await self.calculate_feature_importance(all_features, sport, prop_type)
@@ -154,6 +144,136 @@ class ComprehensiveFeatureEngine:
             logger.error(f"❌ Feature engineering error: {e}")
             raise
     
+    def build_feature_pipeline(self) -> FeatureDAG:
+        """Declare the feature stages, their inputs and what they can be shared across"""
+        def stage(category, scope, ttl, method, *inputs, raw_fields=None):
+            async def run(ctx: PropContext, upstream: Dict[str, Dict[str, float]]):
+                return await method(*(getattr(ctx, name) for name in inputs))
+            return FeatureStage(
+                name=category.value, func=run, scope=scope, inputs=inputs, ttl_seconds=ttl,
+                raw_fields=raw_fields,
+            )
+
+        game, player, prop = CacheScope.GAME, CacheScope.PLAYER, CacheScope.PROP
+        dag = FeatureDAG()
+        for feature_stage in (
+            stage(FeatureCategory.PLAYER_PERFORMANCE, prop, 300, self.create_player_performance_features,
+                  'player_name', 'sport', 'prop_type', 'raw_data'),
+            stage(FeatureCategory.MATCHUP_SPECIFIC, prop, 300, self.create_matchup_specific_features,
+                  'player_name', 'sport', 'prop_type', 'raw_data'),
+            stage(FeatureCategory.REST_TRAVEL, player, 1800, self.create_rest_travel_features,
+                  'player_name', 'sport', 'raw_data', raw_fields=REST_TRAVEL_FIELDS),
+            stage(FeatureCategory.WEATHER_IMPACT, game, 900, self.create_weather_impact_features,
+                  'sport', 'raw_data', raw_fields=WEATHER_FIELDS),
+            stage(FeatureCategory.INJURY_SENTIMENT, player, 600, self.create_injury_sentiment_features,
+                  'player_name', 'sport', 'raw_data', raw_fields=INJURY_FIELDS),
+            stage(FeatureCategory.LINE_MOVEMENT, prop, 60, self.create_line_movement_features,
+                  'player_name', 'prop_type', 'raw_data'),
+            stage(FeatureCategory.HISTORICAL_PROP, prop, 1800, self.create_historical_prop_features,
+                  'player_name', 'prop_type', 'raw_data'),
+            stage(FeatureCategory.GAME_SCRIPT, game, 600, self.create_game_script_features,
+                  'sport', 'raw_data', raw_fields=GAME_SCRIPT_FIELDS),
+            stage(FeatureCategory.REFEREE_IMPACT, game, 3600, self.create_referee_impact_features,
+                  'sport', 'raw_data', raw_fields=REFEREE_FIELDS),
+            stage(FeatureCategory.VENUE_EFFECTS, game, 3600, self.create_venue_effects_features,
+                  'sport', 'raw_data', raw_fields=VENUE_FIELDS),
+        ):
+            dag.add_stage(feature_stage)
+        return dag
+    
+    async def engineer_slate_features(self, props: List[Dict[str, Any]]) -> List[FeatureSet]:
+        """Engineer features for a whole slate of props concurrently.
+        
+        Each prop is a dict with ``player_name``, ``sport``, ``prop_type`` and
+        optional ``raw_data`` (carrying ``game_id`` so game-level stages are
+        shared). Results are returned in input order.
+        """
+        return await asyncio.gather(*(
+            self.engineer_features(
+                prop['player_name'], prop['sport'], prop['prop_type'], prop.get('raw_data') or {}
+            )
+            for prop in props
+        ))
+    
+    async def feature_schema(self) -> FeatureSchema:
+        """Fixed column order for ``engineer_feature_matrix``.
+        
+        Derived once by probing every stage with an outdoor sport (the
+        superset of weather columns); indoor sports leave the extra weather
+        columns at 0. The registry versions it, so changed stage columns get
+        a new version instead of colliding with stored tables.
+        """
+        if self._feature_schema is None:
+            probe = PropContext("schema_probe", self.weather_impact_sports[0], "prop", {})
+            columns = []
+            for stage in self.pipeline.stages.values():
+                stage_features = await stage.func(probe, {})
+                columns.extend(canonical_feature_name(name) for name in stage_features)
+            self._feature_schema = self.feature_registry.register_schema(
+                FEATURE_SET_NAME, list(dict.fromkeys(columns))
+            )
+        return self._feature_schema
+    
+    async def engineer_feature_matrix(self, props: Rows) -> FeatureMatrix:
+        """Engineer a slate straight into a float32 matrix for batched ``predict``.
+        
+        ``props`` is a list of dicts or a DataFrame with ``player_name``,
+        ``sport``, ``prop_type`` and optional ``raw_data``/``game_id``. Stages
+        run through the shared DAG, so game- and player-level stages are
+        computed once per game/player; per-prop importance scoring and the
+        FeatureSet cache are skipped.
+        """
+        schema = await self.feature_schema()
+        records = as_records(props)
+        contexts = []
+        for prop in records:
+            raw_data = dict(prop.get('raw_data') or {})
+            if prop.get('game_id') and 'game_id' not in raw_data:
+                raw_data['game_id'] = prop['game_id']
+            contexts.append(PropContext(prop['player_name'], prop['sport'], prop['prop_type'], raw_data))
+        
+        outputs = await self.pipeline.run_many(contexts)
+        rows = [
+            {key: value for stage_features in stage_outputs.values() for key, value in stage_features.items()}
+            for stage_outputs in outputs
+        ]
+        return FeatureMatrix(
+            values=schema.from_dicts(rows, rename=lambda _, name: canonical_feature_name(name)),
+            schema=schema,
+            row_ids=[prop.get('id', index) for index, prop in enumerate(records)],
+        )
+    
+    async def load_feature_matrix(self, props: Rows, as_of: Any = None) -> Tuple[FeatureMatrix, np.ndarray]:
+        """Previously engineered rows from the feature store, plus a found mask.
+        
+        Without timestamps this serves the latest stored row per prop. With
+        ``as_of`` (or a ``timestamp`` per prop) it is a point-in-time lookup
+        in the offline tier, for building training sets without leakage.
+        """
+        schema = await self.feature_schema()
+        records = as_records(props)
+        entity_ids = [
+            self.feature_entity_id(prop['player_name'], prop['sport'], prop['prop_type']) for prop in records
+        ]
+        if as_of is None and not any(prop.get('timestamp') for prop in records):
+            values = schema.empty(len(records), np.nan)
+            found = np.zeros(len(records), dtype=bool)
+            sports = np.array([prop['sport'] for prop in records], dtype=object)
+            for sport in dict.fromkeys(sports):
+                rows = np.flatnonzero(sports == sport)
+                matrix, sport_found = await asyncio.to_thread(
+                    self.feature_store.get_online, schema, [entity_ids[i] for i in rows], sport
+                )
+                values[rows] = matrix.values
+                found[rows] = sport_found
+            return FeatureMatrix(values, schema, entity_ids), found
+        
+        entity_rows = [
+            {'entity_id': entity_id, 'sport': prop['sport'], 'timestamp': to_epoch(prop.get('timestamp') or as_of)}
+            for entity_id, prop in zip(entity_ids, records)
+        ]
+        return await asyncio.to_thread(self.feature_store.get_historical, schema, entity_rows)
+    
     async def create_player_performance_features(self, player_name: str, sport: str, 
                                                prop_type: str, raw_data: Dict[str, Any]) -> Dict[str, float]:
         """Create player performance trend features"""
@@ -449,10 +569,24 @@ class ComprehensiveFeatureEngine:
         
         return max(0.0, min(1.0, quality_score))
     
+    @staticmethod
+    def feature_entity_id(player_name: str, sport: str, prop_type: str) -> str:
+        return f"{player_name}_{sport}_{prop_type}"
+    
     async def cache_feature_set(self, feature_set: FeatureSet):
-        """Cache feature set for future use"""
-        cache_key = f"{feature_set.player_name}_{feature_set.sport}_{feature_set.prop_type}"
-        self.feature_cache[cache_key] = feature_set
+        """Store the feature row online (and offline, if configured) for reuse"""
+        schema = await self.feature_schema()
+        row = schema.from_dicts(
+            [feature_set.features], rename=lambda _, name: canonical_feature_name(name)
+        )
+        await asyncio.to_thread(
+            self.feature_store.write,
+            schema,
+            self.feature_entity_id(feature_set.player_name, feature_set.sport, feature_set.prop_type),
+            row,
+            feature_set.sport,
+            feature_set.metadata.get('timestamp'),
+        )
         
         # Add to history
         self.feature_history.append({
@@ -467,12 +601,14 @@ class ComprehensiveFeatureEngine:
     def get_service_stats(self) -> Dict[str, Any]:
         """Get feature engineering service statistics"""
         return {
-            'cached_feature_sets': len(self.feature_cache),
+            'cached_feature_sets': len(self.feature_store.online),
+            'feature_store': self.feature_store.get_stats(),
             'total_features_engineered': len(self.feature_history),
             'avg_feature_count': np.mean([h['feature_count'] for h in self.feature_history]) if self.feature_history else 0,
             'avg_quality_score': np.mean([h['quality_score'] for h in self.feature_history]) if self.feature_history else 0,
             'feature_categories': len(FeatureCategory),
             'rolling_windows': self.rolling_windows,
+            'pipeline': self.pipeline.get_stats(),
             'last_engineering': self.feature_history[-1]['timestamp'].isoformat() if self.feature_history else None
         }
 
@@ -5,7 +5,7 @@ import re
 import shutil
 import subprocess
 import time
-from collections import defaultdict, deque
+from collections import deque
 from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
@@ -17,8 +17,21 @@ from selenium.webdriver.chrome.service import Service
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from .prizepicks_ingestion import (
+    AIMDRateLimiter,
+    ConcurrentLeagueFetcher,
+    build_request_headers,
+    load_user_agent,
+)
+from .projection_store import (
+    PlayerLineHistory,
+    PrizePicksProjection,
+    ProjectionDiffer,
+    ProjectionEvent,
+)
+from .trend_engine import BatchTrendEngine, TrendSnapshot, ols_slopes, select_opportunities
+
 # Stub unresolved models
-PrizePicksProjection = None
 ProjectionHistory = None
 PlayerPerformance = None
 ProjectionAnalysis = None
@@ -28,6 +41,15 @@ logger = logging.getLogger(__name__)
 # Modern SQLAlchemy base for ORM models
 Base = declarative_base()
 
+DEFAULT_LEAGUES = [
+    {"id": "NBA", "name": "NBA"},
+    {"id": "NFL", "name": "NFL"},
+    {"id": "MLB", "name": "MLB"},
+    {"id": "NHL", "name": "NHL"},
+    {"id": "NCAAB", "name": "NCAAB"},
+    {"id": "NCAAF", "name": "NCAAF"},
+]
+
 """
 Comprehensive PrizePicks Data Ingestion Service
 Enterprise-grade service for complete PrizePicks API integration with ALL projections.
@@ -79,7 +101,11 @@ class ComprehensivePrizePicksService:
             },
         ]
 
-    def __init__(self, database_url: str = "sqlite:///prizepicks_data.db"):
+    def __init__(
+        self,
+        database_url: str = "sqlite:///prizepicks_data.db",
+        ingestion_mode: str = "concurrent",
+    ):
         self.base_url = "https://api.prizepicks.com"
         self.database_url = database_url
         self.engine = create_engine(self.database_url, future=True)
@@ -99,10 +125,12 @@ class ComprehensivePrizePicksService:
         self.scraper_error_threshold = 3
         self.scraper_stale_minutes = 10
         self.current_projections: Dict[str, Any] = {}
-        self.historical_data: deque[Any] = deque(maxlen=10000)
-        self.player_trends: Dict[str, deque[Any]] = defaultdict(
-            lambda: deque(maxlen=100)
-        )
+        # Change feed: only new projections, line moves and status changes
+        self.historical_data: deque[ProjectionEvent] = deque(maxlen=10000)
+        self.projection_differ = ProjectionDiffer()
+        self.player_trends = PlayerLineHistory(capacity=100)
+        # Rolling last-10-line statistics for every player/stat
+        self.trend_engine = BatchTrendEngine(window=10)
         self.fetch_count: int = 0
         self.error_count: int = 0
         self.last_update: Optional[datetime] = None
@@ -114,6 +142,12 @@ class ComprehensivePrizePicksService:
         self.rate_limit_reset_time: float = time.time() + 3600
         self.min_request_interval: float = 5.0
         self.base_backoff_delay: float = 10.0
+        self.max_retries: int = 3
+        # "concurrent" fans out across leagues under an AIMD limiter with
+        # conditional requests; "sequential" is the original one-at-a-time path
+        self.ingestion_mode = ingestion_mode
+        self.league_fetcher: Optional[ConcurrentLeagueFetcher] = None
+        self.last_changed_leagues: Dict[str, bool] = {}
         self.data_cache: dict[str, Any] = {}
         self.cache_expiry: dict[str, float] = {}
         self.cache_duration: int = 300
@@ -142,20 +176,7 @@ class ComprehensivePrizePicksService:
 
     async def initialize(self):
         """Initialize the HTTP client and prepare the service for use"""
-        import os
-
-        user_agent_path = os.path.join(os.path.dirname(__file__), "../user_agent.txt")
-        user_agent_path = os.path.abspath(user_agent_path)
-        user_agent = None
-        if os.path.exists(user_agent_path):
-            with open(user_agent_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                for line in lines:
-                    if line.strip().lower().startswith("mozilla"):
-                        user_agent = line.strip()
-                        break
-        if not user_agent:
-            user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+        user_agent = load_user_agent()
         if not self.http_client:
             logger.info("🔧 Initializing PrizePicks HTTP client...")
             headers = {
@@ -188,6 +209,15 @@ class ComprehensivePrizePicksService:
         # Load existing projections from database for immediate access
         await self.load_existing_projections()
 
+    async def close(self):
+        """Close the HTTP clients owned by the service"""
+        if self.league_fetcher is not None:
+            await self.league_fetcher.aclose()
+            self.league_fetcher = None
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
     async def start_real_time_ingestion(self):
         """Stub for real-time ingestion. Starts periodic scraping."""
         await self.periodic_scrape_prizepicks_props()
@@ -411,6 +441,9 @@ class ComprehensivePrizePicksService:
 
     async def fetch_all_projections(self) -> List[Dict[str, Any]]:
         """Fetch ALL projections from PrizePicks API"""
+        if self.ingestion_mode == "concurrent":
+            return await self.fetch_all_projections_concurrent()
+
         all_projections = []
 
         try:
@@ -434,6 +467,53 @@ class ComprehensivePrizePicksService:
             logger.error(f"❌ Error fetching all projections: {e}")
             return []
 
+    def _get_league_fetcher(self) -> ConcurrentLeagueFetcher:
+        if self.league_fetcher is None:
+            self.league_fetcher = ConcurrentLeagueFetcher(
+                base_url=self.base_url,
+                limiter=AIMDRateLimiter(),
+                max_retries=self.max_retries,
+            )
+        return self.league_fetcher
+
+    async def fetch_all_projections_concurrent(self) -> List[Dict[str, Any]]:
+        """Fetch ALL projections with every league in flight at once.
+
+        Leagues whose board is unchanged since the last refresh come back as
+        304 and reuse the previously processed rows; ``last_changed_leagues``
+        records which leagues actually changed.
+        """
+        fetcher = self._get_league_fetcher()
+
+        try:
+            data, _ = await fetcher.get_json(f"{self.base_url}/leagues")
+            leagues = data.get("data", []) if data else DEFAULT_LEAGUES
+            league_ids = [league["id"] for league in leagues]
+
+            rows_by_league, changed = await fetcher.fetch_leagues(
+                league_ids, self.process_raw_projections
+            )
+            self.last_changed_leagues = changed
+            self.fetch_count += 1
+            self.last_update = datetime.now(timezone.utc)
+
+            all_projections = [
+                row for league_id in league_ids for row in rows_by_league[league_id]
+            ]
+            stats = fetcher.last_stats
+            logger.info(
+                f"📊 Fetched {len(all_projections)} total projections across "
+                f"{len(league_ids)} leagues in {stats.elapsed_seconds:.2f}s "
+                f"({stats.fetched} changed, {stats.not_modified} not modified, "
+                f"{stats.failed} failed, {stats.throttled} throttled)"
+            )
+            return all_projections
+
+        except Exception as e:
+            self.error_count += 1
+            logger.error(f"❌ Error fetching all projections concurrently: {e}")
+            return []
+
     async def _make_api_request(
         self, url: str, params: Dict[str, Any] = None
     ) -> Optional[Dict[str, Any]]:
@@ -459,42 +539,9 @@ class ComprehensivePrizePicksService:
                 if cache_key in self.cache_expiry:
                     del self.cache_expiry[cache_key]
 
-        # Rate limiting
-        current_time = time.time()
-        if current_time - self.last_request_time < self.rate_limit_delay:
-            await asyncio.sleep(
-                self.rate_limit_delay - (current_time - self.last_request_time)
-            )
-
         # Prepare headers to mimic a real browser and avoid bot detection
-        import os
-
-        user_agent_path = os.path.join(os.path.dirname(__file__), "../user_agent.txt")
-        user_agent_path = os.path.abspath(user_agent_path)
-        user_agent = None
-        if os.path.exists(user_agent_path):
-            with open(user_agent_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                for line in lines:
-                    if line.strip().lower().startswith("mozilla"):
-                        user_agent = line.strip()
-                        break
-        if not user_agent:
-            user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        headers = {
-            "User-Agent": user_agent,
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-origin",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        }
+        # (user agent is read from disk once per process)
+        headers = build_request_headers()
 
         # Add API key if available (not required for PrizePicks)
         # if self.api_key:
@@ -598,25 +645,11 @@ class ComprehensivePrizePicksService:
                 return leagues
             else:
                 logger.warning("⚠️ Failed to fetch leagues, using defaults")
-                return [
-                    {"id": "NBA", "name": "NBA"},
-                    {"id": "NFL", "name": "NFL"},
-                    {"id": "MLB", "name": "MLB"},
-                    {"id": "NHL", "name": "NHL"},
-                    {"id": "NCAAB", "name": "NCAAB"},
-                    {"id": "NCAAF", "name": "NCAAF"},
-                ]
+                return list(DEFAULT_LEAGUES)
 
         except Exception as e:
             logger.error(f"❌ Error fetching leagues: {e}")
-            return [
-                {"id": "NBA", "name": "NBA"},
-                {"id": "NFL", "name": "NFL"},
-                {"id": "MLB", "name": "MLB"},
-                {"id": "NHL", "name": "NHL"},
-                {"id": "NCAAB", "name": "NCAAB"},
-                {"id": "NCAAF", "name": "NCAAF"},
-            ]
+            return list(DEFAULT_LEAGUES)
 
     async def fetch_league_projections(self, league_id: str) -> List[Dict[str, Any]]:
         """Fetch all projections for a specific league"""
@@ -720,58 +753,50 @@ class ComprehensivePrizePicksService:
 
         return processed
 
-    async def process_projections(self, projections: List[Dict[str, Any]]) -> int:
-        """Process and store projections"""
+    def get_projection_changes(
+        self, since: Optional[datetime] = None, kinds: Optional[List[str]] = None
+    ) -> List[ProjectionEvent]:
+        """Return change events, optionally after ``since`` and of given kinds"""
+        return [
+            event
+            for event in self.historical_data
+            if (since is None or event.timestamp > since)
+            and (kinds is None or event.kind in kinds)
+        ]
+
+    async def process_projections(
+        self, projections: List[Dict[str, Any]], full_board: bool = False
+    ) -> int:
+        """Process and store projections that changed since the last scrape.
+
+        Unchanged projections are skipped by fingerprint. New projections and
+        line moves are appended to ``player_trends``; every change is also
+        published to ``historical_data`` as a ``ProjectionEvent``.
+
+        Returns:
+            Number of projections whose content changed
+        """
+        # Rows that fail to parse are not recorded, so the next scrape retries them
+        changed, events = self.projection_differ.diff(
+            projections, full_board, parse=PrizePicksProjection.from_raw
+        )
+        line_moves = {
+            event.projection_id
+            for event in events
+            if event.kind in ("new", "line_change")
+        }
+        now = time.time()
         processed_count = 0
 
-        for proj_data in projections:
+        for projection in changed:
             try:
-                # Create PrizePicksProjection object
-                projection = PrizePicksProjection(
-                    id=proj_data["id"],
-                    player_id=proj_data["player_id"],
-                    player_name=proj_data["player_name"],
-                    team=proj_data["team"],
-                    position=proj_data["position"],
-                    league=proj_data["league"],
-                    sport=proj_data["sport"],
-                    stat_type=proj_data["stat_type"],
-                    line_score=proj_data["line_score"],
-                    start_time=(
-                        datetime.fromisoformat(
-                            proj_data["start_time"].replace("Z", "+00:00")
-                        )
-                        if proj_data["start_time"]
-                        else datetime.now()
-                    ),
-                    status=proj_data["status"],
-                    description=proj_data["description"],
-                    rank=proj_data["rank"],
-                    is_promo=proj_data["is_promo"],
-                    updated_at=(
-                        datetime.fromisoformat(
-                            proj_data["updated_at"].replace("Z", "+00:00")
-                        )
-                        if proj_data["updated_at"]
-                        else datetime.now()
-                    ),
-                )
-
-                # Store in current projections
                 self.current_projections[projection.id] = projection
 
-                # Add to historical data
-                self.historical_data.append(projection)
-
-                # Update player trends
-                player_key = f"{projection.player_id}_{projection.stat_type}"
-                self.player_trends[player_key].append(
-                    {
-                        "timestamp": datetime.now(),
-                        "line": projection.line_score,
-                        "league": projection.league,
-                    }
-                )
+                if projection.id in line_moves:
+                    self.player_trends.append(
+                        projection.trend_key, now, projection.line_score, projection.league
+                    )
+                    self.trend_engine.update(projection.trend_key, projection.line_score)
 
                 # Store in database
                 # await self.store_projection_history(projection)
@@ -782,6 +807,16 @@ class ComprehensivePrizePicksService:
                 logger.warning(f"⚠️ Error processing projection: {e}")
                 continue
 
+        for event in events:
+            if event.kind == "removed":
+                self.current_projections.pop(event.projection_id, None)
+        self.historical_data.extend(events)
+
+        if events:
+            logger.info(
+                f"🔁 {processed_count} of {len(projections)} projections changed "
+                f"({len(events)} events)"
+            )
         return processed_count
 
         # async def store_projection_history(self, projection: Any):
@@ -1066,40 +1101,57 @@ class ComprehensivePrizePicksService:
         values = [game["actual_value"] for game in sorted_games]
 
         # Calculate simple linear trend
-        x = list(range(len(values)))
-        if len(x) > 1:
-            slope = np.polyfit(x, values, 1)[0]
-            return slope
-
-        return 0.0
+        return float(ols_slopes(np.asarray(values)[None, :])[0])
 
     def analyze_player_trends(self, player_id: str, stat_type: str) -> Dict[str, Any]:
         """Analyze player trends over time"""
         player_key = f"{player_id}_{stat_type}"
-        trends = self.player_trends.get(player_key, deque())
+        data_points = self.player_trends.count(player_key)
 
-        if len(trends) < 3:
-            return {"trend": "insufficient_data", "data_points": len(trends)}
+        if data_points < 3:
+            return {"trend": "insufficient_data", "data_points": data_points}
 
-        recent_lines = [t["line"] for t in list(trends)[-10:]]
+        stats = self.trend_engine.stats(player_key)
+        if stats is None:
+            # History recorded before the trend engine saw this key
+            _, recent_lines = self.player_trends.window(player_key, last=10)
+            for line in recent_lines:
+                self.trend_engine.update(player_key, float(line))
+            stats = self.trend_engine.stats(player_key)
 
         # Calculate trend direction
-        if len(recent_lines) >= 3:
-            slope = np.polyfit(range(len(recent_lines)), recent_lines, 1)[0]
-            if slope > 0.1:
-                trend = "increasing"
-            elif slope < -0.1:
-                trend = "decreasing"
-            else:
-                trend = "stable"
+        slope = stats["slope"]
+        if slope > 0.1:
+            trend = "increasing"
+        elif slope < -0.1:
+            trend = "decreasing"
         else:
             trend = "stable"
 
         return {
             "trend": trend,
-            "data_points": len(trends),
-            "recent_average": np.mean(recent_lines) if recent_lines else 0,
-            "volatility": np.std(recent_lines) if len(recent_lines) > 1 else 0,
+            "data_points": data_points,
+            "recent_average": stats["mean"],
+            "volatility": stats["volatility"],
+        }
+
+    def get_trend_snapshot(self) -> TrendSnapshot:
+        """Slope/mean/volatility arrays for every tracked player/stat"""
+        return self.trend_engine.snapshot()
+
+    def analyze_all_player_trends(self) -> Dict[str, Dict[str, Any]]:
+        """``analyze_player_trends`` for the whole board in one vectorized pass"""
+        snapshot = self.trend_engine.snapshot()
+        labels = snapshot.labels()
+        return {
+            key: {
+                "trend": labels[i],
+                "data_points": self.player_trends.count(key),
+                "recent_average": float(snapshot.means[i]),
+                "volatility": float(snapshot.volatilities[i]),
+                "slope": float(snapshot.slopes[i]),
+            }
+            for i, key in enumerate(snapshot.keys)
         }
 
     # def assess_risk(
@@ -1199,34 +1251,26 @@ class ComprehensivePrizePicksService:
             try:
                 high_value_opportunities = []
 
-                for projection_id, analysis in self.analysis_cache.items():
-                    if (
-                        abs(analysis.value_bet_score) > 0.05  # 5%+ value
-                        and analysis.confidence > 0.7  # High confidence
-                        and analysis.risk_assessment.get("risk_score", 1.0) < 0.3
-                    ):  # Low risk
-
-                        projection = self.current_projections.get(projection_id)
-                        if projection:
-                            opportunity = {
-                                "projection_id": projection_id,
-                                "player": projection.player_name,
-                                "stat_type": projection.stat_type,
-                                "line": projection.line_score,
-                                "predicted": analysis.predicted_value,
-                                "value_score": analysis.value_bet_score,
-                                "confidence": analysis.confidence,
-                                "recommendation": analysis.recommendation,
-                                "reasoning": analysis.reasoning,
-                            }
-                            high_value_opportunities.append(opportunity)
+                # Over 5% value, high confidence, low risk; already sorted by |value|
+                for projection_id, analysis in self.rank_value_opportunities(
+                    min_value=0.05, min_confidence=0.7, max_risk=0.3, strict=True
+                ):
+                    projection = self.current_projections.get(projection_id)
+                    if projection:
+                        opportunity = {
+                            "projection_id": projection_id,
+                            "player": projection.player_name,
+                            "stat_type": projection.stat_type,
+                            "line": projection.line_score,
+                            "predicted": analysis.predicted_value,
+                            "value_score": analysis.value_bet_score,
+                            "confidence": analysis.confidence,
+                            "recommendation": analysis.recommendation,
+                            "reasoning": analysis.reasoning,
+                        }
+                        high_value_opportunities.append(opportunity)
 
                 if high_value_opportunities:
-                    # Sort by value score
-                    high_value_opportunities.sort(
-                        key=lambda x: abs(x["value_score"]), reverse=True
-                    )
-
                     logger.info(
                         f"🎯 Found {len(high_value_opportunities)} high-value opportunities"
                     )
@@ -1245,6 +1289,37 @@ class ComprehensivePrizePicksService:
                 logger.error(f"❌ Error detecting opportunities: {e}")
                 await asyncio.sleep(60)
 
+    def rank_value_opportunities(
+        self,
+        min_value: float = 0.05,
+        min_confidence: float = 0.7,
+        max_risk: Optional[float] = None,
+        strict: bool = False,
+    ) -> List[Any]:
+        """Screen the whole analysis cache with array masks.
+
+        Returns:
+            (projection_id, analysis) pairs passing the screen, best |value| first
+        """
+        if not self.analysis_cache:
+            return []
+
+        ids = list(self.analysis_cache.keys())
+        analyses = list(self.analysis_cache.values())
+        count = len(analyses)
+        value_scores = np.fromiter((a.value_bet_score for a in analyses), float, count)
+        confidence = np.fromiter((a.confidence for a in analyses), float, count)
+        risk_scores = None
+        if max_risk is not None:
+            risk_scores = np.fromiter(
+                (a.risk_assessment.get("risk_score", 1.0) for a in analyses), float, count
+            )
+
+        selected = select_opportunities(
+            value_scores, confidence, risk_scores, min_value, min_confidence, max_risk, strict
+        )
+        return [(ids[i], analyses[i]) for i in selected]
+
     def clean_analysis_cache(self):
         """Clean old analysis cache entries"""
         current_time = time.time()
@@ -1317,25 +1392,21 @@ class ComprehensivePrizePicksService:
         """Get high-value betting opportunities"""
         opportunities = []
 
-        for projection_id, analysis in self.analysis_cache.items():
-            if (
-                abs(analysis.value_bet_score) >= min_value
-                and analysis.confidence >= min_confidence
-            ):
-
-                projection = self.current_projections.get(projection_id)
-                if projection:
-                    opportunities.append(
-                        {
-                            "projection": projection,
-                            "analysis": analysis,
-                            "value_score": analysis.value_bet_score,
-                            "confidence": analysis.confidence,
-                        }
-                    )
+        # Sorted by value score
+        for projection_id, analysis in self.rank_value_opportunities(
+            min_value, min_confidence
+        ):
+            projection = self.current_projections.get(projection_id)
+            if projection:
+                opportunities.append(
+                    {
+                        "projection": projection,
+                        "analysis": analysis,
+                        "value_score": analysis.value_bet_score,
+                        "confidence": analysis.confidence,
+                    }
+                )
 
-        # Sort by value score
-        opportunities.sort(key=lambda x: abs(x["value_score"]), reverse=True)
         return opportunities
 
     # Duplicate scrape_prizepicks_props method removed. Use the main async method defined earlier.
@@ -0,0 +1,161 @@
+"""
+Dense feature matrices with versioned column schemas
+
+The feature engines produce one ``Dict[str, float]`` per prop, which models
+then turn back into arrays row by row. ``FeatureSchema`` pins the column
+order (and a version plus a fingerprint of the column list) so a batch of
+props can be written straight into one contiguous float32 matrix that goes
+to ``model.predict`` as-is, and so a model can refuse a matrix built with a
+different schema.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import pandas as pd
+
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+FEATURE_DTYPE = np.float32
+
+Rows = Union[Sequence[Mapping[str, Any]], "pd.DataFrame"]
+
+
+@dataclass(frozen=True)
+class FeatureSchema:
+    """Ordered, versioned list of feature columns"""
+
+    name: str
+    version: int
+    columns: Tuple[str, ...]
+    index: Dict[str, int] = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self):
+        if len(set(self.columns)) != len(self.columns):
+            raise ValueError(f"Duplicate columns in feature schema {self.name}")
+        object.__setattr__(self, "index", {c: i for i, c in enumerate(self.columns)})
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash of the column list; changes whenever columns change"""
+        digest = hashlib.sha1("\x1f".join(self.columns).encode()).hexdigest()
+        return digest[:12]
+
+    @property
+    def schema_id(self) -> str:
+        return f"{self.name}/v{self.version}/{self.fingerprint}"
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def empty(self, n_rows: int, fill: float = 0.0) -> np.ndarray:
+        return np.full((n_rows, len(self.columns)), fill, dtype=FEATURE_DTYPE)
+
+    def from_dicts(
+        self,
+        rows: Sequence[Mapping[str, float]],
+        fill: float = 0.0,
+        rename: Optional[Callable[[int, str], str]] = None,
+    ) -> np.ndarray:
+        """Scatter per-row feature dicts into a matrix; unknown keys are ignored.
+
+        ``rename(row_number, key)`` optionally maps a key to its schema column.
+        """
+        matrix = self.empty(len(rows), fill)
+        index = self.index
+        for r, row in enumerate(rows):
+            for key, value in row.items():
+                column = index.get(rename(r, key) if rename else key)
+                if column is not None:
+                    matrix[r, column] = value
+        return matrix
+
+    def to_dict(self, row: np.ndarray) -> Dict[str, float]:
+        """One matrix row back to the dict form used by the scalar APIs"""
+        return dict(zip(self.columns, row.tolist()))
+
+
+@dataclass
+class FeatureMatrix:
+    """A (rows × schema columns) float32 matrix plus row identifiers"""
+
+    values: np.ndarray
+    schema: FeatureSchema
+    row_ids: List[Any] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.values = np.ascontiguousarray(self.values, dtype=FEATURE_DTYPE)
+        if self.values.ndim != 2 or self.values.shape[1] != len(self.schema):
+            raise ValueError(
+                f"Matrix shape {self.values.shape} does not match schema "
+                f"{self.schema.schema_id} ({len(self.schema)} columns)"
+            )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.schema.index[name]]
+
+    def row_dict(self, row: int) -> Dict[str, float]:
+        return self.schema.to_dict(self.values[row])
+
+    def check_schema(self, expected: FeatureSchema) -> None:
+        """Raise if this matrix was not built with ``expected``"""
+        if self.schema.schema_id != expected.schema_id:
+            raise ValueError(
+                f"Feature schema mismatch: got {self.schema.schema_id}, "
+                f"expected {expected.schema_id}"
+            )
+
+    def to_frame(self):
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required for FeatureMatrix.to_frame")
+        return pd.DataFrame(self.values, columns=list(self.schema.columns), index=self.row_ids or None)
+
+
+def as_records(rows: Rows) -> List[Mapping[str, Any]]:
+    """Accept a list of dicts or a DataFrame of props"""
+    if PANDAS_AVAILABLE and isinstance(rows, pd.DataFrame):
+        return rows.to_dict("records")
+    return list(rows)
+
+
+def numeric_value(raw: Any, default: float = 0.0) -> float:
+    """One prop field as a float; missing, empty or non-numeric values give ``default``"""
+    if raw is None or raw == "":
+        return default
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+def numeric_column(
+    rows: Rows, key: str, default: float = 0.0, dtype=np.float64
+) -> np.ndarray:
+    """One prop field for every row, missing or empty values set to ``default``"""
+    if PANDAS_AVAILABLE and isinstance(rows, pd.DataFrame):
+        if key not in rows:
+            return np.full(len(rows), default, dtype=dtype)
+        values = pd.to_numeric(rows[key], errors="coerce")
+        return values.fillna(default).to_numpy(dtype=dtype)
+
+    return np.fromiter(
+        (numeric_value(row.get(key), default) for row in rows), dtype=dtype, count=len(rows)
+    )
+
+
+def object_column(rows: Rows, key: str, default: Any = None) -> np.ndarray:
+    if PANDAS_AVAILABLE and isinstance(rows, pd.DataFrame):
+        if key not in rows:
+            return np.full(len(rows), default, dtype=object)
+        return rows[key].to_numpy(dtype=object)
+    return np.array([row.get(key, default) for row in rows], dtype=object)
@@ -0,0 +1,256 @@
+"""
+Feature Pipeline - declarative stage DAG with scoped memoization
+
+Each feature stage declares the context fields it reads, the stages it
+depends on and a cache scope. Stages in the same topological level run
+concurrently, and a stage's output is memoized (with a TTL) under the key
+of its scope, so every prop in a game shares one venue/weather/referee/
+game-script computation and every prop for a player shares the player-level
+stages. Engineering a slate then costs roughly one run per distinct game and
+player for shared stages, rather than props × stages. The key also carries
+a fingerprint of the stage's declared inputs, so props that share a game or
+player but carry different raw data for a stage do not share its output.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+StageResult = Dict[str, float]
+
+
+class CacheScope(Enum):
+    """What a stage's output is shared across"""
+    GAME = "game"      # every prop in the same game
+    PLAYER = "player"  # every prop for a player in a game
+    PROP = "prop"      # a single player/prop in a game
+    NONE = "none"      # never cached
+
+
+@dataclass(frozen=True)
+class PropContext:
+    """Inputs for one player/prop"""
+    player_name: str
+    sport: str
+    prop_type: str
+    raw_data: Dict[str, Any] = field(default_factory=dict, hash=False, compare=False)
+
+    @property
+    def game_id(self) -> Optional[str]:
+        for key in ("game_id", "event_id", "match_id"):
+            if self.raw_data.get(key):
+                return str(self.raw_data[key])
+        return None
+
+    def input_fingerprint(
+        self, inputs: Sequence[str], raw_fields: Optional[Sequence[str]] = None
+    ) -> str:
+        """Short hash of the named context fields (e.g. ``raw_data``).
+
+        With ``raw_fields`` only those ``raw_data`` keys are hashed, so a
+        game-level stage is not split by prop-level fields like ``line_score``.
+        """
+        raw_data = self.raw_data
+        if raw_fields is not None:
+            raw_data = {key: raw_data[key] for key in raw_fields if key in raw_data}
+        payload = json.dumps(
+            [raw_data if name == "raw_data" else getattr(self, name) for name in inputs],
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+    def scope_key(
+        self,
+        scope: CacheScope,
+        inputs: Sequence[str] = (),
+        raw_fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Tuple]:
+        """Cache key for ``scope`` and the stage ``inputs``; None when the context cannot be shared"""
+        if scope == CacheScope.NONE or not self.game_id:
+            return None
+        fingerprint = self.input_fingerprint(inputs, raw_fields)
+        sport = self.sport.lower()
+        if scope == CacheScope.GAME:
+            return (sport, self.game_id, fingerprint)
+        if scope == CacheScope.PLAYER:
+            return (sport, self.game_id, self.player_name, fingerprint)
+        return (sport, self.game_id, self.player_name, self.prop_type, fingerprint)
+
+
+@dataclass
+class FeatureStage:
+    """A node in the feature DAG"""
+    name: str
+    func: Callable[[PropContext, Dict[str, StageResult]], Awaitable[StageResult]]
+    scope: CacheScope = CacheScope.PROP
+    depends_on: Tuple[str, ...] = ()
+    inputs: Tuple[str, ...] = ()
+    # raw_data keys the stage reads; None means all of raw_data
+    raw_fields: Optional[Tuple[str, ...]] = None
+    ttl_seconds: float = 300.0
+
+
+@dataclass
+class StageStats:
+    runs: int = 0
+    cache_hits: int = 0
+    total_time: float = 0.0
+
+
+class FeatureDAG:
+    """Runs feature stages in dependency order with shared memoization"""
+
+    def __init__(self, max_cache_entries: int = 50000):
+        self.stages: Dict[str, FeatureStage] = {}
+        self.max_cache_entries = max_cache_entries
+        self._cache: "OrderedDict[Tuple, Tuple[float, StageResult]]" = OrderedDict()
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        self._levels: Optional[List[List[str]]] = None
+        self.stats: Dict[str, StageStats] = {}
+
+    def add_stage(self, stage: FeatureStage) -> "FeatureDAG":
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate feature stage: {stage.name}")
+        self.stages[stage.name] = stage
+        self.stats[stage.name] = StageStats()
+        self._levels = None
+        return self
+
+    @property
+    def levels(self) -> List[List[str]]:
+        """Stages grouped into topological levels (Kahn's algorithm)"""
+        if self._levels is None:
+            remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+            for name, deps in remaining.items():
+                missing = deps - set(self.stages)
+                if missing:
+                    raise ValueError(f"Stage {name} depends on unknown stages: {sorted(missing)}")
+
+            levels = []
+            while remaining:
+                ready = [name for name, deps in remaining.items() if not deps]
+                if not ready:
+                    raise ValueError(f"Cycle in feature DAG: {sorted(remaining)}")
+                levels.append(ready)
+                for name in ready:
+                    del remaining[name]
+                for deps in remaining.values():
+                    deps.difference_update(ready)
+            self._levels = levels
+        return self._levels
+
+    def _cache_get(self, key: Tuple) -> Optional[StageResult]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: Tuple, value: StageResult, ttl: float) -> None:
+        self._cache[key] = (time.monotonic() + ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+    async def _run_stage(
+        self, stage: FeatureStage, context: PropContext, upstream: Dict[str, StageResult]
+    ) -> StageResult:
+        stats = self.stats[stage.name]
+        scope_key = context.scope_key(stage.scope, stage.inputs, stage.raw_fields)
+        key = (stage.name,) + scope_key if scope_key is not None else None
+
+        if key is not None:
+            cached = self._cache_get(key)
+            if cached is not None:
+                stats.cache_hits += 1
+                return cached
+            # Another prop in the slate is already computing this scope
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                stats.cache_hits += 1
+                return await asyncio.shield(pending)
+            pending = asyncio.get_running_loop().create_future()
+            self._in_flight[key] = pending
+
+        start_time = time.perf_counter()
+        try:
+            result = await stage.func(context, upstream)
+        except Exception as e:
+            if key is not None:
+                self._in_flight.pop(key, None)
+                pending.set_exception(e)
+                # Consumed by waiters, if any; avoid "never retrieved" warnings
+                pending.exception()
+            raise
+        stats.runs += 1
+        stats.total_time += time.perf_counter() - start_time
+
+        if key is not None:
+            self._cache_put(key, result, stage.ttl_seconds)
+            self._in_flight.pop(key, None)
+            pending.set_result(result)
+        return result
+
+    async def run(self, context: PropContext) -> Dict[str, StageResult]:
+        """Execute every stage for one prop; returns outputs by stage name"""
+        outputs: Dict[str, StageResult] = {}
+        for level in self.levels:
+            results = await asyncio.gather(*(
+                self._run_stage(
+                    self.stages[name],
+                    context,
+                    {dep: outputs[dep] for dep in self.stages[name].depends_on},
+                )
+                for name in level
+            ))
+            outputs.update(zip(level, results))
+        # Registration order, so downstream dict merges are deterministic
+        return {name: outputs[name] for name in self.stages}
+
+    async def run_many(self, contexts: List[PropContext]) -> List[Dict[str, StageResult]]:
+        """Execute the DAG for a whole slate concurrently"""
+        return await asyncio.gather(*(self.run(context) for context in contexts))
+
+    def invalidate(self, scope_key: Optional[Tuple] = None) -> int:
+        """Drop cached outputs (all, or those whose scope key starts with ``scope_key``)
+
+        ``("nba", "g1")`` drops every stage output for that game; add the
+        player name to drop just that player's outputs.
+        """
+        if scope_key is None:
+            count = len(self._cache)
+            self._cache.clear()
+            return count
+        prefix = tuple(scope_key)
+        doomed = [key for key in self._cache if key[1:1 + len(prefix)] == prefix]
+        for key in doomed:
+            del self._cache[key]
+        return len(doomed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cache_entries": len(self._cache),
+            "levels": self.levels,
+            "stages": {
+                name: {
+                    "scope": self.stages[name].scope.value,
+                    "runs": stats.runs,
+                    "cache_hits": stats.cache_hits,
+                    "avg_time_ms": stats.total_time / stats.runs * 1000 if stats.runs else 0.0,
+                }
+                for name, stats in self.stats.items()
+            },
+        }
@@ -0,0 +1,82 @@
+"""
+Feature Registry - feature configs plus versioned feature-set schemas
+
+A feature set (``"unified"``, ``"comprehensive_features"``) is pinned to
+one ``FeatureSchema`` at a time. Registering different columns for it
+yields the next version. With an offline store attached, the known
+versions are read back from its ``feature_schemas`` tables first, so a
+fresh process continues the stored numbering instead of restarting at v1
+and colliding with tables written by an earlier run.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .feature_matrix import FeatureSchema
+from .feature_store import OfflineFeatureStore
+
+
+class FeatureRegistry:
+    def __init__(self, offline_store: Optional[OfflineFeatureStore] = None):
+        self.registry: Dict[str, Any] = {}
+        self.schemas: Dict[str, List[FeatureSchema]] = {}
+        self.offline_store = offline_store
+
+    def register_feature(self, name: str, config: Dict[str, Any]):
+        self.registry[name] = config
+
+    def get_feature(self, name: str) -> Dict[str, Any]:
+        return self.registry.get(name, {})
+
+    def list_features(self):
+        return list(self.registry.keys())
+
+    def remove_feature(self, name: str):
+        if name in self.registry:
+            del self.registry[name]
+
+    def _versions(self, name: str) -> List[FeatureSchema]:
+        """Known versions of ``name`` in version order, loaded from the store once"""
+        if name not in self.schemas:
+            stored = self.offline_store.stored_schemas(name) if self.offline_store else []
+            self.schemas[name] = stored
+        return self.schemas[name]
+
+    def register_schema(self, name: str, columns: Sequence[str]) -> FeatureSchema:
+        """Schema for ``columns``: a known version with those columns, else the next version"""
+        columns = tuple(columns)
+        versions = self._versions(name)
+        for schema in reversed(versions):
+            if schema.columns == columns:
+                return schema
+        version = versions[-1].version + 1 if versions else 1
+        schema = FeatureSchema(name=name, version=version, columns=columns)
+        versions.append(schema)
+        return schema
+
+    def feature_set_schema(self, name: str, columns: Optional[Sequence[str]] = None) -> Optional[FeatureSchema]:
+        """Current schema of a feature set, independent of any one call's output.
+
+        Explicit ``columns`` define (or re-version) the set. Otherwise the
+        latest known version is used, then the registered feature names.
+        None if the set has no definition yet.
+        """
+        if columns is not None:
+            return self.register_schema(name, columns)
+        versions = self._versions(name)
+        if versions:
+            return versions[-1]
+        if self.registry:
+            return self.register_schema(name, self.list_features())
+        return None
+
+    def get_schema(self, name: str, version: Optional[int] = None) -> FeatureSchema:
+        """Latest (or a specific) registered version; KeyError if unknown"""
+        versions = self._versions(name)
+        if not versions:
+            raise KeyError(f"No feature schema registered for {name}")
+        if version is None:
+            return versions[-1]
+        for schema in versions:
+            if schema.version == version:
+                return schema
+        raise KeyError(f"Feature schema {name} has no version {version}")
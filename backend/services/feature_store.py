@@ -0,0 +1,565 @@
+"""
+Two-tier feature store keyed by a versioned ``FeatureSchema``
+
+Engineered features used to live in per-process dicts (an unbounded
+``FeatureCache``, ``ComprehensiveFeatureEngine.feature_cache``), so every
+process recomputed them and training rebuilt history from scratch. Here
+both tiers store the same float32 row layout for one ``FeatureSchema``:
+
+* online: a bounded LRU with optional TTL in front of an optional Redis
+  (row bytes + event time per entity), for serving the latest features;
+* offline: one SQLite file per sport, one table per schema version, rows
+  append-only with an indexed event date, for point-in-time training
+  lookups (``merge_asof`` of the requested timestamps against each
+  entity's history, so a training row only sees features written at or
+  before its own time).
+
+A table remembers the fingerprint of the columns it was created with; a
+schema whose columns changed must come with a new version, which
+``FeatureRegistry`` numbers from the stored ``feature_schemas`` tables.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .feature_matrix import FEATURE_DTYPE, FeatureMatrix, FeatureSchema, Rows, as_records
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+Timestamp = Union[float, int, str, datetime, date, None]
+
+
+def to_epoch(value: Timestamp) -> float:
+    """Unix seconds from a datetime, date, ISO string or number (None = now)"""
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def event_date(epoch: float) -> str:
+    """UTC date partition of an event time"""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).date().isoformat()
+
+
+class TTLCache:
+    """Bounded LRU with a per-entry time to live.
+
+    ``set`` evicts the least recently used entry once ``max_size`` is
+    exceeded (expired entries are purged first), so memory stays bounded
+    whether or not anything is ever read back.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires, value = entry
+        if expires < time.time():
+            del self.cache[key]
+            self.misses += 1
+            return default
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self.cache[key] = (time.time() + ttl if ttl else float("inf"), value)
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.max_size:
+            self.purge_expired()
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.cache.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        expired = [key for key, (expires, _) in self.cache.items() if expires < now]
+        for key in expired:
+            del self.cache[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_MISSING = object()
+
+# Redis value: 8-byte event time followed by the float32 row
+_TIME_BYTES = np.dtype(np.float64).itemsize
+
+
+class OnlineFeatureStore:
+    """Latest feature row per (schema, entity): bounded LRU, then Redis"""
+
+    def __init__(
+        self,
+        max_entries: int = 50000,
+        ttl: Optional[float] = None,
+        redis_client: Any = None,
+        redis_ttl: Optional[int] = None,
+        key_prefix: str = "features",
+    ):
+        self.cache = TTLCache(max_size=max_entries, ttl=ttl)
+        self.redis = redis_client
+        self.redis_ttl = redis_ttl
+        self.key_prefix = key_prefix
+        self.redis_errors = 0
+
+    @classmethod
+    def from_url(cls, redis_url: Optional[str], **kwargs) -> "OnlineFeatureStore":
+        """LRU-only store unless a Redis URL is given and redis is installed"""
+        client = None
+        if redis_url and REDIS_AVAILABLE:
+            client = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+        elif redis_url:
+            logger.warning("redis is not installed; online feature store is in-process only")
+        return cls(redis_client=client, **kwargs)
+
+    def _key(self, schema: FeatureSchema, entity_id: Hashable) -> str:
+        return f"{self.key_prefix}:{schema.schema_id}:{entity_id}"
+
+    def _redis_failed(self, operation: str, error: Exception) -> None:
+        self.redis_errors += 1
+        logger.warning(f"Feature store Redis {operation} failed, using in-process tier: {error}")
+
+    def put(
+        self, schema: FeatureSchema, entity_ids: Sequence[Hashable], values: np.ndarray, event_times: np.ndarray
+    ) -> None:
+        values = np.ascontiguousarray(values, dtype=FEATURE_DTYPE)
+        keys = [self._key(schema, entity_id) for entity_id in entity_ids]
+        for key, row, event_time in zip(keys, values, event_times):
+            self.cache.set(key, (row.copy(), float(event_time)))
+
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, row, event_time in zip(keys, values, event_times):
+                pipe.set(key, np.float64(event_time).tobytes() + row.tobytes(), ex=self.redis_ttl)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed("write", e)
+
+    def get(
+        self, schema: FeatureSchema, entity_ids: Sequence[Hashable], fill: float = np.nan
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows for ``entity_ids`` plus their event times (NaN where not found)"""
+        values = schema.empty(len(entity_ids), fill)
+        event_times = np.full(len(entity_ids), np.nan)
+        keys = [self._key(schema, entity_id) for entity_id in entity_ids]
+
+        missing = []
+        for i, key in enumerate(keys):
+            entry = self.cache.get(key)
+            if entry is None:
+                missing.append(i)
+            else:
+                values[i], event_times[i] = entry
+
+        if missing and self.redis is not None:
+            try:
+                payloads = self.redis.mget([keys[i] for i in missing])
+            except Exception as e:
+                self._redis_failed("read", e)
+                payloads = []
+            for i, payload in zip(missing, payloads):
+                if payload is None:
+                    continue
+                event_time = float(np.frombuffer(payload[:_TIME_BYTES], dtype=np.float64)[0])
+                row = np.frombuffer(payload[_TIME_BYTES:], dtype=FEATURE_DTYPE)
+                values[i], event_times[i] = row, event_time
+                self.cache.set(keys[i], (row, event_time))
+        return values, event_times
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.cache.get_stats(), "redis": self.redis is not None, "redis_errors": self.redis_errors}
+
+
+_TABLE_NAME = re.compile(r"[^0-9A-Za-z_]")
+
+
+class OfflineFeatureStore:
+    """Append-only feature history, one SQLite file per sport.
+
+    Rows are (entity_id, event_time, event_date, written_at, features) with
+    the features as one float32 blob, so wide schemas don't run into SQLite's
+    column limit and reads are a single ``np.frombuffer``.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._connections: Dict[str, sqlite3.Connection] = {}
+        self._tables: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.RLock()
+
+    def _connection(self, sport: str) -> sqlite3.Connection:
+        sport = _TABLE_NAME.sub("_", str(sport).lower()) or "default"
+        connection = self._connections.get(sport)
+        if connection is None:
+            connection = sqlite3.connect(os.path.join(self.root, f"{sport}.sqlite"), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS feature_schemas "
+                "(table_name TEXT PRIMARY KEY, schema_id TEXT NOT NULL, columns TEXT NOT NULL)"
+            )
+            self._connections[sport] = connection
+        return connection
+
+    def _table(self, schema: FeatureSchema, sport: str) -> Tuple[sqlite3.Connection, str]:
+        """Create (or check) the table holding ``schema`` for ``sport``"""
+        connection = self._connection(sport)
+        table = f"{_TABLE_NAME.sub('_', schema.name)}_v{int(schema.version)}"
+        if self._tables.get((sport, table)) == schema.schema_id:
+            return connection, table
+
+        row = connection.execute(
+            "SELECT schema_id FROM feature_schemas WHERE table_name = ?", (table,)
+        ).fetchone()
+        if row is not None and row[0] != schema.schema_id:
+            raise ValueError(
+                f"Feature schema {schema.schema_id} conflicts with stored {row[0]}; "
+                f"register a new version for changed columns"
+            )
+        if row is None:
+            with connection:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (entity_id TEXT NOT NULL, event_time REAL NOT NULL, "
+                    f"event_date TEXT NOT NULL, written_at REAL NOT NULL, features BLOB NOT NULL)"
+                )
+                connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_entity ON {table} (entity_id, event_time)")
+                connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_date ON {table} (event_date)")
+                connection.execute(
+                    "INSERT INTO feature_schemas VALUES (?, ?, ?)",
+                    (table, schema.schema_id, json.dumps(list(schema.columns))),
+                )
+        self._tables[(sport, table)] = schema.schema_id
+        return connection, table
+
+    def write(
+        self,
+        schema: FeatureSchema,
+        sport: str,
+        entity_ids: Sequence[Hashable],
+        values: np.ndarray,
+        event_times: Sequence[float],
+    ) -> int:
+        values = np.ascontiguousarray(values, dtype=FEATURE_DTYPE)
+        written_at = time.time()
+        records = [
+            (str(entity_id), float(event_time), event_date(event_time), written_at, row.tobytes())
+            for entity_id, row, event_time in zip(entity_ids, values, event_times)
+        ]
+        with self._lock:
+            connection, table = self._table(schema, sport)
+            with connection:
+                connection.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?)", records)
+        return len(records)
+
+    def history(
+        self,
+        schema: FeatureSchema,
+        sport: str,
+        entity_ids: Optional[Sequence[Hashable]] = None,
+        start: Timestamp = None,
+        end: Timestamp = None,
+    ) -> pd.DataFrame:
+        """Stored rows as (entity_id, event_time, row index) plus the stacked values.
+
+        The frame's ``row`` column indexes ``frame.attrs["values"]``.
+        """
+        clauses, params = [], []
+        if entity_ids is not None:
+            unique = list(dict.fromkeys(str(entity_id) for entity_id in entity_ids))
+            clauses.append(f"entity_id IN ({','.join('?' * len(unique))})")
+            params.extend(unique)
+        if start is not None:
+            clauses.append("event_time >= ?")
+            params.append(to_epoch(start))
+        if end is not None:
+            clauses.append("event_time <= ?")
+            params.append(to_epoch(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            connection, table = self._table(schema, sport)
+            rows = connection.execute(
+                f"SELECT entity_id, event_time, features FROM {table}{where} ORDER BY event_time, written_at",
+                params,
+            ).fetchall()
+
+        frame = pd.DataFrame(
+            {
+                "entity_id": [row[0] for row in rows],
+                "event_time": np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows)),
+                "row": np.arange(len(rows)),
+            }
+        )
+        frame.attrs["values"] = (
+            np.frombuffer(b"".join(row[2] for row in rows), dtype=FEATURE_DTYPE).reshape(len(rows), len(schema))
+            if rows
+            else schema.empty(0)
+        )
+        return frame
+
+    def as_of(
+        self,
+        schema: FeatureSchema,
+        sport: str,
+        entity_ids: Sequence[Hashable],
+        timestamps: Sequence[float],
+        max_age: Optional[float] = None,
+        fill: float = np.nan,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Point-in-time rows: each entity's latest features at or before its timestamp.
+
+        Returns the (requests × columns) matrix and the matched event times;
+        rows with no history (or only history older than ``max_age`` seconds)
+        are ``fill`` / NaN.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = schema.empty(len(entity_ids), fill)
+        event_times = np.full(len(entity_ids), np.nan)
+        if not len(entity_ids):
+            return values, event_times
+
+        start = timestamps.min() - max_age if max_age is not None else None
+        history = self.history(schema, sport, entity_ids, start=start, end=timestamps.max())
+        if history.empty:
+            return values, event_times
+
+        requests = pd.DataFrame(
+            {"entity_id": [str(entity_id) for entity_id in entity_ids], "timestamp": timestamps,
+             "request": np.arange(len(entity_ids))}
+        ).sort_values("timestamp", kind="stable")
+        matched = pd.merge_asof(
+            requests,
+            history,
+            left_on="timestamp",
+            right_on="event_time",
+            by="entity_id",
+            direction="backward",
+            tolerance=max_age,
+            allow_exact_matches=True,
+        ).dropna(subset=["row"])
+
+        request_index = matched["request"].to_numpy(dtype=np.intp)
+        values[request_index] = history.attrs["values"][matched["row"].to_numpy(dtype=np.intp)]
+        event_times[request_index] = matched["event_time"].to_numpy()
+        return values, event_times
+
+    def partitions(self, schema: FeatureSchema, sport: str) -> List[Tuple[str, int]]:
+        """(event_date, row count) per date partition"""
+        with self._lock:
+            connection, table = self._table(schema, sport)
+            return connection.execute(
+                f"SELECT event_date, COUNT(*) FROM {table} GROUP BY event_date ORDER BY event_date"
+            ).fetchall()
+
+    def stored_schemas(self, name: str) -> List[FeatureSchema]:
+        """Every version of feature set ``name`` recorded in any sport's file, by version"""
+        versions: Dict[int, FeatureSchema] = {}
+        with self._lock:
+            for filename in sorted(os.listdir(self.root)):
+                if not filename.endswith(".sqlite"):
+                    continue
+                connection = self._connection(filename[: -len(".sqlite")])
+                for schema_id, columns in connection.execute("SELECT schema_id, columns FROM feature_schemas"):
+                    schema_name, version, _ = schema_id.rsplit("/", 2)
+                    if schema_name == name:
+                        versions.setdefault(
+                            int(version[1:]),
+                            FeatureSchema(name=name, version=int(version[1:]), columns=tuple(json.loads(columns))),
+                        )
+        return [versions[version] for version in sorted(versions)]
+
+    def drop_before(self, schema: FeatureSchema, sport: str, before: Timestamp) -> int:
+        """Delete date partitions older than ``before``; returns rows removed"""
+        cutoff = event_date(to_epoch(before))
+        with self._lock:
+            connection, table = self._table(schema, sport)
+            with connection:
+                return connection.execute(f"DELETE FROM {table} WHERE event_date < ?", (cutoff,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+            self._tables.clear()
+
+
+class FeatureStore:
+    """Write once, then serve latest (online) or point-in-time (offline) rows"""
+
+    def __init__(
+        self,
+        online: Optional[OnlineFeatureStore] = None,
+        offline: Optional[OfflineFeatureStore] = None,
+    ):
+        self.online = online if online is not None else OnlineFeatureStore()
+        self.offline = offline
+
+    @classmethod
+    def from_env(cls, max_entries: int = 50000) -> "FeatureStore":
+        """Redis online tier from ``FEATURE_STORE_REDIS_URL``, offline tier under ``FEATURE_STORE_PATH`` (each if set)"""
+        path = os.getenv("FEATURE_STORE_PATH")
+        return cls(
+            online=OnlineFeatureStore.from_url(os.getenv("FEATURE_STORE_REDIS_URL"), max_entries=max_entries),
+            offline=OfflineFeatureStore(path) if path else None,
+        )
+
+    def write(
+        self,
+        schema: FeatureSchema,
+        entity_id: Hashable,
+        features: Union[Mapping[str, float], np.ndarray],
+        sport: str = "default",
+        event_time: Timestamp = None,
+    ) -> None:
+        """Store one entity's features (a dict in any key order, or a schema-ordered row)"""
+        row = schema.from_dicts([features]) if isinstance(features, Mapping) else np.atleast_2d(features)
+        self.write_matrix(FeatureMatrix(row, schema, [entity_id]), sport, [to_epoch(event_time)])
+
+    def write_matrix(
+        self,
+        matrix: FeatureMatrix,
+        sport: str = "default",
+        event_times: Optional[Sequence[Timestamp]] = None,
+    ) -> None:
+        """Store every row of a matrix; ``row_ids`` are the entity ids"""
+        if len(matrix.row_ids) != matrix.shape[0]:
+            raise ValueError("FeatureMatrix.row_ids must name the entity of every row")
+        if event_times is None:
+            epochs = np.full(matrix.shape[0], time.time())
+        else:
+            epochs = np.array([to_epoch(t) for t in event_times], dtype=np.float64)
+        self.online.put(matrix.schema, matrix.row_ids, matrix.values, epochs)
+        if self.offline is not None:
+            self.offline.write(matrix.schema, sport, matrix.row_ids, matrix.values, epochs)
+
+    def get_online(
+        self,
+        schema: FeatureSchema,
+        entity_ids: Sequence[Hashable],
+        sport: Optional[str] = None,
+        fill: float = np.nan,
+    ) -> Tuple[FeatureMatrix, np.ndarray]:
+        """Latest rows for serving, plus a found mask.
+
+        Entities the online tier doesn't hold are read from the offline
+        tier's latest row (when ``sport`` is given) and warm the online tier.
+        """
+        entity_ids = list(entity_ids)
+        values, event_times = self.online.get(schema, entity_ids, fill)
+        found = ~np.isnan(event_times)
+
+        if self.offline is not None and sport is not None and not found.all():
+            missing = np.flatnonzero(~found)
+            missing_ids = [entity_ids[i] for i in missing]
+            rows, times = self.offline.as_of(
+                schema, sport, missing_ids, np.full(len(missing), np.inf), fill=fill
+            )
+            loaded = ~np.isnan(times)
+            values[missing[loaded]] = rows[loaded]
+            found[missing[loaded]] = True
+            if loaded.any():
+                self.online.put(
+                    schema, [missing_ids[i] for i in np.flatnonzero(loaded)], rows[loaded], times[loaded]
+                )
+        return FeatureMatrix(values, schema, entity_ids), found
+
+    def get_historical(
+        self,
+        schema: FeatureSchema,
+        entity_rows: Rows,
+        sport: Optional[str] = None,
+        max_age: Optional[float] = None,
+        fill: float = np.nan,
+    ) -> Tuple[FeatureMatrix, np.ndarray]:
+        """Point-in-time correct training matrix, plus a found mask.
+
+        ``entity_rows`` has ``entity_id`` and ``timestamp`` per row (and
+        ``sport`` unless passed for all rows). Each row gets the features
+        that were stored at or before its own timestamp, never later ones.
+        """
+        if self.offline is None:
+            raise RuntimeError("Feature store has no offline tier configured")
+        records = as_records(entity_rows)
+        entity_ids = [record["entity_id"] for record in records]
+        timestamps = np.array([to_epoch(record["timestamp"]) for record in records], dtype=np.float64)
+        sports = np.array([sport or record.get("sport") or "default" for record in records], dtype=object)
+
+        values = schema.empty(len(records), fill)
+        found = np.zeros(len(records), dtype=bool)
+        for group_sport in dict.fromkeys(sports):
+            rows = np.flatnonzero(sports == group_sport)
+            group_values, event_times = self.offline.as_of(
+                schema, group_sport, [entity_ids[i] for i in rows], timestamps[rows], max_age, fill
+            )
+            values[rows] = group_values
+            found[rows] = ~np.isnan(event_times)
+        return FeatureMatrix(values, schema, entity_ids), found
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"online": self.online.get_stats(), "offline": self.offline.root if self.offline else None}
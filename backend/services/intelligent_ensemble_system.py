@@ -20,6 +20,10 @@ import httpx
 import numpy as np
 from cachetools import TTLCache
 
+from .feature_matrix import FeatureMatrix, FeatureSchema, Rows, numeric_column, numeric_value, object_column
+from .lineup_optimizer import LineupConstraints, LineupOptimizer
+from .lineup_pricing import PICK_TYPE_MULTIPLIERS, POWER_PAYOUTS, Leg, LineupPricer
+
 logger = logging.getLogger(__name__)
 
 # Import all available prediction engines
@@ -72,6 +76,50 @@ except ImportError:
     logger.warning("Recursive AI not available")
 
 
+# Prop predictions awaited at once while building lineups
+MAX_CONCURRENT_PREDICTIONS = 16
+
+# (feature name, prop field, default) shared by the scalar and batch extractors
+PROP_BASE_FIELDS = (
+    ("line_score", "line_score", 0.0),
+    ("projected_value", "projected_value", 0.0),
+    ("historical_average", "historical_average", 0.0),
+    ("recent_form", "recent_form", 0.0),
+    ("opponent_defense_rank", "opponent_defense_rank", 15.0),
+    ("home_away_factor", "is_home_game", None),  # 1.0 home, 0.8 away
+    ("weather_factor", "weather_factor", 1.0),
+    ("injury_factor", "injury_factor", 1.0),
+    ("rest_days", "rest_days", 2.0),
+    ("season_performance", "season_performance", 0.75),
+)
+
+SPORT_FEATURE_FIELDS = {
+    "MLB": (
+        ("batting_average", 0.250),
+        ("slugging_percentage", 0.400),
+        ("era", 4.00),
+        ("whip", 1.30),
+    ),
+    "NBA": (
+        ("usage_rate", 0.20),
+        ("true_shooting_pct", 0.55),
+        ("pace_factor", 100.0),
+    ),
+    "NFL": (
+        ("target_share", 0.15),
+        ("red_zone_touches", 2.0),
+        ("snap_count_pct", 0.70),
+    ),
+}
+
+PROP_FEATURE_SCHEMA = FeatureSchema(
+    name="ensemble_prop_features",
+    version=1,
+    columns=tuple(name for name, _, _ in PROP_BASE_FIELDS)
+    + tuple(name for fields in SPORT_FEATURE_FIELDS.values() for name, _ in fields),
+)
+
+
 @dataclass
 class EnsemblePrediction:
     """Result from the intelligent ensemble system"""
@@ -112,6 +160,9 @@ class IntelligentEnsembleSystem:
         self.api_cache = TTLCache(
             maxsize=500, ttl=1800
         )  # 30-minute cache for API calls
+        # Correlated lineup pricing (simulations cached per slate) and search
+        self.lineup_pricer = LineupPricer()
+        self.lineup_optimizer = LineupOptimizer(self.lineup_pricer)
 
         # In-season sports (current active seasons)
         self.in_season_sports = self._get_in_season_sports()
@@ -390,50 +441,53 @@ class IntelligentEnsembleSystem:
     def _extract_features_from_prop(self, prop: Dict[str, Any]) -> Dict[str, float]:
         """Extract features from prop for prediction engines"""
         features = {
-            "line_score": float(prop.get("line_score", 0)),
-            "projected_value": float(prop.get("projected_value", 0)),
-            "historical_average": float(prop.get("historical_average", 0)),
-            "recent_form": float(prop.get("recent_form", 0)),
-            "opponent_defense_rank": float(prop.get("opponent_defense_rank", 15)),
-            "home_away_factor": 1.0 if prop.get("is_home_game", True) else 0.8,
-            "weather_factor": float(prop.get("weather_factor", 1.0)),
-            "injury_factor": float(prop.get("injury_factor", 1.0)),
-            "rest_days": float(prop.get("rest_days", 2)),
-            "season_performance": float(prop.get("season_performance", 0.75)),
+            name: (
+                numeric_value(prop.get(key), default)
+                if default is not None
+                else (1.0 if prop.get(key, True) else 0.8)
+            )
+            for name, key, default in PROP_BASE_FIELDS
         }
 
         # Sport-specific features
-        sport = prop.get("sport", "")
-        if sport == "MLB":
-            features.update(
-                {
-                    "batting_average": float(prop.get("batting_average", 0.250)),
-                    "slugging_percentage": float(
-                        prop.get("slugging_percentage", 0.400)
-                    ),
-                    "era": float(prop.get("era", 4.00)),
-                    "whip": float(prop.get("whip", 1.30)),
-                }
-            )
-        elif sport == "NBA":
-            features.update(
-                {
-                    "usage_rate": float(prop.get("usage_rate", 0.20)),
-                    "true_shooting_pct": float(prop.get("true_shooting_pct", 0.55)),
-                    "pace_factor": float(prop.get("pace_factor", 100.0)),
-                }
-            )
-        elif sport == "NFL":
-            features.update(
-                {
-                    "target_share": float(prop.get("target_share", 0.15)),
-                    "red_zone_touches": float(prop.get("red_zone_touches", 2.0)),
-                    "snap_count_pct": float(prop.get("snap_count_pct", 0.70)),
-                }
-            )
+        for name, default in SPORT_FEATURE_FIELDS.get(prop.get("sport", ""), ()):
+            features[name] = numeric_value(prop.get(name), default)
 
         return features
 
+    def extract_feature_matrix(self, props: Rows) -> FeatureMatrix:
+        """Batch ``_extract_features_from_prop`` for a list or DataFrame of props.
+
+        Returns a float32 matrix in ``PROP_FEATURE_SCHEMA`` column order, one
+        row per prop. Sport-specific columns are 0 for props of other sports.
+        """
+        n_rows = len(props)
+        values = PROP_FEATURE_SCHEMA.empty(n_rows)
+        column = PROP_FEATURE_SCHEMA.index
+
+        for name, key, default in PROP_BASE_FIELDS:
+            if default is not None:
+                values[:, column[name]] = numeric_column(props, key, default)
+            else:
+                flags = object_column(props, key, True)
+                values[:, column[name]] = np.where(
+                    np.fromiter((bool(v) for v in flags), dtype=bool, count=n_rows), 1.0, 0.8
+                )
+
+        sports = object_column(props, "sport", "")
+        for sport, fields in SPORT_FEATURE_FIELDS.items():
+            rows = np.flatnonzero(sports == sport)
+            if len(rows) == 0:
+                continue
+            for name, default in fields:
+                values[rows, column[name]] = numeric_column(props, name, default)[rows]
+
+        return FeatureMatrix(
+            values=values,
+            schema=PROP_FEATURE_SCHEMA,
+            row_ids=list(object_column(props, "id")),
+        )
+
     async def _get_engine_prediction(
         self,
         engine_name: str,
@@ -652,23 +706,88 @@ class IntelligentEnsembleSystem:
                 "recommendation": "NO BETS AVAILABLE",
             }
 
-        # Get ensemble predictions for all props
-        predictions = []
-        for prop in in_season_props:
-            try:
-                prediction = await self.predict_prop_outcome(prop)
-                predictions.append((prop, prediction))
-                logger.info(
-                    f"✅ {prop.get('player_name', 'Unknown')} {prop.get('stat_type', '')}: {prediction.win_probability:.1%} win prob"
-                )
-            except Exception as e:
-                logger.warning(f"Failed to predict prop {prop.get('id')}: {e}")
-
+        predictions = await self._predict_props(in_season_props)
         if not predictions:
             logger.warning("No successful predictions generated")
             return self._empty_lineup_response()
 
-        # Sort by combined score (win probability * confidence * (1 - risk_score))
+        scored_predictions = self._score_predictions(predictions)
+        lineup_props, total_win_probability, independent_win_probability, _ = (
+            self._optimize_lineups(scored_predictions, lineup_size)[0]
+        )
+        logger.info(
+            f"🏆 Generated lineup with {total_win_probability:.1%} combined win probability"
+        )
+        return self._lineup_response(
+            lineup_props, total_win_probability, independent_win_probability, len(predictions)
+        )
+
+    async def generate_lineups(
+        self,
+        props: List[Dict[str, Any]],
+        lineup_size: int = 5,
+        n_lineups: int = 20,
+        play_type: str = "power",
+    ) -> Dict[str, Any]:
+        """
+        Generate up to ``n_lineups`` diverse lineups for one slate, best first
+        """
+        in_season_props = [
+            prop for prop in props if prop.get("sport") in self.in_season_sports
+        ]
+        predictions = await self._predict_props(in_season_props)
+        if not predictions:
+            logger.warning("No successful predictions generated")
+            return {"lineups": [], "analyzed_props": 0, "timestamp": datetime.now().isoformat()}
+
+        scored_predictions = self._score_predictions(predictions)
+        lineups = []
+        for lineup_props, win_probability, independent_win_probability, expected_multiplier in (
+            self._optimize_lineups(scored_predictions, lineup_size, n_lineups, play_type)
+        ):
+            lineup = self._lineup_response(
+                lineup_props, win_probability, independent_win_probability, len(predictions)
+            )
+            lineup["expected_multiplier"] = expected_multiplier
+            lineups.append(lineup)
+        logger.info(f"🏆 Generated {len(lineups)} {play_type} lineups")
+        return {
+            "lineups": lineups,
+            "play_type": play_type,
+            "analyzed_props": len(predictions),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    async def _predict_props(
+        self, props: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], EnsemblePrediction]]:
+        """Ensemble predictions for all props, at most MAX_CONCURRENT_PREDICTIONS at a time"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PREDICTIONS)
+
+        async def predict(prop):
+            async with semaphore:
+                return await self.predict_prop_outcome(prop)
+
+        results = await asyncio.gather(*(predict(prop) for prop in props), return_exceptions=True)
+        predictions = []
+        for prop, prediction in zip(props, results):
+            if isinstance(prediction, (Exception, asyncio.CancelledError)):
+                logger.warning(f"Failed to predict prop {prop.get('id')}: {prediction!r}")
+                continue
+            if isinstance(prediction, BaseException):
+                # KeyboardInterrupt / SystemExit are not prop failures
+                raise prediction
+            predictions.append((prop, prediction))
+            logger.info(
+                f"✅ {prop.get('player_name', 'Unknown')} {prop.get('stat_type', '')}: {prediction.win_probability:.1%} win prob"
+            )
+        return predictions
+
+    @staticmethod
+    def _score_predictions(
+        predictions: List[Tuple[Dict[str, Any], EnsemblePrediction]]
+    ) -> List[Tuple[Dict[str, Any], EnsemblePrediction, float]]:
+        """Props with their combined score, highest first"""
         scored_predictions = []
         for prop, pred in predictions:
             combined_score = (
@@ -678,22 +797,72 @@ class IntelligentEnsembleSystem:
                 * (1 + pred.expected_value)  # EV boost
             )
             scored_predictions.append((prop, pred, combined_score))
-
-        # Sort by combined score (highest first)
         scored_predictions.sort(key=lambda x: x[2], reverse=True)
+        return scored_predictions
 
-        # Select top props for lineup
-        lineup_props = scored_predictions[:lineup_size]
+    def _optimize_lineups(
+        self,
+        scored_predictions: List[Tuple[Dict[str, Any], EnsemblePrediction, float]],
+        lineup_size: int,
+        n_lineups: int = 1,
+        play_type: str = "power",
+    ) -> List[Tuple[list, float, float, float]]:
+        """(props, win probability, independent win probability, expected
+        multiplier) of the best diverse lineups under correlated pricing.
+
+        Sizes without a payout table fall back to the top-scored props and
+        the independent product.
+        """
+        size = min(lineup_size, len(scored_predictions))
+        legs = [Leg.from_prop(prop) for prop, _, _ in scored_predictions]
+        probabilities = np.array([pred.win_probability for _, pred, _ in scored_predictions])
+        if size not in POWER_PAYOUTS or (play_type == "flex" and size < 3):
+            independent = float(np.prod(probabilities[:size]))
+            return [(scored_predictions[:size], independent, independent, 0.0)]
+
+        multipliers = [
+            PICK_TYPE_MULTIPLIERS.get(prop.get("pick_type") or "normal", 1.0)
+            for prop, _, _ in scored_predictions
+        ]
+        result = self.lineup_optimizer.optimize(
+            legs,
+            probabilities,
+            n_lineups,
+            LineupConstraints(size=size, play_type=play_type),
+            multipliers,
+        )
+        if not len(result["lineups"]):
+            # Stacking limits left no feasible lineup (e.g. a one-team slate)
+            independent = float(np.prod(probabilities[:size]))
+            return [(scored_predictions[:size], independent, independent, 0.0)]
+        return [
+            (
+                [scored_predictions[i] for i in lineup],
+                float(win_probability),
+                float(independent_win_probability),
+                float(expected_multiplier),
+            )
+            for lineup, win_probability, independent_win_probability, expected_multiplier in zip(
+                result["lineups"],
+                result["win_probability"],
+                result["independent_win_probability"],
+                result["expected_multiplier"],
+            )
+        ]
 
+    def _lineup_response(
+        self,
+        lineup_props: List[Tuple[Dict[str, Any], EnsemblePrediction, float]],
+        total_win_probability: float,
+        independent_win_probability: float,
+        analyzed_props: int,
+    ) -> Dict[str, Any]:
+        """Lineup metrics, recommendation and per-prop details"""
         # Calculate lineup metrics
-        lineup_win_probs = [pred.win_probability for _, pred, _ in lineup_props]
         lineup_confidences = [pred.confidence for _, pred, _ in lineup_props]
         lineup_risk_scores = [pred.risk_score for _, pred, _ in lineup_props]
         lineup_expected_values = [pred.expected_value for _, pred, _ in lineup_props]
 
-        # Combined lineup probability (assuming independence)
-        total_win_probability = np.prod(lineup_win_probs)
-
         # Average metrics
         avg_confidence = np.mean(lineup_confidences)
         avg_risk_score = np.mean(lineup_risk_scores)
@@ -731,19 +900,16 @@ class IntelligentEnsembleSystem:
                 }
             )
 
-        logger.info(
-            f"🏆 Generated lineup with {total_win_probability:.1%} combined win probability"
-        )
-
         return {
             "lineup": lineup_details,
             "total_win_probability": total_win_probability,
+            "independent_win_probability": independent_win_probability,
             "expected_value": total_expected_value,
             "confidence": avg_confidence,
             "risk_score": avg_risk_score,
             "recommendation": overall_recommendation,
             "lineup_size": len(lineup_details),
-            "analyzed_props": len(predictions),
+            "analyzed_props": analyzed_props,
             "in_season_sports": self.in_season_sports,
             "timestamp": datetime.now().isoformat(),
             "engine_summary": {
@@ -0,0 +1,307 @@
+"""Beam search for many diverse, correlated PrizePicks lineups per slate.
+
+Lineups used to be the top ``lineup_size`` props by a combined score, which
+ignores how legs co-move, allows unlimited stacking on one team, and yields
+a single lineup. Here lineups are grown one leg at a time over precomputed
+leg probability (and payout-multiplier) arrays and the slate's cached
+``LineupPricer`` simulation:
+
+* a partial lineup keeps its per-sample hit counters bit-sliced, so adding a
+  leg is one ripple-carry add and a popcount, not a reprice from scratch;
+* legs are added in index order, so every lineup is generated once;
+* team, game and player limits are checked on count arrays for a whole level
+  of candidates at once;
+* each partial lineup gets an upper bound on its expected payout: with m legs
+  still to add and payout tables non-decreasing in hits, the payout is at most
+  table[hits so far + m]. Partial lineups whose bound cannot beat the N-th
+  best of a diverse set of greedy seed lineups are pruned, and the
+  ``beam_width`` with the best bound are kept.
+
+The finished lineups are ranked by expected payout and taken greedily so that
+no two returned lineups share more than ``max_shared_legs`` legs. If a level
+starts after ``time_budget`` has run out, the beam shrinks to the number of
+lineups asked for, so the search still finishes with full lineups.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from .lineup_pricing import Leg, LineupPricer, add_bits, count_planes, payout_table
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BEAM_WIDTH = 512
+# Seconds; checked before each level of the search
+DEFAULT_TIME_BUDGET = 2.0
+# Bit-plane bytes materialized per scoring batch
+PLANE_BUFFER_BYTES = 1 << 26
+
+
+@dataclass(frozen=True)
+class LineupConstraints:
+    """Shape and diversity rules for generated lineups"""
+
+    size: int = 5
+    play_type: str = "power"
+    # None: size - 1, i.e. at least two teams per lineup
+    max_per_team: Optional[int] = None
+    max_per_game: Optional[int] = None
+    # None: size - 2 legs shared between any two returned lineups
+    max_shared_legs: Optional[int] = None
+
+    @property
+    def team_limit(self) -> int:
+        return self.size - 1 if self.max_per_team is None else self.max_per_team
+
+    @property
+    def game_limit(self) -> int:
+        return self.size if self.max_per_game is None else self.max_per_game
+
+    @property
+    def shared_limit(self) -> int:
+        return max(self.size - 2, 0) if self.max_shared_legs is None else self.max_shared_legs
+
+
+def _codes(keys: List[Hashable]) -> np.ndarray:
+    """Dense code per key; a missing key gets a code of its own"""
+    index: Dict[Hashable, int] = {}
+    return np.array(
+        [index.setdefault(key if key is not None else ("__leg__", i), len(index)) for i, key in enumerate(keys)],
+        dtype=np.intp,
+    )
+
+
+class LineupOptimizer:
+    """Generates the N best diverse lineups of a slate"""
+
+    def __init__(
+        self,
+        pricer: Optional[LineupPricer] = None,
+        beam_width: int = DEFAULT_BEAM_WIDTH,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+    ):
+        self.pricer = pricer or LineupPricer()
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+
+    def optimize(
+        self,
+        legs: Sequence[Leg],
+        probabilities: Sequence[float],
+        n_lineups: int = 1,
+        constraints: Optional[LineupConstraints] = None,
+        leg_multipliers: Optional[Sequence[float]] = None,
+        time_budget: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Search a slate for ``n_lineups`` diverse lineups.
+
+        Args:
+            legs, probabilities: The slate's legs and their hit probabilities
+            n_lineups: Lineups to return (fewer if the slate runs out)
+            constraints: Lineup size, play type and stacking/diversity limits
+            leg_multipliers: Per-leg payout factor (demon/goblin), default 1
+            time_budget: Seconds before the beam is cut to ``n_lineups``
+
+        Returns:
+            "lineups" (rows of leg indices, best first) with their
+            "expected_multiplier", "win_probability", "hit_distribution"
+            and "independent_win_probability", plus search statistics
+            ("evaluated", "pruned", "timed_out", "elapsed")
+        """
+        started = time.perf_counter()
+        constraints = constraints or LineupConstraints()
+        budget = self.time_budget if time_budget is None else time_budget
+        size = constraints.size
+        table = payout_table(constraints.play_type, size)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        multipliers = np.ones(len(legs)) if leg_multipliers is None else np.asarray(leg_multipliers, dtype=np.float64)
+        n_legs = len(legs)
+
+        players = _codes([leg.player for leg in legs])
+        teams = _codes([leg.team for leg in legs])
+        games = _codes([leg.game for leg in legs])
+        # Best multiplier among legs j.. (bounds the legs still to be added)
+        suffix_multiplier = np.append(np.maximum.accumulate(multipliers[::-1])[::-1], 1.0)
+
+        hits = self.pricer.simulation(legs).hits(probabilities)
+        packed = self.pricer.pack_hits(hits)
+        padding = packed.shape[1] * 64 - hits.shape[1]
+        n_bits = int(size).bit_length()
+
+        seeds = self._seed_lineups(probabilities * multipliers, players, teams, games, n_lineups, constraints)
+        incumbent = -np.inf
+        if len(seeds):
+            seed_values = self._price(legs, probabilities, seeds, constraints, multipliers)["expected_multiplier"]
+            chosen = self._diverse(seeds, seed_values, n_lineups, constraints.shared_limit)
+            if len(chosen) == n_lineups:
+                incumbent = float(seed_values[chosen].min())
+
+        # Beam of partial lineups: members, bit planes, stacking counts, multipliers
+        members = np.zeros((1, 0), dtype=np.intp)
+        planes = np.zeros((n_bits, 1, packed.shape[1]), dtype=np.uint64)
+        team_counts = np.zeros((1, teams.max(initial=-1) + 1), dtype=np.int16)
+        game_counts = np.zeros((1, games.max(initial=-1) + 1), dtype=np.int16)
+        player_counts = np.zeros((1, players.max(initial=-1) + 1), dtype=np.int16)
+        partial_multiplier = np.ones(1)
+        values = np.zeros(1)
+        evaluated = pruned = 0
+        timed_out = False
+
+        for level in range(size):
+            remaining = size - level - 1
+            width = self.beam_width
+            if time.perf_counter() - started > budget:
+                timed_out = True
+                width = max(n_lineups, 1)
+            last = members[:, -1] if level else np.full(len(members), -1)
+            feasible = (
+                (np.arange(n_legs)[None, :] > last[:, None])
+                & (np.arange(n_legs)[None, :] < n_legs - remaining)
+                & (player_counts[:, players] == 0)
+                & (team_counts[:, teams] < constraints.team_limit)
+                & (game_counts[:, games] < constraints.game_limit)
+            )
+            state_index, leg_index = np.nonzero(feasible)
+            if not len(state_index):
+                members, values = np.zeros((0, size), dtype=np.intp), np.zeros(0)
+                break
+            evaluated += len(state_index)
+
+            bound_table = table[np.minimum(np.arange(level + 2) + remaining, size)]
+            bound_factor = partial_multiplier[state_index] * multipliers[leg_index]
+            bound_factor *= suffix_multiplier[leg_index + 1] ** remaining
+            bounds = np.empty(len(state_index))
+            chunk = max(1, PLANE_BUFFER_BYTES // (8 * packed.shape[1] * (n_bits + 2)))
+            for start in range(0, len(state_index), chunk):
+                stop = start + chunk
+                block = planes[:, state_index[start:stop]]
+                add_bits(block, packed[leg_index[start:stop]])
+                distribution = count_planes(block, level + 1)
+                distribution[:, 0] -= padding
+                bounds[start:stop] = distribution @ bound_table / hits.shape[1]
+            bounds *= bound_factor
+
+            keep = bounds >= incumbent - 1e-12
+            pruned += int((~keep).sum())
+            kept = np.nonzero(keep)[0]
+            if remaining:
+                kept = kept[np.argsort(-bounds[kept], kind="stable")[:width]]
+            state_index, leg_index = state_index[kept], leg_index[kept]
+
+            members = np.hstack([members[state_index], leg_index[:, None]])
+            planes = planes[:, state_index]
+            add_bits(planes, packed[leg_index])
+            team_counts = team_counts[state_index]
+            game_counts = game_counts[state_index]
+            player_counts = player_counts[state_index]
+            rows = np.arange(len(kept))
+            np.add.at(team_counts, (rows, teams[leg_index]), 1)
+            np.add.at(game_counts, (rows, games[leg_index]), 1)
+            np.add.at(player_counts, (rows, players[leg_index]), 1)
+            partial_multiplier = partial_multiplier[state_index] * multipliers[leg_index]
+            # With nothing left to add, the bound is the expected payout itself
+            values = bounds[kept]
+
+        candidates = np.vstack([members, seeds]) if len(seeds) else members
+        candidate_values = np.concatenate([values, seed_values]) if len(seeds) else values
+        candidates, first = np.unique(np.sort(candidates, axis=1), axis=0, return_index=True)
+        candidate_values = candidate_values[first]
+        chosen = self._diverse(candidates, candidate_values, n_lineups, constraints.shared_limit)
+        lineups = candidates[chosen].reshape(-1, size)
+        priced = self._price(legs, probabilities, lineups, constraints, multipliers)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"🧮 {len(lineups)} lineups from {n_legs} legs: {evaluated} partial lineups scored, "
+            f"{pruned} pruned in {elapsed * 1000:.0f}ms"
+        )
+        return {
+            "lineups": lineups,
+            "expected_multiplier": priced["expected_multiplier"],
+            "win_probability": priced["win_probability"],
+            "hit_distribution": priced["hit_distribution"],
+            "independent_win_probability": priced["independent_win_probability"],
+            "evaluated": evaluated,
+            "pruned": pruned,
+            "timed_out": timed_out,
+            "elapsed": elapsed,
+        }
+
+    def _price(
+        self,
+        legs: Sequence[Leg],
+        probabilities: np.ndarray,
+        lineups: np.ndarray,
+        constraints: LineupConstraints,
+        multipliers: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        if not len(lineups):
+            empty = np.zeros(0)
+            return {
+                "expected_multiplier": empty,
+                "win_probability": empty,
+                "hit_distribution": np.zeros((0, constraints.size + 1)),
+                "independent_win_probability": empty,
+            }
+        return self.pricer.price_lineups(
+            legs, probabilities, lineups, constraints.play_type, multipliers[lineups].prod(axis=1)
+        )
+
+    @staticmethod
+    def _seed_lineups(
+        scores: np.ndarray,
+        players: np.ndarray,
+        teams: np.ndarray,
+        games: np.ndarray,
+        n_lineups: int,
+        constraints: LineupConstraints,
+    ) -> np.ndarray:
+        """Up to ``n_lineups`` greedy lineups, each started from the best
+        unused leg and kept within the shared-leg limit of earlier seeds"""
+        order = np.argsort(-scores, kind="stable")
+        seeds: List[List[int]] = []
+        membership = np.zeros((0, len(scores)), dtype=np.int16)
+        for first in order:
+            if len(seeds) == n_lineups:
+                break
+            if membership[:, first].any():
+                continue
+            lineup = [int(first)]
+            shared = membership[:, first].copy()
+            for leg in order:
+                if len(lineup) == constraints.size:
+                    break
+                if (
+                    leg in lineup
+                    or players[leg] in players[lineup]
+                    or (teams[lineup] == teams[leg]).sum() >= constraints.team_limit
+                    or (games[lineup] == games[leg]).sum() >= constraints.game_limit
+                    or (shared + membership[:, leg]).max(initial=0) > constraints.shared_limit
+                ):
+                    continue
+                lineup.append(int(leg))
+                shared += membership[:, leg]
+            if len(lineup) == constraints.size:
+                seeds.append(sorted(lineup))
+                row = np.zeros((1, len(scores)), dtype=np.int16)
+                row[0, lineup] = 1
+                membership = np.vstack([membership, row])
+        return np.array(seeds, dtype=np.intp).reshape(-1, constraints.size)
+
+    @staticmethod
+    def _diverse(lineups: np.ndarray, values: np.ndarray, n_lineups: int, max_shared: int) -> List[int]:
+        """Best-first rows sharing at most ``max_shared`` legs with each other"""
+        if not len(lineups):
+            return []
+        membership = np.zeros((len(lineups), lineups.max() + 1), dtype=np.int16)
+        np.put_along_axis(membership, lineups, 1, axis=1)
+        chosen: List[int] = []
+        for row in np.argsort(-values, kind="stable"):
+            if len(chosen) == n_lineups:
+                break
+            if not chosen or (membership[chosen] @ membership[row]).max() <= max_shared:
+                chosen.append(int(row))
+        return chosen
@@ -0,0 +1,327 @@
+"""Simulation-based pricing of correlated PrizePicks lineups.
+
+A lineup's win probability used to be the product of its legs' hit
+probabilities, as if the legs were independent. Same-game legs are not:
+two overs from one team hit together far more often than the product says.
+
+Here each leg of a slate has a latent standard normal performance score.
+The score loads on a game factor, a team factor and a player factor, plus
+idiosyncratic noise; ``LegCorrelation`` sets the variance share of each.
+An "over" leg hits when its score exceeds Φ⁻¹(1 - p), and an "under" leg
+uses the negated score. Each leg therefore keeps its own hit probability p,
+while the shared factors make legs co-move:
+
+* same player: game + team + player share;
+* same team: game + team;
+* opposing teams in one game: the game share only.
+
+The scores are drawn once per slate structure (legs, their keys and
+directions) as one (legs × samples) float32 block and cached. Repricing
+after probabilities change only re-thresholds it. A batch of candidate
+lineups is then priced with bitwise adds and popcounts over the bit-packed
+hit matrix: each lineup gets its hit-count distribution, win probability and
+expected payout multiplier under the power or flex tables.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+from scipy.special import ndtri
+
+logger = logging.getLogger(__name__)
+
+# Payout multipliers by number of picks; flex pays on a partial hit count
+POWER_PAYOUTS = {2: 3.0, 3: 5.0, 4: 10.0, 5: 20.0, 6: 40.0}
+FLEX_PAYOUTS = {
+    3: {3: 2.25, 2: 1.25},
+    4: {4: 5.0, 3: 1.5},
+    5: {5: 10.0, 4: 2.0, 3: 0.4},
+    6: {6: 25.0, 5: 2.0, 4: 0.4},
+}
+PLAY_TYPES = ("power", "flex")
+PICK_TYPE_MULTIPLIERS = {"demon": 1.25, "goblin": 0.85}
+
+DEFAULT_SAMPLES = 20000
+# Bytes of bit-sliced hit counts held at once
+COUNT_BUFFER_BYTES = 1 << 26
+# Set bits of every byte value, for popcounts on NumPy without np.bitwise_count (< 2.0)
+BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+@dataclass(frozen=True)
+class LegCorrelation:
+    """Variance shares of the latent leg score (the rest is idiosyncratic)"""
+
+    game: float = 0.10
+    team: float = 0.15
+    player: float = 0.40
+
+    def __post_init__(self):
+        if min(self.game, self.team, self.player) < 0 or self.game + self.team + self.player >= 1:
+            raise ValueError("Correlation shares must be non-negative and sum to less than 1")
+
+
+@dataclass(frozen=True)
+class Leg:
+    """One pick of a slate: who it is about and which side was taken"""
+
+    player: Hashable
+    team: Hashable = None
+    game: Hashable = None
+    choice: str = "over"
+
+    @classmethod
+    def from_prop(cls, prop: Dict[str, Any]) -> "Leg":
+        """Leg from a prop dict; the game defaults to the (team, opponent) pair"""
+        team = prop.get("team")
+        game = prop.get("game_id") or prop.get("event_id")
+        if game is None and team is not None:
+            opponent = str(prop.get("opponent") or "").replace("vs ", "").replace("@ ", "").strip()
+            game = tuple(sorted((str(team), opponent))) if opponent else (str(team),)
+        return cls(
+            player=prop.get("player_name") or prop.get("player") or prop.get("id"),
+            team=team,
+            game=game,
+            choice=str(prop.get("choice") or "over").lower(),
+        )
+
+
+def payout_table(play_type: str, n_picks: int) -> np.ndarray:
+    """Multiplier paid for 0..n_picks hits"""
+    if play_type not in PLAY_TYPES:
+        raise ValueError(f"Unknown play type {play_type!r}; expected one of {PLAY_TYPES}")
+    table = np.zeros(n_picks + 1)
+    if play_type == "power":
+        if n_picks not in POWER_PAYOUTS:
+            raise ValueError(f"Power plays take {min(POWER_PAYOUTS)}-{max(POWER_PAYOUTS)} picks, not {n_picks}")
+        table[n_picks] = POWER_PAYOUTS[n_picks]
+    else:
+        if n_picks not in FLEX_PAYOUTS:
+            raise ValueError(f"Flex plays take {min(FLEX_PAYOUTS)}-{max(FLEX_PAYOUTS)} picks, not {n_picks}")
+        for hits, multiplier in FLEX_PAYOUTS[n_picks].items():
+            table[hits] = multiplier
+    return table
+
+
+def pick_type_multiplier(pick_types: Sequence[Optional[str]]) -> float:
+    """Demon/goblin adjustment to a lineup's payouts"""
+    return float(np.prod([PICK_TYPE_MULTIPLIERS.get(pick_type or "normal", 1.0) for pick_type in pick_types]))
+
+
+def independent_hit_distribution(probabilities: np.ndarray) -> np.ndarray:
+    """(lineups × picks+1) hit-count distribution if legs were independent"""
+    probabilities = np.atleast_2d(probabilities)
+    distribution = np.zeros((len(probabilities), probabilities.shape[1] + 1))
+    distribution[:, 0] = 1.0
+    for j in range(probabilities.shape[1]):
+        p = probabilities[:, j : j + 1]
+        distribution[:, 1:] = distribution[:, 1:] * (1 - p) + distribution[:, :-1] * p
+        distribution[:, 0] *= 1 - p[:, 0]
+    return distribution
+
+
+def add_bits(planes: np.ndarray, bits: np.ndarray) -> None:
+    """Ripple-carry add 0/1 ``bits`` into bit-sliced counters, in place.
+
+    ``planes[b]`` holds bit b of every counter, 64 counters per word.
+    """
+    carry = bits
+    for plane in planes:
+        next_carry = plane & carry
+        plane ^= carry
+        carry = next_carry
+
+
+def popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a (rows × words) uint64 array"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return byte_popcount_rows(words)
+
+
+def byte_popcount_rows(words: np.ndarray) -> np.ndarray:
+    """``popcount_rows`` through a byte lookup table (any NumPy version)"""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def count_planes(planes: np.ndarray, max_count: int) -> np.ndarray:
+    """(rows × max_count+1) number of counters holding each value"""
+    counts = np.zeros((planes.shape[1], max_count + 1))
+    for c in range(max_count + 1):
+        mask = ~np.zeros_like(planes[0])
+        for bit, plane in enumerate(planes):
+            mask &= plane if (c >> bit) & 1 else ~plane
+        counts[:, c] = popcount_rows(mask)
+    return counts
+
+
+class SlateSimulation:
+    """Cached latent leg scores for one slate structure"""
+
+    def __init__(
+        self,
+        legs: Sequence[Leg],
+        correlation: LegCorrelation,
+        n_samples: int = DEFAULT_SAMPLES,
+        seed: Optional[int] = None,
+    ):
+        self.legs = list(legs)
+        self.n_samples = n_samples
+        rng = np.random.default_rng(seed)
+
+        scores = rng.standard_normal((len(self.legs), n_samples), dtype=np.float32)
+        scores *= np.float32(np.sqrt(1 - correlation.game - correlation.team - correlation.player))
+        for share, keys in (
+            (correlation.game, [leg.game for leg in self.legs]),
+            (correlation.team, [leg.team for leg in self.legs]),
+            (correlation.player, [leg.player for leg in self.legs]),
+        ):
+            if share <= 0:
+                continue
+            codes = self._factor_codes(keys)
+            factors = rng.standard_normal((codes.max(initial=-1) + 1, n_samples), dtype=np.float32)
+            factors *= np.float32(np.sqrt(share))
+            scores += factors[codes]
+        under = np.array([leg.choice == "under" for leg in self.legs])
+        scores[under] *= -1
+        self.scores = scores
+
+    @staticmethod
+    def _factor_codes(keys: List[Hashable]) -> np.ndarray:
+        """Factor row per leg; a leg without a key gets a factor of its own"""
+        index: Dict[Hashable, int] = {}
+        return np.array(
+            [index.setdefault(key if key is not None else ("__leg__", i), len(index)) for i, key in enumerate(keys)],
+            dtype=np.intp,
+        )
+
+    def hits(self, probabilities: np.ndarray) -> np.ndarray:
+        """(legs × samples) bool: leg hit in each simulated outcome"""
+        thresholds = ndtri(1 - np.clip(np.asarray(probabilities, dtype=np.float64), 1e-9, 1 - 1e-9))
+        return self.scores > thresholds.astype(np.float32)[:, None]
+
+
+class LineupPricer:
+    """Prices candidate lineups from a slate's correlated leg simulation.
+
+    Simulations are cached per slate structure (an LRU of ``cache_size``
+    slates), so live probability updates reuse the same draws.
+    """
+
+    def __init__(
+        self,
+        correlation: Optional[LegCorrelation] = None,
+        n_samples: int = DEFAULT_SAMPLES,
+        seed: Optional[int] = 0,
+        cache_size: int = 8,
+    ):
+        self.correlation = correlation or LegCorrelation()
+        self.n_samples = n_samples
+        self.seed = seed
+        self.cache_size = cache_size
+        self.slates: "OrderedDict[str, SlateSimulation]" = OrderedDict()
+
+    def slate_fingerprint(self, legs: Sequence[Leg]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((self.correlation, self.n_samples, self.seed)).encode())
+        for leg in legs:
+            digest.update(repr((leg.player, leg.team, leg.game, leg.choice)).encode())
+        return digest.hexdigest()
+
+    def simulation(self, legs: Sequence[Leg]) -> SlateSimulation:
+        key = self.slate_fingerprint(legs)
+        if key in self.slates:
+            self.slates.move_to_end(key)
+            return self.slates[key]
+        simulation = self.slates[key] = SlateSimulation(legs, self.correlation, self.n_samples, self.seed)
+        while len(self.slates) > self.cache_size:
+            self.slates.popitem(last=False)
+        return simulation
+
+    @staticmethod
+    def pack_hits(hits: np.ndarray) -> np.ndarray:
+        """(legs × words) uint64: each leg's hit bits, 64 samples per word"""
+        padded = np.zeros((hits.shape[0], -(-hits.shape[1] // 64) * 64), dtype=bool)
+        padded[:, : hits.shape[1]] = hits
+        return np.packbits(padded, axis=1, bitorder="little").view(np.uint64)
+
+    def hit_distribution(self, hits: np.ndarray, lineups: np.ndarray) -> np.ndarray:
+        """(lineups × picks+1) simulated hit-count distribution.
+
+        Hit counts are kept bit-sliced: ``planes[b]`` holds bit b of every
+        sample's count, 64 samples per word, and each leg is added with a
+        ripple-carry over the planes. P(count = c) is then a popcount of
+        the AND of the planes (or their complements) that spell c.
+        """
+        n_lineups, n_picks = lineups.shape
+        packed = self.pack_hits(hits)
+        n_bits = int(n_picks).bit_length()
+        distribution = np.zeros((n_lineups, n_picks + 1))
+        chunk = max(1, COUNT_BUFFER_BYTES // (8 * packed.shape[1] * (n_bits + 2)))
+        for start in range(0, n_lineups, chunk):
+            block = lineups[start : start + chunk]
+            planes = np.zeros((n_bits, len(block), packed.shape[1]), dtype=np.uint64)
+            for j in range(n_picks):
+                add_bits(planes, packed[block[:, j]])
+            distribution[start : start + len(block)] = count_planes(planes, n_picks)
+        # Padding samples count as zero hits
+        distribution[:, 0] -= packed.shape[1] * 64 - hits.shape[1]
+        return distribution / hits.shape[1]
+
+    def price_lineups(
+        self,
+        legs: Sequence[Leg],
+        probabilities: Sequence[float],
+        lineups: np.ndarray,
+        play_type: str = "power",
+        payout_multipliers: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Price (lineups × picks) leg indices into one slate.
+
+        Args:
+            legs, probabilities: The slate's legs and their hit probabilities
+            lineups: Equal-size lineups as rows of leg indices
+            play_type: "power" (all must hit) or "flex"
+            payout_multipliers: Per-lineup factor on the payout table
+                (e.g. ``pick_type_multiplier``); defaults to 1
+
+        Returns:
+            Per-lineup "hit_distribution", "win_probability" (any payout),
+            "expected_multiplier" (payout per unit staked), and the same
+            three under independence ("independent_*")
+        """
+        lineups = np.atleast_2d(np.asarray(lineups, dtype=np.intp))
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        table = payout_table(play_type, lineups.shape[1])
+        factor = np.ones(len(lineups)) if payout_multipliers is None else np.asarray(payout_multipliers)
+
+        hits = self.simulation(legs).hits(probabilities)
+        distribution = self.hit_distribution(hits, lineups)
+        independent = independent_hit_distribution(probabilities[lineups])
+        paying = table > 0
+        return {
+            "hit_distribution": distribution,
+            "win_probability": distribution[:, paying].sum(axis=1),
+            "expected_multiplier": distribution @ table * factor,
+            "independent_hit_distribution": independent,
+            "independent_win_probability": independent[:, paying].sum(axis=1),
+            "independent_expected_multiplier": independent @ table * factor,
+        }
+
+    def price_lineup(
+        self,
+        legs: Sequence[Leg],
+        probabilities: Sequence[float],
+        play_type: str = "power",
+        payout_multiplier: float = 1.0,
+    ) -> Dict[str, Any]:
+        """Price a single lineup made of all ``legs``"""
+        priced = self.price_lineups(
+            legs, probabilities, np.arange(len(legs))[None, :], play_type, [payout_multiplier]
+        )
+        return {key: value[0] for key, value in priced.items()}
@@ -0,0 +1,314 @@
+"""
+Concurrent PrizePicks league ingestion
+
+Fetches every league's projection board at once instead of one league at a
+time. Requests are paced by an AIMD (additive-increase, multiplicative-
+decrease) limiter that backs off on 429s and honours Retry-After, share one
+keep-alive (HTTP/2 when ``h2`` is installed) connection pool, and send
+ETag / If-Modified-Since validators so unchanged boards come back as 304
+without a body. A full-board refresh then costs roughly the slowest
+league's latency rather than the sum over leagues.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+)
+
+USER_AGENT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../user_agent.txt")
+)
+
+
+@lru_cache(maxsize=None)
+def load_user_agent(path: str = USER_AGENT_PATH) -> str:
+    """Read the browser user agent once per process"""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip().lower().startswith("mozilla"):
+                    return line.strip()
+    return DEFAULT_USER_AGENT
+
+
+def build_request_headers(user_agent: Optional[str] = None) -> Dict[str, str]:
+    """Browser-like headers for the PrizePicks public API"""
+    return {
+        "User-Agent": user_agent or load_user_agent(),
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Referer": "https://app.prizepicks.com/",
+        "Origin": "https://app.prizepicks.com",
+        "Sec-Fetch-Dest": "empty",
+        "Sec-Fetch-Mode": "cors",
+        "Sec-Fetch-Site": "same-site",
+    }
+
+
+class AIMDRateLimiter:
+    """Request pacer that adapts its rate to upstream 429 responses.
+
+    Each success raises the allowed rate by ``increase`` requests/second;
+    each 429 multiplies it by ``decrease``. A Retry-After header pauses all
+    callers until it has elapsed. ``max_concurrency`` caps in-flight calls.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        max_concurrency: int = 8,
+    ):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self.throttle_events = 0
+
+    async def acquire(self) -> None:
+        await self._semaphore.acquire()
+        now = time.monotonic()
+        # Reserve the next send slot before sleeping so callers stay spaced
+        slot = max(now, self._next_slot, self._blocked_until)
+        self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+    async def __aenter__(self) -> "AIMDRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttle_events += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class ConditionalCacheEntry:
+    """Validators and decoded payload from the last 200 response"""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    payload: Dict[str, Any]
+    fetched_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class IngestionStats:
+    leagues: int = 0
+    fetched: int = 0
+    not_modified: int = 0
+    failed: int = 0
+    throttled: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class ConcurrentLeagueFetcher:
+    """Fetches the projections board for many leagues concurrently"""
+
+    def __init__(
+        self,
+        base_url: str = "https://api.prizepicks.com",
+        limiter: Optional[AIMDRateLimiter] = None,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.base_url = base_url
+        self.limiter = limiter or AIMDRateLimiter()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._client = client
+        self._owns_client = client is None
+        self._validators: Dict[str, ConditionalCacheEntry] = {}
+        self._league_rows: Dict[str, List[Dict[str, Any]]] = {}
+        self.last_stats = IngestionStats()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HAS_H2,
+                timeout=self.timeout,
+                headers=build_request_headers(),
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=120),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if this fetcher created it; injected clients are left open"""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "ConcurrentLeagueFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @staticmethod
+    def _cache_key(url: str, params: Dict[str, Any]) -> str:
+        return f"{url}:{sorted(params.items())}"
+
+    async def get_json(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """GET with conditional validators and AIMD pacing.
+
+        Returns:
+            (payload, changed); ``changed`` is False when the server answered
+            304 and the payload is the previously cached body.
+        """
+        params = params or {}
+        key = self._cache_key(url, params)
+        cached = self._validators.get(key)
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        for attempt in range(self.max_retries):
+            try:
+                async with self.limiter:
+                    response = await self.client.get(url, params=params, headers=headers)
+            except httpx.HTTPError as e:
+                logger.warning(f"⚠️ Request to {url} failed (attempt {attempt + 1}): {e}")
+                self.limiter.on_throttle()
+                continue
+
+            if response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self.limiter.on_throttle(retry_after)
+                self.last_stats.throttled += 1
+                logger.warning(
+                    f"⚠️ Rate limited (429) on {url}; rate now {self.limiter.rate:.2f}/s"
+                )
+                continue
+
+            if response.status_code == 304 and cached is not None:
+                self.limiter.on_success()
+                return cached.payload, False
+
+            if response.status_code >= 500:
+                self.limiter.on_throttle()
+                continue
+
+            if response.status_code >= 400:
+                logger.error(f"❌ HTTP {response.status_code} for {url}")
+                return None, False
+
+            self.limiter.on_success()
+            payload = response.json()
+            self._validators[key] = ConditionalCacheEntry(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                payload=payload,
+            )
+            return payload, True
+
+        logger.error(f"❌ Giving up on {url} after {self.max_retries} attempts")
+        return None, False
+
+    async def fetch_leagues(
+        self,
+        league_ids: List[str],
+        process: Callable[[List[Dict], List[Dict]], List[Dict[str, Any]]],
+        per_page: int = 250,
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, bool]]:
+        """Fetch and process every league's projections concurrently.
+
+        Args:
+            league_ids: Leagues to fetch
+            process: ``(projections, included) -> rows``, e.g.
+                ``ComprehensivePrizePicksService.process_raw_projections``
+
+        Returns:
+            (rows by league, changed flag by league)
+        """
+        start_time = time.perf_counter()
+        self.last_stats = IngestionStats(leagues=len(league_ids))
+        url = f"{self.base_url}/projections"
+
+        async def one(league_id: str):
+            params = {
+                "include": "new_player,league,stat_type",
+                "per_page": per_page,
+                "single_stat": "true",
+                "league_id": league_id,
+            }
+            payload, changed = await self.get_json(url, params)
+            if payload is None:
+                self.last_stats.failed += 1
+                return league_id, [], False
+            if not changed and league_id in self._league_rows:
+                self.last_stats.not_modified += 1
+                return league_id, self._league_rows[league_id], False
+
+            self.last_stats.fetched += 1
+            rows = process(payload.get("data", []), payload.get("included", []))
+            self._league_rows[league_id] = rows
+            return league_id, rows, True
+
+        results = await asyncio.gather(*(one(league_id) for league_id in league_ids))
+        self.last_stats.elapsed_seconds = time.perf_counter() - start_time
+
+        rows_by_league = {league_id: rows for league_id, rows, _ in results}
+        changed_by_league = {league_id: changed for league_id, _, changed in results}
+        return rows_by_league, changed_by_league
@@ -0,0 +1,345 @@
+"""
+Projection change detection and compact line history
+
+Each scrape returns the whole board, but only a small fraction of lines move
+between refreshes. ``ProjectionDiffer`` fingerprints each raw projection and
+only lets changed ones through, emitting ``ProjectionEvent``s for new
+projections, line moves and status changes. ``PlayerLineHistory`` keeps
+each player/stat's recent lines in preallocated columnar ring buffers
+(timestamp, line, league code) instead of a deque of dicts per key.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Projection ids not scraped for this long are forgotten (and reported removed)
+DIFFER_TTL_SECONDS = 6 * 3600
+DIFFER_MAX_ENTRIES = 200_000
+
+
+@lru_cache(maxsize=8192)
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse an API ISO-8601 timestamp; boards repeat the same start times"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+@dataclass
+class PrizePicksProjection:
+    """One projection as held in ``current_projections``"""
+
+    id: str
+    player_id: str
+    player_name: str
+    team: str
+    position: str
+    league: str
+    sport: str
+    stat_type: str
+    line_score: float
+    start_time: Optional[datetime]
+    status: str
+    description: str = ""
+    rank: int = 0
+    is_promo: bool = False
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_raw(cls, row: Dict[str, Any]) -> "PrizePicksProjection":
+        return cls(
+            id=row["id"],
+            player_id=row["player_id"],
+            player_name=row["player_name"],
+            team=row["team"],
+            position=row["position"],
+            league=row["league"],
+            sport=row["sport"],
+            stat_type=row["stat_type"],
+            line_score=float(row["line_score"]),
+            start_time=parse_timestamp(row.get("start_time") or ""),
+            status=row["status"],
+            description=row.get("description", ""),
+            rank=row.get("rank", 0),
+            is_promo=row.get("is_promo", False),
+            updated_at=parse_timestamp(row.get("updated_at") or ""),
+        )
+
+    @property
+    def trend_key(self) -> str:
+        return f"{self.player_id}_{self.stat_type}"
+
+
+@dataclass
+class ProjectionEvent:
+    """A change observed between two scrapes"""
+
+    kind: str  # "new", "line_change", "status_change", "removed"
+    projection_id: str
+    player_id: str
+    stat_type: str
+    league: str
+    old_line: Optional[float] = None
+    new_line: Optional[float] = None
+    old_status: Optional[str] = None
+    new_status: Optional[str] = None
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ProjectionDiffer:
+    """Remembers a fingerprint per projection id and reports what moved
+
+    Ids not seen for ``ttl_seconds`` (or the oldest beyond ``max_entries``)
+    are forgotten and reported as ``removed``, so partial scrapes that never
+    pass ``full_board`` don't accumulate expired projections.
+    """
+
+    def __init__(self, ttl_seconds: float = DIFFER_TTL_SECONDS, max_entries: int = DIFFER_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._fingerprints: Dict[str, int] = {}
+        self._last: Dict[str, Tuple[float, str]] = {}
+        # Projection id -> monotonic time it was last scraped, oldest first
+        self._seen_at: "OrderedDict[str, float]" = OrderedDict()
+
+    @staticmethod
+    def fingerprint(row: Dict[str, Any]) -> int:
+        try:
+            return hash(tuple(row.values()))
+        except TypeError:
+            return hash(repr(sorted(row.items())))
+
+    def diff(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        full_board: bool = False,
+        parse: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Tuple[List[Any], List[ProjectionEvent]]:
+        """Split a scrape into changed rows and change events.
+
+        Args:
+            rows: Raw projections from ``process_raw_projections``
+            full_board: The scrape covers every league, so ids that are no
+                longer present are reported as ``removed``
+            parse: Optional row parser (e.g. ``PrizePicksProjection.from_raw``).
+                A changed row is only recorded once it parses, so a row that
+                fails is retried on the next scrape.
+
+        Returns:
+            (changed rows, parsed if ``parse`` is given, events)
+        """
+        changed: List[Any] = []
+        events: List[ProjectionEvent] = []
+        seen = set()
+        now = datetime.now(timezone.utc)
+        clock = time.monotonic()
+
+        for row in rows:
+            projection_id = row.get("id", "")
+            seen.add(projection_id)
+            if projection_id in self._seen_at:
+                self._seen_at[projection_id] = clock
+                self._seen_at.move_to_end(projection_id)
+            fingerprint = self.fingerprint(row)
+            if self._fingerprints.get(projection_id) == fingerprint:
+                continue
+            try:
+                parsed = parse(row) if parse is not None else row
+                line = float(row.get("line_score", 0) or 0)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(f"⚠️ Error processing projection {projection_id or 'unknown'}: {e}")
+                continue
+            self._fingerprints[projection_id] = fingerprint
+            self._seen_at[projection_id] = clock
+            self._seen_at.move_to_end(projection_id)
+            changed.append(parsed)
+
+            status = row.get("status", "")
+            previous = self._last.get(projection_id)
+            self._last[projection_id] = (line, status)
+            common = dict(
+                projection_id=projection_id,
+                player_id=row.get("player_id", ""),
+                stat_type=row.get("stat_type", ""),
+                league=row.get("league", ""),
+                timestamp=now,
+            )
+
+            if previous is None:
+                events.append(ProjectionEvent("new", new_line=line, new_status=status, **common))
+                continue
+            old_line, old_status = previous
+            if old_line != line:
+                events.append(
+                    ProjectionEvent("line_change", old_line=old_line, new_line=line, **common)
+                )
+            if old_status != status:
+                events.append(
+                    ProjectionEvent("status_change", old_status=old_status, new_status=status, **common)
+                )
+
+        if full_board:
+            gone = [pid for pid in self._fingerprints if pid not in seen]
+        else:
+            gone = []
+        gone.extend(self._expired(clock, exclude=set(gone)))
+        events.extend(self._forget(projection_id, now) for projection_id in gone)
+        return changed, events
+
+    def _expired(self, clock: float, exclude: set) -> List[str]:
+        """Ids past the TTL or over the size bound, least recently seen first"""
+        expired = []
+        remaining = len(self._seen_at) - len(exclude)
+        for projection_id, seen_at in self._seen_at.items():
+            if projection_id in exclude:
+                continue
+            if seen_at >= clock - self.ttl_seconds and remaining <= self.max_entries:
+                break
+            expired.append(projection_id)
+            remaining -= 1
+        return expired
+
+    def _forget(self, projection_id: str, now: datetime) -> ProjectionEvent:
+        old_line, old_status = self._last.pop(projection_id)
+        del self._fingerprints[projection_id]
+        self._seen_at.pop(projection_id, None)
+        return ProjectionEvent(
+            "removed",
+            projection_id=projection_id,
+            player_id="",
+            stat_type="",
+            league="",
+            old_line=old_line,
+            old_status=old_status,
+            timestamp=now,
+        )
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+class PlayerLineHistory:
+    """Per player/stat ring buffers of recent lines stored as 2-D arrays.
+
+    Row ``i`` holds key ``i``'s last ``capacity`` observations; ``heads[i]``
+    is the next write position and ``counts[i]`` the number filled. At the
+    default capacity a key costs 1.4 KB, versus roughly 30 KB for a deque of
+    100 dicts with datetime values.
+    """
+
+    def __init__(self, capacity: int = 100, initial_keys: int = 1024):
+        self.capacity = capacity
+        self._index: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._league_codes: Dict[str, int] = {}
+        self._league_names: List[str] = []
+        self._allocate(initial_keys)
+
+    def _allocate(self, rows: int) -> None:
+        self.timestamps = np.zeros((rows, self.capacity), dtype=np.float64)
+        self.lines = np.zeros((rows, self.capacity), dtype=np.float32)
+        self.leagues = np.zeros((rows, self.capacity), dtype=np.int16)
+        self.heads = np.zeros(rows, dtype=np.int32)
+        self.counts = np.zeros(rows, dtype=np.int32)
+
+    def _grow(self) -> None:
+        rows = len(self.heads)
+        old = (self.timestamps, self.lines, self.leagues, self.heads, self.counts)
+        self._allocate(rows * 2)
+        for new, previous in zip(
+            (self.timestamps, self.lines, self.leagues, self.heads, self.counts), old
+        ):
+            new[:rows] = previous
+
+    def row(self, key: str, create: bool = False) -> int:
+        index = self._index.get(key, -1)
+        if index < 0 and create:
+            index = len(self._keys)
+            if index >= len(self.heads):
+                self._grow()
+            self._index[key] = index
+            self._keys.append(key)
+        return index
+
+    def _league_code(self, league: str) -> int:
+        code = self._league_codes.get(league)
+        if code is None:
+            code = len(self._league_names)
+            self._league_codes[league] = code
+            self._league_names.append(league)
+        return code
+
+    def append(self, key: str, timestamp: float, line: float, league: str = "") -> int:
+        """Record an observation; returns the key's row"""
+        index = self.row(key, create=True)
+        position = self.heads[index]
+        self.timestamps[index, position] = timestamp
+        self.lines[index, position] = line
+        self.leagues[index, position] = self._league_code(league)
+        self.heads[index] = (position + 1) % self.capacity
+        if self.counts[index] < self.capacity:
+            self.counts[index] += 1
+        return index
+
+    def _ordered_positions(self, index: int, last: Optional[int] = None) -> np.ndarray:
+        count = int(self.counts[index])
+        if last is not None:
+            count = min(count, last)
+        start = self.heads[index] - count
+        return (np.arange(start, self.heads[index])) % self.capacity
+
+    def window(self, key: str, last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, lines) for ``key``, oldest first"""
+        index = self.row(key)
+        if index < 0:
+            return np.empty(0), np.empty(0, dtype=np.float32)
+        positions = self._ordered_positions(index, last)
+        return self.timestamps[index, positions], self.lines[index, positions]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-of-deques compatible view: list of {timestamp, line, league}"""
+        index = self.row(key)
+        if index < 0:
+            return default if default is not None else []
+        positions = self._ordered_positions(index)
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(self.timestamps[index, p], tz=timezone.utc),
+                "line": float(self.lines[index, p]),
+                "league": self._league_names[self.leagues[index, p]],
+            }
+            for p in positions
+        ]
+
+    def __getitem__(self, key: str) -> List[Dict[str, Any]]:
+        return self.get(key, [])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def count(self, key: str) -> int:
+        index = self.row(key)
+        return int(self.counts[index]) if index >= 0 else 0
+
+    def memory_bytes(self) -> int:
+        return sum(
+            a.nbytes for a in (self.timestamps, self.lines, self.leagues, self.heads, self.counts)
+        )
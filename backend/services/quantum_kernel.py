@@ -0,0 +1,151 @@
+"""Low-rank, cached quantum kernels for quantum-inspired portfolio learning.
+
+``QuantumInspiredOptimizer.quantum_machine_learning`` used to encode every
+historical row in a Python loop and build the dense (rows × rows) kernel
+|⟨φ(x_i)|φ(x_j)⟩|² on every call. The SVM step then read it as a full
+matrix. That is O(rows²) time and memory, so a long history does not fit.
+
+Here rows are encoded in one vectorized pass: each standardized value v
+becomes (cos(πv/2), sin(πv/2)), and a missing value contributes nothing.
+The kernel is then kept as a Nyström factor K ≈ Z Zᵀ. ``rank`` landmark rows
+L are sampled once, and Z = K(X, L) W^{-1/2} with W = K(L, L). This costs
+O(rows × rank) in time and memory. The squared overlap is a degree-2
+polynomial kernel of rank at most c(2c + 1) for c columns, so the factor is
+exact (to the eigenvalue floor) whenever ``rank`` covers that or the row
+count. The SVM quadratic term wᵀKw becomes |Zᵀw|², with an
+analytic gradient.
+
+``QuantumKernelCache`` keys factors by a fingerprint of the history. When a
+new frame extends a cached one (same columns, same leading rows), only the
+new rows are encoded and projected onto the existing landmarks, with the
+cached standardization. Once the history has grown by ``REFIT_GROWTH``× since
+its last full fit, it is refit from scratch so the landmarks and
+standardization follow the data.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NYSTROM_RANK = 256
+# Relative eigenvalue floor when inverting the landmark kernel
+EIGENVALUE_FLOOR = 1e-10
+# Rows per kernel block while projecting onto the landmarks
+ROW_CHUNK = 1 << 14
+REFIT_GROWTH = 2.0
+
+
+def quantum_feature_map(values: np.ndarray, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+    """(rows × 2·columns) encoding |0⟩ + e^(iφ)|1⟩ with φ = π·(standardized value)"""
+    phi = (values - mean) / (std + 1e-8) * np.pi
+    features = np.empty((len(values), 2 * values.shape[1]))
+    features[:, 0::2] = np.cos(phi / 2)
+    features[:, 1::2] = np.sin(phi / 2)
+    missing = np.repeat(np.isnan(values), 2, axis=1)
+    features[missing] = 0.0
+    return features
+
+
+def squared_overlap(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Quantum kernel block |⟨φ(a_i)|φ(b_j)⟩|²"""
+    return (a @ b.T) ** 2
+
+
+def history_fingerprint(values: np.ndarray) -> str:
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    digest = hashlib.blake2b(values.view(np.uint8), digest_size=16)
+    digest.update(repr(values.shape).encode())
+    return digest.hexdigest()
+
+
+class NystromKernel:
+    """Nyström factor Z (rows × rank) of the quantum kernel of a history"""
+
+    def __init__(self, values: np.ndarray, rank: int = NYSTROM_RANK, seed: Optional[int] = 0):
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.rank = rank
+        self.mean = np.nan_to_num(np.nanmean(self.values, axis=0)) if len(self.values) else np.zeros(values.shape[1])
+        self.std = (
+            np.nan_to_num(np.nanstd(self.values, axis=0, ddof=1)) if len(self.values) > 1 else np.zeros(values.shape[1])
+        )
+        self.fitted_rows = len(self.values)
+
+        rng = np.random.default_rng(seed)
+        n_landmarks = min(rank, len(self.values))
+        landmark_rows = np.sort(rng.choice(len(self.values), n_landmarks, replace=False))
+        self.landmarks = quantum_feature_map(self.values[landmark_rows], self.mean, self.std)
+        eigenvalues, eigenvectors = np.linalg.eigh(squared_overlap(self.landmarks, self.landmarks))
+        keep = eigenvalues > EIGENVALUE_FLOOR * max(eigenvalues.max(initial=0.0), 1e-300)
+        self.projection = eigenvectors[:, keep] / np.sqrt(eigenvalues[keep])
+        self.factor = self._project(self.values)
+
+    def _project(self, values: np.ndarray) -> np.ndarray:
+        factor = np.empty((len(values), self.projection.shape[1]))
+        for start in range(0, len(values), ROW_CHUNK):
+            features = quantum_feature_map(values[start : start + ROW_CHUNK], self.mean, self.std)
+            factor[start : start + ROW_CHUNK] = squared_overlap(features, self.landmarks) @ self.projection
+        return factor
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def extended(self, values: np.ndarray) -> "NystromKernel":
+        """Kernel of ``values`` (this history plus new rows) reusing the landmarks"""
+        kernel = object.__new__(NystromKernel)
+        kernel.__dict__.update(self.__dict__)
+        kernel.values = np.ascontiguousarray(values, dtype=np.float64)
+        kernel.factor = np.vstack([self.factor, self._project(kernel.values[len(self) :])])
+        return kernel
+
+    def block(self, rows=slice(None), cols=None) -> np.ndarray:
+        """Dense kernel block K[rows, cols] (cols default to rows)"""
+        left = self.factor[rows]
+        right = left if cols is None else self.factor[cols]
+        return left @ right.T
+
+    def bet_factor(self, n_bets: int) -> np.ndarray:
+        """Factor rows of the first ``n_bets`` history rows (zero past the end)"""
+        factor = np.zeros((n_bets, self.factor.shape[1]))
+        rows = min(n_bets, len(self))
+        factor[:rows] = self.factor[:rows]
+        return factor
+
+
+class QuantumKernelCache:
+    """LRU of Nyström kernels keyed by history fingerprint, extended in place of refits"""
+
+    def __init__(self, cache_size: int = 8, rank: int = NYSTROM_RANK, seed: Optional[int] = 0):
+        self.cache_size = cache_size
+        self.rank = rank
+        self.seed = seed
+        self.kernels: "OrderedDict[str, NystromKernel]" = OrderedDict()
+
+    def kernel(self, values: np.ndarray) -> NystromKernel:
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        key = history_fingerprint(values)
+        if key in self.kernels:
+            self.kernels.move_to_end(key)
+            return self.kernels[key]
+
+        kernel = None
+        for known in reversed(self.kernels.values()):
+            if (
+                known.values.shape[1] == values.shape[1]
+                and len(known) < len(values) <= REFIT_GROWTH * known.fitted_rows
+                and np.array_equal(known.values, values[: len(known)], equal_nan=True)
+            ):
+                kernel = known.extended(values)
+                logger.info(f"Extended quantum kernel by {len(values) - len(known)} rows")
+                break
+        if kernel is None:
+            kernel = NystromKernel(values, self.rank, self.seed)
+
+        self.kernels[key] = kernel
+        while len(self.kernels) > self.cache_size:
+            self.kernels.popitem(last=False)
+        return kernel
@@ -10,11 +10,13 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import asyncio
 import math
-import random
 from scipy.optimize import minimize
 from scipy.linalg import norm
 import logging
 
+from .parallel_tempering import DEFAULT_CHAINS, DEFAULT_TEMPERATURES, BetArrays, ParallelTempering
+from .quantum_kernel import NystromKernel, QuantumKernelCache
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -34,6 +36,7 @@ class OptimizationResult:
     confidence_interval: Tuple[float, float]
     quantum_advantage: float
     entanglement_score: float
+    telemetry: Optional[Dict[str, Any]] = None
 
 class QuantumInspiredOptimizer:
     """
@@ -41,13 +44,25 @@ class QuantumInspiredOptimizer:
     Uses principles from quantum annealing and variational quantum eigensolvers.
     """
     
-    def __init__(self, num_qubits: int = 10, temperature: float = 1.0):
+    def __init__(
+        self,
+        num_qubits: int = 10,
+        temperature: float = 1.0,
+        n_chains: int = DEFAULT_CHAINS,
+        n_temperatures: int = DEFAULT_TEMPERATURES,
+    ):
         self.num_qubits = num_qubits
         self.temperature = temperature
+        self.n_chains = n_chains
+        self.n_temperatures = n_temperatures
         self.quantum_states = []
         self.hamiltonian_matrix = None
         self.convergence_threshold = 1e-6
         self.max_iterations = 1000
+        # Convergence telemetry of the last annealing run
+        self.last_telemetry: Optional[Dict[str, Any]] = None
+        # Low-rank quantum kernels by historical-data fingerprint
+        self.kernel_cache = QuantumKernelCache()
         
     def initialize_quantum_state(self, bets: List[Dict]) -> QuantumState:
         """Initialize quantum state for betting portfolio optimization"""
@@ -73,97 +88,48 @@ class QuantumInspiredOptimizer:
             confidence=confidence
         )
     
-    def _calculate_energy(self, amplitudes: np.ndarray, bets: List[Dict]) -> float:
-        """Calculate energy of quantum state based on betting portfolio"""
-        portfolio_return = 0.0
-        portfolio_risk = 0.0
-        
-        for i, bet in enumerate(bets):
-            weight = amplitudes[i] ** 2  # Probability amplitude squared
-            expected_return = bet.get('expected_return', 0.0)
-            risk = bet.get('risk_score', 0.5)
-            
-            portfolio_return += weight * expected_return
-            portfolio_risk += weight * risk
-        
-        # Energy function balances return vs risk
-        energy = -(portfolio_return - 0.5 * portfolio_risk)
-        return energy
+    def _calculate_energy(self, amplitudes: np.ndarray, bets) -> float:
+        """Calculate energy of quantum state based on betting portfolio.
+
+        ``bets`` may be the bet dicts or their ``BetArrays``; loops should
+        convert once and pass the arrays.
+        """
+        if not isinstance(bets, BetArrays):
+            bets = BetArrays.from_bets(bets)
+        # Weights are squared amplitudes; energy balances return vs risk
+        return float(bets.energy(amplitudes))
     
     def quantum_annealing(self, bets: List[Dict], constraints: Dict = None) -> OptimizationResult:
         """
         Quantum annealing algorithm for portfolio optimization.
-        Gradually reduces temperature to find global minimum.
+        Runs batched parallel tempering chains over a temperature ladder
+        topped at ``self.temperature`` (see ``services.parallel_tempering``);
+        convergence telemetry is kept in ``last_telemetry``.
         """
         if not bets:
             raise ValueError("No bets provided for optimization")
         
-        current_state = self.initialize_quantum_state(bets)
-        best_state = current_state
-        
-        initial_temp = self.temperature
-        
-        for iteration in range(self.max_iterations):
-            # Annealing schedule - exponential cooling
-            current_temp = initial_temp * (0.95 ** iteration)
-            
-            # Generate new state through quantum tunneling
-            new_state = self._quantum_tunneling(current_state, bets, current_temp)
-            
-            # Accept/reject based on quantum Boltzmann distribution
-            if self._accept_state(current_state, new_state, current_temp):
-                current_state = new_state
-                
-                if new_state.energy < best_state.energy:
-                    best_state = new_state
-            
-            # Check convergence
-            if iteration > 100 and abs(current_state.energy - best_state.energy) < self.convergence_threshold:
-                logger.info(f"Quantum annealing converged at iteration {iteration}")
-                break
-        
-        return self._create_optimization_result(best_state, bets)
-    
-    def _quantum_tunneling(self, state: QuantumState, bets: List[Dict], temperature: float) -> QuantumState:
-        """Simulate quantum tunneling for state exploration"""
-        n_bets = len(bets)
-        
-        # Quantum tunneling allows escaping local minima
-        tunnel_strength = temperature * 0.1
-        
-        # Perturb amplitudes with quantum noise
-        new_amplitudes = state.amplitudes.copy()
-        for i in range(n_bets):
-            # Add quantum fluctuation
-            quantum_noise = np.random.normal(0, tunnel_strength)
-            new_amplitudes[i] += quantum_noise
-        
-        # Renormalize to maintain quantum constraint
-        new_amplitudes = new_amplitudes / norm(new_amplitudes)
-        
-        # Update phases with quantum evolution
-        new_phases = state.phases + np.random.uniform(-0.1, 0.1, n_bets)
-        
-        new_energy = self._calculate_energy(new_amplitudes, bets)
-        new_confidence = 1.0 - np.var(new_amplitudes)
-        
-        return QuantumState(
-            amplitudes=new_amplitudes,
-            phases=new_phases,
-            energy=new_energy,
-            confidence=new_confidence
+        arrays = BetArrays.from_bets(bets)
+        sampler = ParallelTempering(
+            n_chains=self.n_chains,
+            n_temperatures=self.n_temperatures,
+            max_temperature=self.temperature,
+            max_iterations=self.max_iterations,
+            convergence_threshold=self.convergence_threshold,
         )
-    
-    def _accept_state(self, current: QuantumState, new: QuantumState, temperature: float) -> bool:
-        """Quantum acceptance criterion with temperature-dependent probability"""
-        if new.energy < current.energy:
-            return True
-        
-        # Quantum Boltzmann acceptance
-        delta_energy = new.energy - current.energy
-        acceptance_prob = math.exp(-delta_energy / (temperature + 1e-10))
-        
-        return random.random() < acceptance_prob
+        run = sampler.run(arrays)
+        amplitudes = run.pop("amplitudes")
+        self.last_telemetry = run
+
+        best_state = QuantumState(
+            amplitudes=amplitudes,
+            phases=np.zeros(len(arrays)),
+            energy=run["energy"],
+            confidence=1.0 - np.var(amplitudes)
+        )
+        result = self._create_optimization_result(best_state, arrays)
+        result.telemetry = run
+        return result
     
     def variational_quantum_eigensolver(self, bets: List[Dict]) -> OptimizationResult:
         """
@@ -171,18 +137,19 @@ class QuantumInspiredOptimizer:
         Uses parameterized quantum circuits optimized via classical optimization.
         """
         n_bets = len(bets)
+        arrays = BetArrays.from_bets(bets)
         
         def cost_function(params):
             """Cost function for VQE optimization"""
             # Construct quantum state from parameters
-            amplitudes = np.array([math.cos(params[i]) for i in range(n_bets)])
+            amplitudes = np.cos(params)
             amplitudes = amplitudes / norm(amplitudes)
             
             # Calculate expectation value of Hamiltonian
-            energy = self._calculate_energy(amplitudes, bets)
+            energy = self._calculate_energy(amplitudes, arrays)
             
             # Add regularization terms
-            regularization = 0.01 * sum(p**2 for p in params)
+            regularization = 0.01 * np.dot(params, params)
             
             return energy + regularization
         
@@ -198,7 +165,7 @@ class QuantumInspiredOptimizer:
         )
         
         # Construct optimal quantum state
-        optimal_amplitudes = np.array([math.cos(result.x[i]) for i in range(n_bets)])
+        optimal_amplitudes = np.cos(result.x)
         optimal_amplitudes = optimal_amplitudes / norm(optimal_amplitudes)
         
         optimal_state = QuantumState(
@@ -208,27 +175,27 @@ class QuantumInspiredOptimizer:
             confidence=1.0 - np.var(optimal_amplitudes)
         )
         
-        return self._create_optimization_result(optimal_state, bets)
+        return self._create_optimization_result(optimal_state, arrays)
     
     def quantum_machine_learning(self, bets: List[Dict], historical_data: pd.DataFrame) -> OptimizationResult:
         """
         Quantum machine learning approach using quantum feature maps and quantum kernels.
+        The kernel is a cached Nyström factor of the history (see
+        ``services.quantum_kernel``), extended when rows are appended.
         """
         if historical_data.empty:
             logger.warning("No historical data provided, falling back to quantum annealing")
             return self.quantum_annealing(bets)
         
-        # Quantum feature mapping
-        quantum_features = self._quantum_feature_map(historical_data)
-        
-        # Quantum kernel computation
-        quantum_kernel = self._compute_quantum_kernel(quantum_features)
+        # Low-rank quantum kernel over the numeric history
+        values = historical_data.select_dtypes(include=[np.number]).to_numpy(dtype=np.float64)
+        quantum_kernel = self.kernel_cache.kernel(values)
         
         # Quantum support vector machine for portfolio optimization
         optimal_weights = self._quantum_svm_optimization(quantum_kernel, bets)
         
         # Construct optimal state
-        optimal_amplitudes = np.sqrt(optimal_weights)
+        optimal_amplitudes = np.sqrt(np.clip(optimal_weights, 0.0, None))
         optimal_amplitudes = optimal_amplitudes / norm(optimal_amplitudes)
         
         optimal_state = QuantumState(
@@ -240,55 +207,33 @@ class QuantumInspiredOptimizer:
         
         return self._create_optimization_result(optimal_state, bets)
     
-    def _quantum_feature_map(self, data: pd.DataFrame) -> np.ndarray:
-        """Create quantum feature map from classical data"""
-        # Normalize data
-        normalized_data = (data - data.mean()) / (data.std() + 1e-8)
-        
-        # Apply quantum feature encoding
-        features = []
-        for _, row in normalized_data.iterrows():
-            # Pauli feature map
-            feature_vector = []
-            for val in row.values:
-                if not pd.isna(val):
-                    # Quantum encoding: |0⟩ + e^(iφ)|1⟩
-                    phi = val * np.pi
-                    feature_vector.extend([math.cos(phi/2), math.sin(phi/2)])
-            features.append(feature_vector)
-        
-        return np.array(features)
-    
-    def _compute_quantum_kernel(self, features: np.ndarray) -> np.ndarray:
-        """Compute quantum kernel matrix"""
-        n_samples = features.shape[0]
-        kernel_matrix = np.zeros((n_samples, n_samples))
-        
-        for i in range(n_samples):
-            for j in range(n_samples):
-                # Quantum kernel: |⟨φ(x_i)|φ(x_j)⟩|²
-                overlap = np.dot(features[i], features[j])
-                kernel_matrix[i, j] = abs(overlap) ** 2
-        
-        return kernel_matrix
-    
-    def _quantum_svm_optimization(self, kernel: np.ndarray, bets: List[Dict]) -> np.ndarray:
-        """Quantum SVM optimization for portfolio weights"""
+    def _quantum_svm_optimization(self, kernel: NystromKernel, bets: List[Dict]) -> np.ndarray:
+        """Quantum SVM optimization for portfolio weights.
+
+        The quadratic term only needs the first ``len(bets)`` rows of the
+        kernel's Nyström factor.
+        """
         n_bets = len(bets)
         
         # Extract returns for SVM training
         returns = np.array([bet.get('expected_return', 0.0) for bet in bets])
         
+        # wᵀKw = |Zᵀw|² on the low-rank factor
+        factor = kernel.bet_factor(n_bets)
+        kernel_product = lambda w: factor @ (factor.T @ w)
+        
         def objective(weights):
             # Quantum SVM objective with kernel
             portfolio_return = np.dot(weights, returns)
-            kernel_term = np.dot(weights, np.dot(kernel[:n_bets, :n_bets], weights))
+            kernel_term = np.dot(weights, kernel_product(weights))
             return -(portfolio_return - 0.1 * kernel_term)
         
+        def gradient(weights):
+            return -(returns - 0.2 * kernel_product(weights))
+        
         # Constraints: weights sum to 1, non-negative
         constraints = [
-            {'type': 'eq', 'fun': lambda w: np.sum(w) - 1.0},
-            {'type': 'ineq', 'fun': lambda w: w}
+            {'type': 'eq', 'fun': lambda w: np.sum(w) - 1.0, 'jac': lambda w: np.ones_like(w)}
         ]
         
         initial_weights = np.ones(n_bets) / n_bets
@@ -296,27 +241,24 @@ class QuantumInspiredOptimizer:
         result = minimize(
             objective,
             initial_weights,
+            jac=gradient,
             method='SLSQP',
+            bounds=[(0.0, None)] * n_bets,
             constraints=constraints
         )
         
         return result.x if result.success else initial_weights
     
-    def _create_optimization_result(self, state: QuantumState, bets: List[Dict]) -> OptimizationResult:
-        """Create optimization result from quantum state"""
+    def _create_optimization_result(self, state: QuantumState, bets) -> OptimizationResult:
+        """Create optimization result from quantum state (bet dicts or ``BetArrays``)"""
+        if not isinstance(bets, BetArrays):
+            bets = BetArrays.from_bets(bets)
         # Convert amplitudes to allocation weights
         weights = state.amplitudes ** 2
         
-        allocation = {}
-        expected_return = 0.0
-        risk_score = 0.0
-        
-        for i, bet in enumerate(bets):
-            bet_id = bet.get('id', f'bet_{i}')
-            allocation[bet_id] = float(weights[i])
-            
-            expected_return += weights[i] * bet.get('expected_return', 0.0)
-            risk_score += weights[i] * bet.get('risk_score', 0.5)
+        allocation = dict(zip(bets.ids, weights.tolist()))
+        expected_return = float(weights @ bets.expected_return)
+        risk_score = float(weights @ bets.risk_score)
         
         # Calculate confidence interval
         confidence_lower = expected_return - 2 * math.sqrt(risk_score)
@@ -383,7 +325,8 @@ class QuantumPortfolioManager:
                 'strategy': strategy,
                 'expected_return': result.expected_return,
                 'risk_score': result.risk_score,
-                'quantum_advantage': result.quantum_advantage
+                'quantum_advantage': result.quantum_advantage,
+                'iterations': (result.telemetry or {}).get('iterations'),
             })
             
             logger.info(f"Quantum optimization completed with {strategy}: "
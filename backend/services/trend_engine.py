@@ -0,0 +1,220 @@
+"""
+Batch trend analytics for the whole projection board
+
+``BatchTrendEngine`` keeps the last ``window`` lines for every player/stat in
+one padded 2-D array together with running sums (n, Σy, Σy², Σty). Adding an
+observation is O(1), and slopes, means and volatilities for every key come
+out of a single vectorized pass using the closed-form OLS slope over
+consecutive observation indices, instead of one ``np.polyfit`` per key.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Observation counters are rebased past this to keep Σty well conditioned
+_REBASE_AT = 1 << 20
+
+
+def ols_slopes(values: np.ndarray, counts: Optional[np.ndarray] = None) -> np.ndarray:
+    """Least-squares slope of each row of a left-aligned padded matrix.
+
+    Args:
+        values: (rows, width) array; row ``i`` uses its first ``counts[i]`` entries
+        counts: Valid entries per row (defaults to the full width)
+
+    Returns:
+        Slope per row against x = 0, 1, ..., n-1 (0 where n < 2)
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    rows, width = values.shape
+    if counts is None:
+        counts = np.full(rows, width)
+    counts = np.asarray(counts, dtype=np.float64)
+
+    x = np.arange(width, dtype=np.float64)
+    mask = x[None, :] < counts[:, None]
+    masked = np.where(mask, values, 0.0)
+    sum_y = masked.sum(axis=1)
+    sum_xy = (masked * x).sum(axis=1)
+    sum_x = counts * (counts - 1) / 2
+    denominator = counts * counts * (counts * counts - 1) / 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = (counts * sum_xy - sum_x * sum_y) / denominator
+    return np.where(counts >= 2, slopes, 0.0)
+
+
+def value_bet_scores(predicted: np.ndarray, lines: np.ndarray, min_edge: float = 0.5) -> np.ndarray:
+    """Vectorized ``calculate_value_bet_score``: relative edge, 0 inside ``min_edge``"""
+    predicted = np.asarray(predicted, dtype=np.float64)
+    lines = np.asarray(lines, dtype=np.float64)
+    difference = predicted - lines
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(lines > 0, difference / lines, 0.0)
+    scores = np.where(np.abs(difference) < min_edge, 0.0, scores)
+    return np.round(scores, 3)
+
+
+def select_opportunities(
+    value_scores: np.ndarray,
+    confidence: np.ndarray,
+    risk_scores: Optional[np.ndarray] = None,
+    min_value: float = 0.05,
+    min_confidence: float = 0.7,
+    max_risk: Optional[float] = None,
+    strict: bool = False,
+) -> np.ndarray:
+    """Indices passing the value/confidence/risk screen, best |value| first
+
+    ``strict`` requires value and confidence strictly above their minimums.
+    """
+    value_scores = np.asarray(value_scores, dtype=np.float64)
+    above = np.greater if strict else np.greater_equal
+    mask = above(np.abs(value_scores), min_value) & above(np.asarray(confidence), min_confidence)
+    if risk_scores is not None and max_risk is not None:
+        mask &= np.asarray(risk_scores) < max_risk
+    selected = np.flatnonzero(mask)
+    return selected[np.argsort(-np.abs(value_scores[selected]), kind="stable")]
+
+
+@dataclass
+class TrendSnapshot:
+    """Per-key trend statistics, aligned with ``keys``"""
+
+    keys: List[str]
+    counts: np.ndarray
+    slopes: np.ndarray
+    means: np.ndarray
+    volatilities: np.ndarray
+
+    def labels(self, threshold: float = 0.1) -> np.ndarray:
+        labels = np.full(len(self.keys), "stable", dtype=object)
+        labels[self.slopes > threshold] = "increasing"
+        labels[self.slopes < -threshold] = "decreasing"
+        labels[self.counts < 3] = "insufficient_data"
+        return labels
+
+
+class BatchTrendEngine:
+    """Rolling-window trend statistics for many keys at once"""
+
+    def __init__(self, window: int = 10, initial_keys: int = 1024):
+        self.window = window
+        self._index: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._allocate(initial_keys)
+
+    def _allocate(self, rows: int) -> None:
+        self.values = np.zeros((rows, self.window), dtype=np.float64)
+        self.heads = np.zeros(rows, dtype=np.int64)
+        self.counts = np.zeros(rows, dtype=np.int64)
+        self.t_next = np.zeros(rows, dtype=np.int64)
+        self.sum_y = np.zeros(rows, dtype=np.float64)
+        self.sum_y2 = np.zeros(rows, dtype=np.float64)
+        self.sum_ty = np.zeros(rows, dtype=np.float64)
+
+    def _arrays(self):
+        return (
+            self.values, self.heads, self.counts, self.t_next,
+            self.sum_y, self.sum_y2, self.sum_ty,
+        )
+
+    def _row(self, key: str) -> int:
+        row = self._index.get(key)
+        if row is None:
+            row = len(self._keys)
+            if row >= len(self.heads):
+                old = self._arrays()
+                self._allocate(len(self.heads) * 2)
+                for new, previous in zip(self._arrays(), old):
+                    new[:len(previous)] = previous
+            self._index[key] = row
+            self._keys.append(key)
+        return row
+
+    def update(self, key: str, value: float) -> None:
+        """Append one observation to ``key``'s window in O(1)"""
+        row = self._row(key)
+        head = self.heads[row]
+        t = self.t_next[row]
+
+        if self.counts[row] == self.window:
+            evicted = self.values[row, head]
+            self.sum_y[row] -= evicted
+            self.sum_y2[row] -= evicted * evicted
+            self.sum_ty[row] -= (t - self.window) * evicted
+        else:
+            self.counts[row] += 1
+
+        self.values[row, head] = value
+        self.sum_y[row] += value
+        self.sum_y2[row] += value * value
+        self.sum_ty[row] += t * value
+        self.heads[row] = (head + 1) % self.window
+        self.t_next[row] = t + 1
+
+        if t + 1 >= _REBASE_AT:
+            self._rebase(row)
+
+    def update_many(self, keys: Sequence[str], values: Sequence[float]) -> None:
+        for key, value in zip(keys, values):
+            self.update(key, float(value))
+
+    def _rebase(self, row: int) -> None:
+        """Restart ``row``'s observation index at 0 and recompute its sums exactly"""
+        ordered = self.ordered_values(row)
+        t = np.arange(len(ordered), dtype=np.float64)
+        self.sum_y[row] = ordered.sum()
+        self.sum_y2[row] = (ordered * ordered).sum()
+        self.sum_ty[row] = (t * ordered).sum()
+        self.t_next[row] = len(ordered)
+
+    def ordered_values(self, row: int) -> np.ndarray:
+        count = self.counts[row]
+        positions = (np.arange(self.heads[row] - count, self.heads[row])) % self.window
+        return self.values[row, positions]
+
+    def snapshot(self) -> TrendSnapshot:
+        """Slopes, means and volatilities for every key in one pass"""
+        n_keys = len(self._keys)
+        n = self.counts[:n_keys].astype(np.float64)
+        sum_y = self.sum_y[:n_keys]
+        start = (self.t_next[:n_keys] - self.counts[:n_keys]).astype(np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(n > 0, sum_y / n, 0.0)
+            variance = np.where(n > 1, self.sum_y2[:n_keys] / n - means * means, 0.0)
+            sum_t = n * start + n * (n - 1) / 2
+            denominator = n * n * (n * n - 1) / 12
+            slopes = np.where(
+                n >= 2, (n * self.sum_ty[:n_keys] - sum_t * sum_y) / denominator, 0.0
+            )
+
+        return TrendSnapshot(
+            keys=list(self._keys),
+            counts=self.counts[:n_keys].copy(),
+            slopes=slopes,
+            means=means,
+            volatilities=np.sqrt(np.maximum(variance, 0.0)),
+        )
+
+    def stats(self, key: str) -> Optional[Dict[str, float]]:
+        """Trend statistics for a single key without a full snapshot"""
+        row = self._index.get(key)
+        if row is None:
+            return None
+        values = self.ordered_values(row)
+        return {
+            "count": int(self.counts[row]),
+            "slope": float(ols_slopes(values[None, :])[0]) if len(values) else 0.0,
+            "mean": float(values.mean()) if len(values) else 0.0,
+            "volatility": float(values.std()) if len(values) > 1 else 0.0,
+        }
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._keys)
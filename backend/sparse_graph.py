@@ -0,0 +1,231 @@
+"""Correlation networks and centralities on sparse adjacency matrices.
+
+``GraphBasedFeatures`` built its correlation network edge by edge in a
+Python double loop, then ran NetworkX centralities on it (betweenness alone
+is O(VE) in pure Python). Here the thresholded correlation matrix goes
+straight into a CSR adjacency, computed a block of columns at a time. The
+centralities are sparse linear algebra:
+
+* degree, local clustering and motif counts come from row sums and
+  ``A @ A``;
+* eigenvector centrality and PageRank use power iteration with NetworkX's
+  update rules and stopping tests;
+* betweenness is Brandes' algorithm as level-synchronous sparse BFS over a
+  batch of sources at once, with the sources sampled (``k`` pivots,
+  rescaled like ``nx.betweenness_centrality(G, k=...)``);
+* closeness runs ``scipy.sparse.csgraph`` BFS per component, in chunks of
+  sources.
+
+Node ``i`` is feature column ``i``.
+"""
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import shortest_path
+
+logger = logging.getLogger(__name__)
+
+# Sources per batched BFS / shortest-path chunk
+SOURCE_BATCH = 64
+
+
+def correlation_adjacency(
+    X: np.ndarray, threshold: float = 0.3, block_size: int = 512
+) -> sparse.csr_matrix:
+    """|corr| > threshold between columns of X as a weighted CSR adjacency.
+
+    Same edges and weights as thresholding ``np.corrcoef(X.T)``, without
+    holding the dense (features × features) matrix. Constant columns get no
+    edges.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_samples, n_features = X.shape
+    std = X.std(axis=0)
+    Z = (X - X.mean(axis=0)) / np.where(std > 0, std, np.inf)
+
+    rows, cols, weights = [], [], []
+    for start in range(0, n_features, block_size):
+        block = np.abs(Z[:, start : start + block_size].T @ Z) / n_samples
+        r, c = np.nonzero(block > threshold)
+        r += start
+        off_diagonal = r != c
+        rows.append(r[off_diagonal])
+        cols.append(c[off_diagonal])
+        weights.append(block[r[off_diagonal] - start, c[off_diagonal]])
+
+    return sparse.csr_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_features, n_features),
+    )
+
+
+def binary(adjacency: sparse.spmatrix) -> sparse.csr_matrix:
+    """Unweighted copy of the adjacency (1.0 per edge)"""
+    A = sparse.csr_matrix(adjacency, dtype=np.float64, copy=True)
+    A.eliminate_zeros()
+    A.data[:] = 1.0
+    return A
+
+
+def degree_centrality(A: sparse.csr_matrix) -> np.ndarray:
+    n = A.shape[0]
+    if n <= 1:
+        return np.ones(n)
+    return np.diff(A.indptr) / (n - 1)
+
+
+def eigenvector_centrality(
+    A: sparse.csr_matrix, max_iter: int = 1000, tol: float = 1e-6
+) -> np.ndarray:
+    """Power iteration on (A + I) from a uniform start, as NetworkX does.
+
+    Returns zeros if it does not converge (the fallback the feature code used).
+    """
+    n = A.shape[0]
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_last = x
+        x = x_last + A.T @ x_last
+        x /= np.linalg.norm(x) or 1.0
+        if np.abs(x - x_last).sum() < n * tol:
+            return x
+    logger.warning("Eigenvector centrality did not converge in %d iterations", max_iter)
+    return np.zeros(n)
+
+
+def pagerank(
+    adjacency: sparse.spmatrix, alpha: float = 0.85, max_iter: int = 100, tol: float = 1e-6
+) -> np.ndarray:
+    """Weighted PageRank with uniform teleport and dangling redistribution"""
+    W = sparse.csr_matrix(adjacency, dtype=np.float64)
+    n = W.shape[0]
+    out_weight = np.asarray(W.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inverse = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transition_T = (sparse.diags(inverse) @ W).T.tocsr()
+
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha * (transition_T @ x_last + x_last[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(x - x_last).sum() < n * tol:
+            return x
+    logger.warning("PageRank did not converge in %d iterations", max_iter)
+    return x
+
+
+def betweenness_centrality(
+    A: sparse.csr_matrix,
+    k: Optional[int] = None,
+    seed: int = 0,
+    batch_size: int = SOURCE_BATCH,
+) -> np.ndarray:
+    """Normalized (unweighted) betweenness, exact or from ``k`` sampled sources.
+
+    Brandes' dependency accumulation, run for ``batch_size`` sources at a
+    time: the forward BFS counts shortest paths level by level with
+    ``A @ (sigma * frontier)``, and the backward pass pushes dependencies
+    one level up with ``A @ ((1 + delta) / sigma)``.
+    """
+    n = A.shape[0]
+    if k is None or k >= n:
+        sources = np.arange(n)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False))
+
+    betweenness = np.zeros(n)
+    for start in range(0, len(sources), batch_size):
+        batch = sources[start : start + batch_size]
+        b = len(batch)
+        sigma = np.zeros((n, b))
+        sigma[batch, np.arange(b)] = 1.0
+        visited = sigma > 0
+        levels = [visited.copy()]
+
+        while True:
+            reached = A @ (sigma * levels[-1])
+            frontier = (reached > 0) & ~visited
+            if not frontier.any():
+                break
+            sigma[frontier] = reached[frontier]
+            visited |= frontier
+            levels.append(frontier)
+
+        delta = np.zeros((n, b))
+        safe_sigma = np.where(sigma > 0, sigma, 1.0)
+        for depth in range(len(levels) - 2, 0, -1):
+            pushed = A @ np.where(levels[depth + 1], (1 + delta) / safe_sigma, 0.0)
+            delta += np.where(levels[depth], sigma * pushed, 0.0)
+
+        betweenness += delta.sum(axis=1)
+
+    # NetworkX normalization over ordered (s, t) pairs, endpoints excluded
+    pairs = n - 1
+    if pairs < 2:
+        return betweenness
+    if len(sources) == n:
+        return betweenness / (pairs * (pairs - 1))
+    k = len(sources)
+    scale = np.full(n, 1 / (k * (pairs - 1)))
+    scale[sources] = 1 / ((k - 1) * (pairs - 1)) if k > 1 else np.nan
+    return betweenness * scale
+
+
+def closeness_centrality(A: sparse.csr_matrix, batch_size: int = 256) -> np.ndarray:
+    """(reachable - 1) / total distance within each node's component"""
+    n = A.shape[0]
+    closeness = np.zeros(n)
+    for start in range(0, n, batch_size):
+        sources = np.arange(start, min(start + batch_size, n))
+        distances = shortest_path(A, unweighted=True, directed=False, indices=sources)
+        reachable = np.isfinite(distances)
+        total = np.where(reachable, distances, 0.0).sum(axis=1)
+        closeness[sources] = np.divide(
+            reachable.sum(axis=1) - 1.0, total, out=np.zeros(len(sources)), where=total > 0
+        )
+    return closeness
+
+
+def triangle_counts(A: sparse.csr_matrix) -> np.ndarray:
+    """Triangles through each node: diag(A³) / 2"""
+    return np.asarray((A @ A).multiply(A).sum(axis=1)).ravel() / 2
+
+
+def clustering_coefficient(A: sparse.csr_matrix) -> np.ndarray:
+    degree = np.diff(A.indptr).astype(np.float64)
+    possible = degree * (degree - 1)
+    return np.divide(2 * triangle_counts(A), possible, out=np.zeros_like(degree), where=possible > 0)
+
+
+def motif_counts(A: sparse.csr_matrix) -> Dict[str, int]:
+    """Triangles, and open 3-node paths (neighbor pairs of a node that are not linked)"""
+    triangles_per_node = triangle_counts(A)
+    degree = np.diff(A.indptr).astype(np.float64)
+    return {
+        "triangles": int(round(triangles_per_node.sum() / 3)),
+        "3_paths": int(round((degree * (degree - 1) / 2 - triangles_per_node).sum())),
+    }
+
+
+def centralities(
+    adjacency: sparse.spmatrix,
+    betweenness_samples: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[str, np.ndarray]:
+    """All node measures of the correlation network, one array each.
+
+    Only PageRank uses the edge weights. The rest treat the graph as
+    unweighted, as the NetworkX defaults did.
+    """
+    A = binary(adjacency)
+    return {
+        "degree": degree_centrality(A),
+        "betweenness": betweenness_centrality(A, k=betweenness_samples, seed=seed),
+        "closeness": closeness_centrality(A),
+        "eigenvector": eigenvector_centrality(A),
+        "pagerank": pagerank(adjacency),
+        "clustering": clustering_coefficient(A),
+    }
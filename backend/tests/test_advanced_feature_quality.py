@@ -0,0 +1,46 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from advanced_feature_engineering import AdvancedFeatureEngineer, feature_quality_matrix
+
+
+def test_quality_matrix_matches_pairwise_correlations():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 6))
+    X[:, 1] = 0.9 * X[:, 0] + 0.1 * rng.normal(size=200)
+    y = X[:, 2] + 0.5 * rng.normal(size=200)
+
+    quality = feature_quality_matrix(X, y, block_size=4)
+    corr = np.abs(np.corrcoef(X.T))
+    np.fill_diagonal(corr, 0)
+    np.testing.assert_allclose(quality["redundancy"], corr.max(axis=1))
+    np.testing.assert_allclose(
+        quality["correlation_with_target"], [abs(np.corrcoef(X[:, c], y)[0, 1]) for c in range(6)]
+    )
+    np.testing.assert_allclose(quality["variance"], X.var(axis=0))
+
+
+def test_parallel_strategies_match_sequential():
+    rng = np.random.default_rng(1)
+    raw = {f"x{i}_score": float(v) for i, v in enumerate(rng.normal(size=30))}
+    context = {"timestamp": "2024-01-06T20:00:00"}
+
+    async def run(parallel):
+        # A fresh engineer each time so the quality history starts out the same
+        return await AdvancedFeatureEngineer().engineer_maximum_accuracy_features(
+            raw, context=context, parallel=parallel
+        )
+
+    sequential = asyncio.run(run(False))
+    parallel = asyncio.run(run(True))
+    assert sequential.transformation_pipeline == parallel.transformation_pipeline
+    assert sequential.features.keys() == parallel.features.keys()
+    for name, value in sequential.features.items():
+        np.testing.assert_allclose(parallel.features[name], value, err_msg=name)
+    assert parallel.feature_metrics.keys() >= parallel.features.keys()
+    # Interaction discovery is bounded by the top-k screen
+    assert sum("_X_" in name for name in parallel.features) <= 190 * 10 + 120 * 2
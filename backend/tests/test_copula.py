@@ -0,0 +1,73 @@
+import os
+import sys
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from copula import (
+    KendallConcordance,
+    archimedean_logpdf,
+    fit_archimedean,
+    gaussian_logpdf,
+    joint_probability,
+    kendall_tau_matrix,
+    pseudo_observations,
+    sample_copula,
+    student_t_logpdf,
+)
+from enhanced_risk_management import CopulaModeling
+
+
+def test_densities_integrate_to_one_and_match_scipy():
+    grid = (np.arange(600) + 0.5) / 600
+    U = np.array(np.meshgrid(grid, grid)).reshape(2, -1).T
+    R = np.array([[1.0, 0.5], [0.5, 1.0]])
+    for log_density in (
+        gaussian_logpdf(U, R),
+        student_t_logpdf(U, R, 5.0),
+        archimedean_logpdf("clayton", U, 2.0),
+        archimedean_logpdf("gumbel", U, 2.0),
+        archimedean_logpdf("frank", U, -4.0),
+    ):
+        np.testing.assert_allclose(np.exp(log_density).mean(), 1.0, atol=2e-3)
+
+    Z = stats.norm.ppf(U[:50])
+    expected = stats.multivariate_normal(cov=R).logpdf(Z) - stats.norm.logpdf(Z).sum(axis=1)
+    np.testing.assert_allclose(gaussian_logpdf(U[:50], R), expected)
+
+
+def test_incremental_tau_matches_full_recount():
+    X = np.round(np.random.default_rng(0).standard_normal((600, 3)) @ [[1, 0.4, 0.2], [0, 1, 0.3], [0, 0, 1]], 1)
+    concordance = KendallConcordance(X[:500])
+    concordance.append(X[500:520])
+    concordance.append(X[520:])
+    np.testing.assert_allclose(concordance.tau(), kendall_tau_matrix(X), atol=1e-12)
+    np.testing.assert_allclose(concordance.tau()[0, 2], stats.kendalltau(X[:, 0], X[:, 2])[0])
+
+
+def test_archimedean_fits_recover_sampled_parameters():
+    for family, theta in (("clayton", 2.0), ("gumbel", 2.0), ("frank", 5.0), ("frank", -4.0)):
+        U = sample_copula({"copula_type": family, "theta": theta}, 4000, seed=1)
+        fit = fit_archimedean(pseudo_observations(U), family, stats.kendalltau(U[:, 0], U[:, 1])[0])
+        assert abs(fit["theta"] - theta) < 0.15 * abs(theta), (family, fit["theta"])
+
+
+def test_fit_returns_caches_and_prices_joint_legs():
+    rng = np.random.default_rng(2)
+    returns = rng.standard_normal((801, 3)) @ np.linalg.cholesky([[1, 0.6, 0.3], [0.6, 1, 0.4], [0.3, 0.4, 1]]).T
+    modeling = CopulaModeling()
+    modeling.fit_returns(returns[:800])
+    updated = modeling.fit_returns(returns)
+    assert modeling.fit_returns(returns) is updated
+    np.testing.assert_allclose(
+        updated["copula_comparison"]["gaussian"]["correlation_matrix"],
+        CopulaModeling().fit_returns(returns)["copula_comparison"]["gaussian"]["correlation_matrix"],
+    )
+
+    legs = [0.6, 0.5, 0.7]
+    fit = updated["copula_comparison"]["gaussian"]
+    priced = joint_probability(fit, legs, n_samples=200000, seed=0)
+    exact = stats.multivariate_normal(cov=fit["correlation_matrix"]).cdf(stats.norm.ppf(legs))
+    assert abs(priced["probability"] - exact) < 4 * priced["std_error"]
+    np.testing.assert_allclose(priced["marginal_hit_rates"], legs, atol=0.005)
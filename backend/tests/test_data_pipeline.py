@@ -0,0 +1,42 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enhanced_data_pipeline import EnhancedMathematicalDataPipeline
+
+
+def make_frame():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(size=(120, 3)).cumsum(axis=0), columns=["a", "b", "c"])
+    frame.iloc[::13, 1] = np.nan
+    return frame
+
+
+def test_only_stages_for_requested_artifacts_run():
+    pipeline = EnhancedMathematicalDataPipeline({})
+    result = pipeline.comprehensive_data_processing(make_frame(), artifacts=["anomaly_detection"])
+
+    assert list(result.stage_report) == ["missing_data", "anomaly_detection"]
+    assert list(result.processed_data.columns) == ["a", "b", "c", "anomaly_score"]
+    assert not result.processed_data.isnull().any().any()
+    assert result.signal_decomposition == {} and result.quality_metrics == {}
+    assert "ppca_result" not in result.missing_data_analysis
+
+
+def test_stage_outputs_are_memoized_on_frame_content():
+    pipeline = EnhancedMathematicalDataPipeline({})
+    artifacts = ["time_series_features", "statistical_properties"]
+    first = pipeline.comprehensive_data_processing(make_frame(), artifacts=artifacts)
+    second = pipeline.comprehensive_data_processing(make_frame(), artifacts=artifacts)
+
+    assert not any(stage["cached"] for stage in first.stage_report.values())
+    assert all(stage["cached"] for stage in second.stage_report.values())
+    assert second.processed_data.equals(first.processed_data)
+
+    changed = make_frame()
+    changed.iloc[0, 0] += 1.0
+    third = pipeline.comprehensive_data_processing(changed, artifacts=artifacts)
+    assert not third.stage_report["missing_data"]["cached"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from concurrent.futures import ProcessPoolExecutor
+
+from sklearn.feature_selection import mutual_info_regression
+
+from backend.entropy_estimators import (
+    coarse_grain,
+    multiscale_entropy,
+    mutual_information,
+    sample_entropy,
+    transfer_entropy_matrix,
+    transfer_entropy_pair,
+)
+
+
+def reference_sample_entropy(data, m=2, r=0.2):
+    """Direct O(N²) definition over the first N - m templates"""
+    tolerance = r * np.std(data)
+    n_templates = len(data) - m
+    matches_m = matches_m1 = 0
+    for i in range(n_templates):
+        for j in range(i + 1, n_templates):
+            if np.max(np.abs(data[i:i + m] - data[j:j + m])) <= tolerance:
+                matches_m += 1
+                if abs(data[i + m] - data[j + m]) <= tolerance:
+                    matches_m1 += 1
+    if matches_m == 0 or matches_m1 == 0:
+        return 0.0
+    return -np.log(matches_m1 / matches_m)
+
+
+@pytest.mark.parametrize("method", ["blocked", "kdtree"])
+@pytest.mark.parametrize("m", [1, 2, 3])
+def test_sample_entropy_matches_reference(method, m):
+    data = np.random.default_rng(m).normal(size=300).cumsum()
+    expected = reference_sample_entropy(data, m=m)
+    assert sample_entropy(data, m=m, method=method, block_size=37) == pytest.approx(expected)
+
+
+def test_multiscale_entropy_coarse_grains_by_reshape():
+    data = np.random.default_rng(0).normal(size=205)
+    assert np.allclose(coarse_grain(data, 4), [data[i * 4:(i + 1) * 4].mean() for i in range(51)])
+
+    entropies = multiscale_entropy(data, max_scale=20)
+    assert entropies[0] == pytest.approx(reference_sample_entropy(data))
+    # 205 // 19 = 10 points is too few
+    assert entropies[18] == 0.0 and entropies[19] == 0.0
+
+
+def test_mutual_information_matches_sklearn():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(400, 4))
+    y = X[:, 0] + 0.5 * X[:, 1] ** 2 + rng.normal(size=400) * 0.5
+    expected = mutual_info_regression(X, y, random_state=0)
+    assert mutual_information(X, y) == pytest.approx(expected, abs=5e-3)
+
+
+def test_transfer_entropy_finds_coupling_direction():
+    rng = np.random.default_rng(2)
+    noise = rng.normal(size=(1500, 3))
+    series = np.zeros((1500, 3))
+    for t in range(1, 1500):
+        series[t] = 0.5 * series[t - 1] + noise[t]
+        series[t, 1] += 0.6 * series[t - 1, 0]  # 0 drives 1; 2 is independent
+
+    pair = transfer_entropy_pair(series[:, 0], series[:, 1], embedding_dim=1)
+    assert pair["te_x_to_y"] > 0.1 > pair["te_y_to_x"]
+
+    matrix = transfer_entropy_matrix(series, embedding_dim=1, n_jobs=1)
+    assert np.argmax(matrix) == 1  # [0, 1]
+    assert matrix[0, 1] == pytest.approx(pair["te_x_to_y"])
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert np.allclose(transfer_entropy_matrix(series, embedding_dim=1, executor=pool), matrix)
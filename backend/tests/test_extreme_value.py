@@ -0,0 +1,115 @@
+import os
+import sys
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enhanced_risk_management import ExtremeValueTheory
+from extreme_value import (
+    block_maxima,
+    fit_gev,
+    fit_gpd,
+    gev_neg_loglik,
+    gpd_neg_loglik,
+    hill_estimator,
+    threshold_exceedances,
+)
+
+
+def numeric_gradient(loglik, params, data, h=1e-6):
+    grad = np.zeros_like(params)
+    for i in range(params.shape[1]):
+        step = np.zeros(params.shape[1])
+        step[i] = h
+        grad[:, i] = (loglik(params + step, data, False)[0] - loglik(params - step, data, False)[0]) / (2 * h)
+    return grad
+
+
+def test_likelihoods_and_gradients_match_scipy():
+    maxima = stats.genextreme.rvs(-0.2, loc=1, scale=2, size=(80, 2), random_state=0)
+    for xi in (0.2, -0.05, 0.0):
+        params = np.array([[xi, 1.0, 2.0], [xi, 1.2, 1.8]])
+        nll, grad = gev_neg_loglik(params, maxima)
+        expected = [-stats.genextreme.logpdf(maxima[:, j], -xi, *params[j, 1:]).sum() for j in range(2)]
+        np.testing.assert_allclose(nll, expected, rtol=1e-9)
+        h = 1e-6 if xi else 1e-4  # step across the Gumbel switch
+        np.testing.assert_allclose(grad, numeric_gradient(gev_neg_loglik, params, maxima, h), rtol=1e-4, atol=1e-3)
+
+    excesses = stats.genpareto.rvs(0.2, scale=1.5, size=(100, 2), random_state=1)
+    for xi in (0.2, -0.05, 0.0):
+        params = np.array([[xi, 1.5], [xi, 1.2]])
+        nll, grad = gpd_neg_loglik(params, excesses)
+        expected = [-stats.genpareto.logpdf(excesses[:, j], xi, scale=params[j, 1]).sum() for j in range(2)]
+        np.testing.assert_allclose(nll, expected, rtol=1e-9)
+        h = 1e-6 if xi else 1e-4
+        np.testing.assert_allclose(grad, numeric_gradient(gpd_neg_loglik, params, excesses, h), rtol=1e-4, atol=1e-3)
+
+
+def test_batched_fits_reach_scipy_optimum():
+    rng = np.random.default_rng(2)
+    returns = rng.standard_t(4, size=(2520, 6)) * 0.01
+    maxima = block_maxima(returns, 21)
+    loop = np.array([[returns[i * 21 : (i + 1) * 21, j].max() for j in range(6)] for i in range(120)])
+    np.testing.assert_array_equal(maxima, loop)
+
+    gev = fit_gev(maxima)
+    assert gev["converged"].all()
+    for j in range(6):
+        c, loc, scale = stats.genextreme.fit(maxima[:, j])
+        assert gev["neg_loglik"][j] <= -stats.genextreme.logpdf(maxima[:, j], c, loc, scale).sum() + 1e-6
+
+    excess, threshold, counts = threshold_exceedances(returns)
+    gpd = fit_gpd(excess)
+    assert gpd["converged"].all()
+    np.testing.assert_array_equal(gpd["n_exceedances"], counts)
+    for j in range(6):
+        e = excess[:, j][~np.isnan(excess[:, j])]
+        c, _, scale = stats.genpareto.fit(e, floc=0)
+        if -0.5 <= c <= 0.5:
+            assert gpd["neg_loglik"][j] <= -stats.genpareto.logpdf(e, c, scale=scale).sum() + 1e-6
+
+
+def test_hill_matches_sorted_loop_for_ragged_series():
+    rng = np.random.default_rng(3)
+    series = [rng.pareto(3.0, size=n) + 1 for n in (400, 900, 2500)]
+    hill = hill_estimator(series)
+    for j, data in enumerate(series):
+        ordered = np.sort(data)[::-1]
+        k = int(np.sqrt(len(data)))
+        expected = np.mean(np.log(ordered[:k] / ordered[k]))
+        np.testing.assert_allclose(hill["hill_estimate"][j], expected)
+        assert hill["k_threshold"][j] == k
+
+
+def test_tail_risk_batch_is_cached_per_series():
+    rng = np.random.default_rng(4)
+    evt = ExtremeValueTheory()
+    series = {f"user_{i}": rng.standard_t(4, size=600 + 50 * i) * 0.01 for i in range(5)}
+    first = evt.tail_risk_batch(series, block_size=21)
+    assert len(evt.tail_cache) == 5
+
+    single = evt.generalized_pareto_distribution(series["user_2"])
+    np.testing.assert_allclose(first["user_2"]["gpd_shape"], single["shape_parameter"])
+
+    series["user_0"] = series["user_0"] * 2
+    second = evt.tail_risk_batch(series, block_size=21)
+    assert len(evt.tail_cache) == 6
+    assert second["user_1"] is first["user_1"]
+    np.testing.assert_allclose(second["user_0"]["gpd_scale"], 2 * first["user_0"]["gpd_scale"], rtol=1e-4)
+
+
+def test_ragged_batch_matches_single_series():
+    rng = np.random.default_rng(5)
+    series = {"short": rng.standard_t(4, size=1000), "long": rng.standard_t(4, size=2000)}
+
+    batched = block_maxima(list(series.values()), block_size=252)
+    alone = block_maxima(series["short"], block_size=252)
+    assert alone.shape == (3, 1)
+    np.testing.assert_array_equal(batched[:3, 0], alone[:, 0])
+    assert np.isnan(batched[3:, 0]).all() and not np.isnan(batched[:, 1]).any()
+
+    together = ExtremeValueTheory().tail_risk_batch(series, block_size=252)
+    single = ExtremeValueTheory().tail_risk_batch({"short": series["short"]}, block_size=252)
+    for field, value in single["short"].items():
+        np.testing.assert_allclose(together["short"][field], value, rtol=1e-6, err_msg=field)
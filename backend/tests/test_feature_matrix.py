@@ -0,0 +1,119 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from backend.services.comprehensive_feature_engine import ComprehensiveFeatureEngine, canonical_feature_name
+from backend.services.feature_matrix import FeatureMatrix, FeatureSchema
+from backend.services.intelligent_ensemble_system import IntelligentEnsembleSystem
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from advanced_feature_engineering import AdvancedFeatureEngineer
+
+
+def assert_row_matches(matrix, row, features):
+    """Every scalar feature lands in its column; the other columns stay 0"""
+    expected = np.zeros(len(matrix.schema.columns), dtype=np.float32)
+    for name, value in features.items():
+        expected[matrix.schema.index[name]] = value
+    np.testing.assert_allclose(matrix.values[row], expected, rtol=1e-5, atol=1e-6)
+
+
+def test_schema_scatters_dicts_in_column_order():
+    schema = FeatureSchema(name="t", version=1, columns=("a", "b", "c"))
+    values = schema.from_dicts([{"c": 3.0, "a": 1.0, "extra": 9.0}, {"b": 2.0}])
+    matrix = FeatureMatrix(values=values, schema=schema, row_ids=["x", "y"])
+
+    assert matrix.values.dtype == np.float32 and matrix.values.flags["C_CONTIGUOUS"]
+    assert matrix.values.tolist() == [[1.0, 0.0, 3.0], [0.0, 2.0, 0.0]]
+    assert matrix.row_dict(1) == {"a": 0.0, "b": 2.0, "c": 0.0}
+
+
+def test_schema_id_tracks_columns():
+    v1 = FeatureSchema(name="t", version=1, columns=("a", "b"))
+    reordered = FeatureSchema(name="t", version=1, columns=("b", "a"))
+    assert v1.schema_id != reordered.schema_id
+
+    matrix = FeatureMatrix(values=np.zeros((1, 2)), schema=reordered)
+    with pytest.raises(ValueError):
+        matrix.check_schema(v1)
+    with pytest.raises(ValueError):
+        FeatureMatrix(values=np.zeros((1, 3)), schema=v1)
+
+
+def test_extract_feature_matrix_matches_scalar_extractor():
+    system = IntelligentEnsembleSystem()
+    props = [
+        {"id": "a", "sport": "NBA", "line_score": 24.5, "projected_value": 26.1, "is_home_game": False,
+         "usage_rate": 0.31, "rest_days": 1},
+        {"id": "b", "sport": "MLB", "line_score": 1.5, "recent_form": 0.9, "era": 3.2},
+        {"id": "c", "sport": "NFL", "projected_value": 61.0, "is_home_game": True, "target_share": 0.24},
+        {"id": "d", "sport": "NHL", "line_score": 3.5},
+        {"id": "e", "sport": "NBA", "line_score": None, "projected_value": "", "is_home_game": None,
+         "usage_rate": None},
+    ]
+    matrix = system.extract_feature_matrix(props)
+
+    assert matrix.row_ids == ["a", "b", "c", "d", "e"]
+    for row, prop in enumerate(props):
+        assert_row_matches(matrix, row, system._extract_features_from_prop(prop))
+
+
+def test_comprehensive_matrix_matches_engineer_features(monkeypatch):
+    # The stages draw placeholder values; pin them so both paths see the same draws
+    monkeypatch.setattr(np.random, "uniform", lambda low, high: (low + high) / 2)
+    monkeypatch.setattr(np.random, "randint", lambda low, high: low)
+    monkeypatch.setattr(np.random, "choice", lambda options, p=None: options[0])
+    monkeypatch.delenv("FEATURE_STORE_PATH", raising=False)
+    monkeypatch.delenv("FEATURE_STORE_REDIS_URL", raising=False)
+    props = [
+        {"id": 0, "player_name": "A", "sport": "nba", "prop_type": "points", "game_id": "g1"},
+        {"id": 1, "player_name": "A", "sport": "nba", "prop_type": "assists", "game_id": "g1"},
+        {"id": 2, "player_name": "B", "sport": "nfl", "prop_type": "yards", "game_id": "g2"},
+    ]
+
+    async def run():
+        matrix = await ComprehensiveFeatureEngine().engineer_feature_matrix(props)
+        scalar = ComprehensiveFeatureEngine()
+        feature_sets = [
+            await scalar.engineer_features(
+                prop["player_name"], prop["sport"], prop["prop_type"], {"game_id": prop["game_id"]}
+            )
+            for prop in props
+        ]
+        return matrix, feature_sets
+
+    matrix, feature_sets = asyncio.run(run())
+    for row, feature_set in enumerate(feature_sets):
+        features = {canonical_feature_name(name): value for name, value in feature_set.features.items()}
+        assert_row_matches(matrix, row, features)
+
+
+def test_advanced_matrix_matches_scalar_strategies():
+    engineer = AdvancedFeatureEngineer()
+    rng = np.random.default_rng(0)
+    rows = [
+        {
+            **{f"x{i}": float(v) for i, v in enumerate(rng.normal(10, 3, size=12))},
+            "timestamp": timestamp,
+            "player_stats": player_stats,
+        }
+        for timestamp, player_stats in (
+            ("2024-12-25T20:30:00", {"recent_games": [18, 22, 25, 19, 30], "career_stats": {"average": 21.0}}),
+            ("2024-07-03T13:00:00", {"home_away_splits": {"home_avg": 24.0, "away_avg": 19.5}}),
+            ("2024-03-16T02:15:00", {"recent_games": [7], "vs_opponent": {"average": 9.0, "games": 4}}),
+        )
+    ]
+    fields = [f"x{i}" for i in range(12)]
+    matrix = engineer.engineer_feature_matrix(rows, numeric_fields=fields)
+
+    async def scalar(row):
+        features = engineer._create_statistical_features({field: row[field] for field in fields})
+        features.update(await engineer._create_temporal_features(row, {"timestamp": row["timestamp"]}))
+        features.update(await engineer._create_player_performance_features(row["player_stats"]))
+        return features
+
+    for row, record in enumerate(rows):
+        assert_row_matches(matrix, row, asyncio.run(scalar(record)))
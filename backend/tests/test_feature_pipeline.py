@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from backend.services.comprehensive_feature_engine import ComprehensiveFeatureEngine
+from backend.services.feature_pipeline import CacheScope, FeatureDAG, FeatureStage, PropContext
+
+
+def _counting_stage(name, scope, calls, depends_on=()):
+    async def run(ctx, upstream):
+        calls[name] = calls.get(name, 0) + 1
+        await asyncio.sleep(0)
+        return {f"{name}_x": float(len(upstream))}
+
+    return FeatureStage(name=name, func=run, scope=scope, depends_on=depends_on)
+
+
+def test_shared_scopes_run_once_per_game_and_player():
+    calls = {}
+    dag = FeatureDAG()
+    dag.add_stage(_counting_stage("venue", CacheScope.GAME, calls))
+    dag.add_stage(_counting_stage("rest", CacheScope.PLAYER, calls))
+    dag.add_stage(_counting_stage("line", CacheScope.PROP, calls, depends_on=("venue",)))
+
+    contexts = [
+        PropContext(f"p{player}", "nba", prop, {"game_id": "g1"})
+        for player in range(3)
+        for prop in ("points", "assists")
+    ]
+    outputs = asyncio.run(dag.run_many(contexts))
+
+    assert calls == {"venue": 1, "rest": 3, "line": 6}
+    assert list(outputs[0]) == ["venue", "rest", "line"]
+    assert outputs[0]["line"] == {"line_x": 1.0}
+    assert dag.levels == [["venue", "rest"], ["line"]]
+
+
+def test_cycle_and_unknown_dependency_rejected():
+    dag = FeatureDAG()
+    dag.add_stage(_counting_stage("a", CacheScope.PROP, {}, depends_on=("b",)))
+    dag.add_stage(_counting_stage("b", CacheScope.PROP, {}, depends_on=("a",)))
+    with pytest.raises(ValueError):
+        dag.levels
+
+    dag = FeatureDAG()
+    dag.add_stage(_counting_stage("a", CacheScope.PROP, {}, depends_on=("missing",)))
+    with pytest.raises(ValueError):
+        dag.levels
+
+
+def test_scope_key_needs_game_id_and_tracks_inputs():
+    no_game = PropContext("p", "nba", "points", {})
+    assert all(no_game.scope_key(scope, ("raw_data",)) is None for scope in CacheScope)
+
+    before = PropContext("p", "nba", "points", {"game_id": "g1", "line": 24.5})
+    moved = PropContext("p", "nba", "points", {"game_id": "g1", "line": 25.5})
+    assert before.scope_key(CacheScope.PROP, ("raw_data",))[:4] == ("nba", "g1", "p", "points")
+    assert before.scope_key(CacheScope.PROP, ("raw_data",)) != moved.scope_key(CacheScope.PROP, ("raw_data",))
+    # Fields a stage does not declare do not split its cache
+    assert before.scope_key(CacheScope.GAME, ("sport",)) == moved.scope_key(CacheScope.GAME, ("sport",))
+
+
+def test_props_with_different_inputs_do_not_share_stage_output():
+    calls = {}
+
+    async def run(ctx, upstream):
+        calls["line"] = calls.get("line", 0) + 1
+        return {"line_x": float(ctx.raw_data["line"])}
+
+    dag = FeatureDAG()
+    dag.add_stage(FeatureStage(name="line", func=run, scope=CacheScope.PLAYER, inputs=("raw_data",)))
+    contexts = [
+        PropContext("p", "nba", "points", {"game_id": "g1", "line": 24.5}),
+        PropContext("p", "nba", "points", {"game_id": "g1", "line": 24.5}),
+        PropContext("p", "nba", "points", {"game_id": "g1", "line": 26.5}),
+        PropContext("p", "nba", "points", {"line": 24.5}),
+        PropContext("p", "nba", "points", {"line": 24.5}),
+    ]
+    outputs = asyncio.run(dag.run_many(contexts))
+
+    assert [output["line"]["line_x"] for output in outputs] == [24.5, 24.5, 26.5, 24.5, 24.5]
+    assert calls == {"line": 4}
+    assert dag.invalidate(("nba", "g1")) == 2
+
+
+def test_game_stages_shared_across_props_with_different_lines(monkeypatch):
+    monkeypatch.delenv("FEATURE_STORE_PATH", raising=False)
+    monkeypatch.delenv("FEATURE_STORE_REDIS_URL", raising=False)
+    engine = ComprehensiveFeatureEngine()
+    contexts = [
+        PropContext("p1", "nfl", "yards", {"game_id": "g1", "line_score": 20.5}),
+        PropContext("p1", "nfl", "receptions", {"game_id": "g1", "line_score": 8.5}),
+        PropContext("p2", "nfl", "yards", {"game_id": "g1", "line_score": 61.5}),
+    ]
+    outputs = asyncio.run(engine.pipeline.run_many(contexts))
+
+    stats = engine.pipeline.get_stats()["stages"]
+    for stage in ("weather_impact", "game_script", "referee_impact", "venue_effects"):
+        assert stats[stage]["runs"] == 1
+        assert outputs[0][stage] is outputs[2][stage]
+    for stage in ("rest_travel", "injury_sentiment"):
+        assert stats[stage]["runs"] == 2
+    assert stats["line_movement"]["runs"] == 3
+
+    # A game-level field the stage reads still splits its cache
+    weather = contexts[0].scope_key(CacheScope.GAME, ("sport", "raw_data"), ("game_id", "weather"))
+    rainy = PropContext("p1", "nfl", "yards", {"game_id": "g1", "weather": "rain"})
+    assert rainy.scope_key(CacheScope.GAME, ("sport", "raw_data"), ("game_id", "weather")) != weather
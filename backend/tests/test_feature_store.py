@@ -0,0 +1,123 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from backend.services.comprehensive_feature_engine import ComprehensiveFeatureEngine
+from backend.services.feature_matrix import FeatureSchema
+from backend.services.feature_registry import FeatureRegistry
+from backend.services.feature_store import FeatureStore, OfflineFeatureStore, OnlineFeatureStore, TTLCache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from unified_feature_service import UnifiedFeatureService
+
+SCHEMA = FeatureSchema(name="test_features", version=1, columns=("a", "b"))
+DAY = 86400.0
+
+
+def test_ttl_cache_is_bounded_and_expires():
+    cache = TTLCache(max_size=3)
+    for key in range(5):
+        cache.set(key, key)
+    assert len(cache) == 3
+    assert cache.get(0) is None and cache.get(4) == 4
+
+    cache.set("short", 1, ttl=-1)
+    assert cache.get("short") is None
+
+
+def test_point_in_time_lookup_never_sees_later_rows(tmp_path):
+    store = FeatureStore(online=OnlineFeatureStore(max_entries=2), offline=OfflineFeatureStore(str(tmp_path)))
+    for day, value in enumerate([1.0, 2.0, 3.0]):
+        store.write(SCHEMA, "p1", {"a": value, "b": -value}, sport="nba", event_time=day * DAY)
+
+    matrix, found = store.get_historical(
+        SCHEMA,
+        [
+            {"entity_id": "p1", "timestamp": 1.5 * DAY, "sport": "nba"},
+            {"entity_id": "p1", "timestamp": -1.0, "sport": "nba"},
+            {"entity_id": "p1", "timestamp": 5 * DAY, "sport": "nba"},
+            {"entity_id": "p2", "timestamp": 5 * DAY, "sport": "nba"},
+        ],
+    )
+    assert found.tolist() == [True, False, True, False]
+    assert matrix.values[0].tolist() == [2.0, -2.0]
+    assert matrix.values[2].tolist() == [3.0, -3.0]
+    assert np.isnan(matrix.values[1]).all()
+
+    # max_age drops history that is too stale
+    _, found = store.get_historical(SCHEMA, [{"entity_id": "p1", "timestamp": 5 * DAY}], sport="nba", max_age=DAY)
+    assert not found[0]
+
+    # Online misses fall back to the latest offline row
+    store.online.cache.clear()
+    matrix, found = store.get_online(SCHEMA, ["p1"], sport="nba")
+    assert found[0] and matrix.values[0].tolist() == [3.0, -3.0]
+
+    changed = FeatureSchema(name="test_features", version=1, columns=("a", "c"))
+    with pytest.raises(ValueError):
+        store.write(changed, "p1", {"a": 1.0}, sport="nba")
+
+
+def test_engine_serves_stored_features():
+    engine = ComprehensiveFeatureEngine(feature_store=FeatureStore(online=OnlineFeatureStore(max_entries=100)))
+
+    async def run():
+        feature_set = await engine.engineer_features("Player", "nba", "points", {})
+        matrix, found = await engine.load_feature_matrix(
+            [{"player_name": "Player", "sport": "nba", "prop_type": "points"},
+             {"player_name": "Other", "sport": "nba", "prop_type": "points"}]
+        )
+        return feature_set, matrix, found
+
+    feature_set, matrix, found = asyncio.run(run())
+    assert found.tolist() == [True, False]
+    assert matrix.row_dict(0)["avg_prop_5g"] == pytest.approx(feature_set.features["avg_points_5g"])
+    assert engine.get_service_stats()["cached_feature_sets"] == 1
+
+
+def test_registry_versions_continue_from_stored_schemas(tmp_path):
+    offline = OfflineFeatureStore(str(tmp_path))
+    first = FeatureRegistry(offline).register_schema("set", ("a", "b"))
+    offline.write(first, "nba", ["p1"], np.ones((1, 2)), [0.0])
+
+    # A fresh process sees v1 in the store rather than starting over
+    registry = FeatureRegistry(OfflineFeatureStore(str(tmp_path)))
+    assert registry.register_schema("set", ("a", "b")) == first
+    second = registry.register_schema("set", ("a", "c"))
+    assert second.version == 2
+    registry.offline_store.write(second, "nfl", ["p1"], np.ones((1, 2)), [0.0])
+    assert FeatureRegistry(OfflineFeatureStore(str(tmp_path))).get_schema("set") == second
+
+
+def test_unified_service_survives_restart_with_new_columns(tmp_path, monkeypatch):
+    monkeypatch.setenv("FEATURE_STORE_PATH", str(tmp_path))
+    monkeypatch.delenv("FEATURE_STORE_REDIS_URL", raising=False)
+
+    UnifiedFeatureService().process_features({"a": 1, "b": 2, "team": "BOS"}, {"entity_id": "p1"})
+    # The stored definition pins the set; new columns are written under it
+    restarted = UnifiedFeatureService()
+    restarted.process_features({"a": 3, "c": 4}, {"entity_id": "p2"})
+    matrix, found = restarted.get_online_features("unified", ["p1", "p2"], sport="default")
+    assert matrix.schema.columns == ("a", "b") and found.all()
+    np.testing.assert_allclose(matrix.values, [[0.01, 0.02], [0.03, 0.0]])
+
+    # Redefining the set's columns registers the next stored version
+    UnifiedFeatureService().process_features(
+        {"a": 5, "c": 6}, {"entity_id": "p3", "feature_columns": ["a", "c"]}
+    )
+    assert UnifiedFeatureService().registry.get_schema("unified").version == 2
+
+
+def test_engine_schema_comes_from_registry(tmp_path):
+    def engine():
+        store = FeatureStore(offline=OfflineFeatureStore(str(tmp_path)))
+        return ComprehensiveFeatureEngine(feature_store=store)
+
+    first = engine()
+    schema = asyncio.run(first.feature_schema())
+    assert first.feature_registry.get_schema("comprehensive_features") == schema
+    asyncio.run(first.engineer_features("Player", "nba", "points", {}))
+    assert asyncio.run(engine().feature_schema()) == schema
@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.services import intelligent_ensemble_system as ensemble
+from backend.services.lineup_optimizer import LineupConstraints, LineupOptimizer
+from backend.services.lineup_pricing import Leg, LineupPricer
+
+
+def _slate(n_games=4, players_per_team=3, seed=0):
+    rng = np.random.default_rng(seed)
+    legs = [
+        Leg(f"g{game}-{team}-{player}", f"g{game}-{team}", f"g{game}", "over" if rng.random() < 0.7 else "under")
+        for game in range(n_games)
+        for team in ("home", "away")
+        for player in range(players_per_team)
+    ]
+    return legs, rng.uniform(0.5, 0.65, len(legs))
+
+
+def test_beam_search_matches_brute_force_with_diversity():
+    legs, probabilities = _slate()
+    for play_type, size in (("power", 4), ("flex", 5)):
+        constraints = LineupConstraints(size=size, play_type=play_type)
+        optimizer = LineupOptimizer(LineupPricer(n_samples=20000))
+        result = optimizer.optimize(legs, probabilities, 10, constraints)
+
+        every = np.array(
+            [
+                lineup
+                for lineup in itertools.combinations(range(len(legs)), size)
+                if max(np.unique([legs[i].team for i in lineup], return_counts=True)[1]) < size
+            ]
+        )
+        values = optimizer.pricer.price_lineups(legs, probabilities, every, play_type)["expected_multiplier"]
+        best = optimizer._diverse(every, values, 10, constraints.shared_limit)
+        np.testing.assert_allclose(result["expected_multiplier"], values[best])
+
+
+def test_constraints_and_diversity_hold():
+    legs, probabilities = _slate(n_games=6)
+    constraints = LineupConstraints(size=5, max_per_team=2, max_per_game=3, max_shared_legs=2)
+    result = LineupOptimizer(LineupPricer(n_samples=5000)).optimize(legs, probabilities, 15, constraints)
+    lineups = result["lineups"]
+    assert len(lineups) == 15
+    for lineup in lineups:
+        assert len({legs[i].player for i in lineup}) == 5
+        assert max(np.unique([legs[i].team for i in lineup], return_counts=True)[1]) <= 2
+        assert max(np.unique([legs[i].game for i in lineup], return_counts=True)[1]) <= 3
+    for a, b in itertools.combinations(lineups, 2):
+        assert len(set(a) & set(b)) <= 2
+    assert np.all(np.diff(result["expected_multiplier"]) <= 1e-12)
+
+
+def test_exhausted_time_budget_still_returns_full_lineups():
+    legs, probabilities = _slate(n_games=6)
+    result = LineupOptimizer(LineupPricer(n_samples=5000)).optimize(
+        legs, probabilities, 5, LineupConstraints(size=6), time_budget=0.0
+    )
+    assert result["timed_out"]
+    assert result["lineups"].shape == (5, 6)
+
+
+def test_predict_props_caps_concurrency_and_drops_cancelled():
+    system = ensemble.IntelligentEnsembleSystem()
+    running = {"now": 0, "peak": 0}
+
+    async def predict_prop_outcome(prop):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.001)
+        running["now"] -= 1
+        if prop["id"] == 3:
+            raise asyncio.CancelledError()
+        if prop["id"] == 5:
+            raise ValueError("no data")
+        return SimpleNamespace(win_probability=0.6)
+
+    system.predict_prop_outcome = predict_prop_outcome
+    props = [{"id": i} for i in range(4 * ensemble.MAX_CONCURRENT_PREDICTIONS)]
+    predictions = asyncio.run(system._predict_props(props))
+    assert running["peak"] == ensemble.MAX_CONCURRENT_PREDICTIONS
+    assert [prop["id"] for prop, _ in predictions] == [i for i in range(len(props)) if i not in (3, 5)]
+
+
+def test_predict_props_reraises_interrupts():
+    system = ensemble.IntelligentEnsembleSystem()
+
+    async def predict_prop_outcome(prop):
+        if prop["id"] == 1:
+            raise KeyboardInterrupt()
+        return SimpleNamespace(win_probability=0.6)
+
+    system.predict_prop_outcome = predict_prop_outcome
+    with pytest.raises(KeyboardInterrupt):
+        asyncio.run(system._predict_props([{"id": i} for i in range(3)]))
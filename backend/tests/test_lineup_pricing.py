@@ -0,0 +1,78 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from backend.services.lineup_pricing import (
+    Leg,
+    LegCorrelation,
+    LineupPricer,
+    byte_popcount_rows,
+    independent_hit_distribution,
+    payout_table,
+    pick_type_multiplier,
+)
+
+
+def _slate():
+    legs = []
+    for game in range(3):
+        for team in ("home", "away"):
+            for player in range(2):
+                legs.append(Leg(f"g{game}-{team}-{player}", f"g{game}-{team}", f"g{game}", "over"))
+    return legs
+
+
+def test_bit_sliced_counts_match_brute_force():
+    rng = np.random.default_rng(1)
+    hits = rng.random((12, 1000)) < 0.5
+    lineups = np.array(list(itertools.combinations(range(12), 5)))[::17]
+    distribution = LineupPricer().hit_distribution(hits, lineups)
+    counts = hits[lineups].sum(axis=1)
+    expected = np.stack([(counts == c).mean(axis=1) for c in range(6)], axis=1)
+    np.testing.assert_allclose(distribution, expected)
+
+
+def test_popcount_without_numpy_bitwise_count(monkeypatch):
+    words = np.random.default_rng(2).integers(0, 2**63, size=(7, 5), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    expected = [sum(bin(int(word)).count("1") for word in row) for row in words]
+    np.testing.assert_array_equal(byte_popcount_rows(words), expected)
+
+    # NumPy < 2.0 has no np.bitwise_count; pricing falls back to the byte table
+    hits = np.random.default_rng(3).random((8, 700)) < 0.5
+    lineups = np.array(list(itertools.combinations(range(8), 4)))
+    native = LineupPricer().hit_distribution(hits, lineups)
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    np.testing.assert_array_equal(LineupPricer().hit_distribution(hits, lineups), native)
+
+
+def test_uncorrelated_slate_matches_independent_pricing():
+    legs = _slate()
+    probabilities = np.linspace(0.45, 0.65, len(legs))
+    pricer = LineupPricer(LegCorrelation(0.0, 0.0, 0.0), n_samples=200000)
+    lineups = np.array(list(itertools.combinations(range(len(legs)), 3)))[:50]
+    priced = pricer.price_lineups(legs, probabilities, lineups, "flex")
+    np.testing.assert_allclose(priced["hit_distribution"], priced["independent_hit_distribution"], atol=0.006)
+    np.testing.assert_allclose(
+        independent_hit_distribution(probabilities[lineups]).sum(axis=1), np.ones(len(lineups))
+    )
+
+
+def test_payout_tables():
+    np.testing.assert_allclose(payout_table("power", 4), [0, 0, 0, 0, 10])
+    np.testing.assert_allclose(payout_table("flex", 5), [0, 0, 0, 0.4, 2, 10])
+    assert pick_type_multiplier(["demon", None, "goblin"]) == pytest.approx(1.25 * 0.85)
+    with pytest.raises(ValueError):
+        payout_table("flex", 2)
+
+
+def test_same_team_legs_hit_together_more_often():
+    legs = _slate()
+    pricer = LineupPricer(n_samples=100000)
+    probabilities = np.full(len(legs), 0.55)
+    # Two teammates vs. two players from different games
+    priced = pricer.price_lineups(legs, probabilities, np.array([[0, 1], [0, 4]]))
+    assert priced["win_probability"][0] > priced["win_probability"][1] > 0.55**2 - 0.01
+    assert priced["independent_win_probability"] == pytest.approx([0.55**2, 0.55**2])
+    # The slate's draws are cached and reused across probability updates
+    assert pricer.simulation(legs) is pricer.simulation(list(legs))
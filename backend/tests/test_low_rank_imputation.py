@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enhanced_data_pipeline import AdvancedMissingDataImputation
+from low_rank_imputation import imputation_uncertainty, ppca_complete, randomized_svd
+
+
+def make_matrix(m=150, n=60, rank=4, seed=0):
+    rng = np.random.default_rng(seed)
+    truth = rng.normal(size=(m, rank)) @ rng.normal(size=(rank, n)) * 3 + 20
+    truth += rng.normal(size=(m, n)) * 0.3
+    X = truth.copy()
+    mask = rng.random((m, n)) < 0.3
+    X[mask] = np.nan
+    return truth, X, mask
+
+
+def test_randomized_svd_recovers_leading_triplets():
+    truth, _, _ = make_matrix()
+    U, s, Vt = randomized_svd(truth, 4)
+    expected = np.linalg.svd(truth, compute_uv=False)[:4]
+    assert s == pytest.approx(expected, rel=1e-6)
+
+    # Warm start from the previous subspace
+    _, s_warm, _ = randomized_svd(truth, 4, init=Vt.T, n_power_iter=0)
+    assert s_warm == pytest.approx(expected, rel=1e-6)
+
+
+def test_randomized_svt_matches_exact_iteration():
+    _, X, _ = make_matrix()
+    imputer = AdvancedMissingDataImputation()
+    exact = imputer.matrix_completion_svt(X, solver="exact")
+    fast = imputer.matrix_completion_svt(X, solver="randomized")
+
+    assert fast["iterations"] == exact["iterations"]
+    assert np.allclose(fast["completed_matrix"], exact["completed_matrix"], atol=1e-6)
+    assert np.allclose(fast["uncertainty"], exact["uncertainty"])
+
+
+def test_ppca_chunked_on_memmap(tmp_path):
+    truth, X, mask = make_matrix()
+    source = np.memmap(tmp_path / "x.dat", dtype=np.float64, mode="w+", shape=X.shape)
+    source[:] = X
+    out = np.memmap(tmp_path / "out.dat", dtype=np.float64, mode="w+", shape=X.shape)
+
+    chunked = ppca_complete(source, 4, chunk_rows=16, out=out)
+    in_memory = ppca_complete(X, 4)
+
+    assert np.allclose(np.asarray(out), in_memory["imputed_matrix"])
+    assert np.array_equal(np.asarray(out)[~mask], X[~mask])
+    assert np.sqrt(np.mean((np.asarray(out)[mask] - truth[mask]) ** 2)) < 0.5
+    assert np.allclose(imputation_uncertainty(source, chunk_rows=7), imputation_uncertainty(X))
@@ -0,0 +1,46 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from monte_carlo_risk import CHUNK_ELEMENTS, chunk_sizes, simulate_portfolio_risk
+
+
+def test_chunks_bound_memory():
+    for method in ("pseudo", "antithetic", "sobol"):
+        sizes = chunk_sizes(1_000_000, 252, method)
+        assert sum(sizes) >= 1_000_000
+        assert sizes[0] * 252 <= CHUNK_ELEMENTS
+    assert chunk_sizes(1001, 252, "antithetic")[0] % 2 == 0
+    assert chunk_sizes(100000, 252, "sobol")[0] & (chunk_sizes(100000, 252, "sobol")[0] - 1) == 0
+    # Fewer paths than one chunk still give a power-of-two Sobol chunk
+    assert chunk_sizes(1000, 20, "sobol") == [1024]
+
+
+def test_seeded_results_do_not_depend_on_workers():
+    kwargs = dict(mean=0.0005, std=0.01, horizon=100, n_paths=60000, seed=7)
+    inline = simulate_portfolio_risk(**kwargs, n_jobs=1)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        pooled = simulate_portfolio_risk(**kwargs, executor=pool)
+    assert inline["n_chunks"] > 1
+    assert inline["estimates"] == pooled["estimates"]
+    np.testing.assert_array_equal(inline["portfolio_paths"], pooled["portfolio_paths"])
+
+
+@pytest.mark.parametrize("method", ["pseudo", "antithetic", "sobol"])
+def test_estimates_match_direct_simulation(method):
+    mean, std, horizon = 0.0005, 0.01, 100
+    result = simulate_portfolio_risk(mean, std, horizon, n_paths=100000, method=method, seed=1, n_jobs=1)
+    estimates, bands = result["estimates"], result["confidence_intervals"]
+
+    low, high = bands["mean_final_value"]
+    assert low - 1e-3 <= (1 + mean) ** horizon <= high + 1e-3
+
+    paths = np.cumprod(1 + np.random.default_rng(2).normal(mean, std, (200000, horizon)), axis=1)
+    assert estimates["p5"] == pytest.approx(np.percentile(paths[:, -1], 5), abs=3e-3)
+    assert estimates["loss_probability"] == pytest.approx(np.mean(paths[:, -1] < 1), abs=5e-3)
+    drawdowns = 1 - (paths / np.maximum(np.maximum.accumulate(paths, axis=1), 1)).min(axis=1)
+    assert estimates["mean_max_drawdown"] == pytest.approx(drawdowns.mean(), abs=2e-3)
@@ -0,0 +1,36 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from parallel_tasks import map_tasks, pool_workers
+
+
+def _square(value):
+    return value * value
+
+
+def test_small_work_runs_inline():
+    assert pool_workers(8, work=10, min_work=100, n_jobs=4) == 1
+    assert pool_workers(1, work=1000, min_work=100, n_jobs=4) == 1
+    assert pool_workers(8, work=1000, min_work=100, n_jobs=1) == 1
+    assert map_tasks(_square, range(5), work=10, min_work=100, n_jobs=4) == [0, 1, 4, 9, 16]
+
+
+def test_workers_capped_by_tasks_and_jobs():
+    assert pool_workers(3, work=1000, min_work=100, n_jobs=8) == 3
+    assert pool_workers(10, work=1000, min_work=100, n_jobs=4) == 4
+
+
+def test_supplied_executor_always_used_in_order():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert pool_workers(5, work=1, min_work=100, n_jobs=4, executor=executor) == 4
+        results = map_tasks(_square, range(5), work=1, min_work=100, executor=executor)
+    assert results == [0, 1, 4, 9, 16]
+
+
+def test_process_pool_matches_inline():
+    tasks = list(range(6))
+    inline = map_tasks(_square, tasks, work=10, min_work=100, n_jobs=2)
+    pooled = map_tasks(_square, tasks, work=1000, min_work=100, n_jobs=2)
+    assert pooled == inline
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from backend.services.parallel_tempering import BetArrays, ParallelTempering, batch_energy
+from backend.services.quantum_optimization_service import QuantumInspiredOptimizer
+
+
+def _bets(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {"id": f"bet_{i}", "expected_return": float(rng.normal(0.05, 0.05)), "risk_score": float(rng.uniform(0.1, 0.9))}
+        for i in range(n)
+    ]
+
+
+def test_batch_energy_matches_per_bet_sum():
+    bets = _bets(12)
+    arrays = BetArrays.from_bets(bets)
+    states = np.random.default_rng(1).standard_normal((3, 5, 12))
+    expected = np.empty((3, 5))
+    for index in np.ndindex(3, 5):
+        amplitudes = states[index] / np.linalg.norm(states[index])
+        expected[index] = -sum(
+            amplitudes[i] ** 2 * (bet["expected_return"] - 0.5 * bet["risk_score"]) for i, bet in enumerate(bets)
+        )
+    np.testing.assert_allclose(batch_energy(states, arrays.scores()), expected)
+    np.testing.assert_allclose(arrays.energy(states[0, 0] / np.linalg.norm(states[0, 0])), expected[0, 0])
+
+
+def test_parallel_tempering_reaches_the_best_bet_with_telemetry():
+    arrays = BetArrays.from_bets(_bets(20))
+    run = ParallelTempering(n_chains=16, n_temperatures=6).run(arrays, seed=0)
+    assert run["energy"] == pytest.approx(-arrays.scores().max(), abs=2e-3)
+    assert np.linalg.norm(run["amplitudes"]) == pytest.approx(1.0)
+    assert run["energy"] == pytest.approx(float(arrays.energy(run["amplitudes"])))
+    assert len(run["best_energy_trace"]) == run["iterations"]
+    assert np.all(np.diff(run["best_energy_trace"]) <= 0)
+    assert run["acceptance_rate"].shape == (6,)
+    assert run["swap_rate"].shape == (5,)
+    assert np.all((run["swap_rate"] >= 0) & (run["swap_rate"] <= 1))
+
+
+def test_quantum_annealing_reports_allocation_and_telemetry():
+    bets = _bets(30)
+    optimizer = QuantumInspiredOptimizer()
+    result = optimizer.quantum_annealing(bets)
+    assert set(result.optimal_allocation) == {bet["id"] for bet in bets}
+    assert sum(result.optimal_allocation.values()) == pytest.approx(1.0)
+    assert result.telemetry is optimizer.last_telemetry
+    assert result.telemetry["iterations"] >= 1
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from pareto import crowding_distance, dominance_matrix, non_dominated_sort, pareto_select
+
+
+def _brute_force_ranks(scores):
+    """Front ranks by repeatedly removing the rows nobody remaining dominates"""
+    dominates = dominance_matrix(scores)
+    ranks = np.full(len(scores), -1)
+    remaining = np.ones(len(scores), dtype=bool)
+    rank = 0
+    while remaining.any():
+        front = remaining & ~dominates[remaining].any(axis=0)
+        ranks[front] = rank
+        remaining &= ~front
+        rank += 1
+    return ranks
+
+
+@pytest.mark.parametrize("n_objectives", [1, 2, 3, 4, 6])
+def test_non_dominated_sort_matches_brute_force(n_objectives):
+    rng = np.random.default_rng(n_objectives)
+    for _ in range(20):
+        # Small integer grids force ties and duplicate rows
+        scores = rng.integers(0, 5, size=(rng.integers(1, 120), n_objectives)).astype(float)
+        np.testing.assert_array_equal(non_dominated_sort(scores), _brute_force_ranks(scores))
+    scores = rng.random((1500, n_objectives))
+    np.testing.assert_array_equal(non_dominated_sort(scores), _brute_force_ranks(scores))
+
+
+def test_dominance_matrix_definition():
+    scores = np.array([[1.0, 1.0], [1.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+    expected = np.zeros((4, 4), dtype=bool)
+    expected[0, 1] = expected[3, 1] = True
+    np.testing.assert_array_equal(dominance_matrix(scores), expected)
+    np.testing.assert_array_equal(non_dominated_sort(scores), [0, 1, 0, 0])
+
+
+def test_crowding_distance_and_selection_keep_the_spread():
+    front = np.array([[0.0, 1.0], [0.1, 0.9], [0.5, 0.5], [0.55, 0.45], [1.0, 0.0]])
+    scores = np.vstack([front, [[0.2, 0.2]]])
+    ranks = non_dominated_sort(scores)
+    np.testing.assert_array_equal(ranks, [0, 0, 0, 0, 0, 1])
+    distance = crowding_distance(scores, ranks)
+    assert np.isinf(distance[[0, 4, 5]]).all()
+    np.testing.assert_allclose(distance[[1, 2, 3]], [1.0, 0.9, 1.0])
+
+    # The most crowded optimal row is the first one dropped
+    assert set(pareto_select(scores, 4)) == {0, 1, 3, 4}
+    assert 5 in pareto_select(scores, 6)
+    assert 5 not in pareto_select(scores, 6, max_rank=0)
@@ -0,0 +1,29 @@
+import asyncio
+
+import httpx
+
+from backend.services.prizepicks_ingestion import ConcurrentLeagueFetcher
+
+
+def test_fetcher_closes_the_client_it_created():
+    async def scenario():
+        fetcher = ConcurrentLeagueFetcher(base_url="https://api.test")
+        client = fetcher.client
+        await fetcher.aclose()
+        return client, fetcher._client
+
+    client, remaining = asyncio.run(scenario())
+    assert client.is_closed
+    assert remaining is None
+
+
+def test_fetcher_leaves_injected_client_open():
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        async with ConcurrentLeagueFetcher(base_url="https://api.test", client=client) as fetcher:
+            assert fetcher.client is client
+        closed = client.is_closed
+        await client.aclose()
+        return closed
+
+    assert asyncio.run(scenario()) is False
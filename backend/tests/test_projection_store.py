@@ -0,0 +1,121 @@
+import numpy as np
+
+from backend.services import projection_store
+from backend.services.projection_store import PlayerLineHistory, PrizePicksProjection, ProjectionDiffer
+
+
+def make_row(projection_id, line, status="active"):
+    return {
+        "id": projection_id,
+        "player_id": f"player-{projection_id}",
+        "player_name": "Test Player",
+        "team": "NYY",
+        "position": "OF",
+        "league": "MLB",
+        "sport": "MLB",
+        "stat_type": "Total Bases",
+        "line_score": line,
+        "start_time": "2025-07-01T23:05:00Z",
+        "status": status,
+    }
+
+
+def test_differ_skips_unchanged_and_reports_changes():
+    differ = ProjectionDiffer()
+    changed, events = differ.diff([make_row("a", 1.5), make_row("b", 2.5)])
+    assert len(changed) == 2
+    assert [e.kind for e in events] == ["new", "new"]
+
+    changed, events = differ.diff([make_row("a", 1.5), make_row("b", 2.5)])
+    assert changed == [] and events == []
+
+    changed, events = differ.diff([make_row("a", 2.0), make_row("b", 2.5, "suspended")])
+    kinds = {(e.projection_id, e.kind) for e in events}
+    assert kinds == {("a", "line_change"), ("b", "status_change")}
+    assert next(e for e in events if e.kind == "line_change").old_line == 1.5
+
+
+def test_differ_full_board_reports_removals():
+    differ = ProjectionDiffer()
+    differ.diff([make_row("a", 1.5), make_row("b", 2.5)])
+    _, events = differ.diff([make_row("a", 1.5)], full_board=True)
+    assert [(e.projection_id, e.kind) for e in events] == [("b", "removed")]
+    assert len(differ) == 1
+
+
+def test_differ_retries_rows_that_fail_to_parse():
+    differ = ProjectionDiffer()
+    broken = make_row("a", 1.5)
+    del broken["player_name"]
+    changed, events = differ.diff([broken, make_row("b", 2.5)], parse=PrizePicksProjection.from_raw)
+    assert [p.id for p in changed] == ["b"] and len(differ) == 1
+    assert [e.projection_id for e in events] == ["b"]
+
+    # Same payload again: still not marked as seen, so it is retried
+    changed, _ = differ.diff([broken], parse=PrizePicksProjection.from_raw)
+    assert changed == [] and len(differ) == 1
+    changed, events = differ.diff([make_row("a", 1.5)], parse=PrizePicksProjection.from_raw)
+    assert changed[0].line_score == 1.5 and events[0].kind == "new"
+
+
+def test_differ_forgets_expired_and_excess_ids(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(projection_store.time, "monotonic", lambda: clock[0])
+    differ = ProjectionDiffer(ttl_seconds=60, max_entries=3)
+    differ.diff([make_row("a", 1.5), make_row("b", 2.5)])
+
+    clock[0] = 30.0
+    differ.diff([make_row("a", 1.5)])
+    clock[0] = 90.0
+    _, events = differ.diff([make_row("a", 1.5)])
+    assert [(e.projection_id, e.kind) for e in events] == [("b", "removed")]
+
+    _, events = differ.diff([make_row(pid, 1.0) for pid in "cde"])
+    assert ("a", "removed") in {(e.projection_id, e.kind) for e in events}
+    assert len(differ) == 3
+
+
+def test_line_history_ring_buffer_wraps_in_order():
+    history = PlayerLineHistory(capacity=5, initial_keys=1)
+    for i in range(8):
+        history.append("p1_points", 1000.0 + i, 20.0 + i, "NBA")
+    history.append("p2_points", 1000.0, 10.0, "NBA")
+
+    timestamps, lines = history.window("p1_points")
+    np.testing.assert_allclose(lines, [23, 24, 25, 26, 27])
+    assert list(timestamps) == sorted(timestamps)
+    assert history.count("p1_points") == 5
+    assert len(history) == 2
+    assert history["p2_points"][0]["league"] == "NBA"
+    assert "missing" not in history
+
+
+def test_trend_engine_matches_polyfit():
+    from backend.services.trend_engine import BatchTrendEngine, ols_slopes
+
+    rng = np.random.default_rng(3)
+    engine = BatchTrendEngine(window=10, initial_keys=2)
+    series = {f"key{i}": 20 + np.cumsum(rng.normal(0, 1, size=23)) for i in range(5)}
+    for key, values in series.items():
+        engine.update_many([key] * len(values), values)
+
+    snapshot = engine.snapshot()
+    for i, key in enumerate(snapshot.keys):
+        recent = series[key][-10:]
+        assert np.isclose(snapshot.slopes[i], np.polyfit(range(10), recent, 1)[0])
+        assert np.isclose(snapshot.means[i], recent.mean())
+        assert np.isclose(snapshot.volatilities[i], recent.std())
+
+    padded = np.array([[1.0, 2.0, 4.0, 0.0], [3.0, 0.0, 0.0, 0.0]])
+    np.testing.assert_allclose(ols_slopes(padded, np.array([3, 1])), [1.5, 0.0])
+
+
+def test_select_opportunities_threshold_comparisons():
+    from backend.services.trend_engine import select_opportunities
+
+    values = np.array([0.05, -0.2, 0.1, 0.3])
+    confidence = np.array([0.9, 0.7, 0.8, 0.95])
+    risk = np.array([0.1, 0.1, 0.3, 0.2])
+    assert list(select_opportunities(values, confidence)) == [3, 1, 2, 0]
+    # The background scan keeps its strict thresholds: exactly 5% value or 70% confidence is excluded
+    assert list(select_opportunities(values, confidence, risk, max_risk=0.3, strict=True)) == [3]
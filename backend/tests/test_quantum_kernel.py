@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.quantum_kernel import NystromKernel, QuantumKernelCache, quantum_feature_map, squared_overlap
+from backend.services.quantum_optimization_service import QuantumInspiredOptimizer
+
+
+def _dense_kernel(values, kernel):
+    features = quantum_feature_map(values, kernel.mean, kernel.std)
+    return squared_overlap(features, features)
+
+
+def test_nystrom_factor_reproduces_dense_kernel():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(2000, 6)) @ rng.normal(size=(6, 6))
+    values[5, 2] = np.nan
+    kernel = NystromKernel(values, rank=128)
+    dense = _dense_kernel(values, kernel)
+    assert kernel.factor.shape[1] <= 128
+    assert np.linalg.norm(kernel.block() - dense) / np.linalg.norm(dense) < 1e-6
+    np.testing.assert_allclose(kernel.block(slice(0, 10), slice(10, 20)), dense[:10, 10:20], atol=1e-8)
+
+
+def test_feature_map_matches_row_encoding():
+    data = pd.DataFrame({"a": [1.0, 2.0, 4.0], "b": [0.5, -1.0, 3.0]})
+    features = quantum_feature_map(data.to_numpy(), data.mean().to_numpy(), data.std().to_numpy())
+    normalized = (data - data.mean()) / (data.std() + 1e-8)
+    phi = normalized.iloc[1].to_numpy() * np.pi
+    np.testing.assert_allclose(features[1], [np.cos(phi[0] / 2), np.sin(phi[0] / 2), np.cos(phi[1] / 2), np.sin(phi[1] / 2)])
+
+
+def test_cache_extends_with_appended_rows():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(500, 3))
+    more = np.vstack([values, rng.normal(size=(50, 3))])
+    cache = QuantumKernelCache(rank=64)
+    base = cache.kernel(values)
+    assert cache.kernel(values.copy()) is base
+
+    extended = cache.kernel(more)
+    assert extended is not base and len(extended) == 550
+    np.testing.assert_array_equal(extended.factor[:500], base.factor)
+    # New rows use the cached standardization and landmarks
+    np.testing.assert_allclose(extended.block(), _dense_kernel(more, base), atol=1e-8)
+    # Far beyond the fitted size the kernel is refit from scratch
+    refit = cache.kernel(np.vstack([more, rng.normal(size=(600, 3))]))
+    assert refit.fitted_rows == 1150
+
+
+def test_quantum_machine_learning_allocates_on_large_history():
+    rng = np.random.default_rng(2)
+    bets = [{"id": i, "expected_return": float(r), "risk_score": 0.5} for i, r in enumerate(rng.normal(0.05, 0.05, 40))]
+    history = pd.DataFrame(rng.normal(size=(50000, 4)), columns=list("abcd"))
+    result = QuantumInspiredOptimizer().quantum_machine_learning(bets, history)
+    weights = np.array(list(result.optimal_allocation.values()))
+    assert weights.sum() == pytest.approx(1.0)
+    assert np.all(weights >= 0)
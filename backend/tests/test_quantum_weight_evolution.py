@@ -0,0 +1,77 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from quantum_ensemble import EnsembleObjective, QuantumWeightEvolution, entanglement_matrix
+
+
+def _models_and_history(n_models, n_history=12, seed=0):
+    rng = np.random.default_rng(seed)
+    models = [f"model_{i}" for i in range(n_models)]
+    performances = {model: float(rng.uniform(0.5, 0.9)) for model in models}
+    history = [{"predicted_value": 1.0}]
+    for _ in range(n_history):
+        # History entries cover overlapping subsets of models, plus retired ones
+        members = [model for model in models if rng.random() < 0.7] + ["retired_model"]
+        history.append({"model_weights": dict(zip(members, rng.dirichlet(np.ones(len(members)))))})
+    return models, performances, history
+
+
+def _reference_score(weights, performances, history):
+    """Composite score computed one dict at a time"""
+    weighted_performance = sum(weights[model] * performances[model] for model in weights)
+    entropy = -sum(w * np.log(w + 1e-10) for w in weights.values())
+    diversity_bonus = entropy / np.log(len(weights)) if len(weights) > 1 else 0
+    similarities = []
+    for data in history[-10:]:
+        if "model_weights" in data:
+            common = [model for model in weights if model in data["model_weights"]]
+            w1 = np.array([weights[model] for model in common])
+            w2 = np.array([data["model_weights"][model] for model in common])
+            if common and np.linalg.norm(w1) > 0 and np.linalg.norm(w2) > 0:
+                similarities.append(w1 @ w2 / (np.linalg.norm(w1) * np.linalg.norm(w2)))
+    consistency = np.mean(similarities) if similarities else 0.5
+    return 0.6 * weighted_performance + 0.2 * diversity_bonus + 0.2 * consistency
+
+
+def test_batched_objective_matches_per_dict_scores():
+    models, performances, history = _models_and_history(6)
+    objective = EnsembleObjective.from_history(models, performances, history)
+    population = np.random.default_rng(1).dirichlet(np.ones(6), size=20)
+    population[0, :3] = 0.0
+    expected = [_reference_score(dict(zip(models, weights)), performances, history) for weights in population]
+    np.testing.assert_allclose(objective.scores(population), expected)
+
+    no_history = EnsembleObjective.from_history(models, performances, [])
+    expected = [_reference_score(dict(zip(models, weights)), performances, []) for weights in population]
+    np.testing.assert_allclose(no_history.scores(population), expected)
+
+
+def test_entanglement_matrix_is_hermitian_coupling():
+    correlation = np.random.default_rng(2).random((5, 5))
+    coupling = entanglement_matrix(correlation, 0.7)
+    np.testing.assert_allclose(coupling, coupling.conj().T)
+    assert coupling[1, 3] == pytest.approx(0.7 * correlation[1, 3] * np.exp(1j * np.pi / 4))
+    np.testing.assert_array_equal(np.diag(coupling), 0)
+
+
+def test_evolution_improves_on_uniform_and_warm_start_never_regresses():
+    models, performances, history = _models_and_history(15)
+    objective = EnsembleObjective.from_history(models, performances, history)
+    correlation = np.random.default_rng(3).random((15, 15))
+    coupling = entanglement_matrix((correlation + correlation.T) / 2, 0.7)
+    evolution = QuantumWeightEvolution()
+
+    run = evolution.run(objective, coupling, seed=0)
+    assert run["weights"].sum() == pytest.approx(1.0)
+    assert np.all(run["weights"] >= 0)
+    assert run["score"] == pytest.approx(objective.scores(run["weights"])[0])
+    assert run["score"] > objective.scores(np.full(15, 1 / 15))[0]
+    assert len(run["score_trace"]) == run["iterations"] <= evolution.max_iterations
+    assert np.all(np.diff(run["score_trace"]) >= 0)
+
+    rerun = evolution.run(objective, coupling, warm_start=run["weights"], seed=1)
+    assert rerun["score"] >= run["score"]
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from backend.middleware.advanced_rate_limiting import RateLimit, RateLimitStrategy
+from backend.middleware.async_rate_limiting import AsyncAdvancedRateLimiter
+from backend.middleware.rate_limit_store import InProcessRateLimitStore
+
+
+def test_ring_window_admits_exactly_limit():
+    store = InProcessRateLimitStore(buckets_per_window=60)
+    results = [store.hit_window("k", 5, 60, 1000.0 + i * 0.1) for i in range(8)]
+    assert [r[0] for r in results] == [True] * 5 + [False] * 3
+    assert results[-1][3] > 0, "Denied requests should carry a retry-after"
+
+
+def test_ring_window_slides():
+    store = InProcessRateLimitStore(buckets_per_window=60)
+    for i in range(5):
+        store.hit_window("k", 5, 60, 1000.0 + i)
+    assert not store.hit_window("k", 5, 60, 1030.0)[0]
+    # Every earlier bucket has aged out one window later
+    assert store.hit_window("k", 5, 60, 1061.0)[0]
+
+
+def test_gcra_burst_then_refill():
+    store = InProcessRateLimitStore()
+    admitted = [store.hit_gcra("g", 10, 60, 3, 1000.0)[0] for _ in range(5)]
+    assert admitted == [True, True, True, False, False]
+    # One token refills every 6 seconds
+    assert store.hit_gcra("g", 10, 60, 3, 1006.0)[0]
+
+
+def test_store_is_bounded():
+    store = InProcessRateLimitStore(max_keys=100)
+    for i in range(1000):
+        store.hit_window(f"client-{i}", 10, 60, 1000.0)
+    assert len(store) == 100
+
+
+@pytest.mark.parametrize("strategy", [
+    RateLimitStrategy.SLIDING_WINDOW,
+    RateLimitStrategy.SLIDING_WINDOW_COUNTER,
+    RateLimitStrategy.FIXED_WINDOW,
+    RateLimitStrategy.TOKEN_BUCKET,
+])
+def test_async_limiter_local_fallback(strategy):
+    limiter = AsyncAdvancedRateLimiter()
+    limiter.endpoint_limits["/test"] = RateLimit(20, 3600, strategy)
+
+    async def run():
+        return [await limiter.check_rate_limit("user", "/test") for _ in range(25)]
+
+    results = asyncio.run(run())
+    assert sum(r.allowed for r in results) == 20
+    assert results[-1].retry_after is not None
+    assert limiter.stats["local_checks"] == 25
+
+
+def test_utils_rate_limiter_counts_per_key():
+    from backend.utils.rate_limiter import RateLimiter
+
+    limiter = RateLimiter(window_seconds=60, max_requests=3)
+
+    async def run():
+        first = [await limiter.check_rate_limit("a") for _ in range(4)]
+        other = await limiter.check_rate_limit("b")
+        return first, other, await limiter.time_until_reset("a")
+
+    first, other, reset_in = asyncio.run(run())
+    assert first == [True, True, True, False]
+    assert other is True
+    assert 0 < reset_in <= 60
+    assert len(limiter) == 2
+
+
+def test_utils_rate_limiter_memory_is_bounded():
+    from backend.utils.rate_limiter import RateLimiter
+
+    limiter = RateLimiter(window_seconds=60, max_requests=100, max_keys=1000)
+
+    async def run():
+        for i in range(5000):
+            await limiter.check_rate_limit(f"client-{i}")
+
+    asyncio.run(run())
+    assert len(limiter) == 1000
+    assert limiter.memory_bytes() < 1000 * 200
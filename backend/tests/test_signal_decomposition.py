@@ -0,0 +1,45 @@
+import numpy as np
+from scipy.interpolate import CubicSpline
+from scipy.signal import argrelextrema
+
+from backend.signal_decomposition import (
+    SplineEnvelope,
+    decompose_columns,
+    empirical_mode_decomposition,
+    local_maxima,
+    local_minima,
+)
+
+
+def test_extrema_and_envelope_match_scipy():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=400)
+    assert np.array_equal(local_maxima(x), argrelextrema(x, np.greater)[0])
+    assert np.array_equal(local_minima(x), argrelextrema(x, np.less)[0])
+
+    envelope = SplineEnvelope(400)
+    knots = np.concatenate(([0], np.sort(rng.choice(np.arange(1, 399), 30, replace=False)), [399]))
+    values = rng.normal(size=len(knots))
+    expected = CubicSpline(knots, values, bc_type="natural")(np.arange(400))
+    assert np.allclose(envelope(knots, values), expected)
+    # Same knots again reuse the prepared system
+    envelope(knots, values * 2)
+    assert envelope.hits == 1 and envelope.misses == 1
+
+
+def test_emd_separates_components_and_reconstructs():
+    t = np.linspace(0, 10, 2000)
+    fast, slow = np.sin(2 * np.pi * 3 * t), 0.5 * np.sin(2 * np.pi * 0.3 * t)
+    result = empirical_mode_decomposition(fast + slow + 0.1 * t)
+
+    assert np.allclose(result["imfs"].sum(axis=0) + result["residual"], fast + slow + 0.1 * t)
+    assert np.corrcoef(result["imfs"][0], fast)[0, 1] > 0.99
+
+
+def test_decompose_columns_pool_matches_inline():
+    rng = np.random.default_rng(1)
+    columns = [rng.normal(size=3000).cumsum() * 0.05 + rng.normal(size=3000) for _ in range(4)]
+    inline = decompose_columns(columns, n_jobs=1)
+    pooled = decompose_columns(columns, n_jobs=2)
+    for a, b in zip(inline, pooled):
+        assert a["n_imfs"] == b["n_imfs"] and np.allclose(a["imfs"], b["imfs"])
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enhanced_feature_engineering import GraphBasedFeatures
+from sparse_graph import betweenness_centrality, binary, centralities, correlation_adjacency
+
+
+def make_features(seed=3):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(60, 40))
+    X[:, 5] = X[:, 3] + 0.1 * rng.normal(size=60)
+    X[:, 7] = 1.0  # constant column: no edges
+    return X
+
+
+def test_adjacency_matches_thresholded_corrcoef():
+    X = make_features()
+    adjacency = correlation_adjacency(X, threshold=0.2, block_size=7).toarray()
+    with np.errstate(invalid="ignore"):
+        expected = np.abs(np.corrcoef(X.T))
+    expected = np.where(expected > 0.2, expected, 0.0)
+    np.fill_diagonal(expected, 0.0)
+    assert np.allclose(adjacency, expected)
+
+
+def test_centralities_match_networkx():
+    adjacency = correlation_adjacency(make_features(), threshold=0.2)
+    G = nx.from_scipy_sparse_array(adjacency)
+    measures = centralities(adjacency)
+
+    closeness = {}
+    for component in nx.connected_components(G):
+        closeness.update(nx.closeness_centrality(G.subgraph(component)))
+    expected = {
+        "degree": nx.degree_centrality(G),
+        "betweenness": nx.betweenness_centrality(G),
+        "closeness": closeness,
+        "eigenvector": nx.eigenvector_centrality(G, max_iter=1000),
+        "pagerank": nx.pagerank(G),
+        "clustering": nx.clustering(G),
+    }
+    for name, values in expected.items():
+        assert measures[name] == pytest.approx([values[i] for i in range(40)], abs=1e-9), name
+
+    sampled = betweenness_centrality(binary(adjacency), k=20)
+    assert np.corrcoef(sampled, measures["betweenness"])[0, 1] > 0.9
+
+
+def test_network_features_cached_per_fingerprint():
+    graph = GraphBasedFeatures()
+    X = make_features()
+    first = graph.correlation_network_features(X)
+    assert graph.correlation_network_features(X.copy()) is first
+
+    changed = X.copy()
+    changed[0, 0] += 1.0
+    assert graph.correlation_network_features(changed)["fingerprint"] != first["fingerprint"]
+
+    G = graph.construct_correlation_network(X)
+    triangles = sum(nx.triangles(G).values()) // 3
+    assert graph.network_motifs(G)["triangles"] == first["motifs"]["triangles"] == triangles
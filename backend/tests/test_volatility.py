@@ -0,0 +1,63 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from volatility import ewma_variance, fit_garch, garch_neg_loglik
+
+
+def simulate(n, omega=1e-5, alpha=0.08, beta=0.9, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = np.zeros(n)
+    variance = omega / (1 - alpha - beta)
+    for t in range(n):
+        returns[t] = np.sqrt(variance) * rng.normal()
+        variance = omega + alpha * returns[t] ** 2 + beta * variance
+    return returns
+
+
+def test_ewma_matches_recursion():
+    returns = np.column_stack([simulate(500, seed=s) for s in range(3)])
+    expected = np.zeros_like(returns)
+    expected[0] = returns[:50].var(axis=0)
+    for t in range(1, len(returns)):
+        expected[t] = 0.94 * expected[t - 1] + 0.06 * returns[t - 1] ** 2
+    np.testing.assert_allclose(ewma_variance(returns), expected)
+    np.testing.assert_allclose(ewma_variance(returns[:, 0]), expected[:, 0])
+
+
+def test_garch_likelihood_and_gradient_match_loop():
+    returns = simulate(2000)
+    params = np.array([1.2e-5, 0.07, 0.9])
+
+    variance, loglik = np.var(returns), 0.0
+    for t in range(1, len(returns)):
+        variance = params[0] + params[1] * returns[t - 1] ** 2 + params[2] * variance
+        loglik += -0.5 * (np.log(variance) + returns[t] ** 2 / variance)
+
+    nll, grad, info = garch_neg_loglik(params, returns)
+    np.testing.assert_allclose(nll[0], -loglik)
+    steps = np.array([1e-11, 1e-7, 1e-7])
+    numeric = [
+        (garch_neg_loglik(params + e, returns, False)[0] - garch_neg_loglik(params - e, returns, False)[0])[0]
+        / (2 * e[i])
+        for i, e in enumerate(np.diag(steps))
+    ]
+    np.testing.assert_allclose(grad[0], numeric, rtol=1e-4)
+    assert np.all(np.linalg.eigvalsh(info[0]) > 0)
+
+
+def test_batched_fit_matches_single_fits():
+    returns = np.column_stack(
+        [simulate(3000, alpha=a, beta=0.9 - a / 2, seed=i) for i, a in enumerate((0.03, 0.08, 0.14))]
+    )
+    batched = fit_garch(returns)
+    assert batched["converged"].all()
+    for column in range(returns.shape[1]):
+        single = fit_garch(returns[:, column])
+        np.testing.assert_allclose(batched["neg_loglik"][column], single["neg_loglik"])
+        np.testing.assert_allclose(batched["alpha"][column], single["alpha"])
+    # Recovers the simulated ordering of the ARCH effect
+    assert np.all(np.diff(batched["alpha"]) > 0)
+    assert np.all(batched["alpha"] + batched["beta"] < 1)
@@ -1,6 +1,8 @@
 # Copied and adapted from Newfolder (example structure)
 from typing import Any, Dict
 
+import numpy as np
+
 from feature_cache import FeatureCache
 from feature_logger import FeatureLogger
 from feature_monitor import FeatureMonitor
@@ -8,17 +10,20 @@ from feature_registry import FeatureRegistry
 from feature_selector import FeatureSelector
 from feature_transformation import FeatureTransformer
 from feature_validator import FeatureValidator
+from services.feature_store import FeatureStore
 
 
 class UnifiedFeatureService:
     def __init__(self, config: Dict[str, Any] = {}):
         self.logger = FeatureLogger()
-        self.registry = FeatureRegistry()
         self.validator = FeatureValidator()
         self.transformer = FeatureTransformer()
         self.selector = FeatureSelector()
         self.monitor = FeatureMonitor()
         self.cache = FeatureCache()
+        self.store = config.get("feature_store") or FeatureStore.from_env()
+        # Versions continue from the offline store's schema tables across restarts
+        self.registry = FeatureRegistry(self.store.offline)
 
     def process_features(
         self, data: Dict[str, Any], config: Dict[str, Any] = {}
@@ -30,9 +35,38 @@ class UnifiedFeatureService:
         transformed = self.transformer.transform(data)
         selected = self.selector.select(transformed, config.get("target", []))
         self.cache.set("last_features", selected)
+        if "entity_id" in config:
+            # Persist under the feature set's schema so training can replay it;
+            # the store holds float rows, so only numeric features are written
+            numeric = {
+                name: value
+                for name, value in selected.items()
+                if isinstance(value, (bool, int, float, np.number))
+            }
+            feature_set = config.get("feature_set", "unified")
+            schema = self.registry.feature_set_schema(
+                feature_set, config.get("feature_columns")
+            ) or self.registry.register_schema(feature_set, list(numeric))
+            self.store.write(
+                schema,
+                config["entity_id"],
+                numeric,
+                sport=config.get("sport", "default"),
+                event_time=config.get("event_time"),
+            )
         self.monitor.record(selected, config.get("processing_time", 0))
         self.logger.log("Features processed successfully")
         return selected
 
     def get_features(self, key: str) -> Dict[str, Any]:
         return self.cache.get(key)
+
+    def get_online_features(self, feature_set: str, entity_ids, version=None, sport=None):
+        """Latest stored rows for serving (offline fallback when ``sport`` is given), plus a found mask"""
+        return self.store.get_online(self.registry.get_schema(feature_set, version), entity_ids, sport)
+
+    def get_historical_features(self, feature_set: str, entity_rows, version=None, max_age=None):
+        """Point-in-time training matrix (``entity_id``/``timestamp``/``sport`` rows), plus a found mask"""
+        return self.store.get_historical(
+            self.registry.get_schema(feature_set, version), entity_rows, max_age=max_age
+        )
@@ -2,27 +2,125 @@
 
 import asyncio
 import time
-from collections import defaultdict
-from typing import DefaultDict, Dict, Optional
+from array import array
+from typing import Optional
+
+_SLOT_BITS = 32
+_SLOT_MASK = (1 << _SLOT_BITS) - 1
+_EMPTY = 0
+
+
+def _sift_down(heap: array, pos: int) -> None:
+    """Restore the min-heap property below ``pos`` (heapq works on lists only)."""
+    size = len(heap)
+    item = heap[pos]
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] < heap[child]:
+            child += 1
+        if heap[child] >= item:
+            break
+        heap[pos] = heap[child]
+        pos = child
+    heap[pos] = item
+
+
+def _heap_push(heap: array, item: int) -> None:
+    heap.append(item)
+    pos = len(heap) - 1
+    while pos:
+        parent = (pos - 1) >> 1
+        if heap[parent] <= item:
+            break
+        heap[pos] = heap[parent]
+        pos = parent
+    heap[pos] = item
+
+
+def _heap_pop(heap: array) -> int:
+    top = heap[0]
+    last = heap.pop()
+    if heap:
+        heap[0] = last
+        _sift_down(heap, 0)
+    return top
+
+
+def _heap_replace(heap: array, item: int) -> None:
+    heap[0] = item
+    _sift_down(heap, 0)
 
 
 class RateLimiter:
-    """Rate limiter implementation using sliding window."""
+    """Rate limiter implementation using sliding window.
+
+    Each key owns a fixed ring of ``buckets`` sub-window counters, so a check
+    is O(1) amortized and memory per key does not grow with request volume.
+    All per-key state lives in flat ``array`` slabs indexed by slot:
 
-    def __init__(self, window_seconds: int, max_requests: int):
+    - an open-addressing table maps ``hash(key)`` to a slot (12 bytes/entry,
+      kept at <= 50% load)
+    - counters use the smallest item size that holds ``max_requests``
+      (60 one-byte buckets for limits under 256)
+    - an expiry min-heap of packed ``expiry << 32 | slot`` words evicts keys
+      idle for a full window without scanning the rest
+
+    With 60 one-byte buckets this is roughly 120 bytes per tracked key, and
+    fewer buckets trade window resolution for memory (16 buckets: ~75 bytes,
+    so a million clients fit in under 100 MB).
+    Keys are tracked by their 64-bit hash, so two keys colliding would share
+    a limit; at these table sizes that is vanishingly unlikely.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int,
+        max_requests: int,
+        buckets: int = 60,
+        max_keys: Optional[int] = None,
+    ):
         """Initialize rate limiter.
 
         Args:
             window_seconds: Time window in seconds
             max_requests: Maximum requests allowed in window
+            buckets: Number of sub-window counters per key
+            max_keys: Hard cap on tracked keys; the key closest to expiry is
+                evicted when full
         """
         self.window_seconds = window_seconds
         self.max_requests = max_requests
-        self.requests: DefaultDict[str, Dict[float, int]] = defaultdict(dict)
+        self.buckets = buckets
+        self.max_keys = max_keys
+        self.bucket_width = window_seconds / buckets
         self.cache_hits = 0
         self.total_requests = 0
         self._cleanup_task = None
 
+        # Bucket indices are stored relative to construction so they fit in 32 bits
+        self._origin = int(time.time() // self.bucket_width) - buckets
+
+        if max_requests < 1 << 8:
+            self._count_type = "B"
+        elif max_requests < 1 << 16:
+            self._count_type = "H"
+        else:
+            self._count_type = "L"
+
+        self._table_hashes = array("q", bytes(8 * 16))
+        self._table_slots = array("I", bytes(4 * 16))
+        self._table_used = 0
+
+        self._counts = array(self._count_type)
+        self._totals = array(self._count_type)
+        self._heads = array("I")
+        self._slot_hashes = array("q")
+        self._free_slots = array("I")
+        self._expiry_heap = array("Q")
+        self._zero_ring = array(self._count_type, bytes(self._counts.itemsize * buckets))
+
         # Cleanup task will be started when needed
 
     async def check_rate_limit(self, key: str) -> bool:
@@ -43,23 +141,20 @@ class RateLimiter:
                 pass
 
         self.total_requests += 1
-        current_time = time.time()
+        bucket = self._current_bucket()
+        self._evict_expired(bucket)
 
-        # Remove old timestamps
-        self._cleanup_old_timestamps(key, current_time)
+        slot = self._lookup(key)
+        if slot < 0:
+            slot = self._allocate(key, bucket)
+        else:
+            self._advance(slot, bucket)
 
-        # Count recent requests
-        recent_requests = sum(
-            count
-            for timestamp, count in self.requests[key].items()
-            if current_time - timestamp < self.window_seconds
-        )
-
-        if recent_requests >= self.max_requests:
+        if self._totals[slot] >= self.max_requests:
             return False
 
-        # Add new request
-        self.requests[key][current_time] = self.requests[key].get(current_time, 0) + 1
+        self._counts[slot * self.buckets + bucket % self.buckets] += 1
+        self._totals[slot] += 1
         return True
 
     async def time_until_reset(self, key: str) -> float:
@@ -71,39 +166,197 @@ class RateLimiter:
         Returns:
             float: Seconds until rate limit resets
         """
-        if not self.requests[key]:
+        slot = self._lookup(key)
+        if slot < 0:
+            return 0.0
+
+        bucket = self._current_bucket()
+        self._advance(slot, bucket)
+        if not self._totals[slot]:
             return 0.0
 
-        current_time = time.time()
-        oldest_timestamp = min(self.requests[key].keys())
-        return max(0.0, self.window_seconds - (current_time - oldest_timestamp))
+        # The oldest populated bucket is the next one to leave the window
+        base = slot * self.buckets
+        head = self._heads[slot]
+        oldest = head
+        for offset in range(self.buckets - 1, -1, -1):
+            if self._counts[base + (head - offset) % self.buckets]:
+                oldest = head - offset
+                break
+
+        reset_at = (self._origin + oldest + self.buckets) * self.bucket_width
+        return max(0.0, reset_at - time.time())
+
+    def __len__(self) -> int:
+        """Number of keys currently tracked."""
+        return self._table_used
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by per-key state."""
+        slabs = (
+            self._table_hashes,
+            self._table_slots,
+            self._counts,
+            self._totals,
+            self._heads,
+            self._slot_hashes,
+            self._expiry_heap,
+            self._free_slots,
+        )
+        return sum(a.itemsize * len(a) for a in slabs)
+
+    def _current_bucket(self) -> int:
+        return int(time.time() // self.bucket_width) - self._origin
 
-    def _cleanup_old_timestamps(self, key: str, current_time: float) -> None:
-        """Remove timestamps outside the window.
+    def _advance(self, slot: int, bucket: int) -> None:
+        """Zero the sub-buckets that left the window since the slot's last hit.
+
+        Args:
+            slot: Slot index of the key
+            bucket: Current relative bucket index
+        """
+        head = self._heads[slot]
+        if bucket <= head:
+            return
+
+        base = slot * self.buckets
+        if bucket - head >= self.buckets:
+            self._counts[base:base + self.buckets] = self._zero_ring
+            self._totals[slot] = 0
+        else:
+            counts = self._counts
+            for stale in range(head + 1, bucket + 1):
+                index = base + stale % self.buckets
+                self._totals[slot] -= counts[index]
+                counts[index] = 0
+        self._heads[slot] = bucket
+
+    def _allocate(self, key: str, bucket: int) -> int:
+        """Assign a zeroed slot to a new key.
 
         Args:
             key: Identifier for the client
-            current_time: Current timestamp
+            bucket: Current relative bucket index
+
+        Returns:
+            int: Slot index
         """
-        cutoff_time = current_time - self.window_seconds
-        self.requests[key] = {
-            ts: count for ts, count in self.requests[key].items() if ts > cutoff_time
-        }
+        if self.max_keys is not None and self._table_used >= self.max_keys and self._expiry_heap:
+            self._release(_heap_pop(self._expiry_heap) & _SLOT_MASK)
 
-    async def _cleanup_old_requests(self) -> None:
-        """Periodically clean up old requests."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            base = slot * self.buckets
+            self._counts[base:base + self.buckets] = self._zero_ring
+            self._totals[slot] = 0
+            self._heads[slot] = bucket
+        else:
+            slot = len(self._heads)
+            self._counts.extend(self._zero_ring)
+            self._totals.append(0)
+            self._heads.append(bucket)
+            self._slot_hashes.append(_EMPTY)
+
+        key_hash = self._hash(key)
+        self._slot_hashes[slot] = key_hash
+        self._table_insert(key_hash, slot)
+        _heap_push(self._expiry_heap, ((bucket + self.buckets) << _SLOT_BITS) | slot)
+        return slot
+
+    def _release(self, slot: int) -> None:
+        self._table_delete(self._slot_hashes[slot])
+        self._slot_hashes[slot] = _EMPTY
+        self._free_slots.append(slot)
+
+    def _evict_expired(self, bucket: int) -> None:
+        """Release keys whose whole window has elapsed.
+
+        Each live key has exactly one heap entry. An entry that comes due for
+        a key that was hit since it was pushed is re-queued at the key's new
+        expiry, so every pop is O(log n) and no pass ever visits every key.
+
+        Args:
+            bucket: Current relative bucket index
+        """
+        heap = self._expiry_heap
+        while heap and heap[0] >> _SLOT_BITS <= bucket:
+            slot = heap[0] & _SLOT_MASK
+            expiry = self._heads[slot] + self.buckets
+            if expiry <= bucket:
+                _heap_pop(heap)
+                self._release(slot)
+            else:
+                _heap_replace(heap, (expiry << _SLOT_BITS) | slot)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return hash(key) or 1
+
+    def _lookup(self, key: str) -> int:
+        key_hash = self._hash(key)
+        mask = len(self._table_hashes) - 1
+        index = key_hash & mask
+        while True:
+            stored = self._table_hashes[index]
+            if stored == key_hash:
+                return self._table_slots[index]
+            if stored == _EMPTY:
+                return -1
+            index = (index + 1) & mask
+
+    def _table_insert(self, key_hash: int, slot: int) -> None:
+        if (self._table_used + 1) * 2 > len(self._table_hashes):
+            self._table_resize(len(self._table_hashes) * 2)
+
+        mask = len(self._table_hashes) - 1
+        index = key_hash & mask
+        while self._table_hashes[index] != _EMPTY:
+            index = (index + 1) & mask
+        self._table_hashes[index] = key_hash
+        self._table_slots[index] = slot
+        self._table_used += 1
+
+    def _table_delete(self, key_hash: int) -> None:
+        """Remove a hash using backward-shift deletion (no tombstones)."""
+        hashes, slots = self._table_hashes, self._table_slots
+        mask = len(hashes) - 1
+        hole = key_hash & mask
+        while hashes[hole] != key_hash:
+            if hashes[hole] == _EMPTY:
+                return
+            hole = (hole + 1) & mask
+
+        index = hole
         while True:
-            current_time = time.time()
-            cutoff_time = current_time - self.window_seconds
+            index = (index + 1) & mask
+            stored = hashes[index]
+            if stored == _EMPTY:
+                break
+            home = stored & mask
+            # Shift back entries whose probe sequence passes through the hole
+            if (index > hole and (home <= hole or home > index)) or (
+                index < hole and home <= hole and home > index
+            ):
+                hashes[hole] = stored
+                slots[hole] = slots[index]
+                hole = index
 
-            # Clean up each key's timestamps
-            for key in list(self.requests.keys()):
-                self._cleanup_old_timestamps(key, current_time)
+        hashes[hole] = _EMPTY
+        self._table_used -= 1
 
-                # Remove empty entries
-                if not self.requests[key]:
-                    del self.requests[key]
+    def _table_resize(self, size: int) -> None:
+        old_hashes, old_slots = self._table_hashes, self._table_slots
+        self._table_hashes = array("q", bytes(8 * size))
+        self._table_slots = array("I", bytes(4 * size))
+        self._table_used = 0
+        for key_hash, slot in zip(old_hashes, old_slots):
+            if key_hash != _EMPTY:
+                self._table_insert(key_hash, slot)
 
+    async def _cleanup_old_requests(self) -> None:
+        """Periodically release idle keys when traffic is too low to do it inline."""
+        while True:
+            self._evict_expired(self._current_bucket())
             await asyncio.sleep(60)  # Run every minute
 
     def record_cache_hit(self) -> None: